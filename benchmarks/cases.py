@@ -0,0 +1,318 @@
+# benchmarks/cases.py
+
+import os
+from functools import partial
+
+from benchmarks.synthetic import dataset_path, generate_frame
+
+# Row counts above which a case is skipped, for functions whose cost makes
+# larger sizes impractical (Excel is written cell by cell, a random forest
+# is trained on every row, seaborn bootstraps a confidence interval for
+# every repeated x value of a line plot).
+EXCEL_MAX_ROWS = 100000
+TRAIN_MAX_ROWS = 100000
+LINE_PLOT_MAX_ROWS = 100000
+PLOT_MAX_ROWS = 1000000
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'bz2': '.bz2', 'zstd': '.zst'}
+# Filter of the filtering cases, keeping about a tenth of the rows.
+FILTER_EXPRESSION = "int_0 < 200 and category_0 in ('c0', 'c1', 'c2', 'c3') or float_0 is null"
+
+class Dataset:
+    """
+    Synthetic dataset of one size, generated lazily and shared by the cases.
+
+    Parameters:
+        rows (int): Number of rows.
+        data_dir (str): Directory caching the generated files.
+        work_dir (str): Directory the cases write their outputs to.
+        **options: Options forwarded to ``generate_frame`` (columns, null_rate, cardinality, seed).
+    """
+
+    def __init__(self, rows, data_dir, work_dir, **options):
+        self.rows = rows
+        self.data_dir = data_dir
+        self.work_dir = work_dir
+        self.options = options
+        self._frame = None
+
+    def frame(self):
+        """Return a fresh copy of the generated frame."""
+        if self._frame is None:
+            self._frame = generate_frame(self.rows, **self.options)
+        return self._frame.copy()
+
+    def path(self, format='csv', compression=None, **overrides):
+        """Return the path of the dataset written as 'csv', 'json', 'excel' or 'parquet', with ``overrides`` applied."""
+        return dataset_path(self.data_dir, self.rows, format=format, compression=compression,
+                            **{**self.options, **overrides})
+
+    def output(self, name):
+        """Return a path in the work directory for an output file."""
+        return os.path.join(self.work_dir, name)
+
+class Case:
+    """
+    One benchmarked function call.
+
+    ``setup(dataset)`` prepares the arguments and returns a zero-argument
+    callable; only that callable is timed, so data generation and copies of
+    the input frame are not part of the measurement.
+
+    Parameters:
+        name (str): '<module>.<function>' name of the case.
+        setup (callable): Function returning the callable to time.
+        max_rows (int): Largest dataset the case runs on; no limit if None.
+    """
+
+    def __init__(self, name, setup, max_rows=None):
+        self.name = name
+        self.setup = setup
+        self.max_rows = max_rows
+
+    def applies_to(self, rows):
+        return self.max_rows is None or rows <= self.max_rows
+
+def _drain(chunks):
+    for _ in chunks:
+        pass
+
+def _chunks(df, chunksize=100000):
+    return [df.iloc[start:start + chunksize] for start in range(0, len(df), chunksize)]
+
+def _numeric(dataset):
+    return dataset.frame()[['float_0', 'float_1', 'float_2', 'float_3']]
+
+def _features(dataset):
+    return dataset.frame().drop(columns=['target', 'label', 'datetime_0'])
+
+def _training_frame(dataset):
+    # train_model does not impute, so train on the complete rows
+    return dataset.frame().drop(columns=['label', 'datetime_0']).dropna()
+
+def _trained(dataset):
+    from dataauto.model_trainer import train_model
+    from sklearn.model_selection import train_test_split
+    df = _training_frame(dataset)
+    model, _ = train_model(df, 'target')
+    X, y = df.drop(columns=['target']), df['target']
+    _, X_test, _, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    return model, X_test, y_test
+
+def _loader_cases():
+    from dataauto import data_loader
+    return [
+        Case('data_loader.load_csv', lambda d: partial(data_loader.load_csv, d.path('csv'))),
+        Case('data_loader.load_json', lambda d: partial(data_loader.load_json, d.path('json'))),
+        Case('data_loader.load_parquet', lambda d: partial(data_loader.load_parquet, d.path('parquet'))),
+        Case('data_loader.load_parquet[where]',
+             lambda d: partial(data_loader.load_parquet, d.path('parquet'), where=FILTER_EXPRESSION)),
+        Case('data_loader.load_excel', lambda d: partial(data_loader.load_excel, d.path('excel')),
+             max_rows=EXCEL_MAX_ROWS),
+        Case('data_loader.iter_csv', lambda d: partial(_drain, data_loader.iter_csv(d.path('csv')))),
+        Case('data_loader.iter_json', lambda d: partial(_drain, data_loader.iter_json(d.path('json')))),
+        Case('data_loader.iter_chunks', lambda d: partial(_drain, data_loader.iter_chunks(d.path('csv')))),
+        Case('data_loader.iter_excel', lambda d: partial(_drain, data_loader.iter_excel(d.path('excel'))),
+             max_rows=EXCEL_MAX_ROWS),
+        Case('data_loader.load_excel_sheets', lambda d: partial(data_loader.load_excel_sheets, d.path('excel')),
+             max_rows=EXCEL_MAX_ROWS),
+    ]
+
+def _saver_cases():
+    from dataauto import data_saver
+    return [
+        Case('data_saver.save_csv', lambda d: partial(data_saver.save_csv, d.frame(), d.output('out.csv'))),
+        Case('data_saver.save_json', lambda d: partial(data_saver.save_json, d.frame(), d.output('out.json'))),
+        Case('data_saver.save_excel', lambda d: partial(data_saver.save_excel, d.frame(), d.output('out.xlsx')),
+             max_rows=EXCEL_MAX_ROWS),
+        Case('data_saver.save_excel_sheets',
+             lambda d: partial(data_saver.save_excel_sheets, {'data': d.frame()}, d.output('sheets.xlsx')),
+             max_rows=EXCEL_MAX_ROWS),
+        Case('data_saver.save_chunks',
+             lambda d: partial(data_saver.save_chunks, _chunks(d.frame()), d.output('chunks.jsonl'), format='json')),
+    ]
+
+def _available_codecs():
+    codecs = ['gzip', 'bz2']
+    try:
+        import zstandard  # noqa: F401
+        codecs.append('zstd')
+    except ImportError:
+        pass
+    return codecs
+
+def _compression_cases():
+    """Compressed variants of the CSV and JSON cases, named e.g. 'data_loader.load_csv[gzip]'."""
+    from dataauto import data_loader, data_saver
+    cases = []
+    for codec in _available_codecs():
+        extension = COMPRESSION_EXTENSIONS[codec]
+        cases += [
+            Case(f"data_loader.load_csv[{codec}]",
+                 lambda d, codec=codec: partial(data_loader.load_csv, d.path('csv', compression=codec))),
+            Case(f"data_loader.load_json[{codec}]",
+                 lambda d, codec=codec: partial(data_loader.load_json, d.path('json', compression=codec))),
+            Case(f"data_saver.save_csv[{codec}]",
+                 lambda d, extension=extension: partial(data_saver.save_csv, d.frame(),
+                                                        d.output(f"out.csv{extension}"))),
+            Case(f"data_saver.save_json[{codec}]",
+                 lambda d, extension=extension: partial(data_saver.save_json, d.frame(),
+                                                        d.output(f"out.jsonl{extension}"))),
+        ]
+    return cases
+
+def _json_engine_cases():
+    """The JSON cases on the pyarrow engine, named e.g. 'data_loader.load_json[pyarrow]', when pyarrow is installed."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return []
+    from dataauto import data_loader, data_saver
+    return [
+        Case('data_loader.load_json[pyarrow]',
+             lambda d: partial(data_loader.load_json, d.path('json'), engine='pyarrow')),
+        Case('data_loader.iter_json[pyarrow]',
+             lambda d: partial(_drain, data_loader.iter_json(d.path('json'), engine='pyarrow'))),
+        Case('data_saver.save_json[pyarrow]',
+             lambda d: partial(data_saver.save_json, d.frame(), d.output('out.json'), engine='pyarrow')),
+        Case('data_saver.save_chunks[pyarrow]',
+             lambda d: partial(data_saver.save_chunks, _chunks(d.frame()), d.output('chunks.jsonl'), format='json',
+                               json_engine='pyarrow')),
+    ]
+
+def _cleaner_cases():
+    from dataauto import data_cleaner
+    return [
+        Case('data_cleaner.clean_data', lambda d: partial(data_cleaner.clean_data, _numeric(d))),
+        Case('data_cleaner.remove_outliers', lambda d: partial(data_cleaner.remove_outliers, d.frame(), 'float_0')),
+        Case('data_cleaner.scale_features', lambda d: partial(data_cleaner.scale_features, _numeric(d).fillna(0))),
+    ]
+
+def _available_engines():
+    engines = ['pandas']
+    for name in ('duckdb', 'polars'):
+        try:
+            __import__(name)
+            engines.append(name)
+        except ImportError:
+            pass
+    return engines
+
+def _engine_cases():
+    """The file-to-file operations of dataauto.engines on each installed engine, e.g. 'engines.clean[duckdb]'."""
+    from dataauto.engines import get_engine
+    cases = []
+    for name in _available_engines():
+        cases += [
+            Case(f"engines.clean[{name}]",
+                 lambda d, name=name: partial(get_engine(name).clean, d.path('csv'), d.output('clean.csv'),
+                                              columns=['float_0', 'float_1', 'int_0'])),
+            Case(f"engines.remove_outliers[{name}]",
+                 lambda d, name=name: partial(get_engine(name).remove_outliers, d.path('csv'),
+                                              d.output('outliers.csv'), 'float_0')),
+            Case(f"engines.scale[{name}]",
+                 lambda d, name=name: partial(get_engine(name).scale, d.path('csv'), d.output('scale.csv'),
+                                              columns=['float_0', 'float_1'])),
+            Case(f"engines.filter[{name}]",
+                 lambda d, name=name: partial(get_engine(name).filter, d.path('csv'), d.output('filter.csv'),
+                                              FILTER_EXPRESSION)),
+            Case(f"engines.filter[{name}-parquet]",
+                 lambda d, name=name: partial(get_engine(name).filter, d.path('parquet'),
+                                              d.output('filter.parquet'), FILTER_EXPRESSION)),
+        ]
+    return cases
+
+def _filtering_cases():
+    from dataauto import filtering
+    return [
+        Case('filtering.filter_frame', lambda d: partial(filtering.filter_frame, d.frame(), FILTER_EXPRESSION)),
+    ]
+
+def _preprocessing_cases():
+    from dataauto import preprocessing
+    return [
+        Case('preprocessing.fill_missing', lambda d: partial(preprocessing.fill_missing, _numeric(d))),
+        Case('preprocessing.remove_outliers', lambda d: partial(preprocessing.remove_outliers, d.frame(), 'float_0')),
+        Case('preprocessing.scale_data',
+             lambda d: partial(preprocessing.scale_data, _numeric(d).fillna(0), ['float_0', 'float_1'])),
+        Case('preprocessing.FrequencyEncoder',
+             lambda d: partial(preprocessing.FrequencyEncoder().fit_transform,
+                               d.frame()[['category_0', 'category_1']])),
+        Case('preprocessing.HashingEncoder',
+             lambda d: partial(preprocessing.HashingEncoder().fit_transform, d.frame()[['string_0']])),
+        Case('preprocessing.categorical_encoding_plan',
+             lambda d: partial(preprocessing.categorical_encoding_plan, _features(d))),
+        Case('preprocessing.preprocess_features',
+             lambda d: partial(lambda X: preprocessing.preprocess_features(X).fit_transform(X), _features(d))),
+    ]
+
+def _plotter_cases():
+    from dataauto import data_plotter
+    plots = {
+        'plot_histogram': lambda d: partial(data_plotter.plot_histogram, d.frame(), 'float_0', d.output('plots')),
+        'plot_scatter': lambda d: partial(data_plotter.plot_scatter, d.frame(), 'float_0', 'float_1',
+                                          d.output('plots')),
+        'plot_box': lambda d: partial(data_plotter.plot_box, d.frame(), 'float_0', d.output('plots')),
+        'plot_heatmap': lambda d: partial(data_plotter.plot_heatmap, d.frame(), output_dir=d.output('plots')),
+    }
+    cases = [Case(f"data_plotter.{name}", setup, max_rows=PLOT_MAX_ROWS) for name, setup in plots.items()]
+    cases.append(Case('data_plotter.plot_line',
+                      lambda d: partial(data_plotter.plot_line, d.frame(), 'int_0', 'float_0', d.output('plots')),
+                      max_rows=LINE_PLOT_MAX_ROWS))
+    return cases
+
+def _trainer_cases():
+    from dataauto import model_trainer
+
+    def evaluate(d):
+        model, X_test, y_test = _trained(d)
+        return partial(model_trainer.evaluate_model, model, X_test, y_test)
+
+    return [
+        Case('model_trainer.preprocess_features',
+             lambda d: partial(lambda X: model_trainer.preprocess_features(X).fit_transform(X), _features(d))),
+        Case('model_trainer.train_model',
+             lambda d: partial(model_trainer.train_model, _training_frame(d), 'target'),
+             max_rows=TRAIN_MAX_ROWS),
+        Case('model_trainer.evaluate_model', evaluate, max_rows=TRAIN_MAX_ROWS),
+        Case('model_trainer.train_model_incremental',
+             lambda d: partial(model_trainer.train_model_incremental, d.path('csv', null_rate=0.0), 'label',
+                               model_type='classifier')),
+    ]
+
+def _report_cases():
+    from dataauto import report_generator
+
+    def column_specs(df):
+        return [report_generator.column_figure_spec(name, df[name]) for name in df.columns]
+
+    def profile_specs(d):
+        from dataauto.data_profiler import profile_dataframe
+        profile = profile_dataframe(d.frame())
+        return lambda: [report_generator.profile_figure_spec(name, column)
+                        for name, column in profile.columns.items()]
+
+    return [
+        Case('report_generator.column_figure_spec', lambda d: partial(column_specs, d.frame())),
+        Case('report_generator.profile_figure_spec', profile_specs),
+        Case('report_generator.render_column_figure',
+             lambda d: partial(report_generator.render_column_figure, column_specs(d.frame())[0])),
+        Case('report_generator.render_heatmap_figure',
+             lambda d: partial(report_generator.render_heatmap_figure, _numeric(d).corr())),
+        Case('report_generator.render_figures',
+             lambda d: partial(report_generator.render_figures, column_specs(d.frame()), n_jobs=1)),
+        Case('report_generator.generate_report',
+             lambda d: partial(report_generator.generate_report, d.frame(), d.output('report.pdf'), n_jobs=1),
+             max_rows=PLOT_MAX_ROWS),
+    ]
+
+def all_cases():
+    """
+    Return the benchmark cases of every public function, grouped by module.
+
+    The SQL functions are not benchmarked as they need a database server,
+    nor are helpers whose cost does not depend on the data size
+    (``encoding_for_cardinality``, ``categorical_transformers``).
+    """
+    return (_loader_cases() + _saver_cases() + _compression_cases() + _json_engine_cases() + _cleaner_cases()
+            + _engine_cases() + _filtering_cases() + _preprocessing_cases() + _plotter_cases() + _trainer_cases()
+            + _report_cases())
@@ -0,0 +1,203 @@
+# benchmarks/run.py
+
+import contextlib
+import fnmatch
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import click
+
+from dataauto import __version__
+from dataauto.instrumentation import peak_rss_bytes, reset_peak_rss
+from benchmarks.cases import Dataset, all_cases
+
+DEFAULT_ROWS = ('1e4', '1e5')
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), 'dataauto-benchmarks')
+# Relative slowdown (or memory growth) above which a case is reported as a regression.
+DEFAULT_THRESHOLD = 0.25
+# Memory growth below this is noise from the allocator and is never reported.
+MEMORY_NOISE_BYTES = 16 * 1024 * 1024
+
+def _current_rss_bytes():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def measure(case, dataset, repeat=1):
+    """
+    Time one case on a dataset and measure the memory it allocates.
+
+    Parameters:
+        case (Case): The benchmark case.
+        dataset (Dataset): Input data.
+        repeat (int): Number of runs; the fastest one is reported.
+
+    Returns:
+        dict: ``name``, ``rows``, ``seconds``, ``rows_per_second`` and ``peak_memory_bytes``
+        (growth of the peak resident set size over the run, None where it cannot be measured),
+        or ``error`` if the case raised.
+    """
+    result = {'name': case.name, 'rows': dataset.rows}
+    timings, peaks = [], []
+    try:
+        for _ in range(repeat):
+            call = case.setup(dataset)
+            gc.collect()
+            before = _current_rss_bytes()
+            resettable = reset_peak_rss() and before is not None
+            start = time.perf_counter()
+            # The plotting and report functions print a line per file they write
+            with contextlib.redirect_stdout(io.StringIO()):
+                call()
+            timings.append(time.perf_counter() - start)
+            if resettable:
+                peaks.append(max(0, peak_rss_bytes() - before))
+            del call
+    except (Exception, SystemExit) as e:
+        # The plotting functions exit on errors
+        result['error'] = f"{type(e).__name__}: {e}"
+        return result
+    seconds = min(timings)
+    result.update(seconds=seconds, rows_per_second=dataset.rows / seconds if seconds else None,
+                  peak_memory_bytes=min(peaks) if peaks else None)
+    return result
+
+def run_benchmarks(rows, patterns=None, data_dir=DEFAULT_DATA_DIR, repeat=1, echo=print, **options):
+    """
+    Run the benchmark cases on synthetic datasets of the given sizes.
+
+    Parameters:
+        rows (list): Dataset sizes.
+        patterns (list): Glob patterns of case names to run, e.g. ``['data_loader.*']``; all cases if None.
+        data_dir (str): Directory caching the generated input files.
+        repeat (int): Runs per case; the fastest one is reported.
+        echo (callable): Function called with one line per finished case.
+        **options: Options forwarded to ``generate_frame`` (columns, null_rate, cardinality, seed).
+
+    Returns:
+        dict: ``meta`` (environment and options) and ``results`` (one dict per case and size).
+    """
+    cases = [case for case in all_cases()
+             if not patterns or any(fnmatch.fnmatch(case.name, pattern) for pattern in patterns)]
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in rows:
+            dataset = Dataset(size, data_dir, work_dir, **options)
+            for case in cases:
+                if not case.applies_to(size):
+                    continue
+                result = measure(case, dataset, repeat)
+                results.append(result)
+                echo(format_result(result))
+    return {
+        'meta': {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'dataauto_version': __version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': repeat,
+            'options': options,
+        },
+        'results': results,
+    }
+
+def format_result(result):
+    if 'error' in result:
+        return f"{result['name']:<45} {result['rows']:>10}  failed: {result['error']}"
+    memory = result['peak_memory_bytes']
+    memory = f"{memory / 1024 ** 2:9.1f} MB" if memory is not None else f"{'n/a':>12}"
+    return (f"{result['name']:<45} {result['rows']:>10} {result['seconds']:10.4f} s "
+            f"{result['rows_per_second']:14,.0f} rows/s {memory}")
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, memory_noise=MEMORY_NOISE_BYTES):
+    """
+    Compare benchmark results against a baseline run.
+
+    A case regresses when it is more than ``threshold`` slower than in the
+    baseline, or uses more than ``threshold`` more memory and at least
+    ``memory_noise`` bytes more. Cases missing from either run are ignored.
+
+    Parameters:
+        results (dict): Output of ``run_benchmarks``.
+        baseline (dict): Earlier output of ``run_benchmarks``.
+        threshold (float): Tolerated relative change.
+        memory_noise (int): Memory growth in bytes that is never reported.
+
+    Returns:
+        list: One dict per regression with ``name``, ``rows``, ``metric`` ('seconds' or
+        'peak_memory_bytes'), ``baseline``, ``current`` and ``change`` (relative).
+    """
+    previous = {(result['name'], result['rows']): result for result in baseline['results'] if 'error' not in result}
+    regressions = []
+    for result in results['results']:
+        old = previous.get((result['name'], result['rows']))
+        if old is None or 'error' in result:
+            continue
+        for metric, noise in (('seconds', 0), ('peak_memory_bytes', memory_noise)):
+            before, after = old.get(metric), result.get(metric)
+            if before is None or after is None or after - before <= noise:
+                continue
+            change = (after - before) / before if before else float('inf')
+            if change > threshold:
+                regressions.append({'name': result['name'], 'rows': result['rows'], 'metric': metric,
+                                    'baseline': before, 'current': after, 'change': change})
+    return regressions
+
+def _parse_rows(ctx, param, values):
+    try:
+        return [int(float(value)) for value in values]
+    except ValueError:
+        raise click.BadParameter("Row counts must be numbers, e.g. 10000 or 1e5.")
+
+@click.command()
+@click.option('--rows', multiple=True, default=DEFAULT_ROWS, callback=_parse_rows, show_default=True,
+              help='Dataset size; repeat for several sizes (e.g. --rows 1e4 --rows 1e6).')
+@click.option('--case', 'patterns', multiple=True, help='Glob pattern of the cases to run, e.g. "data_loader.*".')
+@click.option('--columns', default=None, help='Column mix, e.g. "float:4,int:2,category:2,string:1,bool:1,datetime:1".')
+@click.option('--null-rate', type=float, default=0.05, show_default=True, help='Fraction of missing values.')
+@click.option('--cardinality', type=int, default=50, show_default=True, help='Distinct values of category columns.')
+@click.option('--seed', type=int, default=0, show_default=True, help='Random seed of the generated data.')
+@click.option('--repeat', type=int, default=1, show_default=True, help='Runs per case; the fastest is reported.')
+@click.option('--data-dir', default=DEFAULT_DATA_DIR, show_default=True, help='Directory caching generated files.')
+@click.option('--output', type=click.Path(), help='Write the results to this JSON file.')
+@click.option('--baseline', type=click.Path(exists=True), help='Compare against the results in this JSON file.')
+@click.option('--threshold', type=float, default=DEFAULT_THRESHOLD, show_default=True,
+              help='Relative slowdown or memory growth reported as a regression.')
+def main(rows, patterns, columns, null_rate, cardinality, seed, repeat, data_dir, output, baseline, threshold):
+    """Benchmark the dataauto library on synthetic data."""
+    import matplotlib
+    matplotlib.use('Agg')
+    results = run_benchmarks(rows, patterns, data_dir=data_dir, repeat=repeat, echo=click.echo,
+                             columns=columns, null_rate=null_rate, cardinality=cardinality, seed=seed)
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+        click.echo(f"Results written to {output}")
+    failed = any('error' in result for result in results['results'])
+    regressions = []
+    if baseline:
+        with open(baseline) as f:
+            regressions = compare(results, json.load(f), threshold)
+        for regression in regressions:
+            click.echo(f"REGRESSION {regression['name']} ({regression['rows']} rows): {regression['metric']} "
+                       f"{regression['baseline']:.4g} -> {regression['current']:.4g} "
+                       f"(+{regression['change']:.0%})")
+        if not regressions:
+            click.echo(f"No regressions against {baseline}.")
+    if failed or regressions:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+# benchmarks/synthetic.py
+
+import os
+import numpy as np
+import pandas as pd
+
+from dataauto.compression import open_text
+from dataauto.excel import write_sheets
+
+# Column kinds and how many of each a generated frame has by default.
+DEFAULT_COLUMNS = {'float': 4, 'int': 2, 'category': 2, 'string': 1, 'bool': 1, 'datetime': 1}
+COLUMN_KINDS = ('float', 'int', 'category', 'string', 'bool', 'datetime')
+
+def parse_column_spec(spec):
+    """
+    Parse a column mix such as ``'float:4,int:2,category:2'`` into a dict.
+
+    Parameters:
+        spec (str or dict): Column mix; a dict is returned unchanged.
+
+    Returns:
+        dict: Mapping of column kind to number of columns.
+    """
+    if isinstance(spec, dict):
+        return dict(spec)
+    columns = {}
+    for part in spec.split(','):
+        kind, _, count = part.strip().partition(':')
+        if kind not in COLUMN_KINDS:
+            raise ValueError(f"Unknown column kind {kind!r}. Choose from {', '.join(COLUMN_KINDS)}.")
+        columns[kind] = int(count or 1)
+    return columns
+
+def _column(kind, rows, cardinality, rng):
+    if kind == 'float':
+        return rng.normal(loc=rng.uniform(-100, 100), scale=rng.uniform(1, 50), size=rows)
+    if kind == 'int':
+        return rng.integers(0, 1000, size=rows)
+    if kind == 'category':
+        # Zipf-like frequencies, as real categorical data rarely is uniform
+        weights = 1.0 / np.arange(1, cardinality + 1)
+        codes = rng.choice(cardinality, size=rows, p=weights / weights.sum())
+        return pd.Categorical.from_codes(codes, categories=[f"c{i}" for i in range(cardinality)]).astype(object)
+    if kind == 'string':
+        return pd.Series(rng.integers(0, max(rows, 1), size=rows)).map('id_{:x}'.format).to_numpy(dtype=object)
+    if kind == 'bool':
+        return rng.random(rows) < 0.5
+    if kind == 'datetime':
+        start = np.datetime64('2020-01-01T00:00:00')
+        return start + rng.integers(0, 4 * 365 * 24 * 3600, size=rows).astype('timedelta64[s]')
+    raise ValueError(f"Unknown column kind {kind!r}.")
+
+def generate_frame(rows, columns=None, null_rate=0.05, cardinality=50, seed=0, target=True):
+    """
+    Generate a deterministic synthetic DataFrame.
+
+    The same arguments always produce the same frame. Columns are named
+    ``<kind>_<index>`` (e.g. ``float_0``, ``category_1``).
+
+    Parameters:
+        rows (int): Number of rows.
+        columns (dict or str): Column mix, e.g. ``{'float': 4, 'category': 2}`` or ``'float:4,category:2'``;
+            ``DEFAULT_COLUMNS`` if None.
+        null_rate (float): Fraction of missing values in every feature column.
+        cardinality (int): Number of distinct values of category columns.
+        seed (int): Random seed.
+        target (bool): Add complete ``target`` (float, linear in the float columns plus noise)
+            and ``label`` (two classes) columns for model training.
+
+    Returns:
+        pd.DataFrame: The generated frame.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for kind, count in parse_column_spec(columns or DEFAULT_COLUMNS).items():
+        for index in range(count):
+            data[f"{kind}_{index}"] = _column(kind, rows, cardinality, rng)
+    df = pd.DataFrame(data)
+    if target:
+        signal = rng.normal(size=rows)
+        for name in df.columns:
+            if name.startswith('float_'):
+                signal = signal + df[name].to_numpy() / df[name].std()
+        df['target'] = signal
+        df['label'] = np.where(signal > np.median(signal), 'yes', 'no')
+    if null_rate > 0:
+        for name in df.columns:
+            if name in ('target', 'label'):
+                continue
+            mask = rng.random(rows) < null_rate
+            if df[name].dtype == bool:
+                df[name] = df[name].astype(object)
+            df.loc[mask, name] = None
+    return df
+
+def dataset_path(directory, rows, format='csv', compression=None, **options):
+    """
+    Return the path of a generated dataset file, writing it on first use.
+
+    Files are named after their generation options, so a data directory can
+    be reused across benchmark runs.
+
+    Parameters:
+        directory (str): Directory holding the generated files.
+        rows (int): Number of rows.
+        format (str): 'csv', 'json' (JSON lines), 'excel' or 'parquet'.
+        compression (str): 'gzip', 'bz2' or 'zstd' to compress CSV and JSON files with
+            ``dataauto.compression``; uncompressed if None.
+        **options: Options forwarded to ``generate_frame``.
+
+    Returns:
+        str: Path of the dataset file.
+    """
+    extension = {'csv': 'csv', 'json': 'jsonl', 'excel': 'xlsx', 'parquet': 'parquet'}[format]
+    key = '_'.join(f"{name}-{value}" for name, value in sorted(options.items()) if name != 'columns')
+    columns = parse_column_spec(options.get('columns') or DEFAULT_COLUMNS)
+    key += '_' + '-'.join(f"{kind}{count}" for kind, count in columns.items())
+    if compression:
+        extension += {'gzip': '.gz', 'bz2': '.bz2', 'zstd': '.zst'}[compression]
+    path = os.path.join(directory, f"synthetic_{rows}_{key}.{extension}")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        df = generate_frame(rows, **options)
+        temporary = os.path.join(directory, f".tmp-{os.path.basename(path)}")
+        if format == 'csv':
+            with open_text(temporary, 'w') as f:
+                df.to_csv(f, index=False)
+        elif format == 'json':
+            with open_text(temporary, 'w') as f:
+                df.to_json(f, orient='records', lines=True, date_format='iso')
+        elif format == 'parquet':
+            df.to_parquet(temporary, index=False)
+        else:
+            write_sheets({'Sheet1': df}, temporary)
+        os.replace(temporary, path)
+    return path
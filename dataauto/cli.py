@@ -1,27 +1,57 @@
 # dataauto/cli.py
 
 import click
-import pandas as pd
-from dataauto.data_loader import load_csv, load_json, load_excel, load_sql
-from dataauto.data_saver import save_csv, save_json, save_excel, save_sql
-from dataauto.data_cleaner import clean_data, remove_outliers, scale_features
-from dataauto.data_plotter import plot_histogram, plot_scatter, plot_box, plot_heatmap, plot_line
-from dataauto.model_trainer import train_model
-from dataauto.report_generator import generate_report
-from dataauto.scheduler import schedule_command
 from dataauto import __version__
+from dataauto.daemon import FORWARDED_COMMANDS, forward
+from dataauto.instrumentation import StageProfiler, stage
 import os
-import joblib
 
-@click.group()
+# Command modules are imported inside the commands that use them, so that
+# `dataauto --help` or a light command does not pay for pandas, scikit-learn,
+# matplotlib and reportlab.
+
+class DaemonGroup(click.Group):
+    """Command group that remembers its raw arguments, so they can be forwarded to ``dataauto daemon``."""
+
+    def parse_args(self, ctx, args):
+        ctx.meta['dataauto.args'] = list(args)
+        return super().parse_args(ctx, args)
+
+@click.group(cls=DaemonGroup)
 @click.version_option(version=__version__, prog_name='DataAuto')
-def cli():
+@click.option('--profile', is_flag=True, help='Print wall time, CPU time and memory of each phase of the command')
+@click.option('--profile-output', help='Also write the phase timings to a .json file, or a cProfile dump to any other path (e.g. out.prof)')
+@click.pass_context
+def cli(ctx, profile, profile_output):
     """DataAuto: Automate your data analysis tasks with ease."""
-    pass
+    if ctx.invoked_subcommand in FORWARDED_COMMANDS and '--help' not in ctx.meta['dataauto.args']:
+        # A running daemon executes (and profiles) the command with the same arguments
+        response = forward(ctx.meta['dataauto.args'])
+        if response is not None:
+            click.echo(response['output'], nl=False)
+            if response['error']:
+                click.echo(f"Error: {response['error']}", err=True)
+            ctx.exit(response['exit_code'])
+    if profile or profile_output:
+        json_output = profile_output is not None and profile_output.lower().endswith('.json')
+        profiler = StageProfiler(profile_all=bool(profile_output) and not json_output,
+                                 profile_output=None if json_output else profile_output)
+
+        def report():
+            click.echo(profiler.format_table(), err=True)
+            if json_output:
+                profiler.write_json(profile_output)
+            if profile_output:
+                click.echo(f"Profile saved to {profile_output}.", err=True)
+
+        # Closed in reverse order: the profiler stops before the report is printed
+        ctx.call_on_close(report)
+        ctx.with_resource(profiler)
+        ctx.with_resource(profiler.stage(ctx.invoked_subcommand))
 
 @cli.command()
 @click.argument('file_path')
-@click.option('--format', type=click.Choice(['csv', 'json', 'excel', 'sql']), default='csv', help='Format of the input file')
+@click.option('--format', type=click.Choice(['csv', 'json', 'excel', 'parquet', 'sql']), default='csv', help='Format of the input file')
 @click.option('--db-type', type=click.Choice(['postgresql', 'mysql']), help='Type of the SQL database')
 @click.option('--host', help='Database host')
 @click.option('--port', type=int, help='Database port')
@@ -30,19 +60,40 @@ def cli():
 @click.option('--password', help='Database password')
 @click.option('--query', help='SQL query to execute')
 @click.option('--sheet', default='Sheet1', help='Sheet name or index for Excel files')
-def load(file_path, format, db_type, host, port, dbname, user, password, query, sheet):
+@click.option('--all-sheets', is_flag=True, help='Load every sheet of an Excel file, in parallel')
+@click.option('--n-jobs', type=int, default=None, help='Worker processes for --all-sheets (default: number of CPUs)')
+@click.option('--json-engine', type=click.Choice(['pandas', 'pyarrow']), default='pandas', help='JSON lines engine; pyarrow parses and writes whole columns at a time on several threads')
+@click.option('--json-schema', help="Column types of JSON input for the pyarrow engine, e.g. 'id:int64,when:timestamp[s]'")
+@click.option('--where', help="Keep only the rows matching a filter expression, e.g. \"age > 30 and city = 'Paris'\"; applied by the Parquet reader or the database for parquet and sql")
+def load(file_path, format, db_type, host, port, dbname, user, password, query, sheet, all_sheets, n_jobs, json_engine,
+         json_schema, where):
     """Load data from a specified file format or SQL database."""
+    with stage('import'):
+        from dataauto.data_loader import load_csv, load_json, load_excel, load_excel_sheets, load_parquet, load_sql
+        from dataauto.filtering import filter_frame
     try:
-        if format == 'csv':
-            df = load_csv(file_path)
-        elif format == 'json':
-            df = load_json(file_path)
-        elif format == 'excel':
-            df = load_excel(file_path, sheet_name=sheet)
-        elif format == 'sql':
-            if not all([db_type, host, port, dbname, user, password, query]):
-                raise click.ClickException("All SQL connection parameters must be provided for SQL format.")
-            df = load_sql(db_type, host, port, dbname, user, password, query)
+        if format == 'excel' and all_sheets:
+            with stage('load'):
+                sheets = load_excel_sheets(file_path, n_jobs=n_jobs)
+            for name, df in sheets.items():
+                click.echo(f"Sheet {name} loaded from {file_path}. Shape: {df.shape}")
+            return
+        with stage('load'):
+            if format == 'csv':
+                df = load_csv(file_path)
+            elif format == 'json':
+                df = load_json(file_path, engine=json_engine, schema=json_schema)
+            elif format == 'excel':
+                df = load_excel(file_path, sheet_name=sheet)
+            elif format == 'parquet':
+                df = load_parquet(file_path, where=where)
+            elif format == 'sql':
+                if not all([db_type, host, port, dbname, user, password, query]):
+                    raise click.ClickException("All SQL connection parameters must be provided for SQL format.")
+                df = load_sql(db_type, host, port, dbname, user, password, query, where=where)
+        if where is not None and format in ('csv', 'json', 'excel'):
+            with stage('compute'):
+                df = filter_frame(df, where)
         click.echo(f"Data loaded from {file_path}. Shape: {df.shape}")
     except Exception as e:
         raise click.ClickException(f"Error loading data: {e}")
@@ -59,35 +110,81 @@ def load(file_path, format, db_type, host, port, dbname, user, password, query,
 @click.option('--password', help='Database password')
 @click.option('--query', help='SQL query to save the data to')
 @click.option('--sheet', default='Sheet1', help='Sheet name for Excel files')
-def save(input_file, output_file, format, db_type, host, port, dbname, user, password, query, sheet):
+@click.option('--json-engine', type=click.Choice(['pandas', 'pyarrow']), default='pandas', help='JSON lines engine; pyarrow parses and writes whole columns at a time on several threads')
+def save(input_file, output_file, format, db_type, host, port, dbname, user, password, query, sheet, json_engine):
     """Save data to a specified file format or SQL database."""
+    with stage('import'):
+        from dataauto.data_loader import load_csv
+        from dataauto.data_saver import save_csv, save_json, save_excel, save_sql
     try:
-        df = pd.read_csv(input_file)
-        if format == 'csv':
-            save_csv(df, output_file)
-        elif format == 'json':
-            save_json(df, output_file)
-        elif format == 'excel':
-            save_excel(df, output_file, sheet_name=sheet)
-        elif format == 'sql':
-            if not all([db_type, host, port, dbname, user, password, query]):
-                raise click.ClickException("All SQL connection parameters must be provided for SQL format.")
-            save_sql(df, db_type, host, port, dbname, user, password, query)
+        with stage('load'):
+            df = load_csv(input_file)
+        with stage('write'):
+            if format == 'csv':
+                save_csv(df, output_file)
+            elif format == 'json':
+                save_json(df, output_file, engine=json_engine)
+            elif format == 'excel':
+                save_excel(df, output_file, sheet_name=sheet)
+            elif format == 'sql':
+                if not all([db_type, host, port, dbname, user, password, query]):
+                    raise click.ClickException("All SQL connection parameters must be provided for SQL format.")
+                save_sql(df, db_type, host, port, dbname, user, password, query)
         click.echo(f"Data saved successfully to {output_file} in {format.upper()} format.")
     except Exception as e:
         raise click.ClickException(f"Error saving data: {e}")
 
+@cli.command()
+@click.argument('source')
+@click.argument('destination')
+@click.option('--input-format', type=click.Choice(['csv', 'json', 'excel', 'sql']), help='Format of the input; inferred from the file extension by default')
+@click.option('--output-format', type=click.Choice(['csv', 'json', 'excel', 'sql']), help='Format of the output; inferred from the file extension by default')
+@click.option('--chunksize', type=int, default=100000, show_default=True, help='Number of rows read and written at a time')
+@click.option('--queue-size', type=int, default=4, show_default=True, help='Number of chunks buffered between the reader and the writer')
+@click.option('--sheet', default='0', help='Sheet name or index of Excel input')
+@click.option('--output-sheet', default='Sheet1', help='Sheet name of Excel output')
+@click.option('--db-type', type=click.Choice(['postgresql', 'mysql']), help='Type of the SQL database')
+@click.option('--host', help='Database host')
+@click.option('--port', type=int, help='Database port')
+@click.option('--dbname', help='Database name')
+@click.option('--user', help='Database user')
+@click.option('--password', help='Database password')
+@click.option('--json-engine', type=click.Choice(['pandas', 'pyarrow']), default='pandas', help='JSON lines engine; pyarrow parses and writes whole columns at a time on several threads')
+@click.option('--json-schema', help="Column types of JSON input for the pyarrow engine, e.g. 'id:int64,when:timestamp[s]'")
+def convert(source, destination, input_format, output_format, chunksize, queue_size, sheet, output_sheet, db_type,
+            host, port, dbname, user, password, json_engine, json_schema):
+    """
+    Convert SOURCE to DESTINATION chunk by chunk, in constant memory.
+
+    For SQL input SOURCE is the query, for SQL output DESTINATION is the table name.
+    """
+    with stage('import'):
+        from dataauto.conversion import convert_file
+    sql = {'db_type': db_type, 'host': host, 'port': port, 'dbname': dbname, 'user': user, 'password': password}
+    try:
+        with stage('stream'):
+            result = convert_file(source, destination, input_format=input_format, output_format=output_format,
+                                  chunksize=chunksize, queue_size=queue_size,
+                                  sheet_name=int(sheet) if sheet.isdigit() else sheet, output_sheet=output_sheet,
+                                  sql=sql if any(sql.values()) else None, json_engine=json_engine,
+                                  json_schema=json_schema)
+        click.echo(f"Converted {result['rows']} rows in {result['chunks']} chunks from {source} to {destination}.")
+    except Exception as e:
+        raise click.ClickException(f"Error converting data: {e}")
+
 @cli.command()
 @click.argument('file_path')
 @click.option('--strategy', type=click.Choice(['mean', 'median', 'mode']), default='mean', help='Strategy to fill missing values')
 @click.option('--columns', multiple=True, required=True, help='Columns to clean')
 @click.option('--output-file', required=True, help='Path to save the cleaned data')
-def clean(file_path, strategy, columns, output_file):
+@click.option('--engine', type=click.Choice(['pandas', 'duckdb', 'polars']), default='pandas', help='Run on pandas, or as a multi-threaded DuckDB or Polars query over the file (.csv or .parquet)')
+def clean(file_path, strategy, columns, output_file, engine):
     """Clean data by handling missing values."""
+    with stage('import'):
+        from dataauto.engines import get_engine
     try:
-        df = pd.read_csv(file_path)
-        df_cleaned = clean_data(df, strategy=strategy, columns=list(columns))
-        df_cleaned.to_csv(output_file, index=False)
+        runner = get_engine(engine)
+        runner.clean(file_path, output_file, strategy=strategy, columns=list(columns))
         click.echo(f"Missing values filled using {strategy} strategy for columns: {', '.join(columns)}.")
         click.echo(f"Cleaned data saved to {output_file}.")
     except Exception as e:
@@ -99,12 +196,14 @@ def clean(file_path, strategy, columns, output_file):
 @click.option('--method', type=click.Choice(['IQR']), default='IQR', help='Method to remove outliers')
 @click.option('--multiplier', type=float, default=1.5, help='Multiplier for determining outliers')
 @click.option('--output-file', required=True, help='Path to save the data without outliers')
-def remove_outlier(file_path, column, method, multiplier, output_file):
+@click.option('--engine', type=click.Choice(['pandas', 'duckdb', 'polars']), default='pandas', help='Run on pandas, or as a multi-threaded DuckDB or Polars query over the file (.csv or .parquet)')
+def remove_outlier(file_path, column, method, multiplier, output_file, engine):
     """Remove outliers from a specified column."""
+    with stage('import'):
+        from dataauto.engines import get_engine
     try:
-        df = pd.read_csv(file_path)
-        df_cleaned, removed = remove_outliers(df, column=column, method=method, multiplier=multiplier)
-        df_cleaned.to_csv(output_file, index=False)
+        runner = get_engine(engine)
+        removed = runner.remove_outliers(file_path, output_file, column=column, multiplier=multiplier)
         click.echo(f"Removed {removed} outliers from column '{column}' using {method} method.")
         click.echo(f"Cleaned data saved to {output_file}.")
     except Exception as e:
@@ -115,17 +214,112 @@ def remove_outlier(file_path, column, method, multiplier, output_file):
 @click.option('--columns', multiple=True, required=True, help='Columns to scale')
 @click.option('--method', type=click.Choice(['standard', 'minmax', 'robust']), default='standard', help='Scaling method')
 @click.option('--output-file', required=True, help='Path to save the scaled data')
-def scale(file_path, columns, method, output_file):
+@click.option('--engine', type=click.Choice(['pandas', 'duckdb', 'polars']), default='pandas', help='Run on pandas, or as a multi-threaded DuckDB or Polars query over the file (.csv or .parquet)')
+def scale(file_path, columns, method, output_file, engine):
     """Scale numerical features."""
+    with stage('import'):
+        from dataauto.engines import get_engine
     try:
-        df = pd.read_csv(file_path)
-        df_scaled = scale_features(df, columns=list(columns), method=method)
-        df_scaled.to_csv(output_file, index=False)
+        runner = get_engine(engine)
+        runner.scale(file_path, output_file, columns=list(columns), method=method)
         click.echo(f"Columns {', '.join(columns)} scaled using {method} method.")
         click.echo(f"Scaled data saved to {output_file}.")
     except Exception as e:
         raise click.ClickException(f"Error scaling data: {e}")
 
+@cli.command('filter')
+@click.argument('file_path')
+@click.argument('expression')
+@click.option('--output-file', required=True, help='Path to save the matching rows')
+@click.option('--chunksize', type=int, default=100000, help='Rows filtered at a time from CSV input with the pandas engine')
+@click.option('--engine', type=click.Choice(['pandas', 'duckdb', 'polars']), default='pandas', help='Run on pandas, or as a multi-threaded DuckDB or Polars query over the file (.csv or .parquet)')
+def filter_rows(file_path, expression, output_file, chunksize, engine):
+    """Keep the rows matching an expression, e.g. "age > 30 and city in ('Paris', 'Oslo')"."""
+    with stage('import'):
+        from dataauto.engines import get_engine
+    try:
+        runner = get_engine(engine, chunksize=chunksize) if engine == 'pandas' else get_engine(engine)
+        kept = runner.filter(file_path, output_file, expression)
+        click.echo(f"Kept {kept} rows matching {expression}.")
+        click.echo(f"Filtered data saved to {output_file}.")
+    except Exception as e:
+        raise click.ClickException(f"Error filtering data: {e}")
+
+@cli.command()
+@click.argument('file_path')
+@click.option('--format', type=click.Choice(['csv', 'json']), default='csv', help='Format of the input file')
+@click.option('--chunksize', type=int, default=100000, help='Number of rows processed at a time')
+@click.option('--sample', type=int, help='Estimate statistics from a random sample of this many rows')
+@click.option('--sample-method', type=click.Choice(['reservoir', 'block']), default='reservoir', help='Sampling method (block reads random offsets of a CSV without a full pass)')
+@click.option('--state-file', help='Keep the profile of an append-only file here and only read newly appended rows')
+def summarize(file_path, format, chunksize, sample, sample_method, state_file):
+    """Generate summary statistics of the data in a single streaming pass."""
+    with stage('import'):
+        from dataauto.data_loader import iter_chunks
+        from dataauto.data_profiler import profile_chunks
+        from dataauto.sampling import sample_file
+        from dataauto.incremental import update_profile_state
+    try:
+        # Reading and profiling are interleaved chunk by chunk, so they form a single phase
+        with stage('compute'):
+            if sample:
+                profile = sample_file(file_path, sample, method=sample_method, format=format, chunksize=chunksize)
+            elif state_file:
+                state = update_profile_state(file_path, state_file, format=format, chunksize=chunksize)
+                profile = state.profile
+                click.echo(f"Processed {state.rows_added} new rows.")
+            else:
+                profile = profile_chunks(iter_chunks(file_path, format=format, chunksize=chunksize))
+        click.echo(profile.to_string())
+    except Exception as e:
+        raise click.ClickException(f"Error summarizing data: {e}")
+
+@cli.command()
+@click.argument('file_path')
+@click.option('--output-report', default='data_report.pdf', help='Path to save the report (.pdf, or .html for a self-contained HTML report)')
+@click.option('--sample', type=int, help='Build the report from a random sample of this many rows')
+@click.option('--sample-method', type=click.Choice(['reservoir', 'block']), default='reservoir', help='Sampling method (block reads random offsets of a CSV without a full pass)')
+@click.option('--n-jobs', type=int, help='Number of processes rendering figures (default: serial for small reports, up to 4 otherwise)')
+@click.option('--no-column-sections', is_flag=True, help='Only include the overview pages')
+@click.option('--chunksize', type=int, default=100000, help='Number of rows processed at a time for HTML reports')
+@click.option('--state-file', help='Keep the profile of an append-only file here and only read newly appended rows')
+def report(file_path, output_report, sample, sample_method, n_jobs, no_column_sections, chunksize, state_file):
+    """Generate a PDF or HTML report summarizing the data."""
+    with stage('import'):
+        from dataauto.data_loader import load_csv, iter_chunks
+        from dataauto.sampling import sample_file
+        from dataauto.incremental import update_profile_state
+        from dataauto.report_generator import generate_report
+        from dataauto.html_report import generate_html_report
+    try:
+        html = output_report.lower().endswith(('.html', '.htm'))
+        if state_file:
+            with stage('compute'):
+                state = update_profile_state(file_path, state_file, chunksize=chunksize, correlation=True)
+            click.echo(f"Processed {state.rows_added} new rows.")
+            if html:
+                generate_html_report(None, output_report=output_report, state=state)
+            else:
+                generate_report(None, output_report=output_report, profile=state.profile, correlation=state.correlation,
+                                column_sections=not no_column_sections, n_jobs=n_jobs)
+        elif sample:
+            with stage('load'):
+                summary = sample_file(file_path, sample, method=sample_method)
+            if html:
+                generate_html_report(summary, output_report=output_report)
+            else:
+                generate_report(summary.sample, output_report=output_report, profile=summary,
+                                column_sections=not no_column_sections, n_jobs=n_jobs)
+        elif html:
+            # Aggregated in one streaming pass, so the data never has to fit in memory
+            generate_html_report(iter_chunks(file_path, chunksize=chunksize), output_report=output_report)
+        else:
+            with stage('load'):
+                df = load_csv(file_path)
+            generate_report(df, output_report=output_report, column_sections=not no_column_sections, n_jobs=n_jobs)
+    except Exception as e:
+        raise click.ClickException(f"Error generating report: {e}")
+
 @cli.command()
 @click.argument('file_path')
 @click.option('--plot-type', type=click.Choice(['histogram', 'scatter', 'box', 'heatmap', 'line']), required=True, help='Type of plot to generate')
@@ -134,31 +328,39 @@ def scale(file_path, columns, method, output_file):
 @click.option('--y', help='Y-axis column (for scatter and line plots)')
 @click.option('--output-dir', required=True, help='Directory to save plots')
 @click.option('--interactive', is_flag=True, help='Generate interactive plots')
-def plot(file_path, plot_type, columns, x, y, output_dir, interactive):
+@click.option('--method', type=click.Choice(['pearson', 'spearman']), default='pearson', help='Correlation method (for heatmap)')
+@click.option('--max-columns', type=int, default=30, help='Maximum number of columns drawn in a heatmap')
+def plot(file_path, plot_type, columns, x, y, output_dir, interactive, method, max_columns):
     """Generate plots from the data."""
+    with stage('import'):
+        from dataauto.data_loader import load_csv
+        from dataauto.data_plotter import plot_histogram, plot_scatter, plot_box, plot_heatmap, plot_line
     try:
-        df = pd.read_csv(file_path)
-        os.makedirs(output_dir, exist_ok=True)
-        if plot_type == 'histogram':
-            if not columns:
-                raise click.ClickException("Please specify at least one column for histogram.")
-            for col in columns:
-                plot_histogram(df, col, output_dir, interactive=interactive)
-        elif plot_type == 'scatter':
-            if not all([x, y]):
-                raise click.ClickException("Please specify both --x and --y columns for scatter plot.")
-            plot_scatter(df, x, y, output_dir, interactive=interactive)
-        elif plot_type == 'box':
-            if not columns:
-                raise click.ClickException("Please specify at least one column for box plot.")
-            for col in columns:
-                plot_box(df, col, output_dir, interactive=interactive)
-        elif plot_type == 'heatmap':
-            plot_heatmap(df, output_dir, interactive=interactive)
-        elif plot_type == 'line':
-            if not all([x, y]):
-                raise click.ClickException("Please specify both --x and --y columns for line plot.")
-            plot_line(df, x, y, output_dir, interactive=interactive)
+        with stage('load'):
+            df = load_csv(file_path)
+        with stage('plot'):
+            os.makedirs(output_dir, exist_ok=True)
+            if plot_type == 'histogram':
+                if not columns:
+                    raise click.ClickException("Please specify at least one column for histogram.")
+                for col in columns:
+                    plot_histogram(df, col, output_dir, interactive=interactive)
+            elif plot_type == 'scatter':
+                if not all([x, y]):
+                    raise click.ClickException("Please specify both --x and --y columns for scatter plot.")
+                plot_scatter(df, x, y, output_dir, interactive=interactive)
+            elif plot_type == 'box':
+                if not columns:
+                    raise click.ClickException("Please specify at least one column for box plot.")
+                for col in columns:
+                    plot_box(df, col, output_dir, interactive=interactive)
+            elif plot_type == 'heatmap':
+                plot_heatmap(df, list(columns) or None, output_dir, interactive=interactive,
+                             method=method, max_columns=max_columns)
+            elif plot_type == 'line':
+                if not all([x, y]):
+                    raise click.ClickException("Please specify both --x and --y columns for line plot.")
+                plot_line(df, x, y, output_dir, interactive=interactive)
         click.echo(f"{plot_type.capitalize()} plots saved to {output_dir}.")
     except Exception as e:
         raise click.ClickException(f"Error generating plots: {e}")
@@ -171,32 +373,205 @@ def plot(file_path, plot_type, columns, x, y, output_dir, interactive):
 @click.option('--random-state', type=int, default=42, help='Random state for reproducibility')
 @click.option('--output-model', required=True, help='Path to save the trained model')
 @click.option('--output-report', required=True, help='Path to save the model report')
-def train(file_path, target, model_type, test_size, random_state, output_model, output_report):
+@click.option('--compress', type=click.IntRange(0, 9), default=0, help='Compression level for the saved model (0 keeps it memory-mappable)')
+@click.option('--incremental', is_flag=True, help='Stream the file in chunks and train an incremental model out-of-core')
+@click.option('--estimator', type=click.Choice(['naive_bayes', 'sgd']), default='sgd', help='Estimator for incremental training (naive_bayes is for classifiers only)')
+@click.option('--chunksize', type=int, default=100000, help='Rows per chunk for incremental training')
+@click.option('--profile-fit', help='Path to write a cProfile dump of the model fitting step')
+@click.pass_context
+def train(ctx, file_path, target, model_type, test_size, random_state, output_model, output_report, compress, incremental, estimator, chunksize, profile_fit):
     """Train a machine learning model."""
+    with stage('import'):
+        from dataauto.data_loader import load_csv
+        from dataauto.model_trainer import train_model, train_model_incremental
+        from dataauto.model_store import build_model_metadata, save_model
     try:
-        df = pd.read_csv(file_path)
-        model, report = train_model(df, target=target, model_type=model_type, test_size=test_size, random_state=random_state)
-        joblib.dump(model, output_model)
-        with open(output_report, 'w') as f:
-            f.write(report)
+        timings_file = os.path.splitext(output_report)[0] + '.timings.json'
+        # tracemalloc slows down allocation-heavy fits, so traced memory is only recorded under --profile
+        options = ctx.find_root().params
+        profiler = StageProfiler(track_memory=bool(options.get('profile') or options.get('profile_output')),
+                                 profile_stages=('fit', 'second_pass') if profile_fit else (), profile_output=profile_fit)
+        with profiler:
+            if incremental:
+                with profiler.stage('train'):
+                    model, report = train_model_incremental(file_path, target=target, model_type=model_type, estimator=estimator,
+                                                            chunksize=chunksize, test_size=test_size, random_state=random_state)
+                X = None
+            else:
+                with profiler.stage('load'):
+                    df = load_csv(file_path)
+                with profiler.stage('train'):
+                    model, report = train_model(df, target=target, model_type=model_type, test_size=test_size, random_state=random_state)
+                X = df.drop(columns=[target])
+            training_time = profiler.stages[-1]['wall_time']
+            metadata = build_model_metadata(model, X=X, target=target, model_type=model_type, training_time=training_time)
+            with profiler.stage('save'):
+                save_model(model, output_model, compress=compress, metadata=metadata)
+                with open(output_report, 'w') as f:
+                    f.write(report)
+        profiler.write_json(timings_file)
         click.echo("Model trained successfully.")
         click.echo(report)
         click.echo(f"Trained model saved to {output_model}.")
         click.echo(f"Model report saved to {output_report}.")
+        click.echo(f"Stage timings saved to {timings_file}.")
+        if profile_fit:
+            click.echo(f"Fit profile saved to {profile_fit}.")
     except Exception as e:
         raise click.ClickException(f"Error training model: {e}")
 
 @cli.command()
+@click.argument('model_path')
 @click.argument('file_path')
-@click.option('--schedule', required=True, help='Schedule time in 24-hour format HH:MM (e.g., "14:30")')
-@click.option('--command', required=True, type=click.Choice(['load', 'save', 'clean', 'scale', 'plot', 'train']), help='Command to schedule')
-def schedule(file_path, schedule, command):
-    """Schedule a CLI command."""
+@click.option('--output-file', required=True, help='Path to save the data with predictions')
+@click.option('--n-jobs', type=int, default=1, help='Number of worker processes sharing the memory-mapped model')
+def predict(model_path, file_path, output_file, n_jobs):
+    """Predict with a trained model."""
+    with stage('import'):
+        from dataauto.data_loader import load_csv
+        from dataauto.model_store import predict as predict_model, predictions_frame
+    try:
+        with stage('load'):
+            df = load_csv(file_path)
+        with stage('compute'):
+            predictions = predict_model(model_path, df, n_jobs=n_jobs)
+        with stage('write'):
+            predictions_frame(df, predictions).to_csv(output_file, index=False)
+        click.echo(f"Predictions for {len(df)} rows saved to {output_file}.")
+    except Exception as e:
+        raise click.ClickException(f"Error predicting: {e}")
+
+@cli.command()
+@click.argument('pipeline_file')
+@click.option('--state-file', help='File keeping the hashes of successful step runs (default: <pipeline_file>.state.json)')
+@click.option('--force', is_flag=True, help='Run every step even if its inputs and parameters are unchanged')
+@click.option('--dry-run', is_flag=True, help='Only show which steps would run')
+@click.option('--workers', type=int, default=1,
+              help='Run independent steps concurrently in this many worker processes (default: one step at a time)')
+def pipeline(pipeline_file, state_file, force, dry_run, workers):
+    """Run a pipeline of commands defined in a JSON file.
+
+    Each step lists its command, arguments, inputs and outputs; steps whose
+    inputs and parameters hash to the same values as their last successful
+    run are skipped and their existing outputs reused.
+    """
+    from dataauto.pipeline import run_pipeline
+    from dataauto.scheduler import WorkerPool
+    pool = WorkerPool(workers=workers) if workers > 1 and not dry_run else None
     try:
-        schedule_command(command, file_path, schedule)
-        click.echo(f"Scheduled command '{command}' on file '{file_path}' at '{schedule}'.")
+        results = run_pipeline(pipeline_file, state_file=state_file, force=force, dry_run=dry_run, pool=pool,
+                               echo=click.echo)
     except Exception as e:
+        raise click.ClickException(f"Error running pipeline: {e}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    failed = [result['name'] for result in results if result['status'] == 'failed']
+    if failed:
+        raise click.ClickException(f"Pipeline steps failed: {', '.join(failed)}")
+
+@cli.command()
+@click.argument('file_path')
+@click.option('--schedule', help='Run daily at this time in 24-hour format HH:MM (e.g., "14:30")')
+@click.option('--cron', help='Run on a cron expression (e.g., "*/15 * * * *")')
+@click.option('--every', type=float, help='Run every N seconds')
+@click.option('--watch', multiple=True, help='Run when files in this file or directory change (repeatable)')
+@click.option('--pattern', multiple=True, help='Only react to changed file names matching this glob (with --watch)')
+@click.option('--debounce', type=float, default=2.0, help='Seconds without changes before a file-triggered run')
+@click.option('--command', required=True, type=click.Choice(['load', 'save', 'clean', 'scale', 'plot', 'train', 'summarize', 'report', 'pipeline']), help='Command to schedule')
+@click.option('--workers', type=int, default=2, help='Number of warm worker processes running scheduled jobs')
+@click.option('--timeout', type=float, help='Kill a scheduled job after this many seconds')
+@click.option('--memory-budget', type=int, help='Memory in MB that concurrently running jobs may use (default: 75% of RAM)')
+@click.option('--history-file', type=click.Path(dir_okay=False), help='JSON lines file recording queue wait, run time and peak memory of every run')
+@click.argument('command_args', nargs=-1, type=click.UNPROCESSED)
+def schedule(file_path, schedule, cron, every, watch, pattern, debounce, command, workers, timeout, memory_budget, history_file, command_args):
+    """Schedule a CLI command.
+
+    The command runs daily (--schedule), on a cron expression (--cron), at an
+    interval (--every) or when watched files change (--watch); a burst of
+    file changes causes a single run.
+
+    Options after ``--`` are passed on to the scheduled command, e.g.
+    ``dataauto schedule log.csv --schedule 14:30 --command summarize -- --state-file log.state.json``.
+
+    Runs in the foreground until interrupted (Ctrl+C), then waits for the
+    running jobs to finish.
+    """
+    from dataauto.scheduler import schedule_command, configure_pool, run_scheduler, shutdown_scheduler
+    if sum(bool(value) for value in (schedule, cron, every, watch)) != 1:
+        raise click.UsageError("Specify exactly one of --schedule, --cron, --every or --watch.")
+    try:
+        configure_pool(workers=workers, timeout=timeout,
+                       memory_budget=memory_budget * 1024 ** 2 if memory_budget else None,
+                       history_file=history_file)
+        schedule_command(command, file_path, schedule, args=command_args, cron=cron, every=every,
+                         watch=list(watch) or None, patterns=list(pattern) or None, debounce=debounce,
+                         background=False)
+        if schedule:
+            when = f"at '{schedule}'"
+        elif cron:
+            when = f"on cron '{cron}'"
+        elif every:
+            when = f"every {every:g}s"
+        else:
+            when = f"when {', '.join(watch)} changes"
+        click.echo(f"Scheduled command '{command}' on file '{file_path}' {when}. Press Ctrl+C to stop.")
+    except Exception as e:
+        shutdown_scheduler()
         raise click.ClickException(f"Error scheduling command: {e}")
+    try:
+        run_scheduler()
+    except KeyboardInterrupt:
+        click.echo("Stopping the scheduler after the running jobs finish.")
+    finally:
+        shutdown_scheduler()
+
+@cli.group()
+def daemon():
+    """Keep loaded data and imports resident for a sequence of commands.
+
+    While ``dataauto daemon start`` runs, data commands are executed by the
+    daemon, which reuses frames parsed by earlier commands until their file
+    changes. Set DATAAUTO_NO_DAEMON=1 to run a command in-process anyway.
+    """
+
+@daemon.command()
+@click.option('--socket', 'socket_file', help='Socket path (default: $DATAAUTO_SOCKET or a per-user runtime path)')
+@click.option('--memory-limit', type=int, help='Memory in MB for resident frames (default: 25% of RAM); least recently used frames are evicted')
+@click.option('--no-preload', is_flag=True, help='Do not import pandas, scikit-learn and matplotlib up front')
+def start(socket_file, memory_limit, no_preload):
+    """Run the daemon in the foreground until it is stopped."""
+    from dataauto.daemon import serve, socket_path
+    path = socket_file or socket_path()
+    try:
+        serve(path, memory_limit=memory_limit * 1024 ** 2 if memory_limit else None, preload=not no_preload,
+              ready=lambda: click.echo(f"Daemon listening on {path}."))
+    except Exception as e:
+        raise click.ClickException(f"Error running daemon: {e}")
+
+@daemon.command()
+@click.option('--socket', 'socket_file', help='Socket path of the daemon')
+def stop(socket_file):
+    """Stop a running daemon."""
+    from dataauto.daemon import request, socket_path
+    if request(socket_file or socket_path(), {'action': 'stop'}) is None:
+        raise click.ClickException("No daemon is running.")
+    click.echo("Daemon stopped.")
+
+@daemon.command()
+@click.option('--socket', 'socket_file', help='Socket path of the daemon')
+def status(socket_file):
+    """Show the frames held by a running daemon."""
+    from dataauto.daemon import request, socket_path
+    response = request(socket_file or socket_path(), {'action': 'status'})
+    if response is None:
+        raise click.ClickException("No daemon is running.")
+    cache = response['cache']
+    click.echo(f"Daemon pid {response['pid']}: {len(cache['frames'])} frames, "
+               f"{cache['total_bytes'] / 1024 ** 2:.1f} of {cache['max_bytes'] / 1024 ** 2:.0f} MB, "
+               f"{cache['hits']} hits, {cache['misses']} misses.")
+    for frame in cache['frames']:
+        click.echo(f"  {frame['path']} ({frame['kind']}): {frame['rows']} rows, {frame['bytes'] / 1024 ** 2:.1f} MB")
 
 if __name__ == '__main__':
     cli()
\ No newline at end of file
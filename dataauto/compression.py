@@ -0,0 +1,304 @@
+# dataauto/compression.py
+
+import bz2
+import gzip
+import io
+import itertools
+import os
+import queue
+import struct
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.gzip': 'gzip', '.bz2': 'bz2', '.zst': 'zstd'}
+# Uncompressed bytes per independently compressed block (gzip member or bz2 stream).
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_LEVELS = {'gzip': 6, 'bz2': 9, 'zstd': 3}
+
+# gzip members written by this module carry their total size in an extra
+# field (subfield 'DA'), so a reader can split the file into members without
+# inflating it and decompress them in parallel. Other gzip readers ignore the
+# field and read the file as ordinary multi-member gzip.
+_GZIP_HEADER = struct.Struct('<BBBBIBBHBBHI')
+_GZIP_EXTRA_ID = b'DA'
+_GZIP_TRAILER_SIZE = 8
+
+def detect_compression(path):
+    """Return the codec of a file from its extension ('gzip', 'bz2' or 'zstd'), or None if uncompressed."""
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(str(path))[1].lower())
+
+def strip_compression_extension(path):
+    """Return ``path`` without its compression extension, e.g. 'data.csv' for 'data.csv.gz'."""
+    root, extension = os.path.splitext(str(path))
+    return root if extension.lower() in COMPRESSION_EXTENSIONS else str(path)
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("Reading and writing .zst files requires the zstandard package "
+                          "(pip install zstandard).") from e
+    return zstandard
+
+def _gzip_member(block, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    deflated = compressor.compress(block) + compressor.flush()
+    size = _GZIP_HEADER.size + len(deflated) + _GZIP_TRAILER_SIZE
+    # ID1 ID2 CM FLG(FEXTRA) MTIME XFL OS XLEN SI1 SI2 LEN member-size
+    header = _GZIP_HEADER.pack(0x1f, 0x8b, 8, 4, 0, 0, 255, 8, _GZIP_EXTRA_ID[0], _GZIP_EXTRA_ID[1], 4, size)
+    return header + deflated + struct.pack('<II', zlib.crc32(block), len(block) & 0xffffffff)
+
+def _gzip_member_size(header):
+    """Return the member size recorded by ``_gzip_member``, or None for other gzip members."""
+    if len(header) < _GZIP_HEADER.size:
+        return None
+    id1, id2, method, flags, _, _, _, xlen, si1, si2, length, size = _GZIP_HEADER.unpack_from(header)
+    if (id1, id2, method) != (0x1f, 0x8b, 8) or not flags & 4 or xlen != 8 or bytes((si1, si2)) != _GZIP_EXTRA_ID \
+            or length != 4:
+        return None
+    return size
+
+class _BlockReader(io.RawIOBase):
+    """Readable raw stream over an iterator of byte blocks."""
+
+    def __init__(self, blocks, on_close=None):
+        self._blocks = iter(blocks)
+        self._buffer = b''
+        self._on_close = on_close
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buffer:
+            self._buffer = next(self._blocks, None)
+            if self._buffer is None:
+                self._buffer = b''
+                return 0
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self):
+        if not self.closed and self._on_close is not None:
+            self._on_close()
+        super().close()
+
+class _Prefetcher:
+    """
+    Run a block iterator in a background thread, at most ``depth`` blocks ahead.
+
+    Decompression then overlaps with whatever the consumer does with the
+    blocks (e.g. CSV parsing); zlib, bz2 and zstandard release the GIL while
+    they work.
+    """
+
+    def __init__(self, blocks, depth, on_close=None):
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._on_close = on_close
+        self._thread = threading.Thread(target=self._run, args=(blocks,), name='dataauto-decompress', daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, blocks):
+        try:
+            for block in blocks:
+                if not self._put(('block', block)):
+                    return
+            self._put(('done', None))
+        except BaseException as e:
+            self._put(('error', e))
+
+    def __iter__(self):
+        while True:
+            kind, value = self._queue.get()
+            if kind == 'done':
+                return
+            if kind == 'error':
+                raise value
+            yield value
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        if self._on_close is not None:
+            self._on_close()
+
+def _read_blocks(stream, block_size):
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            return
+        yield block
+
+def _parallel_gzip_blocks(raw, executor, depth, block_size):
+    """Yield the decompressed members of a gzip file written by this module, decompressing ``depth`` at a time."""
+    pending = deque()
+    while True:
+        header = raw.read(_GZIP_HEADER.size)
+        if not header:
+            break
+        size = _gzip_member_size(header)
+        if size is None:
+            # A member from another writer (e.g. the file was appended to): inflate the rest sequentially
+            for future in pending:
+                yield future.result()
+            pending.clear()
+            rest = gzip.GzipFile(fileobj=io.BufferedReader(_BlockReader(
+                itertools.chain([header], _read_blocks(raw, block_size)))))
+            yield from _read_blocks(rest, block_size)
+            return
+        member = header + raw.read(size - len(header))
+        pending.append(executor.submit(zlib.decompress, member, 16 + zlib.MAX_WBITS))
+        if len(pending) >= depth:
+            yield pending.popleft().result()
+    for future in pending:
+        yield future.result()
+
+class _BlockWriter(io.RawIOBase):
+    """
+    Writable raw stream compressing fixed-size blocks in a thread pool.
+
+    Blocks are compressed independently and written in order, so the output
+    is a sequence of complete gzip members or bz2 streams, which every gzip
+    and bz2 reader decodes as one file.
+    """
+
+    def __init__(self, raw, compress, threads, block_size):
+        self._raw = raw
+        self._compress = compress
+        self._block_size = block_size
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='dataauto-compress')
+        self._depth = 2 * threads
+        self._pending = deque()
+        self._buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._buffer += b
+        while len(self._buffer) >= self._block_size:
+            self._submit(bytes(self._buffer[:self._block_size]))
+            del self._buffer[:self._block_size]
+        return len(b)
+
+    def _submit(self, block):
+        self._pending.append(self._executor.submit(self._compress, block))
+        while len(self._pending) > self._depth:
+            self._raw.write(self._pending.popleft().result())
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._buffer or not self._pending:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self._raw.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown()
+            self._raw.close()
+            super().close()
+
+def open_compressed(path, mode='rb', compression='infer', threads=None, level=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Open a gzip, bz2 or zstd compressed file as a binary stream, using several threads.
+
+    Writing splits the data into ``block_size`` blocks compressed in parallel
+    (gzip members or bz2 streams; zstd uses its own multithreaded compressor).
+    Reading decompresses in a background thread, ahead of the consumer; gzip
+    files written by this function are decompressed in parallel, several
+    members at a time. gzip and bz2 files written this way are standard
+    multi-member files that any gzip or bz2 tool reads.
+
+    Parameters:
+        path (str): File path.
+        mode (str): 'rb' or 'wb'.
+        compression (str): 'gzip', 'bz2' or 'zstd', or 'infer' to use the file extension.
+        threads (int): Compression or decompression threads; the number of CPUs if None.
+        level (int): Compression level; the codec's usual default if None.
+        block_size (int): Uncompressed bytes per block.
+
+    Returns:
+        A binary file object.
+    """
+    if compression == 'infer':
+        compression = detect_compression(path)
+    if compression not in DEFAULT_LEVELS:
+        raise ValueError(f"Unsupported compression {compression!r}. Choose 'gzip', 'bz2' or 'zstd'.")
+    if mode not in ('rb', 'wb'):
+        raise ValueError("Compressed files are opened in 'rb' or 'wb' mode.")
+    threads = max(1, threads or os.cpu_count() or 1)
+    level = DEFAULT_LEVELS[compression] if level is None else level
+
+    if mode == 'wb':
+        if compression == 'zstd':
+            compressor = _zstandard().ZstdCompressor(level=level, threads=threads if threads > 1 else 0)
+            return compressor.stream_writer(open(path, 'wb'), closefd=True)
+        if compression == 'gzip':
+            compress = partial(_gzip_member, level=level)
+        else:
+            compress = partial(bz2.compress, compresslevel=level)
+        return io.BufferedWriter(_BlockWriter(open(path, 'wb'), compress, threads, block_size),
+                                 buffer_size=block_size)
+
+    raw = open(path, 'rb')
+    executor = None
+    try:
+        if compression == 'gzip' and _gzip_member_size(raw.read(_GZIP_HEADER.size)) is not None:
+            raw.seek(0)
+            executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='dataauto-decompress')
+            blocks = _parallel_gzip_blocks(raw, executor, 2 * threads, block_size)
+        else:
+            raw.seek(0)
+            if compression == 'gzip':
+                stream = gzip.GzipFile(fileobj=raw)
+            elif compression == 'bz2':
+                stream = bz2.BZ2File(raw)
+            else:
+                stream = _zstandard().ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            blocks = _read_blocks(stream, block_size)
+    except BaseException:
+        raw.close()
+        raise
+
+    def close():
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        raw.close()
+
+    prefetcher = _Prefetcher(blocks, depth=2 * threads, on_close=close)
+    return io.BufferedReader(_BlockReader(prefetcher, on_close=prefetcher.close), buffer_size=block_size)
+
+def open_text(path, mode='r', threads=None, level=None):
+    """
+    Open a file in text mode, transparently (de)compressing it if its extension says so.
+
+    Parameters:
+        path (str): File path, e.g. 'data.csv' or 'data.csv.gz'.
+        mode (str): 'r' or 'w'.
+        threads (int): Threads for compressed files (see ``open_compressed``).
+        level (int): Compression level for compressed files.
+
+    Returns:
+        A text file object.
+    """
+    if detect_compression(path) is None:
+        return open(path, mode, encoding='utf-8', newline='' if mode == 'w' else None)
+    binary = open_compressed(path, mode + 'b', threads=threads, level=level)
+    return io.TextIOWrapper(binary, encoding='utf-8', newline='' if mode == 'w' else None)
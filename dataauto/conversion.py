@@ -0,0 +1,132 @@
+# dataauto/conversion.py
+
+import os
+import queue
+import threading
+
+from dataauto.compression import strip_compression_extension
+from dataauto.data_loader import iter_csv, iter_excel, iter_json, iter_sql
+from dataauto.data_saver import save_chunks
+from dataauto.ndjson import check_engine
+
+FORMAT_EXTENSIONS = {
+    '.csv': 'csv',
+    '.json': 'json',
+    '.jsonl': 'json',
+    '.ndjson': 'json',
+    '.xlsx': 'excel',
+    '.xls': 'excel',
+}
+# Extensions that can be read but not written: Excel output is always an .xlsx workbook.
+READ_ONLY_EXTENSIONS = {'.xls'}
+# How long a blocked thread waits before checking whether the other one gave up.
+_POLL_SECONDS = 0.1
+
+def _extension(path):
+    return os.path.splitext(strip_compression_extension(path))[1].lower()
+
+def infer_format(path):
+    """
+    Return the format of a file from its extension, ignoring a compression extension ('data.csv.gz' is 'csv').
+
+    Raises:
+        ValueError: If the extension is not one of ``FORMAT_EXTENSIONS``.
+    """
+    extension = _extension(path)
+    if extension not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Cannot infer the format of {path!r}; specify it explicitly.")
+    return FORMAT_EXTENSIONS[extension]
+
+def _put(items, item, stop):
+    while not stop.is_set():
+        try:
+            items.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _read(chunks, items, stop):
+    try:
+        for chunk in chunks:
+            if not _put(items, ('chunk', chunk), stop):
+                return
+        _put(items, ('done', None), stop)
+    except BaseException as e:
+        _put(items, ('error', e), stop)
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+def _drain(items, counts):
+    while True:
+        kind, value = items.get()
+        if kind == 'done':
+            return
+        if kind == 'error':
+            raise value
+        counts['chunks'] += 1
+        yield value
+
+def convert_file(source, destination, input_format=None, output_format=None, chunksize=100000, queue_size=4,
+                 sheet_name=0, output_sheet='Sheet1', sql=None, json_engine='pandas', json_schema=None):
+    """
+    Convert data between formats chunk by chunk, in constant memory.
+
+    A reader thread parses ``chunksize`` rows at a time into a queue holding
+    at most ``queue_size`` chunks, and the calling thread writes them out as
+    they arrive. Parsing and writing overlap, and at most ``queue_size + 2``
+    chunks are in memory whatever the size of the input. An error on either
+    side stops both threads and is raised.
+
+    Parameters:
+        source (str): Input file, or the query for 'sql' input.
+        destination (str): Output file, or the table name for 'sql' output.
+        input_format (str): 'csv', 'json' (JSON lines), 'excel' or 'sql'; inferred from the extension if None.
+        output_format (str): 'csv', 'json', 'excel' or 'sql'; inferred from the extension if None.
+        chunksize (int): Number of rows per chunk.
+        queue_size (int): Number of parsed chunks that may wait for the writer.
+        sheet_name (str or int): Sheet to read from Excel input.
+        output_sheet (str): Sheet to write for Excel output.
+        sql (dict): Connection parameters (``db_type``, ``host``, ``port``, ``dbname``,
+            ``user``, ``password``) for 'sql' input or output.
+        json_engine (str): 'pandas' or 'pyarrow', for JSON input and output (see ``data_loader.load_json``).
+        json_schema: Column types of JSON input for the 'pyarrow' engine, or None to infer them.
+
+    Returns:
+        dict: Number of ``rows`` and ``chunks`` converted.
+    """
+    input_format = input_format or infer_format(source)
+    output_format = output_format or infer_format(destination)
+    sql = sql or {}
+    if 'sql' in (input_format, output_format) and not all(sql.get(key) for key in
+                                                          ('db_type', 'host', 'port', 'dbname', 'user', 'password')):
+        raise ValueError("All SQL connection parameters must be provided for SQL format.")
+    if input_format == 'csv':
+        chunks = iter_csv(source, chunksize=chunksize)
+    elif input_format == 'json':
+        chunks = iter_json(source, chunksize=chunksize, engine=json_engine, schema=json_schema)
+    elif input_format == 'excel':
+        chunks = iter_excel(source, sheet_name=sheet_name, chunksize=chunksize)
+    elif input_format == 'sql':
+        chunks = iter_sql(query=source, chunksize=chunksize, **sql)
+    else:
+        raise ValueError("Unsupported input format. Choose 'csv', 'json', 'excel' or 'sql'.")
+    if output_format not in ('csv', 'json', 'excel', 'sql'):
+        raise ValueError("Unsupported output format. Choose 'csv', 'json', 'excel' or 'sql'.")
+    if output_format == 'excel' and _extension(destination) in READ_ONLY_EXTENSIONS:
+        raise ValueError(f"Cannot write {destination!r}: Excel output is written as .xlsx.")
+    check_engine(json_engine, json_schema)
+
+    items = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    reader = threading.Thread(target=_read, args=(chunks, items, stop), name='dataauto-convert-reader', daemon=True)
+    counts = {'chunks': 0}
+    reader.start()
+    try:
+        rows = save_chunks(_drain(items, counts), destination, format=output_format, sheet_name=output_sheet,
+                           json_engine=json_engine, **sql)
+    finally:
+        stop.set()
+        reader.join()
+    return {'rows': rows, 'chunks': counts['chunks']}
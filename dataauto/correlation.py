@@ -0,0 +1,247 @@
+# dataauto/correlation.py
+
+import warnings
+import numpy as np
+import pandas as pd
+from scipy.cluster import hierarchy
+from scipy.spatial.distance import squareform
+from dataauto.data_profiler import encode_array, decode_array
+
+# Heatmaps larger than this are drawn without per-cell annotations.
+ANNOTATE_MAX_COLUMNS = 15
+
+class StreamingCorrelation:
+    """
+    Pearson correlation accumulated one chunk at a time.
+
+    Each chunk is shifted by a fixed per-column offset (the means of the first
+    chunk), cast to float32 and reduced to cross-product matrices with a single
+    BLAS matrix product; the per-chunk results are summed in float64. Missing
+    values are handled pairwise, like ``DataFrame.corr``: when a chunk contains
+    NaNs, per-pair counts and sums are accumulated from the null masks as well.
+
+    Parameters:
+        columns (list): Names of the numeric columns to correlate.
+        dtype: Floating point type used for the per-chunk products.
+    """
+
+    def __init__(self, columns, dtype=np.float32):
+        self.columns = list(columns)
+        self.dtype = dtype
+        p = len(self.columns)
+        self.shift = None
+        self.n = np.zeros((p, p))
+        self.sums = np.zeros((p, p))
+        self.squares = np.zeros((p, p))
+        self.products = np.zeros((p, p))
+
+    def update(self, chunk):
+        """Add a DataFrame chunk containing ``columns``."""
+        values = chunk[self.columns].to_numpy(dtype=np.float64)
+        if not len(values):
+            return self
+        if self.shift is None:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0))
+        centered = (values - self.shift).astype(self.dtype)
+        missing = np.isnan(centered)
+        if missing.any():
+            present = (~missing).astype(self.dtype)
+            centered[missing] = 0
+            squared = centered * centered
+            # Sums of column i over the rows where column j is also present
+            self.n += present.T @ present
+            self.sums += centered.T @ present
+            self.squares += squared.T @ present
+        else:
+            self.n += len(centered)
+            self.sums += centered.sum(axis=0, dtype=np.float64)[:, None]
+            self.squares += (centered * centered).sum(axis=0, dtype=np.float64)[:, None]
+        self.products += centered.T @ centered
+        return self
+
+    def retain(self, columns):
+        """
+        Stop correlating the columns not in ``columns``, e.g. columns a profile has since found to hold text.
+
+        Returns:
+            StreamingCorrelation: self.
+        """
+        retained = set(columns)
+        keep = [i for i, column in enumerate(self.columns) if column in retained]
+        if len(keep) == len(self.columns):
+            return self
+        self.columns = [self.columns[i] for i in keep]
+        if self.shift is not None:
+            self.shift = self.shift[keep]
+        for name in ['n', 'sums', 'squares', 'products']:
+            setattr(self, name, getattr(self, name)[np.ix_(keep, keep)])
+        return self
+
+    def merge(self, other):
+        """Merge another StreamingCorrelation over the same columns into this one."""
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift = other.shift
+        # Re-express the other accumulators around this shift
+        delta = other.shift - self.shift
+        sums = other.sums + delta[:, None] * other.n
+        self.squares += other.squares + 2 * delta[:, None] * other.sums + delta[:, None] ** 2 * other.n
+        self.products += (other.products + delta[:, None] * other.sums.T + delta[None, :] * other.sums
+                          + np.outer(delta, delta) * other.n)
+        self.sums += sums
+        self.n += other.n
+        return self
+
+    def to_dict(self):
+        """Return the accumulator state as a JSON-serializable dict."""
+        state = {'columns': [str(column) for column in self.columns], 'dtype': np.dtype(self.dtype).str}
+        state['shift'] = encode_array(self.shift) if self.shift is not None else None
+        for name in ['n', 'sums', 'squares', 'products']:
+            state[name] = encode_array(getattr(self, name))
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        """Restore a StreamingCorrelation saved with ``to_dict``."""
+        engine = cls(state['columns'], np.dtype(state['dtype']).type)
+        engine.shift = decode_array(state['shift']) if state['shift'] is not None else None
+        for name in ['n', 'sums', 'squares', 'products']:
+            setattr(engine, name, decode_array(state[name]))
+        return engine
+
+    def correlation(self, min_periods=1):
+        """Return the correlation matrix as a DataFrame."""
+        n = np.where(self.n >= max(min_periods, 1), self.n, np.nan)
+        sums_x, sums_y = self.sums, self.sums.T
+        covariance = self.products - sums_x * sums_y / n
+        variance_x = self.squares - sums_x ** 2 / n
+        variance_y = variance_x.T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = covariance / np.sqrt(variance_x * variance_y)
+        corr = np.clip(corr, -1.0, 1.0)
+        np.fill_diagonal(corr, np.where(np.diag(variance_x) > 0, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+def numeric_columns(df):
+    """Return the names of the numeric, non-boolean columns of a DataFrame."""
+    return [col for col in df.columns
+            if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])]
+
+def correlation_chunks(chunks, columns=None, dtype=np.float32):
+    """
+    Compute the Pearson correlation matrix in a single pass over DataFrame chunks.
+
+    Parameters:
+        chunks (Iterable[pd.DataFrame]): DataFrame chunks, e.g. from ``data_loader.iter_chunks``.
+        columns (list): Columns to correlate; the numeric columns of the first chunk if None.
+        dtype: Floating point type used for the per-chunk products.
+
+    Returns:
+        pd.DataFrame: The correlation matrix.
+    """
+    engine = None
+    for chunk in chunks:
+        if engine is None:
+            engine = StreamingCorrelation(columns if columns is not None else numeric_columns(chunk), dtype)
+        engine.update(chunk)
+    if engine is None:
+        return pd.DataFrame()
+    return engine.correlation()
+
+def correlation_matrix(df, columns=None, method='pearson', chunksize=100000, dtype=np.float32):
+    """
+    Compute a correlation matrix of an in-memory DataFrame.
+
+    Spearman correlation is the Pearson correlation of the column ranks; ranking
+    needs every value of a column, so it is only available for in-memory data.
+    Columns are ranked once over all their non-null values, whereas
+    ``DataFrame.corr`` re-ranks every pair over the rows where both are present,
+    so results differ slightly when there are missing values.
+
+    Parameters:
+        df (pd.DataFrame): The input DataFrame.
+        columns (list): Columns to correlate; all numeric columns if None.
+        method (str): 'pearson' or 'spearman'.
+        chunksize (int): Number of rows processed at a time.
+        dtype: Floating point type used for the per-chunk products.
+
+    Returns:
+        pd.DataFrame: The correlation matrix.
+    """
+    columns = list(columns) if columns is not None else numeric_columns(df)
+    data = df[columns]
+    if method == 'spearman':
+        data = data.rank()
+    elif method != 'pearson':
+        raise ValueError("Unsupported correlation method. Choose 'pearson' or 'spearman'.")
+    chunks = (data.iloc[start:start + chunksize] for start in range(0, max(len(data), 1), chunksize))
+    return correlation_chunks(chunks, columns, dtype)
+
+def top_correlations(corr, k=20):
+    """
+    Return the ``k`` column pairs with the largest absolute correlation.
+
+    Parameters:
+        corr (pd.DataFrame): A correlation matrix.
+        k (int): Number of pairs to return.
+
+    Returns:
+        pd.DataFrame: Columns 'column_1', 'column_2' and 'correlation', strongest first.
+    """
+    values = corr.to_numpy()
+    rows, cols = np.triu_indices(len(values), k=1)
+    pair_values = values[rows, cols]
+    strength = np.nan_to_num(np.abs(pair_values), nan=-1.0)
+    k = min(k, len(pair_values))
+    order = np.argpartition(-strength, k - 1)[:k] if k else np.empty(0, dtype=np.int64)
+    order = order[np.argsort(-strength[order], kind='stable')]
+    return pd.DataFrame({
+        'column_1': corr.index[rows[order]],
+        'column_2': corr.columns[cols[order]],
+        'correlation': pair_values[order],
+    })
+
+def cluster_order(corr):
+    """
+    Order columns so that strongly correlated columns are adjacent.
+
+    Uses average-linkage hierarchical clustering on the distance ``1 - |r|``.
+
+    Parameters:
+        corr (pd.DataFrame): A correlation matrix.
+
+    Returns:
+        list: Column names in clustered order.
+    """
+    if len(corr) < 3:
+        return list(corr.columns)
+    distance = 1 - np.abs(np.nan_to_num(corr.to_numpy()))
+    distance = (distance + distance.T) / 2
+    np.fill_diagonal(distance, 0)
+    linkage = hierarchy.linkage(squareform(np.clip(distance, 0, None), checks=False), method='average')
+    return list(corr.columns[hierarchy.leaves_list(linkage)])
+
+def plot_subset(corr, max_columns=30):
+    """
+    Select and order at most ``max_columns`` columns of a correlation matrix for plotting.
+
+    When there are too many columns, the ones taking part in the strongest
+    correlations are kept. The result is ordered with ``cluster_order``.
+
+    Parameters:
+        corr (pd.DataFrame): A correlation matrix.
+        max_columns (int): Maximum number of columns to keep.
+
+    Returns:
+        pd.DataFrame: The reduced and reordered correlation matrix.
+    """
+    if len(corr) > max_columns:
+        strength = np.abs(np.nan_to_num(corr.to_numpy()))
+        np.fill_diagonal(strength, 0)
+        keep = np.sort(np.argsort(-strength.max(axis=1), kind='stable')[:max_columns])
+        corr = corr.iloc[keep, keep]
+    order = cluster_order(corr)
+    return corr.loc[order, order]
@@ -0,0 +1,289 @@
+# dataauto/daemon.py
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# Share of physical memory the resident frames may use by default.
+DEFAULT_MEMORY_FRACTION = 0.25
+# Commands the CLI forwards to a running daemon; the others always run in-process.
+FORWARDED_COMMANDS = {'load', 'save', 'clean', 'remove-outlier', 'scale', 'filter', 'summarize', 'report', 'plot',
+                      'train', 'predict', 'pipeline'}
+
+# Set while this process is the daemon, so commands it runs are not forwarded back to it.
+_serving = False
+
+def _private_directory():
+    # Used when there is no $XDG_RUNTIME_DIR: a directory of our own in the shared temp directory
+    return os.path.join(tempfile.gettempdir(), f"dataauto-{os.getuid()}")
+
+def socket_path():
+    """
+    Return the path of the daemon socket.
+
+    That is ``$DATAAUTO_SOCKET``, a per-user path in ``$XDG_RUNTIME_DIR``, or
+    a socket in a 0700 directory of the user's in the temp directory.
+    """
+    if os.environ.get('DATAAUTO_SOCKET'):
+        return os.environ['DATAAUTO_SOCKET']
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        return os.path.join(os.environ['XDG_RUNTIME_DIR'], f"dataauto-{os.getuid()}.sock")
+    return os.path.join(_private_directory(), 'daemon.sock')
+
+def _make_private_directory(directory):
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    # Someone else may have created it first
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise RuntimeError(f"{directory} must be a directory that only you can access.")
+
+def _is_own_socket(path):
+    """Return whether ``path`` is a socket owned by the current user, so that requests are safe to send to it."""
+    try:
+        info = os.lstat(path)
+    except FileNotFoundError:
+        return False
+    return stat.S_ISSOCK(info.st_mode) and info.st_uid == os.getuid()
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    return (stat.st_size, stat.st_mtime_ns)
+
+class FrameCache:
+    """
+    Least-recently-used cache of parsed files, bounded by memory.
+
+    Entries are keyed by absolute path and reader (e.g. 'csv') and are
+    dropped as soon as the file's size or modification time changes.
+    Callers receive copies, so commands that modify their frame in place do
+    not alter the cached one.
+
+    Parameters:
+        max_bytes (int): Memory the cached frames may use together; frames
+            larger than this are returned but not kept.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key, path):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry['fingerprint'] != _fingerprint(path):
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry['frame']
+
+    def _discard(self, key):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry['bytes']
+
+    def get(self, path, kind, loader):
+        """
+        Return a copy of the cached frame for ``path``, loading it with ``loader()`` if needed.
+
+        Parameters:
+            path (str): File path.
+            kind (str): Reader and options the frame was loaded with, e.g. 'csv' or 'excel:Sheet1'.
+            loader (callable): Function reading the file into a DataFrame.
+
+        Returns:
+            pd.DataFrame: A copy of the frame.
+        """
+        key = (os.path.abspath(path), kind)
+        with self._lock:
+            frame = self._lookup(key, path)
+            if frame is not None:
+                self.hits += 1
+                return frame.copy()
+            self.misses += 1
+        fingerprint = _fingerprint(path)
+        frame = loader()
+        size = int(frame.memory_usage(deep=True).sum())
+        with self._lock:
+            if size <= self.max_bytes:
+                if key in self._entries:
+                    self._discard(key)
+                self._entries[key] = {'frame': frame, 'bytes': size, 'fingerprint': fingerprint,
+                                      'loaded_at': time.time()}
+                self.total_bytes += size
+                while self.total_bytes > self.max_bytes:
+                    self._discard(next(iter(self._entries)))
+        return frame.copy()
+
+    def peek(self, path, kind):
+        """Return a copy of the cached frame for ``path`` if it is resident and current, else None."""
+        with self._lock:
+            frame = self._lookup((os.path.abspath(path), kind), path)
+            if frame is None:
+                return None
+            self.hits += 1
+            return frame.copy()
+
+    def stats(self):
+        """Return the cache usage and one dict per resident frame, least recently used first."""
+        with self._lock:
+            return {
+                'max_bytes': self.max_bytes,
+                'total_bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'frames': [{'path': path, 'kind': kind, 'rows': len(entry['frame']), 'bytes': entry['bytes']}
+                           for (path, kind), entry in self._entries.items()],
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        action = request.get('action')
+        if action == 'run':
+            response = self.server.run(request['args'], request.get('cwd'))
+        elif action == 'status':
+            response = {'pid': os.getpid(), 'cache': self.server.cache.stats()}
+        elif action == 'stop':
+            response = {'stopped': True}
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            response = {'error': f"Unknown action: {action!r}"}
+        self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """
+    Unix socket server running CLI commands in a process with warm imports and resident frames.
+
+    Requests are handled one at a time, each in the client's working directory.
+
+    Parameters:
+        path (str): Socket path.
+        cache (FrameCache): Cache serving ``data_loader`` loads while the server runs.
+    """
+
+    def __init__(self, path, cache):
+        self.cache = cache
+        # Created owner-only from the start rather than tightened after bind
+        previous = os.umask(0o177)
+        try:
+            super().__init__(path, _RequestHandler)
+        finally:
+            os.umask(previous)
+
+    def run(self, args, cwd=None):
+        from dataauto.cli import cli
+        from dataauto.scheduler import invoke_command
+        output = io.StringIO()
+        previous = os.getcwd()
+        try:
+            if cwd:
+                os.chdir(cwd)
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                exit_code, error = invoke_command(cli, args)
+        finally:
+            os.chdir(previous)
+        return {'exit_code': exit_code, 'error': error, 'output': output.getvalue()}
+
+def _remove_stale_socket(path):
+    if not os.path.lexists(path):
+        return
+    if not _is_own_socket(path):
+        raise RuntimeError(f"{path} exists and is not a socket of yours.")
+    if request(path, {'action': 'status'}) is not None:
+        raise RuntimeError(f"A dataauto daemon is already listening on {path}.")
+    os.remove(path)
+
+def serve(path=None, memory_limit=None, preload=True, ready=None):
+    """
+    Run the daemon until it is stopped.
+
+    Parameters:
+        path (str): Socket path; ``socket_path()`` if None.
+        memory_limit (int): Bytes the resident frames may use; a quarter of physical memory if None.
+        preload (bool): Import the heavy modules before accepting commands.
+        ready (callable): Called once the socket accepts connections.
+    """
+    global _serving
+    from dataauto import data_loader
+    from dataauto.scheduler import PRELOAD_MODULES, physical_memory_bytes
+    path = path or socket_path()
+    if memory_limit is None:
+        memory_limit = int((physical_memory_bytes() or 4 * 1024 ** 3) * DEFAULT_MEMORY_FRACTION)
+    if preload:
+        import importlib
+        import matplotlib
+        matplotlib.use('Agg')
+        for module in PRELOAD_MODULES:
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                pass
+    if os.path.dirname(path) == _private_directory():
+        _make_private_directory(os.path.dirname(path))
+    _remove_stale_socket(path)
+    cache = FrameCache(memory_limit)
+    server = DaemonServer(path, cache)
+    _serving = True
+    data_loader.set_frame_cache(cache)
+    try:
+        if ready is not None:
+            ready()
+        server.serve_forever()
+    finally:
+        data_loader.set_frame_cache(None)
+        _serving = False
+        server.server_close()
+        if os.path.exists(path):
+            os.remove(path)
+
+def request(path, message, timeout=None):
+    """
+    Send one request to the daemon at ``path`` and return its response.
+
+    Returns None if no daemon is listening, or if ``path`` is not a socket owned
+    by the current user: requests carry command lines, which may hold passwords.
+    """
+    if not _is_own_socket(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(path)
+            client.sendall(json.dumps(message).encode('utf-8') + b'\n')
+            with client.makefile('rb') as response:
+                line = response.readline()
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    return json.loads(line) if line else None
+
+def forward(args):
+    """
+    Run a CLI command in the daemon if one is running.
+
+    Returns:
+        dict: ``exit_code``, ``error`` and ``output`` of the command, or None if it
+        should run in-process (no daemon, ``DATAAUTO_NO_DAEMON`` set, or already in the daemon).
+    """
+    if _serving or os.environ.get('DATAAUTO_NO_DAEMON'):
+        return None
+    path = socket_path()
+    if not _is_own_socket(path):
+        return None
+    return request(path, {'action': 'run', 'args': list(args), 'cwd': os.getcwd()})
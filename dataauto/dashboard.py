@@ -15,6 +15,7 @@ from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 import joblib
 import sys
+from dataauto.correlation import correlation_matrix, plot_subset, ANNOTATE_MAX_COLUMNS
 
 st.title("DataAuto Interactive Dashboard")
 
@@ -87,9 +88,11 @@ if uploaded_file is not None:
             if len(selected_cols) < 2:
                 st.error("Please select at least two columns for the heatmap.")
             else:
-                corr = df[selected_cols].corr()
+                method = st.radio("Correlation Method", ["pearson", "spearman"])
+                corr = plot_subset(correlation_matrix(df, selected_cols, method=method), max_columns=50)
                 fig, ax = plt.subplots(figsize=(10, 8))
-                sns.heatmap(corr, annot=True, cmap='coolwarm', ax=ax)
+                sns.heatmap(corr, annot=len(corr) <= ANNOTATE_MAX_COLUMNS, fmt='.2f', cmap='coolwarm',
+                            vmin=-1, vmax=1, ax=ax)
                 plt.title('Heatmap of Numerical Features')
                 st.pyplot(fig)
 
@@ -1,47 +1,249 @@
 # dataauto/data_loader.py
 
+import contextlib
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.exc import SQLAlchemyError
+from dataauto.compression import detect_compression, open_text
+from dataauto.excel import is_streamable, iter_sheet, read_sheet, read_sheets
+from dataauto.filtering import arrow_filter, filter_frame, sql_where
+from dataauto.ndjson import check_engine, iter_ndjson, read_ndjson
+
+# Cache of parsed files kept by ``dataauto daemon`` (see dataauto/daemon.py), or None.
+_frame_cache = None
+
+def set_frame_cache(cache):
+    """Serve file loads from ``cache`` (a daemon.FrameCache), or read files directly if None."""
+    global _frame_cache
+    _frame_cache = cache
+
+def _load(file_path, kind, loader):
+    if _frame_cache is None:
+        return loader()
+    return _frame_cache.get(file_path, kind, loader)
+
+def _read(file_path, reader):
+    """Call ``reader`` with the path, or with a decompressing text stream for .gz, .bz2 and .zst files."""
+    if detect_compression(file_path) is None:
+        return reader(file_path)
+    with open_text(file_path) as f:
+        return reader(f)
 
 def load_csv(file_path):
-    """Load data from a CSV file."""
+    """Load data from a CSV file, optionally gzip, bz2 or zstd compressed."""
     try:
-        df = pd.read_csv(file_path)
+        df = _load(file_path, 'csv', lambda: _read(file_path, pd.read_csv))
         return df
     except Exception as e:
         raise e
 
-def load_json(file_path):
-    """Load data from a JSON file."""
+def load_parquet(file_path, where=None):
+    """
+    Load data from a Parquet file, optionally keeping only the rows matching a filter expression.
+
+    The conditions of ``where`` that pyarrow can evaluate (see ``filtering.arrow_filter``)
+    are pushed down into the reader: row groups whose statistics rule them out are
+    skipped, and filtered-out rows are never converted to pandas. The rest of the
+    expression is evaluated on the loaded rows.
+
+    Parameters:
+        file_path (str): Path to the Parquet file.
+        where (str): Filter expression (see ``filtering.parse_expression``), or None to load every row.
+
+    Returns:
+        pd.DataFrame: The loaded data.
+    """
+    try:
+        if where is None:
+            return _load(file_path, 'parquet', lambda: pd.read_parquet(file_path))
+        df = _frame_cache.peek(file_path, 'parquet') if _frame_cache is not None else None
+        if df is not None:
+            return filter_frame(df, where).reset_index(drop=True)
+        import pyarrow.parquet as pq
+        pushed, remaining = arrow_filter(where, pq.read_schema(file_path))
+        df = pq.read_table(file_path, filters=pushed).to_pandas()
+        return df if remaining is None else filter_frame(df, remaining).reset_index(drop=True)
+    except Exception as e:
+        raise e
+
+def load_json(file_path, engine='pandas', schema=None):
+    """
+    Load data from a JSON lines file, optionally gzip, bz2 or zstd compressed.
+
+    Parameters:
+        file_path (str): Path to the JSON lines file.
+        engine (str): 'pandas' (``pd.read_json``) or 'pyarrow', which parses blocks of
+            lines into typed columns on several threads (see ``dataauto.ndjson``).
+        schema: Column types for the 'pyarrow' engine, e.g. ``{'id': 'int64'}`` or
+            ``'id:int64,name:string'``, to skip type inference; None to infer them.
+
+    Returns:
+        pd.DataFrame: The loaded data.
+    """
     try:
-        df = pd.read_json(file_path, lines=True)
+        check_engine(engine, schema)
+        if engine == 'pyarrow':
+            return _load(file_path, f'json:pyarrow:{schema}', lambda: read_ndjson(file_path, schema=schema))
+        df = _load(file_path, 'json', lambda: _read(file_path, lambda f: pd.read_json(f, lines=True)))
         return df
     except Exception as e:
         raise e
 
+def _read_excel(file_path, sheet_name):
+    if is_streamable(file_path):
+        return read_sheet(file_path, sheet_name)
+    return pd.read_excel(file_path, sheet_name=sheet_name)
+
 def load_excel(file_path, sheet_name=0):
-    """Load data from an Excel file."""
+    """Load data from an Excel file, streaming .xlsx rows instead of materializing every cell at once."""
     try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
+        df = _load(file_path, f'excel:{sheet_name}', lambda: _read_excel(file_path, sheet_name))
         return df
     except Exception as e:
         raise e
 
-def load_sql(db_type, host, port, dbname, user, password, query):
-    """Load data from a SQL database."""
+def load_excel_sheets(file_path, sheet_names=None, n_jobs=None):
+    """
+    Load several sheets of an Excel file, parsing them in parallel worker processes.
+
+    Parameters:
+        file_path (str): Path to the Excel file.
+        sheet_names (list): Sheets to load; all sheets if None.
+        n_jobs (int): Number of worker processes; defaults to the number of CPUs.
+
+    Returns:
+        dict: Mapping of sheet name to DataFrame.
+    """
+    try:
+        if not is_streamable(file_path):
+            return pd.read_excel(file_path, sheet_name=list(sheet_names) if sheet_names else None)
+        return read_sheets(file_path, sheet_names, n_jobs=n_jobs)
+    except Exception as e:
+        raise e
+
+def create_sql_engine(db_type, host, port, dbname, user, password):
+    """Create a SQLAlchemy engine for a PostgreSQL or MySQL database."""
+    if db_type.lower() == 'postgresql':
+        return create_engine(f'postgresql://{user}:{password}@{host}:{port}/{dbname}')
+    elif db_type.lower() == 'mysql':
+        return create_engine(f'mysql+pymysql://{user}:{password}@{host}:{port}/{dbname}')
+    else:
+        raise ValueError("Unsupported database type. Choose 'postgresql' or 'mysql'.")
+
+def _filtered_query(query, where, dialect):
+    """Wrap ``query`` so that the database applies the filter expression ``where``; returns the query and parameters."""
+    if where is None:
+        return query, None
+    condition, parameters = sql_where(where, dialect.identifier_preparer.quote)
+    return text(f"SELECT * FROM ({query}) AS dataauto_filtered WHERE {condition}"), parameters
+
+def load_sql(db_type, host, port, dbname, user, password, query, where=None):
+    """
+    Load data from a SQL database.
+
+    ``where`` is a filter expression (see ``filtering.parse_expression``) translated
+    into the query's WHERE clause, with values passed as bound parameters, so that
+    only the matching rows leave the database.
+    """
     try:
-        if db_type.lower() == 'postgresql':
-            engine = create_engine(f'postgresql://{user}:{password}@{host}:{port}/{dbname}')
-        elif db_type.lower() == 'mysql':
-            engine = create_engine(f'mysql+pymysql://{user}:{password}@{host}:{port}/{dbname}')
-        else:
-            raise ValueError("Unsupported database type. Choose 'postgresql' or 'mysql'.")
-    
+        engine = create_sql_engine(db_type, host, port, dbname, user, password)
+        query, parameters = _filtered_query(query, where, engine.dialect)
         with engine.connect() as connection:
-            df = pd.read_sql_query(query, connection)
+            df = pd.read_sql_query(query, connection, params=parameters)
         return df
     except SQLAlchemyError as e:
         raise e
     except Exception as e:
-        raise e
\ No newline at end of file
+        raise e
+
+def iter_csv(file_path, chunksize=100000):
+    """Iterate over a CSV file (optionally compressed) in DataFrame chunks of ``chunksize`` rows."""
+    try:
+        with contextlib.ExitStack() as stack:
+            source = file_path if detect_compression(file_path) is None else stack.enter_context(open_text(file_path))
+            with pd.read_csv(source, chunksize=chunksize) as reader:
+                for chunk in reader:
+                    yield chunk
+    except Exception as e:
+        raise e
+
+def iter_json(file_path, chunksize=100000, engine='pandas', schema=None):
+    """
+    Iterate over a JSON lines file (optionally compressed) in DataFrame chunks of ``chunksize`` rows.
+
+    ``engine`` and ``schema`` are as for ``load_json``; with 'pyarrow', column types
+    are fixed by the schema or by the first block of the file.
+    """
+    try:
+        check_engine(engine, schema)
+        if engine == 'pyarrow':
+            yield from iter_ndjson(file_path, schema=schema, chunksize=chunksize)
+            return
+        with contextlib.ExitStack() as stack:
+            source = file_path if detect_compression(file_path) is None else stack.enter_context(open_text(file_path))
+            with pd.read_json(source, lines=True, chunksize=chunksize) as reader:
+                for chunk in reader:
+                    yield chunk
+    except Exception as e:
+        raise e
+
+def iter_excel(file_path, sheet_name=0, chunksize=100000):
+    """
+    Iterate over an Excel sheet in DataFrame chunks of ``chunksize`` rows.
+
+    .xlsx sheets are streamed row by row with openpyxl's read-only mode, so
+    only one chunk of cells is in memory; other formats are read whole.
+    """
+    try:
+        df = _frame_cache.peek(file_path, f'excel:{sheet_name}') if _frame_cache is not None else None
+        if df is None and is_streamable(file_path):
+            yield from iter_sheet(file_path, sheet_name, chunksize)
+            return
+        if df is None:
+            df = pd.read_excel(file_path, sheet_name=sheet_name)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+    except Exception as e:
+        raise e
+
+def iter_sql(db_type, host, port, dbname, user, password, query, chunksize=100000, where=None):
+    """
+    Iterate over the result of a SQL query in DataFrame chunks of ``chunksize`` rows.
+
+    Rows are fetched with a server-side cursor, so the result is never held
+    in memory all at once. ``where`` filters the rows in the database, as for ``load_sql``.
+    """
+    try:
+        engine = create_sql_engine(db_type, host, port, dbname, user, password)
+        query, parameters = _filtered_query(query, where, engine.dialect)
+        with engine.connect().execution_options(stream_results=True) as connection:
+            for chunk in pd.read_sql_query(query, connection, params=parameters, chunksize=chunksize):
+                yield chunk
+    except SQLAlchemyError as e:
+        raise e
+    except Exception as e:
+        raise e
+
+def iter_chunks(file_path, format='csv', chunksize=100000):
+    """
+    Iterate over a file in DataFrame chunks without loading it all into memory.
+
+    Parameters:
+        file_path (str): Path to the input file.
+        format (str): Format of the input file ('csv' or 'json').
+        chunksize (int): Number of rows per chunk.
+
+    Returns:
+        Iterator[pd.DataFrame]: DataFrame chunks.
+    """
+    if _frame_cache is not None:
+        # A frame already resident in the daemon is sliced instead of parsing the file again
+        df = _frame_cache.peek(file_path, format)
+        if df is not None:
+            return (df.iloc[start:start + chunksize].copy() for start in range(0, len(df), chunksize))
+    if format == 'csv':
+        return iter_csv(file_path, chunksize=chunksize)
+    elif format == 'json':
+        return iter_json(file_path, chunksize=chunksize)
+    else:
+        raise ValueError("Unsupported format for chunked reading. Choose 'csv' or 'json'.")
@@ -6,6 +6,7 @@ import matplotlib.pyplot as plt
 import plotly.express as px
 import os
 import sys
+from dataauto.correlation import correlation_matrix, numeric_columns, plot_subset, ANNOTATE_MAX_COLUMNS
 
 def plot_histogram(df, column, output_dir='plots', interactive=False):
     """
@@ -136,20 +137,28 @@ def plot_box(df, column, output_dir='plots', interactive=False):
         print(f"Error during plotting: {e}")
         sys.exit(1)
 
-def plot_heatmap(df, columns, output_dir='plots', interactive=False):
+def plot_heatmap(df, columns=None, output_dir='plots', interactive=False, method='pearson', max_columns=30):
     """
-    Generate a heatmap for specified columns.
+    Generate a correlation heatmap for specified columns.
+
+    Wide tables are reduced to the ``max_columns`` columns with the strongest
+    correlations, ordered so that correlated columns are adjacent; cells are
+    only annotated for small heatmaps.
 
     Parameters:
         df (pd.DataFrame): The input DataFrame.
-        columns (list): List of columns to include in the heatmap.
+        columns (list): List of columns to include in the heatmap; all numeric columns if None.
         output_dir (str): Directory to save the plots.
         interactive (bool): Whether to generate an interactive plot.
+        method (str): Correlation method ('pearson' or 'spearman').
+        max_columns (int): Maximum number of columns drawn.
 
     Returns:
         None
     """
     try:
+        if not columns:
+            columns = numeric_columns(df)
         for column in columns:
             if column not in df.columns:
                 raise ValueError(f"Column '{column}' does not exist in the DataFrame.")
@@ -162,11 +171,13 @@ def plot_heatmap(df, columns, output_dir='plots', interactive=False):
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        corr = df[columns].corr()
+        corr = plot_subset(correlation_matrix(df, columns, method=method), max_columns=max_columns)
+        annotate = len(corr) <= ANNOTATE_MAX_COLUMNS
 
         # Static Heatmap
-        plt.figure(figsize=(10, 8))
-        sns.heatmap(corr, annot=True, cmap='coolwarm')
+        size = min(max(8, 0.3 * len(corr)), 30)
+        plt.figure(figsize=(size * 1.25, size))
+        sns.heatmap(corr, annot=annotate, fmt='.2f', cmap='coolwarm', vmin=-1, vmax=1)
         plt.title('Correlation Heatmap')
         plt.tight_layout()
         plt.savefig(os.path.join(output_dir, "correlation_heatmap.png"))
@@ -175,7 +186,8 @@ def plot_heatmap(df, columns, output_dir='plots', interactive=False):
 
         # Interactive Heatmap
         if interactive:
-            fig = px.imshow(corr, text_auto=True, aspect="auto", title="Interactive Correlation Heatmap")
+            fig = px.imshow(corr, text_auto='.2f' if annotate else False, aspect="auto",
+                            zmin=-1, zmax=1, title="Interactive Correlation Heatmap")
             fig.write_html(os.path.join(output_dir, "correlation_heatmap.html"))
             print(f"Interactive correlation heatmap saved to {output_dir}/correlation_heatmap.html.")
 
@@ -1,42 +1,127 @@
 # dataauto/data_saver.py
 
 import pandas as pd
-from sqlalchemy import create_engine
 from sqlalchemy.exc import SQLAlchemyError
+from dataauto.compression import detect_compression, open_text
+from dataauto.data_loader import create_sql_engine
+from dataauto.excel import is_streamable, write_sheets
+from dataauto.ndjson import check_engine, write_ndjson
+
+def _write(output_file, writer):
+    """Call ``writer`` with the path, or with a compressing text stream for .gz, .bz2 and .zst files."""
+    if detect_compression(output_file) is None:
+        return writer(output_file)
+    with open_text(output_file, 'w') as f:
+        return writer(f)
 
 def save_csv(df, output_file):
-    """Save DataFrame to a CSV file."""
+    """Save DataFrame to a CSV file, compressed in parallel if its name ends in .gz, .bz2 or .zst."""
     try:
-        df.to_csv(output_file, index=False)
+        _write(output_file, lambda f: df.to_csv(f, index=False))
     except Exception as e:
         raise e
 
-def save_json(df, output_file):
-    """Save DataFrame to a JSON file."""
+def save_json(df, output_file, engine='pandas'):
+    """
+    Save DataFrame to a JSON lines file, compressed in parallel if its name ends in .gz, .bz2 or .zst.
+
+    The 'pyarrow' engine encodes whole columns at a time with pyarrow compute
+    kernels (see ``dataauto.ndjson``); unlike 'pandas', it writes floats with
+    full precision and datetimes as ISO 8601 strings rather than epoch milliseconds.
+    """
     try:
-        df.to_json(output_file, orient='records', lines=True)
+        check_engine(engine)
+        if engine == 'pyarrow':
+            write_ndjson(df, output_file)
+            return
+        _write(output_file, lambda f: df.to_json(f, orient='records', lines=True))
     except Exception as e:
         raise e
 
 def save_excel(df, output_file, sheet_name='Sheet1'):
-    """Save DataFrame to an Excel file."""
+    """Save DataFrame to an Excel file, streaming .xlsx rows to disk instead of building every cell first."""
     try:
-        df.to_excel(output_file, index=False, sheet_name=sheet_name)
+        if is_streamable(output_file):
+            write_sheets({sheet_name: df}, output_file)
+        else:
+            df.to_excel(output_file, index=False, sheet_name=sheet_name)
+    except Exception as e:
+        raise e
+
+def save_excel_sheets(sheets, output_file):
+    """
+    Save several DataFrames as the sheets of one .xlsx file, streaming rows to disk.
+
+    Parameters:
+        sheets (dict): Mapping of sheet name to a DataFrame or an iterable of DataFrame chunks.
+        output_file (str): Path of the .xlsx file.
+
+    Returns:
+        dict: Number of rows written per sheet.
+    """
+    try:
+        return write_sheets(sheets, output_file)
     except Exception as e:
         raise e
 
 def save_sql(df, db_type, host, port, dbname, user, password, query):
     """Save DataFrame to a SQL database."""
     try:
-        if db_type.lower() == 'postgresql':
-            engine = create_engine(f'postgresql://{user}:{password}@{host}:{port}/{dbname}')
-        elif db_type.lower() == 'mysql':
-            engine = create_engine(f'mysql+pymysql://{user}:{password}@{host}:{port}/{dbname}')
-        else:
-            raise ValueError("Unsupported database type. Choose 'postgresql' or 'mysql'.")
-        
+        engine = create_sql_engine(db_type, host, port, dbname, user, password)
         df.to_sql(name='data_table', con=engine, if_exists='replace', index=False)
     except SQLAlchemyError as e:
         raise e
     except Exception as e:
-        raise e
\ No newline at end of file
+        raise e
+
+def save_chunks(chunks, output_file, format='csv', sheet_name='Sheet1', db_type=None, host=None, port=None,
+                dbname=None, user=None, password=None, json_engine='pandas'):
+    """
+    Write DataFrame chunks to a file or SQL table one at a time.
+
+    Only the chunk being written is held in memory, so inputs of any size
+    can be saved from ``data_loader.iter_chunks`` and friends. The output is
+    the same as saving the concatenated chunks with ``save_csv``,
+    ``save_json``, ``save_excel`` or ``save_sql``; CSV and JSON output is
+    compressed if the file name ends in .gz, .bz2 or .zst.
+
+    Parameters:
+        chunks (iterable): DataFrames with the same columns.
+        output_file (str): Path of the output file, or the table name for 'sql'.
+        format (str): 'csv', 'json' (JSON lines), 'excel' or 'sql'.
+        sheet_name (str): Sheet name for Excel files.
+        db_type, host, port, dbname, user, password: SQL connection parameters for 'sql'.
+        json_engine (str): Engine for 'json' output, as for ``save_json``.
+
+    Returns:
+        int: Number of rows written.
+    """
+    rows = 0
+    try:
+        if format == 'csv':
+            with open_text(output_file, 'w') as f:
+                for index, chunk in enumerate(chunks):
+                    chunk.to_csv(f, index=False, header=index == 0)
+                    rows += len(chunk)
+        elif format == 'json' and json_engine != 'pandas':
+            check_engine(json_engine)
+            rows = write_ndjson(chunks, output_file)
+        elif format == 'json':
+            with open_text(output_file, 'w') as f:
+                for chunk in chunks:
+                    chunk.to_json(f, orient='records', lines=True)
+                    rows += len(chunk)
+        elif format == 'excel':
+            rows = write_sheets({sheet_name: chunks}, output_file)[sheet_name]
+        elif format == 'sql':
+            engine = create_sql_engine(db_type, host, port, dbname, user, password)
+            for index, chunk in enumerate(chunks):
+                chunk.to_sql(name=output_file, con=engine, if_exists='append' if index else 'replace', index=False)
+                rows += len(chunk)
+        else:
+            raise ValueError("Unsupported format. Choose 'csv', 'json', 'excel' or 'sql'.")
+        return rows
+    except SQLAlchemyError as e:
+        raise e
+    except Exception as e:
+        raise e
@@ -0,0 +1,442 @@
+# dataauto/engines.py
+
+import os
+import pandas as pd
+
+from dataauto.compression import detect_compression, open_compressed, strip_compression_extension
+from dataauto.data_cleaner import clean_data, remove_outliers, scale_features
+from dataauto.data_loader import iter_csv, load_csv, load_parquet
+from dataauto.data_saver import save_chunks, save_csv
+from dataauto.filtering import compile_expression, filter_frame, parse_expression, treat_nan_as_null
+from dataauto.instrumentation import stage
+
+ENGINES = ('pandas', 'duckdb', 'polars')
+# Statistics each scaling method needs, as computed by the lazy engines.
+SCALE_STATISTICS = {'standard': ('mean', 'std'), 'minmax': ('min', 'max'), 'robust': ('median', 'q1', 'q3')}
+_NUMERIC_TYPES = ('TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT', 'UTINYINT', 'USMALLINT', 'UINTEGER',
+                  'UBIGINT', 'UHUGEINT', 'FLOAT', 'DOUBLE', 'DECIMAL')
+
+def is_parquet(path):
+    """Whether ``path`` names a Parquet file; any other file is read and written as CSV."""
+    return os.path.splitext(strip_compression_extension(path))[1].lower() == '.parquet'
+
+def _check_strategy(strategy):
+    if strategy not in ('mean', 'median', 'mode'):
+        raise ValueError("Unsupported strategy. Choose 'mean', 'median', or 'mode'.")
+
+def _check_scaling(method):
+    if method not in SCALE_STATISTICS:
+        raise ValueError("Unsupported scaling method. Choose 'standard', 'minmax', or 'robust'.")
+
+def _scale_parameters(method, statistics):
+    """Return the ``(offset, divisor)`` of a scaler from its statistics, matching the scikit-learn scalers."""
+    if method == 'standard':
+        offset, divisor = statistics['mean'], statistics['std']
+    elif method == 'minmax':
+        offset = statistics['min']
+        divisor = None if offset is None else statistics['max'] - offset
+    else:
+        offset = statistics['median']
+        divisor = None if offset is None else statistics['q3'] - statistics['q1']
+    # Like scikit-learn, a constant column is shifted but not divided
+    return offset, divisor if divisor else 1.0
+
+class Engine:
+    """
+    Cleaning, scaling and filtering of a data file, written to another file.
+
+    Files ending in .parquet are read and written as Parquet, other files as
+    CSV (optionally gzip, bz2 or zstd compressed). Every engine gives the
+    same results as the pandas functions of ``data_cleaner``; the 'duckdb'
+    and 'polars' engines run them as multi-threaded queries over the file
+    instead of loading it into a DataFrame first.
+    """
+
+    name = None
+
+    def clean(self, input_file, output_file, strategy='mean', columns=None):
+        """Fill missing values in ``columns`` (all columns if None) with their 'mean', 'median' or 'mode'."""
+        raise NotImplementedError
+
+    def remove_outliers(self, input_file, output_file, column, multiplier=1.5):
+        """
+        Drop the rows whose ``column`` is outside the IQR fences.
+
+        Returns:
+            int: Number of rows removed.
+        """
+        raise NotImplementedError
+
+    def scale(self, input_file, output_file, columns=None, method='standard'):
+        """Scale ``columns`` (the numeric columns if None) with the 'standard', 'minmax' or 'robust' method."""
+        raise NotImplementedError
+
+    def filter(self, input_file, output_file, expression):
+        """
+        Keep the rows matching ``expression``, a condition such as ``"age > 30 and city in ('Paris', 'Oslo')"``.
+
+        The expression (see ``filtering.parse_expression``) is checked against the
+        column types of the file and means the same on every engine.
+
+        Returns:
+            int: Number of rows kept.
+        """
+        raise NotImplementedError
+
+class PandasEngine(Engine):
+    """
+    Engine loading the file into a pandas DataFrame and using ``data_cleaner``.
+
+    ``filter`` does not load the whole file: CSV input is filtered one chunk
+    at a time, and the expression is pushed down into the Parquet reader.
+
+    Parameters:
+        chunksize (int): Rows per chunk when filtering CSV input.
+    """
+
+    name = 'pandas'
+
+    def __init__(self, chunksize=100000):
+        self.chunksize = chunksize
+
+    def _read(self, path):
+        with stage('load'):
+            return pd.read_parquet(path) if is_parquet(path) else load_csv(path)
+
+    def _write(self, df, path):
+        with stage('write'):
+            if is_parquet(path):
+                df.to_parquet(path, index=False)
+            else:
+                save_csv(df, path)
+
+    def clean(self, input_file, output_file, strategy='mean', columns=None):
+        _check_strategy(strategy)
+        df = self._read(input_file)
+        with stage('compute'):
+            df = clean_data(df, strategy=strategy, columns=None if columns is None else list(columns))
+        self._write(df, output_file)
+
+    def remove_outliers(self, input_file, output_file, column, multiplier=1.5):
+        df = self._read(input_file)
+        with stage('compute'):
+            df, removed = remove_outliers(df, column=column, method='IQR', multiplier=multiplier)
+        self._write(df, output_file)
+        return removed
+
+    def scale(self, input_file, output_file, columns=None, method='standard'):
+        _check_scaling(method)
+        df = self._read(input_file)
+        with stage('compute'):
+            df = scale_features(df, columns=None if columns is None else list(columns), method=method)
+        self._write(df, output_file)
+
+    def filter(self, input_file, output_file, expression):
+        expression = parse_expression(expression)
+        if is_parquet(input_file):
+            with stage('load'):
+                df = load_parquet(input_file, where=expression)
+            self._write(df, output_file)
+            return len(df)
+        with stage('compute'):
+            chunks = (filter_frame(chunk, expression) for chunk in iter_csv(input_file, chunksize=self.chunksize))
+            if not is_parquet(output_file):
+                return save_chunks(chunks, output_file)
+            df = pd.concat(list(chunks), ignore_index=True)
+        self._write(df, output_file)
+        return len(df)
+
+def _duckdb():
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError("The 'duckdb' engine requires the duckdb package (pip install duckdb).") from e
+    return duckdb
+
+def _identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _string(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+def _number(value):
+    # A bare literal such as 2.5 is a DECIMAL in DuckDB
+    return 'NULL::DOUBLE' if value is None else f"{float(value)!r}::DOUBLE"
+
+def _literal(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, pd.Timestamp):
+        return f"{'TIMESTAMP' if value.tz is None else 'TIMESTAMPTZ'} {_string(value.isoformat(sep=' '))}"
+    if isinstance(value, str):
+        return _string(value)
+    return str(value) if isinstance(value, int) else _number(value)
+
+def _sql_kind(type_name):
+    """Return the filter expression kind of a DuckDB column type (see ``filtering.Expression.check``)."""
+    if type_name == 'BOOLEAN':
+        return 'bool'
+    if type_name.startswith(_NUMERIC_TYPES):
+        return 'number'
+    if type_name == 'VARCHAR':
+        return 'string'
+    if type_name.startswith(('TIMESTAMP', 'DATE')):
+        return 'datetime'
+    return None
+
+class DuckDBEngine(Engine):
+    """
+    Engine running each operation as a SQL query of an in-memory DuckDB database over the file.
+
+    DuckDB scans CSV and Parquet files in parallel and streams the result of
+    ``COPY (query) TO file`` without materializing the table. The statistics
+    an operation needs (means, quantiles, ...) are computed by one aggregate
+    query first.
+
+    Parameters:
+        threads (int): Worker threads; DuckDB's default (the number of CPUs) if None.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, threads=None):
+        self._connection = _duckdb().connect()
+        if threads:
+            self._connection.execute(f"SET threads = {int(threads)}")
+
+    def _source(self, path):
+        if is_parquet(path):
+            return f"read_parquet({_string(path)})"
+        return f"read_csv({_string(path)}, header = true)"
+
+    def _describe(self, path):
+        return self._connection.execute(f"DESCRIBE SELECT * FROM {self._source(path)}").fetchall()
+
+    def _columns(self, path, numeric=False):
+        return [name for name, kind, *_ in self._describe(path) if not numeric or kind.startswith(_NUMERIC_TYPES)]
+
+    def _statistics(self, path, requests):
+        """Compute ``(column, statistic)`` pairs in one scan; returns their values in order."""
+        functions = {
+            'mean': 'avg({})', 'median': 'quantile_cont({}, 0.5)', 'std': 'stddev_pop({})', 'min': 'min({})',
+            'max': 'max({})', 'q1': 'quantile_cont({}, 0.25)', 'q3': 'quantile_cont({}, 0.75)', 'count': 'count(*)',
+        }
+        select = ', '.join(functions[statistic].format(_identifier(column)) for column, statistic in requests)
+        return self._connection.execute(f"SELECT {select} FROM {self._source(path)}").fetchone()
+
+    def _copy(self, input_file, output_file, replace=None, where=None):
+        """Write ``SELECT * REPLACE (...) FROM input WHERE ...`` to ``output_file``; returns the number of rows."""
+        select = '*'
+        if replace:
+            select += ' REPLACE (' + ', '.join(f"{expression} AS {_identifier(column)}"
+                                               for column, expression in replace.items()) + ')'
+        query = f"SELECT {select} FROM {self._source(input_file)}"
+        if where is not None:
+            query += f" WHERE {where}"
+        options = '(FORMAT parquet)' if is_parquet(output_file) else '(FORMAT csv, HEADER true)'
+        return self._connection.execute(f"COPY ({query}) TO {_string(output_file)} {options}").fetchone()[0]
+
+    def clean(self, input_file, output_file, strategy='mean', columns=None):
+        _check_strategy(strategy)
+        columns = self._columns(input_file) if columns is None else list(columns)
+        replace = {}
+        if strategy == 'mode':
+            for column in columns:
+                # The most frequent value, the smallest one on ties, as pandas' mode().iloc[0]
+                name = _identifier(column)
+                replace[column] = (f"coalesce({name}, (SELECT {name} FROM {self._source(input_file)} "
+                                   f"WHERE {name} IS NOT NULL GROUP BY {name} ORDER BY count(*) DESC, {name} LIMIT 1))")
+        elif columns:
+            values = self._statistics(input_file, [(column, strategy) for column in columns])
+            replace = {column: f"coalesce({_identifier(column)}, {_number(value)})"
+                       for column, value in zip(columns, values)}
+        with stage('compute'):
+            self._copy(input_file, output_file, replace=replace)
+
+    def remove_outliers(self, input_file, output_file, column, multiplier=1.5):
+        with stage('compute'):
+            q1, q3, total = self._statistics(input_file, [(column, 'q1'), (column, 'q3'), (column, 'count')])
+            if q1 is None:
+                bounds = 'NULL AND NULL'  # an empty or all-missing column: no row is kept, as with pandas
+            else:
+                iqr = q3 - q1
+                bounds = f"{_number(q1 - multiplier * iqr)} AND {_number(q3 + multiplier * iqr)}"
+            kept = self._copy(input_file, output_file, where=f"{_identifier(column)} BETWEEN {bounds}")
+        return total - kept
+
+    def scale(self, input_file, output_file, columns=None, method='standard'):
+        _check_scaling(method)
+        columns = self._columns(input_file, numeric=True) if columns is None else list(columns)
+        with stage('compute'):
+            names = SCALE_STATISTICS[method]
+            requests = [(column, name) for column in columns for name in names]
+            values = iter(self._statistics(input_file, requests) if requests else ())
+            replace = {}
+            for column in columns:
+                offset, divisor = _scale_parameters(method, {name: next(values) for name in names})
+                replace[column] = f"({_identifier(column)} - {_number(offset)}) / {_number(divisor)}"
+            self._copy(input_file, output_file, replace=replace)
+
+    def filter(self, input_file, output_file, expression):
+        columns = self._describe(input_file)
+        expression = compile_expression(expression, {name: _sql_kind(kind) for name, kind, *_ in columns})
+        treat_nan_as_null(expression, [name for name, kind, *_ in columns if kind in ('FLOAT', 'DOUBLE')])
+        where = expression.to_sql(_identifier, _literal)
+        with stage('compute'):
+            return self._copy(input_file, output_file, where=where)
+
+def _polars():
+    try:
+        import polars
+    except ImportError as e:
+        raise ImportError("The 'polars' engine requires the polars package (pip install polars).") from e
+    return polars
+
+class PolarsEngine(Engine):
+    """
+    Engine running each operation as a Polars lazy query over the file.
+
+    The query is optimized as a whole (e.g. only the needed columns are
+    aggregated) and executed on all cores; results without a row count are
+    streamed to the output file with ``sink_csv``/``sink_parquet``.
+    """
+
+    name = 'polars'
+
+    def _scan(self, path):
+        pl = _polars()
+        if is_parquet(path):
+            return pl.scan_parquet(path)
+        if detect_compression(path) is not None:
+            with open_compressed(path) as f:
+                return pl.read_csv(f).lazy()
+        return pl.scan_csv(path)
+
+    def _sink(self, frame, path):
+        pl = _polars()
+        if isinstance(frame, pl.LazyFrame) and detect_compression(path) is None:
+            if is_parquet(path):
+                frame.sink_parquet(path)
+            else:
+                frame.sink_csv(path)
+            return
+        if isinstance(frame, pl.LazyFrame):
+            frame = frame.collect()
+        if is_parquet(path):
+            frame.write_parquet(path)
+        elif detect_compression(path) is not None:
+            with open_compressed(path, 'wb') as f:
+                frame.write_csv(f)
+        else:
+            frame.write_csv(path)
+
+    def _columns(self, frame, numeric=False):
+        schema = frame.collect_schema()
+        return [name for name, kind in schema.items() if not numeric or kind.is_numeric()]
+
+    def _kinds(self, frame):
+        """Return the filter expression kind of each column (see ``filtering.Expression.check``)."""
+        pl = _polars()
+        kinds = {}
+        for name, kind in frame.collect_schema().items():
+            if kind == pl.Boolean:
+                kinds[name] = 'bool'
+            elif kind.is_numeric():
+                kinds[name] = 'number'
+            elif kind in (pl.String, pl.Categorical, pl.Enum):
+                kinds[name] = 'string'
+            elif kind.is_temporal() and kind != pl.Duration:
+                kinds[name] = 'datetime'
+            else:
+                kinds[name] = None
+        return kinds
+
+    def _statistic(self, column, statistic):
+        pl = _polars()
+        values = pl.col(column)
+        if statistic == 'mean':
+            return values.mean()
+        if statistic == 'median':
+            return values.median()
+        if statistic == 'mode':
+            # The most frequent value, the smallest one on ties, as pandas' mode().iloc[0]
+            return values.drop_nulls().mode().sort().first()
+        if statistic == 'std':
+            return values.std(ddof=0)
+        if statistic == 'min':
+            return values.min()
+        if statistic == 'max':
+            return values.max()
+        return values.quantile(0.25 if statistic == 'q1' else 0.75, interpolation='linear')
+
+    def clean(self, input_file, output_file, strategy='mean', columns=None):
+        _check_strategy(strategy)
+        pl = _polars()
+        frame = self._scan(input_file)
+        columns = self._columns(frame) if columns is None else list(columns)
+        with stage('compute'):
+            frame = frame.with_columns([pl.col(column).fill_null(self._statistic(column, strategy))
+                                        for column in columns])
+            self._sink(frame, output_file)
+
+    def remove_outliers(self, input_file, output_file, column, multiplier=1.5):
+        pl = _polars()
+        frame = self._scan(input_file)
+        with stage('compute'):
+            q1, q3, total = frame.select(self._statistic(column, 'q1').alias('q1'),
+                                         self._statistic(column, 'q3').alias('q3'), pl.len()).collect().row(0)
+            if q1 is None:
+                kept = frame.clear()
+            else:
+                iqr = q3 - q1
+                kept = frame.filter(pl.col(column).is_between(q1 - multiplier * iqr, q3 + multiplier * iqr))
+            kept = kept.collect()
+            self._sink(kept, output_file)
+        return total - kept.height
+
+    def scale(self, input_file, output_file, columns=None, method='standard'):
+        _check_scaling(method)
+        pl = _polars()
+        frame = self._scan(input_file)
+        columns = self._columns(frame, numeric=True) if columns is None else list(columns)
+        with stage('compute'):
+            names = SCALE_STATISTICS[method]
+            requests = [self._statistic(column, name).alias(str(index))
+                        for index, (column, name) in enumerate((column, name) for column in columns for name in names)]
+            values = iter(frame.select(requests).collect().row(0) if requests else ())
+            expressions = []
+            for column in columns:
+                offset, divisor = _scale_parameters(method, {name: next(values) for name in names})
+                expressions.append((pl.col(column).cast(pl.Float64) - pl.lit(offset, dtype=pl.Float64)) / divisor)
+            self._sink(frame.with_columns(expressions), output_file)
+
+    def filter(self, input_file, output_file, expression):
+        frame = self._scan(input_file)
+        expression = compile_expression(expression, self._kinds(frame))
+        treat_nan_as_null(expression, [name for name, kind in frame.collect_schema().items() if kind.is_float()])
+        condition = expression.to_polars()
+        with stage('compute'):
+            kept = frame.filter(condition).collect()
+            self._sink(kept, output_file)
+        return kept.height
+
+def get_engine(name, **options):
+    """
+    Return the engine named 'pandas', 'duckdb' or 'polars'.
+
+    Parameters:
+        name (str): Engine name.
+        **options: Engine options, e.g. ``chunksize`` for 'pandas' or ``threads`` for 'duckdb'.
+
+    Returns:
+        Engine: The engine.
+    """
+    if name == 'pandas':
+        return PandasEngine(**options)
+    if name == 'duckdb':
+        return DuckDBEngine(**options)
+    if name == 'polars':
+        return PolarsEngine()
+    raise ValueError("Unsupported engine. Choose 'pandas', 'duckdb' or 'polars'.")
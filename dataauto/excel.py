@@ -0,0 +1,173 @@
+# dataauto/excel.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Formats openpyxl reads and writes; others (e.g. .xls, .ods) go through pandas.
+STREAMING_EXTENSIONS = ('.xlsx', '.xlsm')
+
+def is_streamable(path):
+    """Whether ``path`` is a workbook openpyxl can stream (.xlsx or .xlsm)."""
+    return os.path.splitext(str(path))[1].lower() in STREAMING_EXTENSIONS
+
+def _open_workbook(path):
+    from openpyxl import load_workbook
+    # read_only parses rows lazily from the sheet XML instead of building every cell object
+    return load_workbook(path, read_only=True, data_only=True, keep_links=False)
+
+def _worksheet(workbook, sheet_name):
+    if isinstance(sheet_name, int):
+        try:
+            return workbook.worksheets[sheet_name]
+        except IndexError:
+            raise ValueError(f"Worksheet index {sheet_name} is invalid, {len(workbook.worksheets)} worksheets found.")
+    if sheet_name not in workbook.sheetnames:
+        raise ValueError(f"Worksheet named {sheet_name!r} not found.")
+    return workbook[sheet_name]
+
+def _whole_numbers_as_integers(df):
+    for name in df.columns:
+        column = df[name]
+        # Like pd.read_excel, whole numbers stored as floats are read as integers
+        if column.dtype == 'float64' and len(column) and column.notna().all() and (column % 1 == 0).all():
+            df[name] = column.astype('int64')
+    return df
+
+def _frame(rows, columns):
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    for position in np.flatnonzero(df.dtypes == object):
+        # Empty cells are NaN in text columns too, as with pd.read_excel
+        column = df.iloc[:, position]
+        df.iloc[:, position] = column.where(column.notna(), np.nan)
+    return _whole_numbers_as_integers(df)
+
+def iter_sheet(path, sheet_name=0, chunksize=100000):
+    """
+    Iterate over a worksheet in DataFrame chunks, holding one chunk of cells in memory.
+
+    The first row is the header. As with ``pd.read_excel``, blank rows between data rows
+    are read as missing values and trailing blank rows are dropped.
+
+    Parameters:
+        path (str): Path of an .xlsx or .xlsm workbook.
+        sheet_name (str or int): Sheet name or index.
+        chunksize (int): Number of rows per chunk.
+
+    Returns:
+        Iterator[pd.DataFrame]: DataFrame chunks; a single empty frame if the sheet has only a header.
+    """
+    workbook = _open_workbook(path)
+    try:
+        rows = _worksheet(workbook, sheet_name).iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        while header and header[-1] is None:
+            header.pop()
+        if not header:
+            return
+        width = len(header)
+        columns = [f"Unnamed: {index}" if value is None else value for index, value in enumerate(header)]
+        blank = (None,) * width
+        batch = []
+        blanks = 0
+        emitted = False
+        for row in rows:
+            if all(value is None for value in row):
+                # Blank rows count only when data follows them, as pd.read_excel drops trailing ones
+                blanks += 1
+                continue
+            for values in [blank] * blanks + [row[:width] + (None,) * (width - len(row))]:
+                batch.append(values)
+                if len(batch) >= chunksize:
+                    yield _frame(batch, columns)
+                    emitted = True
+                    batch = []
+            blanks = 0
+        if batch or not emitted:
+            yield _frame(batch, columns)
+    finally:
+        workbook.close()
+
+def read_sheet(path, sheet_name=0, chunksize=100000):
+    """Read a whole worksheet into a DataFrame through ``iter_sheet``."""
+    chunks = list(iter_sheet(path, sheet_name, chunksize))
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0]
+    # A chunk with only blanks in a column makes it object; the whole column may be numeric
+    return _whole_numbers_as_integers(pd.concat(chunks, ignore_index=True).infer_objects())
+
+def sheet_names(path):
+    """Return the names of the worksheets of a workbook."""
+    workbook = _open_workbook(path)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+def _read_sheet_job(job):
+    path, name = job
+    return read_sheet(path, name)
+
+def read_sheets(path, names=None, n_jobs=None):
+    """
+    Read several worksheets, in parallel worker processes when ``n_jobs`` > 1.
+
+    Each worker opens the workbook in read-only mode and parses one sheet,
+    so sheets are parsed concurrently (openpyxl parsing is pure Python and
+    does not run in parallel threads).
+
+    Parameters:
+        path (str): Path of an .xlsx or .xlsm workbook.
+        names (list): Sheet names; all sheets if None.
+        n_jobs (int): Number of worker processes; defaults to the number of CPUs.
+
+    Returns:
+        dict: Mapping of sheet name to DataFrame, in workbook order.
+    """
+    names = sheet_names(path) if names is None else list(names)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    jobs = [(path, name) for name in names]
+    if n_jobs <= 1 or len(jobs) < 2:
+        return {name: read_sheet(path, name) for name in names}
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(jobs))) as executor:
+        return dict(zip(names, executor.map(_read_sheet_job, jobs)))
+
+def _rows(df):
+    # openpyxl writes NaN as a number cell; missing values must be empty cells
+    values = df.astype(object).where(df.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+def write_sheets(sheets, path):
+    """
+    Write worksheets with openpyxl's write-only mode, which streams rows to disk.
+
+    Memory stays proportional to one chunk rather than to the workbook:
+    rows are serialized as they are appended instead of being kept as cell
+    objects until the workbook is saved.
+
+    Parameters:
+        sheets (dict): Mapping of sheet name to a DataFrame or an iterable of DataFrame chunks.
+        path (str): Path of the .xlsx file.
+
+    Returns:
+        dict: Number of rows written per sheet.
+    """
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    counts = {}
+    for name, data in sheets.items():
+        worksheet = workbook.create_sheet(title=name)
+        chunks = [data] if isinstance(data, pd.DataFrame) else data
+        counts[name] = 0
+        for index, chunk in enumerate(chunks):
+            if index == 0:
+                worksheet.append(list(chunk.columns))
+            for row in _rows(chunk):
+                worksheet.append(row)
+            counts[name] += len(chunk)
+    workbook.save(path)
+    return counts
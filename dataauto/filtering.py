@@ -0,0 +1,878 @@
+# dataauto/filtering.py
+
+import functools
+import operator
+import re
+
+import numpy as np
+import pandas as pd
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<string>'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*")
+      | (?P<quoted>`(?:[^`]|``)+`)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<op>==|!=|<>|<=|>=|&&|\|\||[=<>+\-*/%(),\[\]&|~!])
+    )""", re.VERBOSE)
+_KEYWORDS = {'and', 'or', 'not', 'in', 'is', 'between', 'null', 'none', 'true', 'false'}
+# Comparison operators, with the spelling each one is normalized to.
+_COMPARISONS = {'==': '==', '=': '==', '!=': '!=', '<>': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
+_COMPARE_FUNCTIONS = {'==': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le, '>': operator.gt,
+                      '>=': operator.ge}
+_ARITHMETIC_FUNCTIONS = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv,
+                         '%': operator.mod}
+_SQL_COMPARISONS = {'==': '=', '!=': '<>'}
+
+class NotPushable(Exception):
+    """Raised when part of an expression has no equivalent in the target reader."""
+
+def _kind(dtype):
+    """Return the kind of values of a pandas dtype: 'number', 'string', 'bool', 'datetime', or None if unknown."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'bool'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'number'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype) or \
+            isinstance(dtype, pd.CategoricalDtype):
+        return 'string'
+    return None
+
+def frame_kinds(df, columns=None):
+    """
+    Return the kind of each column of ``df``, or of the given ``columns`` only (the others have no known kind).
+
+    A float column with only missing values also has no known kind: it may be a chunk
+    of a text column whose values are all missing. An object column holding only
+    booleans and missing values (a CSV boolean column with gaps) is 'bool'.
+    """
+    kinds = {}
+    for name, dtype in df.dtypes.items():
+        if columns is not None and name not in columns:
+            kinds[name] = None
+        elif pd.api.types.is_float_dtype(dtype) and not df[name].notna().any():
+            kinds[name] = None
+        elif pd.api.types.is_object_dtype(dtype) and pd.api.types.infer_dtype(df[name], skipna=True) == 'boolean':
+            kinds[name] = 'bool'
+        else:
+            kinds[name] = _kind(dtype)
+    return kinds
+
+def arrow_kinds(schema):
+    """Return the kind of each field of a pyarrow schema."""
+    import pyarrow as pa
+    kinds = {}
+    for field in schema:
+        kind = field.type
+        if pa.types.is_dictionary(kind):
+            kind = kind.value_type
+        if pa.types.is_boolean(kind):
+            kinds[field.name] = 'bool'
+        elif pa.types.is_integer(kind) or pa.types.is_floating(kind) or pa.types.is_decimal(kind):
+            kinds[field.name] = 'number'
+        elif pa.types.is_timestamp(kind) or pa.types.is_date(kind):
+            kinds[field.name] = 'datetime'
+        elif pa.types.is_string(kind) or pa.types.is_large_string(kind):
+            kinds[field.name] = 'string'
+        else:
+            kinds[field.name] = None
+    return kinds
+
+def _full(value, n):
+    return np.broadcast_to(np.asarray(value, dtype=bool), (n,))
+
+def _take(data, mask):
+    return data[mask] if np.ndim(data) else data
+
+class Expression:
+    """
+    A node of a parsed filter expression.
+
+    Value nodes (columns, literals, arithmetic) evaluate to ``(data, missing)``
+    pairs of arrays; predicates evaluate to ``(true, null)`` masks, following
+    SQL's three-valued logic: a comparison with a missing value is unknown,
+    and only rows where the whole expression is true are kept.
+    """
+
+    def columns(self):
+        """Return the set of column names the expression reads."""
+        return set().union(*(child.columns() for child in self.children()))
+
+    def children(self):
+        return ()
+
+    def check(self, kinds):
+        """
+        Check the types of the expression against the kinds of the columns.
+
+        Parameters:
+            kinds (dict): Mapping of column name to 'number', 'string', 'bool', 'datetime' or None (any kind),
+                or None when the columns are not known (they are then not checked).
+
+        Returns:
+            str: The kind of the expression's value, or None if unknown.
+        """
+        raise NotImplementedError
+
+    def values(self, df):
+        raise TypeError(f"{self} is a condition, not a value.")
+
+    def truth(self, df):
+        """Return the ``(true, null)`` masks of a boolean value."""
+        data, missing = self.values(df)
+        missing = _full(missing, len(df))
+        true = np.asarray(data, dtype=bool) & ~missing if np.ndim(data) else _full(bool(data), len(df)) & ~missing
+        return true, missing
+
+    def to_arrow(self):
+        """Return the equivalent ``pyarrow.compute.Expression``; raises NotPushable if there is none."""
+        raise NotPushable(str(self))
+
+    def to_sql(self, identifier, literal):
+        """Return the equivalent SQL, quoting names with ``identifier`` and rendering values with ``literal``."""
+        raise NotImplementedError
+
+    def to_polars(self):
+        """Return the equivalent Polars expression."""
+        raise NotImplementedError
+
+class Column(Expression):
+
+    def __init__(self, name):
+        self.name = name
+        # Set by ``treat_nan_as_null`` for float columns of engines that tell NaN from null
+        self.nan_is_null = False
+
+    def __str__(self):
+        return self.name if re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', self.name) else \
+            '`' + self.name.replace('`', '``') + '`'
+
+    def columns(self):
+        return {self.name}
+
+    def check(self, kinds):
+        if kinds is None:
+            return None
+        if self.name not in kinds:
+            raise ValueError(f"Unknown column '{self.name}' in filter expression.")
+        return kinds[self.name]
+
+    def values(self, df):
+        series = df[self.name]
+        missing = series.isna().to_numpy()
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype(object)
+        if pd.api.types.is_extension_array_dtype(series.dtype) and pd.api.types.is_numeric_dtype(series.dtype):
+            # Nullable integers and booleans: pd.NA cannot be compared, it is tracked by ``missing`` instead
+            kind = bool if pd.api.types.is_bool_dtype(series.dtype) else float
+            return series.to_numpy(dtype=kind, na_value=kind(0)), missing
+        return series.to_numpy(), missing
+
+    def to_arrow(self):
+        import pyarrow.compute as pc
+        return pc.field(self.name)
+
+    def to_sql(self, identifier, literal):
+        if self.nan_is_null:
+            return f"(CASE WHEN isnan({identifier(self.name)}) THEN NULL ELSE {identifier(self.name)} END)"
+        return identifier(self.name)
+
+    def to_polars(self):
+        import polars as pl
+        return pl.col(self.name).fill_nan(None) if self.nan_is_null else pl.col(self.name)
+
+class Literal(Expression):
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        if self.value is None:
+            return 'null'
+        if isinstance(self.value, bool):
+            return str(self.value).lower()
+        if isinstance(self.value, (str, pd.Timestamp)):
+            return "'" + str(self.value).replace("'", "''") + "'"
+        return repr(self.value)
+
+    def check(self, kinds):
+        if self.value is None:
+            return 'null'
+        if isinstance(self.value, bool):
+            return 'bool'
+        if isinstance(self.value, pd.Timestamp):
+            return 'datetime'
+        return 'string' if isinstance(self.value, str) else 'number'
+
+    def as_datetime(self):
+        """Return this literal as a timestamp, for comparison with a datetime column."""
+        if not isinstance(self.value, str):
+            return self
+        try:
+            return Literal(pd.Timestamp(self.value))
+        except ValueError:
+            raise ValueError(f"Cannot compare a datetime column with {self}, which is not a date.")
+
+    def values(self, df):
+        if isinstance(self.value, pd.Timestamp) and self.value.tz is None:
+            return self.value.to_datetime64(), False
+        return self.value, self.value is None
+
+    def to_arrow(self):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        return pc.scalar(pa.scalar(self.value))
+
+    def to_sql(self, identifier, literal):
+        return literal(self.value)
+
+    def to_polars(self):
+        import polars as pl
+        value = self.value.to_pydatetime() if isinstance(self.value, pd.Timestamp) else self.value
+        return pl.lit(value)
+
+def _check_number(node, kinds):
+    kind = node.check(kinds)
+    if kind not in ('number', None):
+        raise ValueError(f"Arithmetic on {node}, which is not a number.")
+
+class Arithmetic(Expression):
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def __str__(self):
+        return f"({self.left} {self.op} {self.right})"
+
+    def children(self):
+        return (self.left, self.right)
+
+    def check(self, kinds):
+        _check_number(self.left, kinds)
+        _check_number(self.right, kinds)
+        return 'number'
+
+    def values(self, df):
+        left, left_missing = self.left.values(df)
+        right, right_missing = self.right.values(df)
+        with np.errstate(all='ignore'):
+            data = _ARITHMETIC_FUNCTIONS[self.op](left, right)
+        return data, np.logical_or(left_missing, right_missing)
+
+    def to_arrow(self):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        if self.op == '%':
+            raise NotPushable(str(self))
+        left, right = self.left.to_arrow(), self.right.to_arrow()
+        if self.op == '/':
+            # Arrow divides integers with integer division
+            return pc.divide(left.cast(pa.float64()), right.cast(pa.float64()))
+        return {'+': pc.add, '-': pc.subtract, '*': pc.multiply}[self.op](left, right)
+
+    def to_sql(self, identifier, literal):
+        left, right = self.left.to_sql(identifier, literal), self.right.to_sql(identifier, literal)
+        if self.op == '/':
+            # Integer columns are divided exactly, not with the integer division of some databases
+            return f"({left} * 1.0 / {right})"
+        if self.op == '%':
+            # SQL's % truncates toward zero; take the sign of the divisor like NumPy and Polars
+            return f"((({left} % {right}) + {right}) % {right})"
+        return f"({left} {self.op} {right})"
+
+    def to_polars(self):
+        return _ARITHMETIC_FUNCTIONS[self.op](self.left.to_polars(), self.right.to_polars())
+
+class Negate(Expression):
+
+    def __init__(self, operand):
+        self.operand = operand
+
+    def __str__(self):
+        return f"-{self.operand}"
+
+    def children(self):
+        return (self.operand,)
+
+    def check(self, kinds):
+        _check_number(self.operand, kinds)
+        return 'number'
+
+    def values(self, df):
+        data, missing = self.operand.values(df)
+        return -data, missing
+
+    def to_arrow(self):
+        import pyarrow.compute as pc
+        return pc.negate(self.operand.to_arrow())
+
+    def to_sql(self, identifier, literal):
+        return f"(-{self.operand.to_sql(identifier, literal)})"
+
+    def to_polars(self):
+        return -self.operand.to_polars()
+
+def _check_comparable(left, right, kinds):
+    """Check that ``left`` and ``right`` can be compared; returns them with date strings made timestamps."""
+    left_kind, right_kind = left.check(kinds), right.check(kinds)
+    if 'null' in (left_kind, right_kind):
+        raise ValueError("Cannot compare with null; use 'is null' or 'is not null'.")
+    if left_kind == 'datetime' and isinstance(right, Literal):
+        right, right_kind = right.as_datetime(), 'datetime'
+    if right_kind == 'datetime' and isinstance(left, Literal):
+        left, left_kind = left.as_datetime(), 'datetime'
+    if None not in (left_kind, right_kind) and left_kind != right_kind:
+        raise ValueError(f"Cannot compare {left} ({left_kind}) with {right} ({right_kind}).")
+    return left, right
+
+class Compare(Expression):
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def __str__(self):
+        return f"({self.left} {self.op} {self.right})"
+
+    def children(self):
+        return (self.left, self.right)
+
+    def check(self, kinds):
+        self.left, self.right = _check_comparable(self.left, self.right, kinds)
+        return 'bool'
+
+    def truth(self, df):
+        n = len(df)
+        left, left_missing = self.left.values(df)
+        right, right_missing = self.right.values(df)
+        known = ~_full(np.logical_or(left_missing, right_missing), n)
+        compare = _COMPARE_FUNCTIONS[self.op]
+        if not known.any():
+            return np.zeros(n, dtype=bool), ~known
+        if all(np.ndim(data) == 0 or data.dtype != object for data in (left, right)):
+            # Missing numbers are NaN, which compare as False; no need to skip them
+            with np.errstate(invalid='ignore'):
+                true = _full(compare(left, right), n) & known
+        else:
+            true = np.zeros(n, dtype=bool)
+            true[known] = compare(_take(left, known), _take(right, known))
+        return true, ~known
+
+    def to_arrow(self):
+        return _COMPARE_FUNCTIONS[self.op](self.left.to_arrow(), self.right.to_arrow())
+
+    def to_sql(self, identifier, literal):
+        op = _SQL_COMPARISONS.get(self.op, self.op)
+        return f"({self.left.to_sql(identifier, literal)} {op} {self.right.to_sql(identifier, literal)})"
+
+    def to_polars(self):
+        return _COMPARE_FUNCTIONS[self.op](self.left.to_polars(), self.right.to_polars())
+
+class In(Expression):
+
+    def __init__(self, operand, items):
+        self.operand = operand
+        self.items = items
+
+    def __str__(self):
+        return f"({self.operand} in ({', '.join(str(item) for item in self.items)}))"
+
+    def children(self):
+        return (self.operand,)
+
+    def check(self, kinds):
+        items = []
+        for item in self.items:
+            _, item = _check_comparable(self.operand, item, kinds)
+            items.append(item)
+        self.items = items
+        return 'bool'
+
+    def truth(self, df):
+        data, missing = self.operand.values(df)
+        missing = _full(missing, len(df))
+        items = [item.value for item in self.items]
+        if np.ndim(data) == 0:
+            return _full(data in items, len(df)) & ~missing, missing
+        return pd.Series(data, copy=False).isin(items).to_numpy() & ~missing, missing
+
+    def to_arrow(self):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        operand = self.operand.to_arrow()
+        found = pc.is_in(operand, value_set=pa.array([item.value for item in self.items]))
+        # is_in is false for a missing value; it must be unknown, so that 'not in' does not keep it either
+        return pc.if_else(pc.is_null(operand, nan_is_null=True), pc.scalar(pa.scalar(None, pa.bool_())), found)
+
+    def to_sql(self, identifier, literal):
+        items = ', '.join(item.to_sql(identifier, literal) for item in self.items)
+        return f"({self.operand.to_sql(identifier, literal)} IN ({items}))"
+
+    def to_polars(self):
+        import polars as pl
+        operand = self.operand.to_polars()
+        items = [item.to_polars() for item in self.items]
+        found = functools.reduce(operator.or_, [operand == item for item in items])
+        return pl.when(operand.is_null()).then(None).otherwise(found)
+
+class IsNull(Expression):
+
+    def __init__(self, operand, negated=False):
+        self.operand = operand
+        self.negated = negated
+
+    def __str__(self):
+        return f"({self.operand} is {'not ' if self.negated else ''}null)"
+
+    def children(self):
+        return (self.operand,)
+
+    def check(self, kinds):
+        self.operand.check(kinds)
+        return 'bool'
+
+    def truth(self, df):
+        _, missing = self.operand.values(df)
+        missing = _full(missing, len(df))
+        return (~missing if self.negated else missing.copy()), np.zeros(len(df), dtype=bool)
+
+    def to_arrow(self):
+        import pyarrow.compute as pc
+        missing = pc.is_null(self.operand.to_arrow(), nan_is_null=True)
+        return ~missing if self.negated else missing
+
+    def to_sql(self, identifier, literal):
+        return f"({self.operand.to_sql(identifier, literal)} IS {'NOT ' if self.negated else ''}NULL)"
+
+    def to_polars(self):
+        operand = self.operand.to_polars()
+        return operand.is_not_null() if self.negated else operand.is_null()
+
+def _check_condition(node, kinds):
+    kind = node.check(kinds)
+    if kind not in ('bool', None):
+        raise ValueError(f"{node} is not a condition; compare it with a value.")
+
+class Not(Expression):
+
+    def __init__(self, operand):
+        self.operand = operand
+
+    def __str__(self):
+        return f"(not {self.operand})"
+
+    def children(self):
+        return (self.operand,)
+
+    def check(self, kinds):
+        _check_condition(self.operand, kinds)
+        return 'bool'
+
+    def truth(self, df):
+        true, null = self.operand.truth(df)
+        return ~true & ~null, null
+
+    def to_arrow(self):
+        return ~self.operand.to_arrow()
+
+    def to_sql(self, identifier, literal):
+        return f"(NOT {self.operand.to_sql(identifier, literal)})"
+
+    def to_polars(self):
+        return ~self.operand.to_polars()
+
+class And(Expression):
+
+    def __init__(self, operands):
+        self.operands = operands
+
+    def __str__(self):
+        return '(' + ' and '.join(str(operand) for operand in self.operands) + ')'
+
+    def children(self):
+        return tuple(self.operands)
+
+    def check(self, kinds):
+        for operand in self.operands:
+            _check_condition(operand, kinds)
+        return 'bool'
+
+    def truth(self, df):
+        true, null = self.operands[0].truth(df)
+        for operand in self.operands[1:]:
+            # Rows already false are settled; the others take the other operand into account
+            other_true, other_null = operand.truth(df)
+            false = (~true & ~null) | (~other_true & ~other_null)
+            true = true & other_true
+            null = ~true & ~false
+        return true, null
+
+    def to_arrow(self):
+        return functools.reduce(operator.and_, [operand.to_arrow() for operand in self.operands])
+
+    def to_sql(self, identifier, literal):
+        return '(' + ' AND '.join(operand.to_sql(identifier, literal) for operand in self.operands) + ')'
+
+    def to_polars(self):
+        return functools.reduce(operator.and_, [operand.to_polars() for operand in self.operands])
+
+class Or(Expression):
+
+    def __init__(self, operands):
+        self.operands = operands
+
+    def __str__(self):
+        return '(' + ' or '.join(str(operand) for operand in self.operands) + ')'
+
+    def children(self):
+        return tuple(self.operands)
+
+    def check(self, kinds):
+        for operand in self.operands:
+            _check_condition(operand, kinds)
+        return 'bool'
+
+    def truth(self, df):
+        true, null = self.operands[0].truth(df)
+        for operand in self.operands[1:]:
+            other_true, other_null = operand.truth(df)
+            true = true | other_true
+            null = ~true & (null | other_null)
+        return true, null
+
+    def to_arrow(self):
+        return functools.reduce(operator.or_, [operand.to_arrow() for operand in self.operands])
+
+    def to_sql(self, identifier, literal):
+        return '(' + ' OR '.join(operand.to_sql(identifier, literal) for operand in self.operands) + ')'
+
+    def to_polars(self):
+        return functools.reduce(operator.or_, [operand.to_polars() for operand in self.operands])
+
+def _unescape(text):
+    quote = text[0]
+    return re.sub(r"\\(.)|" + quote * 2, lambda match: match.group(1) or quote, text[1:-1])
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise ValueError(f"Invalid filter expression: unexpected {text[position:].strip()[:20]!r}.")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'number':
+            value = float(value) if any(c in value for c in '.eE') else int(value)
+        elif kind == 'string':
+            value = _unescape(value)
+        elif kind == 'quoted':
+            kind, value = 'name', value[1:-1].replace('``', '`')
+        elif kind == 'name' and value.lower() in _KEYWORDS:
+            kind, value = 'keyword', value.lower()
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+class _Parser:
+    """Recursive descent parser of the filter grammar, from the loosest binding operator ('or') down."""
+
+    def __init__(self, text):
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def peek(self, *accepted):
+        if self.position < len(self.tokens):
+            token = self.tokens[self.position]
+            if token[1] in accepted and token[0] in ('op', 'keyword'):
+                return token[1]
+        return None
+
+    def take(self, *accepted):
+        value = self.peek(*accepted)
+        if value is not None:
+            self.position += 1
+        return value
+
+    def expect(self, *accepted):
+        value = self.take(*accepted)
+        if value is None:
+            found = self.tokens[self.position][1] if self.position < len(self.tokens) else 'the end'
+            raise ValueError(f"Invalid filter expression: expected {' or '.join(map(repr, accepted))}, "
+                             f"found {found!r}.")
+        return value
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Invalid filter expression: the expression is empty.")
+        expression = self.disjunction()
+        if self.position < len(self.tokens):
+            raise ValueError(f"Invalid filter expression: unexpected {self.tokens[self.position][1]!r}.")
+        return expression
+
+    def disjunction(self):
+        operands = [self.conjunction()]
+        while self.take('or', '|', '||'):
+            operands.append(self.conjunction())
+        return operands[0] if len(operands) == 1 else Or(operands)
+
+    def conjunction(self):
+        operands = [self.negation()]
+        while self.take('and', '&', '&&'):
+            operands.append(self.negation())
+        return operands[0] if len(operands) == 1 else And(operands)
+
+    def negation(self):
+        if self.take('not', '~', '!'):
+            return Not(self.negation())
+        return self.predicate()
+
+    def predicate(self):
+        left = self.sum()
+        if self.peek(*_COMPARISONS):
+            # Chained comparisons, as in '0 < x <= 10', compare each pair
+            comparisons = []
+            while self.peek(*_COMPARISONS):
+                op = _COMPARISONS[self.take(*_COMPARISONS)]
+                right = self.sum()
+                comparisons.append(Compare(op, left, right))
+                left = right
+            return comparisons[0] if len(comparisons) == 1 else And(comparisons)
+        if self.take('is'):
+            negated = bool(self.take('not'))
+            self.expect('null', 'none')
+            return IsNull(left, negated)
+        negated = bool(self.take('not'))
+        if self.take('in'):
+            closing = ')' if self.expect('(', '[') == '(' else ']'
+            items = [self.item()]
+            while self.take(','):
+                items.append(self.item())
+            self.expect(closing)
+            result = In(left, items)
+        elif self.take('between'):
+            low = self.sum()
+            self.expect('and', '&', '&&')
+            result = And([Compare('>=', left, low), Compare('<=', left, self.sum())])
+        elif negated:
+            raise ValueError("Invalid filter expression: expected 'in' or 'between' after 'not'.")
+        else:
+            return left
+        return Not(result) if negated else result
+
+    def item(self):
+        item = self.unary()
+        if not isinstance(item, Literal) or item.value is None:
+            raise ValueError(f"Invalid filter expression: {item} in a list; lists hold numbers, strings "
+                             "or true/false.")
+        return item
+
+    def sum(self):
+        left = self.product()
+        while self.peek('+', '-'):
+            left = Arithmetic(self.take('+', '-'), left, self.product())
+        return left
+
+    def product(self):
+        left = self.unary()
+        while self.peek('*', '/', '%'):
+            left = Arithmetic(self.take('*', '/', '%'), left, self.unary())
+        return left
+
+    def unary(self):
+        if self.take('-'):
+            operand = self.unary()
+            if isinstance(operand, Literal) and isinstance(operand.value, (int, float)) and \
+                    not isinstance(operand.value, bool):
+                return Literal(-operand.value)
+            return Negate(operand)
+        if self.take('+'):
+            return self.unary()
+        return self.primary()
+
+    def primary(self):
+        if self.position >= len(self.tokens):
+            raise ValueError("Invalid filter expression: unexpected end of the expression.")
+        kind, value = self.tokens[self.position]
+        self.position += 1
+        if kind in ('number', 'string'):
+            return Literal(value)
+        if kind == 'name':
+            return Column(value)
+        if kind == 'keyword' and value in ('true', 'false'):
+            return Literal(value == 'true')
+        if kind == 'keyword' and value in ('null', 'none'):
+            return Literal(None)
+        if value == '(':
+            expression = self.disjunction()
+            self.expect(')')
+            return expression
+        raise ValueError(f"Invalid filter expression: unexpected {value!r}.")
+
+def parse_expression(text):
+    """
+    Parse a filter expression into a tree of ``Expression`` nodes.
+
+    The grammar is a small subset of SQL and of ``DataFrame.query``:
+
+    - comparisons ``==`` (or ``=``), ``!=`` (or ``<>``), ``<``, ``<=``, ``>``, ``>=``, chained as in ``0 < x < 1``
+    - ``x in (1, 2)``, ``x not in ('a', 'b')``, ``x between 1 and 5``, ``x is null``, ``x is not null``
+    - arithmetic with ``+``, ``-``, ``*``, ``/`` and ``%``
+    - ``and``, ``or`` and ``not`` (or ``&``, ``|`` and ``~``), and parentheses
+    - numbers, strings in single or double quotes, ``true``, ``false`` and ``null``
+    - column names, in backticks if they are not identifiers (``\\`unit price\\` > 3``)
+
+    Parameters:
+        text (str): The expression, e.g. ``"age > 30 and city in ('Paris', 'Oslo')"``.
+
+    Returns:
+        Expression: The root of the tree.
+    """
+    if isinstance(text, Expression):
+        return text
+    return _Parser(text).parse()
+
+def compile_expression(expression, kinds=None):
+    """
+    Parse ``expression`` if needed and check its types.
+
+    Parameters:
+        expression: An expression string or a parsed ``Expression``.
+        kinds (dict): Kind of each column (see ``Expression.check``), or None to skip the checks.
+
+    Returns:
+        Expression: The checked expression, with strings compared to datetime columns converted to timestamps.
+    """
+    expression = parse_expression(expression)
+    _check_condition(expression, kinds)
+    return expression
+
+def treat_nan_as_null(expression, columns):
+    """
+    Make ``to_sql`` and ``to_polars`` read NaN in ``columns`` as a missing value.
+
+    pandas cannot tell NaN from null in a float column, so the expression means
+    the same on every reader only if the others treat NaN as null too. Pass the
+    float columns only: the translation keeps readers from using statistics to
+    skip data, and ``to_sql`` uses DuckDB's ``isnan``.
+
+    Parameters:
+        expression (Expression): A parsed expression.
+        columns (Iterable): Names of the float columns.
+
+    Returns:
+        Expression: ``expression``, changed in place.
+    """
+    columns = set(columns)
+    nodes = [expression]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, Column):
+            node.nan_is_null = node.name in columns
+        nodes.extend(node.children())
+    return expression
+
+def filter_mask(df, expression):
+    """
+    Evaluate a filter expression on a DataFrame.
+
+    Every node is one vectorized NumPy operation over whole columns, and the
+    expression is evaluated in a single pass over the tree.
+
+    Parameters:
+        df (pd.DataFrame): The data.
+        expression: An expression string or a parsed ``Expression``.
+
+    Returns:
+        np.ndarray: Boolean mask of the rows where the expression is true.
+    """
+    expression = parse_expression(expression)
+    expression = compile_expression(expression, frame_kinds(df, expression.columns()))
+    true, _ = expression.truth(df)
+    return true
+
+def filter_frame(df, expression):
+    """
+    Return the rows of ``df`` matching a filter expression (see ``parse_expression``).
+
+    As in SQL, a comparison with a missing value is neither true nor false,
+    so rows where the condition is unknown are dropped, with or without 'not'.
+
+    Parameters:
+        df (pd.DataFrame): The data.
+        expression: An expression string or a parsed ``Expression``.
+
+    Returns:
+        pd.DataFrame: The matching rows, with their original index.
+    """
+    return df[filter_mask(df, expression)]
+
+def split_conjuncts(expression):
+    """Return the operands of a top-level 'and', or the expression itself."""
+    return list(expression.operands) if isinstance(expression, And) else [expression]
+
+def arrow_filter(expression, schema):
+    """
+    Split a filter expression into a part a pyarrow reader can apply and the rest.
+
+    Each operand of a top-level 'and' is pushed down if it has a pyarrow
+    equivalent, so a Parquet reader can skip row groups and rows while
+    scanning; the remaining operands are evaluated on the DataFrame.
+    Operands reading a float column are never pushed down: Parquet files may
+    store NaN, which pandas treats as missing but Arrow compares as a number,
+    and Parquet statistics leave NaN out, so even a NaN-aware pyarrow
+    expression would skip row groups holding NaN.
+
+    Parameters:
+        expression: An expression string or a parsed ``Expression``.
+        schema (pyarrow.Schema): Schema of the data, used to check the expression's types.
+
+    Returns:
+        tuple: ``(pushed, remaining)``: a ``pyarrow.compute.Expression`` or None, and an ``Expression`` or None.
+    """
+    import pyarrow as pa
+    expression = compile_expression(expression, arrow_kinds(schema))
+    floats = {field.name for field in schema if pa.types.is_floating(field.type)}
+    pushed, remaining = None, []
+    for conjunct in split_conjuncts(expression):
+        try:
+            if conjunct.columns() & floats:
+                raise NotPushable(str(conjunct))
+            converted = conjunct.to_arrow()
+        except NotPushable:
+            remaining.append(conjunct)
+            continue
+        pushed = converted if pushed is None else pushed & converted
+    if not remaining:
+        return pushed, None
+    return pushed, remaining[0] if len(remaining) == 1 else And(remaining)
+
+def sql_where(expression, identifier):
+    """
+    Translate a filter expression into a SQL condition with bound parameters.
+
+    Parameters:
+        expression: An expression string or a parsed ``Expression``.
+        identifier (callable): Quotes a column name for the database, e.g. a dialect's
+            ``identifier_preparer.quote``.
+
+    Returns:
+        tuple: ``(condition, parameters)``, with values as ``:f0``, ``:f1``, ... placeholders.
+    """
+    expression = compile_expression(expression)
+    parameters = {}
+
+    def literal(value):
+        if value is None:
+            return 'NULL'
+        name = f"f{len(parameters)}"
+        parameters[name] = value.to_pydatetime() if isinstance(value, pd.Timestamp) else value
+        return f":{name}"
+
+    return expression.to_sql(identifier, literal), parameters
@@ -0,0 +1,344 @@
+# dataauto/html_report.py
+
+import json
+import math
+import sys
+import numpy as np
+import pandas as pd
+from jinja2 import Environment
+from markupsafe import Markup
+from dataauto.data_profiler import DataProfile, PROFILE_STATS
+from dataauto.correlation import StreamingCorrelation, plot_subset, top_correlations
+from dataauto.instrumentation import stage
+from dataauto.sampling import SampleSummary
+
+HISTOGRAM_BINS = 30
+# Quantiles embedded for every numeric column (deciles).
+QUANTILES = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+SIGNIFICANT_DIGITS = 5
+
+# The page embeds the aggregated data once as JSON and a single script draws
+# every chart as inline SVG the first time its section scrolls into view.
+TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{{ title }}</title>
+<style>
+body { font-family: Helvetica, Arial, sans-serif; margin: 0 auto; max-width: 1000px; padding: 0 16px; color: #222; }
+h1 { text-align: center; }
+.meta { text-align: center; color: #666; }
+nav { columns: 4; font-size: 13px; margin: 16px 0; }
+nav a { display: block; color: #4c72b0; text-decoration: none; }
+section { border-top: 1px solid #ddd; padding: 12px 0; min-height: 220px; display: flex; gap: 24px; flex-wrap: wrap; }
+section h2 { width: 100%; margin: 0; font-size: 18px; }
+table { border-collapse: collapse; font-size: 12px; font-family: monospace; }
+td { padding: 1px 8px; border-bottom: 1px solid #f0f0f0; }
+td:first-child { color: #666; }
+.chart { flex: 1; min-width: 420px; }
+svg text { font-size: 10px; fill: #444; }
+</style>
+</head>
+<body>
+<h1>{{ title }}</h1>
+<p class="meta">{{ "{:,}".format(rows) }} rows, {{ columns|length }} columns{% if sample %}
+(estimated from a sample of {{ "{:,}".format(sample.rows) }} rows, {{ "{:.0%}".format(sample.confidence) }} confidence intervals){% endif %}</p>
+<nav>{% for name in columns %}<a href="#col-{{ loop.index0 }}">{{ name }}</a>{% endfor %}</nav>
+{% if has_correlation %}<section id="correlation" data-kind="correlation"><h2>Correlations</h2></section>{% endif %}
+{% for name in columns %}<section id="col-{{ loop.index0 }}" data-kind="column" data-index="{{ loop.index0 }}"><h2>{{ name }}</h2></section>
+{% endfor %}
+<script type="application/json" id="report-data">{{ data }}</script>
+<script>
+(function () {
+  var DATA = JSON.parse(document.getElementById('report-data').textContent);
+  var NS = 'http://www.w3.org/2000/svg';
+
+  function el(tag, attrs, parent) {
+    var node = document.createElementNS(NS, tag);
+    for (var key in attrs) node.setAttribute(key, attrs[key]);
+    if (parent) parent.appendChild(node);
+    return node;
+  }
+  function text(parent, x, y, value, anchor) {
+    var node = el('text', {x: x, y: y, 'text-anchor': anchor || 'start'}, parent);
+    node.textContent = value;
+    return node;
+  }
+  function fmt(value) {
+    if (value === null || value === undefined) return '';
+    if (typeof value === 'number') return Math.abs(value) >= 1e6 || (value !== 0 && Math.abs(value) < 1e-3) ? value.toExponential(3) : String(+value.toPrecision(6));
+    return String(value);
+  }
+  function statsTable(stats) {
+    var table = document.createElement('table');
+    DATA.stats.forEach(function (name, i) {
+      if (stats[i] === null) return;
+      var row = table.insertRow();
+      row.insertCell().textContent = name;
+      row.insertCell().textContent = fmt(stats[i]);
+    });
+    return table;
+  }
+  function intervalsTable(intervals) {
+    var table = document.createElement('table');
+    intervals.forEach(function (interval) {
+      var row = table.insertRow();
+      row.insertCell().textContent = interval[0];
+      row.insertCell().textContent = fmt(interval[1]);
+      row.insertCell().textContent = '[' + fmt(interval[2]) + ', ' + fmt(interval[3]) + ']';
+    });
+    return table;
+  }
+  function histogram(parent, column) {
+    var w = 440, h = 200, pad = 30, edges = column.edges, counts = column.counts;
+    var svg = el('svg', {width: w, height: h + 40}, parent);
+    var max = Math.max.apply(null, counts) || 1, lo = edges[0], hi = edges[edges.length - 1], span = (hi - lo) || 1;
+    var x = function (v) { return pad + (v - lo) / span * (w - 2 * pad); };
+    counts.forEach(function (count, i) {
+      var bh = count / max * h;
+      el('rect', {x: x(edges[i]), y: h - bh, width: Math.max(x(edges[i + 1]) - x(edges[i]) - 1, 1), height: bh, fill: '#4c72b0'}, svg);
+    });
+    var q = column.quantiles;
+    if (q) {
+      // Box from the quartiles, whiskers from the 10th to 90th percentile
+      var y = h + 20;
+      el('line', {x1: x(q[0]), x2: x(q[8]), y1: y, y2: y, stroke: '#444'}, svg);
+      el('rect', {x: x(column.box[0]), y: y - 7, width: x(column.box[2]) - x(column.box[0]), height: 14, fill: '#fff', stroke: '#444'}, svg);
+      el('line', {x1: x(q[4]), x2: x(q[4]), y1: y - 7, y2: y + 7, stroke: '#dd8452', 'stroke-width': 2}, svg);
+    }
+    text(svg, pad, h + 38, fmt(lo));
+    text(svg, w - pad, h + 38, fmt(hi), 'end');
+  }
+  function bars(parent, column) {
+    var w = 440, rowH = 18, h = column.labels.length * rowH, pad = 120;
+    var svg = el('svg', {width: w, height: h}, parent);
+    var max = Math.max.apply(null, column.counts) || 1;
+    column.labels.forEach(function (label, i) {
+      el('rect', {x: pad, y: i * rowH + 2, width: column.counts[i] / max * (w - pad - 50), height: rowH - 4, fill: '#4c72b0'}, svg);
+      text(svg, pad - 4, i * rowH + 13, String(label).slice(0, 20), 'end');
+      text(svg, pad + column.counts[i] / max * (w - pad - 50) + 4, i * rowH + 13, fmt(column.counts[i]));
+    });
+  }
+  function color(r) {
+    if (r === null) return '#eee';
+    var t = Math.min(Math.abs(r), 1), c = r < 0 ? [59, 76, 192] : [180, 4, 38];
+    return 'rgb(' + c.map(function (v) { return Math.round(255 - (255 - v) * t); }).join(',') + ')';
+  }
+  function heatmap(parent) {
+    var corr = DATA.correlation, n = corr.columns.length, cell = Math.max(8, Math.min(24, Math.floor(600 / n))), pad = 110;
+    var svg = el('svg', {width: pad + n * cell + 10, height: pad + n * cell + 10}, parent);
+    corr.columns.forEach(function (name, i) {
+      text(svg, pad - 4, pad + i * cell + cell * 0.7, String(name).slice(0, 18), 'end');
+      var label = text(svg, 0, 0, String(name).slice(0, 18));
+      label.setAttribute('transform', 'translate(' + (pad + i * cell + cell * 0.7) + ',' + (pad - 4) + ') rotate(-60)');
+      corr.values[i].forEach(function (r, j) {
+        var rect = el('rect', {x: pad + j * cell, y: pad + i * cell, width: cell, height: cell, fill: color(r)}, svg);
+        el('title', {}, rect).textContent = name + ' ~ ' + corr.columns[j] + ': ' + fmt(r);
+      });
+    });
+    if (corr.top.length) {
+      var list = document.createElement('table');
+      corr.top.forEach(function (pair) {
+        var row = list.insertRow();
+        row.insertCell().textContent = pair[0] + ' ~ ' + pair[1];
+        row.insertCell().textContent = fmt(pair[2]);
+      });
+      parent.appendChild(list);
+    }
+  }
+  function render(section) {
+    if (section.dataset.kind === 'correlation') return heatmap(section);
+    var column = DATA.columns[+section.dataset.index];
+    section.appendChild(statsTable(column.stats));
+    if (column.intervals) section.appendChild(intervalsTable(column.intervals));
+    var chart = document.createElement('div');
+    chart.className = 'chart';
+    section.appendChild(chart);
+    if (column.edges) histogram(chart, column);
+    else if (column.labels) bars(chart, column);
+  }
+
+  var sections = document.querySelectorAll('section[data-kind]');
+  if (!('IntersectionObserver' in window)) {
+    sections.forEach(render);
+    return;
+  }
+  var observer = new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      if (entry.isIntersecting) {
+        observer.unobserve(entry.target);
+        render(entry.target);
+      }
+    });
+  }, {rootMargin: '200px'});
+  sections.forEach(function (section) { observer.observe(section); });
+})();
+</script>
+</body>
+</html>
+"""
+
+def _compact(value):
+    """Convert a statistic to a JSON value rounded to SIGNIFICANT_DIGITS."""
+    if value is None:
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        if not math.isfinite(value):
+            return None
+        return float(f"{value:.{SIGNIFICANT_DIGITS}g}")
+    if pd.isna(value):
+        return None
+    return str(value)
+
+def build_report_data(chunks, max_heatmap_columns=50, top_values=10):
+    """
+    Aggregate a dataset into the data embedded in the HTML report, in one pass.
+
+    Only summaries are kept: per-column statistics, an approximate histogram
+    and deciles from the quantile sketch, the most frequent values of
+    non-numeric columns and a (reduced) correlation matrix. Their size
+    depends on the number of columns only, not on the number of rows.
+
+    Parameters:
+        chunks (Iterable[pd.DataFrame]): DataFrame chunks, e.g. from ``data_loader.iter_chunks``.
+        max_heatmap_columns (int): Maximum number of columns in the embedded correlation matrix.
+        top_values (int): Number of frequent values embedded for non-numeric columns.
+
+    Returns:
+        dict: JSON-serializable report data.
+    """
+    profile = DataProfile()
+    correlation = None
+    for chunk in chunks:
+        profile.update(chunk)
+        if correlation is None:
+            correlation = StreamingCorrelation(profile.numeric_columns())
+        # Columns that turned out to hold text in this chunk leave the correlation
+        correlation.retain(profile.numeric_columns()).update(chunk)
+    return report_data(profile, correlation, max_heatmap_columns=max_heatmap_columns, top_values=top_values)
+
+def report_data(profile, correlation=None, max_heatmap_columns=50, top_values=10):
+    """
+    Build the data embedded in the HTML report from an existing profile.
+
+    Parameters:
+        profile (DataProfile): Profile of the dataset.
+        correlation (StreamingCorrelation): Correlation accumulators of the numeric columns, if available.
+        max_heatmap_columns (int): Maximum number of columns in the embedded correlation matrix.
+        top_values (int): Number of frequent values embedded for non-numeric columns.
+
+    Returns:
+        dict: JSON-serializable report data.
+    """
+    columns = []
+    for name, column in profile.columns.items():
+        summary = column.summary()
+        entry = {'name': str(name), 'stats': [_compact(summary.get(stat)) for stat in PROFILE_STATS]}
+        if column.numeric and column.count:
+            counts, edges = column.quantiles.histogram(HISTOGRAM_BINS, range=(column.min, column.max))
+            entry['counts'] = [int(round(count)) for count in counts]
+            entry['edges'] = [_compact(edge) for edge in edges]
+            entry['quantiles'] = [_compact(q) for q in column.quantiles.quantiles(QUANTILES)]
+            entry['box'] = [_compact(summary[stat]) for stat in ['25%', '50%', '75%']]
+        elif not column.numeric:
+            top = column.top.top(top_values)
+            entry['labels'] = [str(value) for value, _ in top]
+            entry['counts'] = [int(count) for _, count in top]
+        columns.append(entry)
+
+    data = {'rows': profile.rows, 'stats': PROFILE_STATS, 'columns': columns, 'correlation': None}
+    if correlation is not None and len(correlation.columns) >= 2:
+        full_corr = correlation.correlation()
+        corr = plot_subset(full_corr, max_columns=max_heatmap_columns)
+        data['correlation'] = {
+            'columns': [str(name) for name in corr.columns],
+            'values': [[_compact(value) for value in row] for row in corr.to_numpy()],
+            'top': [[str(row.column_1), str(row.column_2), _compact(row.correlation)]
+                    for row in top_correlations(full_corr, k=20).itertuples(index=False)],
+        }
+    return data
+
+def add_sample_intervals(data, summary):
+    """
+    Add the confidence intervals of a sample to report data built from its rows.
+
+    Parameters:
+        data (dict): Report data built from ``summary.sample``.
+        summary (SampleSummary): The sample the data was built from.
+
+    Returns:
+        dict: The report data, with an 'intervals' entry per column and the estimated row count.
+    """
+    intervals = summary.intervals()
+    for column in data['columns']:
+        name = next(key for key in summary.sample.columns if str(key) == column['name'])
+        column['intervals'] = [[statistic, _compact(row.estimate), _compact(row.lower), _compact(row.upper)]
+                               for statistic, row in intervals.loc[name].iterrows()]
+    data['sample'] = {'rows': len(summary.sample), 'confidence': summary.confidence}
+    data['rows'] = int(round(summary.total_rows))
+    return data
+
+def render_html_report(data, title='DataAuto Report'):
+    """
+    Render report data from ``build_report_data`` to a self-contained HTML page.
+
+    Parameters:
+        data (dict): Report data.
+        title (str): Page title.
+
+    Returns:
+        str: The HTML document.
+    """
+    payload = json.dumps(data, separators=(',', ':'), allow_nan=False)
+    # Keep the JSON from closing the script element it is embedded in
+    payload = payload.replace('</', '<\\/')
+    template = Environment(autoescape=True).from_string(TEMPLATE)
+    return template.render(
+        title=title,
+        rows=data['rows'],
+        columns=[column['name'] for column in data['columns']],
+        has_correlation=data['correlation'] is not None,
+        sample=data.get('sample'),
+        data=Markup(payload),
+    )
+
+def generate_html_report(chunks, output_report='data_report.html', max_heatmap_columns=50, state=None):
+    """
+    Generate a self-contained HTML report from DataFrame chunks.
+
+    Parameters:
+        chunks (Iterable[pd.DataFrame] or pd.DataFrame or SampleSummary): DataFrame chunks, a whole DataFrame,
+            or a sample whose confidence intervals are shown next to every column.
+        output_report (str): Path to save the HTML report.
+        max_heatmap_columns (int): Maximum number of columns in the correlation heatmap.
+        state (ProfileState): Stored profile to report on instead of reading ``chunks``.
+
+    Returns:
+        None
+    """
+    try:
+        with stage('aggregate'):
+            if state is not None:
+                data = report_data(state.profile, state.correlation, max_heatmap_columns=max_heatmap_columns)
+            elif isinstance(chunks, SampleSummary):
+                data = add_sample_intervals(build_report_data([chunks.sample], max_heatmap_columns=max_heatmap_columns),
+                                            chunks)
+            else:
+                if isinstance(chunks, pd.DataFrame):
+                    df = chunks
+                    chunks = (df.iloc[start:start + 100000] for start in range(0, max(len(df), 1), 100000))
+                data = build_report_data(chunks, max_heatmap_columns=max_heatmap_columns)
+        with stage('render'):
+            html = render_html_report(data)
+        with stage('write'):
+            with open(output_report, 'w', encoding='utf-8') as f:
+                f.write(html)
+        print(f"HTML report generated successfully and saved to {output_report}.")
+
+    except Exception as e:
+        print(f"Error generating HTML report: {e}")
+        sys.exit(1)
@@ -0,0 +1,192 @@
+# dataauto/incremental.py
+
+import hashlib
+import io
+import json
+import os
+import pandas as pd
+from dataauto.data_profiler import DataProfile
+from dataauto.correlation import StreamingCorrelation
+
+STATE_VERSION = 1
+# Bytes at the start of the file hashed to detect that it was replaced or rewritten.
+HEAD_BYTES = 65536
+
+class _BoundedReader(io.RawIOBase):
+    """Read at most ``remaining`` bytes from a binary file object."""
+
+    def __init__(self, f, remaining):
+        self.f = f
+        self.remaining = remaining
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self.remaining)
+        if size <= 0:
+            return 0
+        data = self.f.read(size)
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+def _complete_lines_end(f, size):
+    """Return the offset just past the last newline before ``size`` (0 if there is none)."""
+    position = size
+    while position > 0:
+        start = max(0, position - 65536)
+        f.seek(start)
+        block = f.read(position - start)
+        index = block.rfind(b'\n')
+        if index != -1:
+            return start + index + 1
+        position = start
+    return 0
+
+def _head_digest(f, length):
+    f.seek(0)
+    return hashlib.sha256(f.read(length)).hexdigest()
+
+class ProfileState:
+    """
+    Mergeable profile of an append-only file and the byte offset it covers.
+
+    Parameters:
+        profile (DataProfile): Profile of the rows up to ``offset``.
+        correlation (StreamingCorrelation): Correlation accumulators, or None if not tracked.
+        offset (int): Byte offset just past the last line that was processed.
+        header (str): CSV header line, or None for JSON lines files.
+        head_sha256 (str): Digest of the first ``min(offset, HEAD_BYTES)`` bytes of the file.
+    """
+
+    def __init__(self, profile=None, correlation=None, offset=0, header=None, head_sha256=None):
+        self.profile = profile if profile is not None else DataProfile()
+        self.correlation = correlation
+        self.offset = offset
+        self.header = header
+        self.head_sha256 = head_sha256
+        self.rows_added = 0
+
+    def to_dict(self):
+        """Return the state as a JSON-serializable dict."""
+        return {
+            'version': STATE_VERSION,
+            'offset': self.offset,
+            'header': self.header,
+            'head_sha256': self.head_sha256,
+            'profile': self.profile.to_dict(),
+            'correlation': self.correlation.to_dict() if self.correlation is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Restore a ProfileState saved with ``to_dict``."""
+        correlation = state.get('correlation')
+        return cls(
+            profile=DataProfile.from_dict(state['profile']),
+            correlation=StreamingCorrelation.from_dict(correlation) if correlation else None,
+            offset=state['offset'],
+            header=state['header'],
+            head_sha256=state['head_sha256'],
+        )
+
+    def save(self, state_file):
+        """Write the state to ``state_file`` atomically."""
+        temporary = f"{state_file}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temporary, state_file)
+
+    @classmethod
+    def load(cls, state_file):
+        """Load a state file, or return None if it does not exist or is from another version."""
+        if not os.path.exists(state_file):
+            return None
+        with open(state_file) as f:
+            state = json.load(f)
+        if state.get('version') != STATE_VERSION:
+            return None
+        return cls.from_dict(state)
+
+def _align_types(chunk, profile):
+    """Cast columns that the stored profile treats as non-numeric to strings, like a full read would."""
+    for name, column in profile.columns.items():
+        if name in chunk.columns and not column.numeric and pd.api.types.is_numeric_dtype(chunk[name]):
+            chunk[name] = chunk[name].astype(object).where(chunk[name].isna(), chunk[name].astype(str))
+    return chunk
+
+def _read_new_chunks(f, start, end, format, header, chunksize):
+    """Parse the complete lines between byte offsets ``start`` and ``end`` in chunks."""
+    f.seek(start)
+    reader = io.TextIOWrapper(io.BufferedReader(_BoundedReader(f, end - start)), encoding='utf-8')
+    if format == 'csv':
+        names = pd.read_csv(io.StringIO(header), nrows=0).columns
+        chunks = pd.read_csv(reader, header=None, names=names, chunksize=chunksize)
+    elif format == 'json':
+        chunks = pd.read_json(reader, lines=True, chunksize=chunksize)
+    else:
+        raise ValueError("Unsupported format for incremental profiling. Choose 'csv' or 'json'.")
+    with chunks:
+        for chunk in chunks:
+            yield chunk
+
+def update_profile_state(file_path, state_file, format='csv', chunksize=100000, correlation=False):
+    """
+    Bring the stored profile of an append-only file up to date.
+
+    Only the complete lines appended since the previous run are parsed and
+    merged into the stored state; a partially written last line is left for
+    the next run. If the file was truncated, replaced or its header changed,
+    the profile is rebuilt from the start.
+
+    Parameters:
+        file_path (str): Path to the CSV or JSON lines file.
+        state_file (str): Path of the JSON state file (created if missing).
+        format (str): Format of the input file ('csv' or 'json').
+        chunksize (int): Number of rows parsed at a time.
+        correlation (bool): Also maintain the correlation accumulators of the numeric columns.
+
+    Returns:
+        ProfileState: The updated state; ``rows_added`` holds the number of new rows.
+    """
+    state = ProfileState.load(state_file)
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        header = None
+        if format == 'csv':
+            f.seek(0)
+            header = f.readline().decode('utf-8')
+            if not header.endswith('\n'):
+                raise ValueError("The CSV file has no complete header line yet.")
+
+        if state is not None:
+            unchanged = (
+                size >= state.offset
+                and state.header == header
+                and _head_digest(f, min(state.offset, HEAD_BYTES)) == state.head_sha256
+                and (state.correlation is not None or not correlation)
+            )
+            if not unchanged:
+                state = None
+        if state is None:
+            start = len(header.encode('utf-8')) if header is not None else 0
+            state = ProfileState(offset=start, header=header)
+        start = state.offset
+
+        end = _complete_lines_end(f, size)
+        if end > start:
+            for chunk in _read_new_chunks(f, start, end, format, header, chunksize):
+                chunk = _align_types(chunk, state.profile)
+                state.profile.update(chunk)
+                if correlation:
+                    if state.correlation is None:
+                        state.correlation = StreamingCorrelation(state.profile.numeric_columns())
+                    # Columns that turned out to hold text in this chunk leave the correlation
+                    state.correlation.retain(state.profile.numeric_columns()).update(chunk)
+                state.rows_added += len(chunk)
+            state.offset = end
+        state.head_sha256 = _head_digest(f, min(state.offset, HEAD_BYTES))
+
+    state.save(state_file)
+    return state
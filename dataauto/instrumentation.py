@@ -0,0 +1,211 @@
+# dataauto/instrumentation.py
+
+import cProfile
+import json
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Profiler that library functions report their stages to, set by StageProfiler.__enter__.
+_active_profiler = None
+
+def stage(name):
+    """
+    Record a named stage on the active StageProfiler.
+
+    Library functions wrap their expensive steps with ``with stage('fit'):``;
+    when no profiler is active this is a no-op.
+
+    Parameters:
+        name (str): Stage name.
+
+    Returns:
+        A context manager.
+    """
+    if _active_profiler is None:
+        return nullcontext()
+    return _active_profiler.stage(name)
+
+def max_rss_bytes():
+    """Return the peak resident set size of the current process in bytes."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+def reset_peak_rss():
+    """
+    Reset the peak resident set size of the current process, where supported (Linux).
+
+    Returns:
+        bool: Whether the peak was reset; if not, ``peak_rss_bytes`` reports the lifetime peak.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def peak_rss_bytes():
+    """Return the peak resident set size since the last ``reset_peak_rss`` (or process start) in bytes."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return max_rss_bytes()
+
+class StageProfiler:
+    """
+    Record wall time, CPU time and peak traced memory for named stages.
+
+    Use as a context manager to make it the active profiler for ``stage()``
+    calls made by library code; stages may be nested and are recorded with
+    '/'-separated names (e.g. 'train/fit'). A profiler entered while another
+    one is active also reports its stages to the outer profiler, under the
+    outer profiler's current stage.
+
+    Parameters:
+        track_memory (bool): Trace Python allocations with tracemalloc to report peak memory per stage.
+        profile_stages (iterable): Stage names to run under cProfile.
+        profile_output (str): Path to write the cProfile stats of ``profile_stages`` (or of everything) to.
+        profile_all (bool): Run everything between ``__enter__`` and ``__exit__`` under cProfile.
+    """
+
+    def __init__(self, track_memory=True, profile_stages=(), profile_output=None, profile_all=False):
+        self.track_memory = track_memory
+        self.profile_stages = set(profile_stages)
+        self.profile_output = profile_output
+        self.profile_all = profile_all
+        self.stages = []
+        self._stack = []
+        self._cprofile = None
+        self._started_tracemalloc = False
+        self._previous = None
+        self._start = time.perf_counter()
+
+    def __enter__(self):
+        global _active_profiler
+        self._previous = _active_profiler
+        _active_profiler = self
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._start = time.perf_counter()
+        if self.profile_all:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _active_profiler
+        _active_profiler = self._previous
+        self.total_wall_time = time.perf_counter() - self._start
+        if self.profile_all:
+            self._cprofile.disable()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if self._cprofile is not None and self.profile_output:
+            self._cprofile.dump_stats(self.profile_output)
+        return False
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage ``name``."""
+        path = '/'.join([frame['name'] for frame in self._stack] + [name])
+        tracing = self.track_memory and tracemalloc.is_tracing()
+        frame = {'name': name, 'child_peak': 0}
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            # The peak is about to be reset, so hand it to the enclosing stages first
+            self._note_peak(peak)
+            tracemalloc.reset_peak()
+            frame['baseline'] = current
+        profile = name in self.profile_stages and not self.profile_all
+        if profile:
+            if self._cprofile is None:
+                self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+        self._stack.append(frame)
+        started = time.perf_counter() - self._start
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - self._start - started
+            cpu_time = time.process_time() - cpu_start
+            self._stack.pop()
+            if profile:
+                self._cprofile.disable()
+            record = {'name': path, 'start': started, 'wall_time': wall_time, 'cpu_time': cpu_time,
+                      'max_rss_bytes': peak_rss_bytes()}
+            if tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                stage_peak = max(peak - frame['baseline'], frame['child_peak'])
+                record['peak_memory_bytes'] = stage_peak
+                self._note_peak(stage_peak + frame['baseline'])
+            self.stages.append(record)
+            if self._previous is not None:
+                self._previous._adopt(record, self._start)
+
+    def _note_peak(self, level):
+        """Raise the child peak of the current stage (and of enclosing profilers' stages) to ``level`` bytes."""
+        profiler = self
+        while profiler is not None:
+            if profiler._stack and 'baseline' in profiler._stack[-1]:
+                parent = profiler._stack[-1]
+                parent['child_peak'] = max(parent['child_peak'], level - parent['baseline'])
+            profiler = profiler._previous
+
+    def _adopt(self, record, start):
+        """Record a stage of a nested profiler that started ``start`` (perf_counter) under the current stage."""
+        prefix = '/'.join(frame['name'] for frame in self._stack)
+        record = dict(record, name=f"{prefix}/{record['name']}" if prefix else record['name'],
+                      start=record['start'] + start - self._start)
+        self.stages.append(record)
+        if self._previous is not None:
+            self._previous._adopt(record, self._start)
+
+    def format_table(self):
+        """
+        Return the recorded stages as a text table in the order they started, nested stages indented.
+
+        Returns:
+            str: One line per stage with wall time, CPU time, peak traced memory and peak RSS.
+        """
+        rows = [('stage', 'wall s', 'cpu s', 'peak MB', 'rss MB')]
+        for record in sorted(self.stages, key=lambda record: (record['start'], record['name'].count('/'))):
+            depth = record['name'].count('/')
+            peak = record.get('peak_memory_bytes')
+            rows.append((
+                '  ' * depth + record['name'].rsplit('/', 1)[-1],
+                f"{record['wall_time']:.3f}",
+                f"{record['cpu_time']:.3f}",
+                f"{peak / 1024 ** 2:.1f}" if peak is not None else '-',
+                f"{record['max_rss_bytes'] / 1024 ** 2:.1f}",
+            ))
+        width = max(len(row[0]) for row in rows)
+        lines = [f"{row[0]:<{width}}  {row[1]:>8}  {row[2]:>8}  {row[3]:>8}  {row[4]:>8}" for row in rows]
+        total = getattr(self, 'total_wall_time', None)
+        if total is not None:
+            lines.append(f"{'total':<{width}}  {total:>8.3f}")
+        return '\n'.join(lines)
+
+    def to_dict(self):
+        """Return the recorded stages as a JSON-serializable dict."""
+        return {
+            'stages': self.stages,
+            'total_wall_time': getattr(self, 'total_wall_time', None),
+            'max_rss_bytes': max_rss_bytes(),
+        }
+
+    def write_json(self, output_file):
+        """Write the recorded stages to a JSON file."""
+        with open(output_file, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,182 @@
+# dataauto/model_store.py
+
+import json
+import os
+import platform
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from dataauto import __version__
+
+METADATA_SUFFIX = '.meta.json'
+
+# Model loaded once per worker process by _init_predict_worker.
+_worker_model = None
+
+def metadata_path(model_path):
+    """Return the path of the metadata sidecar for a model artifact."""
+    return f"{model_path}{METADATA_SUFFIX}"
+
+def build_model_metadata(model, X=None, target=None, model_type=None, training_time=None):
+    """
+    Collect descriptive metadata about a trained model.
+
+    Parameters:
+        model: Trained model or pipeline.
+        X (pd.DataFrame): Feature DataFrame the model was trained on.
+        target (str): Target column name.
+        model_type (str): Type of model ('regressor' or 'classifier').
+        training_time (float): Training wall time in seconds.
+
+    Returns:
+        dict: JSON-serializable metadata.
+    """
+    import sklearn
+
+    metadata = {
+        'dataauto_version': __version__,
+        'sklearn_version': sklearn.__version__,
+        'python_version': platform.python_version(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'model_class': type(model).__name__,
+        'model_type': model_type,
+        'target': target,
+        'training_time_seconds': training_time,
+    }
+    if X is not None:
+        metadata['feature_names'] = [str(col) for col in X.columns]
+        metadata['feature_dtypes'] = {str(col): str(dtype) for col, dtype in X.dtypes.items()}
+        metadata['n_training_rows'] = int(X.shape[0])
+    elif hasattr(model, 'feature_names_in_'):
+        metadata['feature_names'] = [str(col) for col in model.feature_names_in_]
+    return metadata
+
+def save_model(model, output_model, compress=0, metadata=None):
+    """
+    Save a trained model and write a JSON metadata sidecar next to it.
+
+    With ``compress=0`` (the default) numpy arrays are stored uncompressed so the
+    artifact can be opened with ``load_model(mmap_mode='r')``; any other level
+    trades load speed and memory mapping for a smaller file.
+
+    Parameters:
+        model: Trained model or pipeline.
+        output_model (str): Path to save the model to.
+        compress (int): Joblib compression level (0-9).
+        metadata (dict): Extra metadata to store in the sidecar.
+
+    Returns:
+        dict: The metadata written to the sidecar.
+    """
+    if not 0 <= compress <= 9:
+        raise ValueError("Compression level must be between 0 and 9.")
+
+    joblib.dump(model, output_model, compress=compress)
+
+    metadata = dict(metadata or {})
+    metadata['compress'] = compress
+    metadata['mmap_compatible'] = compress == 0
+    metadata['file_size_bytes'] = os.path.getsize(output_model)
+    with open(metadata_path(output_model), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return metadata
+
+def load_model_metadata(model_path):
+    """
+    Load the metadata sidecar of a model artifact.
+
+    Parameters:
+        model_path (str): Path to the saved model.
+
+    Returns:
+        dict: The stored metadata, or an empty dict if there is no sidecar.
+    """
+    path = metadata_path(model_path)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def load_model(model_path, mmap_mode='r'):
+    """
+    Load a saved model, memory-mapping its arrays when possible.
+
+    Memory-mapped arrays are backed by the OS page cache, so every process that
+    loads the same artifact shares a single copy of them. Note that scikit-learn
+    copies decision tree node arrays into its own buffers when unpickling, so
+    only plain numpy attributes (scaler statistics, coefficients, ...) stay
+    mapped. Compressed artifacts cannot be memory-mapped and are loaded into
+    memory instead.
+
+    Parameters:
+        model_path (str): Path to the saved model.
+        mmap_mode (str): Memory-map mode passed to joblib, or None to load fully.
+
+    Returns:
+        The loaded model.
+    """
+    if mmap_mode is not None and load_model_metadata(model_path).get('mmap_compatible') is False:
+        mmap_mode = None
+    return joblib.load(model_path, mmap_mode=mmap_mode)
+
+def select_features(df, metadata):
+    """
+    Select and order the columns a model was trained on.
+
+    Parameters:
+        df (pd.DataFrame): Input data.
+        metadata (dict): Model metadata as returned by ``load_model_metadata``.
+
+    Returns:
+        pd.DataFrame: The feature columns in training order.
+    """
+    feature_names = metadata.get('feature_names')
+    if not feature_names:
+        return df
+    missing = [col for col in feature_names if col not in df.columns]
+    if missing:
+        raise ValueError(f"Input data is missing feature columns: {', '.join(missing)}")
+    return df[feature_names]
+
+def _init_predict_worker(model_path):
+    global _worker_model
+    _worker_model = load_model(model_path, mmap_mode='r')
+
+def _predict_chunk(X):
+    return _worker_model.predict(X)
+
+def predict(model_path, df, n_jobs=1, chunksize=10000):
+    """
+    Predict with a saved model, optionally across several processes.
+
+    Each worker process loads the artifact itself with ``mmap_mode='r'`` instead
+    of receiving a pickled copy of the model for every chunk.
+
+    Parameters:
+        model_path (str): Path to the saved model.
+        df (pd.DataFrame): Input data.
+        n_jobs (int): Number of worker processes.
+        chunksize (int): Number of rows sent to a worker at a time.
+
+    Returns:
+        np.ndarray: Predictions.
+    """
+    X = select_features(df, load_model_metadata(model_path))
+    if n_jobs <= 1 or len(X) <= chunksize:
+        return load_model(model_path, mmap_mode='r').predict(X)
+
+    chunks = [X.iloc[start:start + chunksize] for start in range(0, len(X), chunksize)]
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_predict_worker,
+                             initargs=(model_path,)) as executor:
+        results = list(executor.map(_predict_chunk, chunks))
+    return np.concatenate(results)
+
+def predictions_frame(df, predictions, column='prediction'):
+    """Return a copy of ``df`` with a predictions column appended."""
+    result = df.copy()
+    result[column] = pd.Series(predictions, index=df.index)
+    return result
@@ -3,17 +3,42 @@
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from sklearn.linear_model import SGDRegressor, SGDClassifier
+from sklearn.naive_bayes import GaussianNB
 from sklearn.metrics import mean_squared_error, r2_score, classification_report
 from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.preprocessing import StandardScaler
+from dataauto.data_loader import iter_chunks
+from dataauto.instrumentation import stage
+from dataauto.preprocessing import (
+    HASHING_MIN_CARDINALITY, categorical_encoding_plan, categorical_transformers, encoding_for_cardinality
+)
+import numpy as np
+import pandas as pd
 import sys
 
-def preprocess_features(X):
+# Estimators supporting partial_fit, usable by train_model_incremental.
+INCREMENTAL_ESTIMATORS = {
+    'regressor': {
+        'sgd': lambda random_state: SGDRegressor(random_state=random_state),
+    },
+    'classifier': {
+        'sgd': lambda random_state: SGDClassifier(random_state=random_state),
+        'naive_bayes': lambda random_state: GaussianNB(),
+    },
+}
+
+def preprocess_features(X, **policy):
     """
     Preprocess features by handling numerical and categorical variables.
 
+    Categorical columns are one-hot, frequency/target or hash encoded depending
+    on their measured cardinality (see ``preprocessing.encoding_for_cardinality``),
+    and sparse encodings are kept sparse so wide data is never densified.
+
     Parameters:
         X (pd.DataFrame): Features.
+        **policy: Keyword arguments forwarded to ``encoding_for_cardinality``.
 
     Returns:
         ColumnTransformer: Preprocessing pipeline.
@@ -25,15 +50,10 @@ def preprocess_features(X):
         ('scaler', StandardScaler())
     ])
 
-    categorical_transformer = Pipeline(steps=[
-        ('onehot', OneHotEncoder(handle_unknown='ignore'))
-    ])
-
+    plan = categorical_encoding_plan(X, categorical_features, **policy)
     preprocessor = ColumnTransformer(
-        transformers=[
-            ('num', numeric_transformer, numeric_features),
-            ('cat', categorical_transformer, categorical_features)
-        ]
+        transformers=[('num', numeric_transformer, numeric_features)] + categorical_transformers(plan),
+        sparse_threshold=1.0
     )
 
     return preprocessor
@@ -62,7 +82,8 @@ def train_model(df, target, model_type='regressor', test_size=0.2, random_state=
         y = df[target]
 
         # Preprocess features
-        preprocessor = preprocess_features(X)
+        with stage('encoding_plan'):
+            preprocessor = preprocess_features(X)
 
         # Select and instantiate the model
         if model_type.lower() == "regressor":
@@ -79,23 +100,198 @@ def train_model(df, target, model_type='regressor', test_size=0.2, random_state=
             raise ValueError("Unsupported model type. Choose 'regressor' or 'classifier'.")
 
         # Split the data
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state)
+        with stage('split'):
+            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state)
 
-        # Fit the model
-        model.fit(X_train, y_train)
+        # Fit the model, timing the preprocessing and the estimator separately
+        with stage('preprocess'):
+            X_train_transformed = preprocessor.fit_transform(X_train, y_train)
+        with stage('fit'):
+            model.steps[-1][1].fit(X_train_transformed, y_train)
 
         # Evaluate the model
-        if model_type.lower() == "regressor":
-            predictions = model.predict(X_test)
-            mse = mean_squared_error(y_test, predictions)
-            r2 = r2_score(y_test, predictions)
-            report = f"Mean Squared Error (MSE): {mse}\nR^2 Score: {r2}\n"
-        else:
-            predictions = model.predict(X_test)
-            report = classification_report(y_test, predictions, zero_division=0)
+        report = evaluate_model(model, X_test, y_test, model_type)
 
         return model, report
 
     except Exception as e:
         print(f"Error during model training: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+def evaluate_model(model, X_test, y_test, model_type='regressor'):
+    """
+    Evaluate a trained model on held-out data.
+
+    Parameters:
+        model (Pipeline): Trained model pipeline.
+        X_test (pd.DataFrame): Held-out features.
+        y_test (pd.Series): Held-out target.
+        model_type (str): Type of model ('regressor' or 'classifier').
+
+    Returns:
+        str: Evaluation report.
+    """
+    with stage('predict'):
+        predictions = model.predict(X_test)
+    with stage('metrics'):
+        if model_type.lower() == "regressor":
+            mse = mean_squared_error(y_test, predictions)
+            r2 = r2_score(y_test, predictions)
+            return f"Mean Squared Error (MSE): {mse}\nR^2 Score: {r2}\n"
+        return classification_report(y_test, predictions, zero_division=0)
+
+def _split_chunks(chunks, target, test_size, random_state, text_columns=()):
+    """
+    Yield (X_train, y_train, X_holdout, y_holdout) for each chunk.
+
+    The holdout masks are drawn from a generator seeded with ``random_state``,
+    so every pass over the same chunks produces the same split. Numbers in
+    ``text_columns`` are turned into their text, like the values read from
+    the chunks where those columns hold text.
+    """
+    rng = np.random.default_rng(random_state)
+    for chunk in chunks:
+        if target not in chunk.columns:
+            raise ValueError(f"Target column '{target}' does not exist in the dataset.")
+        holdout = rng.random(len(chunk)) < test_size
+        X = chunk.drop(columns=[target])
+        for col in text_columns:
+            if pd.api.types.is_numeric_dtype(X[col]):
+                X[col] = X[col].astype(object).where(X[col].isna(), X[col].astype(str))
+        y = chunk[target]
+        yield X[~holdout], y[~holdout], X[holdout], y[holdout]
+
+class _TextInNumericColumns(Exception):
+    """Raised by the first pass when columns typed as numeric by the first chunk hold text in a later one."""
+
+    def __init__(self, columns):
+        super().__init__(', '.join(map(str, columns)))
+        self.columns = set(columns)
+
+def _streaming_statistics(splits, model_type, max_holdout_rows, text_columns=()):
+    """Collect the statistics of the first pass of train_model_incremental."""
+    numeric_features = categorical_features = None
+    scaler = StandardScaler()
+    counts = {}
+    classes = set()
+    first_chunk = None
+    holdout_X, holdout_y, holdout_rows = [], [], 0
+    for X_train, y_train, X_holdout, y_holdout in splits:
+        if numeric_features is None:
+            numeric_features = [col for col in X_train.select_dtypes(include=['int64', 'float64']).columns
+                                if col not in text_columns]
+            categorical_features = [col for col in X_train.columns if col in text_columns or col in
+                                    X_train.select_dtypes(include=['object', 'category']).columns]
+            counts = {col: pd.Series(dtype='int64') for col in categorical_features}
+        # A column missing from the whole first chunk is float there, whatever it holds later
+        promoted = [col for col in numeric_features if not pd.api.types.is_numeric_dtype(X_train[col])]
+        if promoted:
+            raise _TextInNumericColumns(promoted)
+        if len(X_train):
+            if first_chunk is None:
+                first_chunk = X_train
+            if numeric_features:
+                scaler.partial_fit(X_train[numeric_features])
+            for col in categorical_features:
+                # Stop counting once a column is known to be hashed
+                if counts[col] is not None:
+                    counts[col] = counts[col].add(X_train[col].value_counts(), fill_value=0)
+                    if len(counts[col]) > HASHING_MIN_CARDINALITY:
+                        counts[col] = None
+            if model_type == 'classifier':
+                classes.update(y_train.dropna().unique())
+        if holdout_rows < max_holdout_rows and len(X_holdout):
+            keep = max_holdout_rows - holdout_rows
+            holdout_X.append(X_holdout.iloc[:keep])
+            holdout_y.append(y_holdout.iloc[:keep])
+            holdout_rows += len(holdout_X[-1])
+    return numeric_features, categorical_features, scaler, counts, classes, first_chunk, holdout_X, holdout_y
+
+def train_model_incremental(file_path, target, model_type='regressor', estimator='sgd', file_format='csv',
+                            chunksize=100000, test_size=0.2, random_state=42, max_holdout_rows=100000):
+    """
+    Train a model out-of-core by streaming the input file in chunks.
+
+    The file is read twice. The first pass fits the scaling statistics, the
+    value counts of every categorical column (which decide its encoding, see
+    ``preprocessing.encoding_for_cardinality``) and the target classes; the second
+    pass trains a ``partial_fit``-capable estimator chunk by chunk. A random
+    sample of rows (up to ``max_holdout_rows``) is held out from both passes
+    for evaluation. Only one chunk is held in memory at a time.
+
+    Parameters:
+        file_path (str): Path to the input file.
+        target (str): Target column name.
+        model_type (str): Type of model to train ('regressor' or 'classifier').
+        estimator (str): Incremental estimator ('sgd', or 'naive_bayes' for classifiers).
+        file_format (str): Format of the input file ('csv' or 'json').
+        chunksize (int): Number of rows per chunk.
+        test_size (float): Proportion of rows to hold out for evaluation.
+        random_state (int): Random state for reproducibility.
+        max_holdout_rows (int): Maximum number of held-out rows kept in memory.
+
+    Returns:
+        Pipeline: Trained model pipeline.
+        str: Evaluation report.
+    """
+    model_type = model_type.lower()
+    if model_type not in INCREMENTAL_ESTIMATORS:
+        raise ValueError("Unsupported model type. Choose 'regressor' or 'classifier'.")
+    if estimator not in INCREMENTAL_ESTIMATORS[model_type]:
+        choices = ', '.join(f"'{name}'" for name in INCREMENTAL_ESTIMATORS[model_type])
+        raise ValueError(f"Unsupported incremental {model_type}. Choose from {choices}.")
+
+    text_columns = set()
+
+    def passes():
+        return _split_chunks(iter_chunks(file_path, file_format, chunksize), target, test_size, random_state,
+                             text_columns)
+
+    # First pass: preprocessing statistics, category counts and target classes. It starts over, treating
+    # them as categorical, when columns that looked numeric turn out to hold text.
+    with stage('first_pass'):
+        while True:
+            try:
+                (numeric_features, categorical_features, scaler, counts, classes, first_chunk,
+                 holdout_X, holdout_y) = _streaming_statistics(passes(), model_type, max_holdout_rows, text_columns)
+                break
+            except _TextInNumericColumns as e:
+                text_columns |= e.columns
+
+    if first_chunk is None:
+        raise ValueError("No training rows found in the dataset.")
+
+    plan = {col: 'hashing' if counts[col] is None else encoding_for_cardinality(len(counts[col]))
+            for col in categorical_features}
+    dense = estimator == 'naive_bayes'
+    preprocessor = ColumnTransformer(
+        transformers=[('num', StandardScaler(), numeric_features)] + categorical_transformers(
+            plan, categories={col: counts[col].index for col in categorical_features if counts[col] is not None},
+            dense=dense),
+        sparse_threshold=0 if dense else 1.0
+    )
+    preprocessor.fit(first_chunk)
+    # Replace the statistics of the first chunk with those of the full pass
+    if numeric_features:
+        fitted_scaler = preprocessor.named_transformers_['num']
+        for attr in ('mean_', 'var_', 'scale_', 'n_samples_seen_'):
+            setattr(fitted_scaler, attr, getattr(scaler, attr))
+    if 'freq' in preprocessor.named_transformers_:
+        preprocessor.named_transformers_['freq'].frequencies_ = {
+            col: (counts[col] / counts[col].sum()).to_dict() for col in preprocessor.named_transformers_['freq'].frequencies_
+        }
+
+    # Second pass: incremental training
+    model = INCREMENTAL_ESTIMATORS[model_type][estimator](random_state)
+    fit_params = {'classes': np.array(sorted(classes, key=str))} if model_type == 'classifier' else {}
+    with stage('second_pass'):
+        for X_train, y_train, _, _ in passes():
+            if len(X_train):
+                model.partial_fit(preprocessor.transform(X_train), y_train, **fit_params)
+
+    pipeline = Pipeline(steps=[('preprocessor', preprocessor), (model_type, model)])
+
+    if not holdout_X:
+        return pipeline, "No rows were held out for evaluation.\n"
+    report = evaluate_model(pipeline, pd.concat(holdout_X), pd.concat(holdout_y), model_type)
+    return pipeline, report
\ No newline at end of file
@@ -0,0 +1,265 @@
+# dataauto/ndjson.py
+
+import json
+import numpy as np
+import pandas as pd
+
+from dataauto.compression import detect_compression, open_compressed
+
+# Bytes of input parsed per block; the block is also the unit of multi-threaded parsing.
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+# Rows encoded per batch when writing, bounding the size of the encoded text held in memory.
+WRITE_BATCH_ROWS = 65536
+# Implementations of the JSON lines readers and writers in data_loader and data_saver.
+JSON_ENGINES = ('pandas', 'pyarrow')
+# Characters that must be escaped inside a JSON string.
+_NEEDS_ESCAPE = r'["\\\x00-\x1f]'
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.json
+    except ImportError as e:
+        raise ImportError("The 'pyarrow' JSON engine requires the pyarrow package (pip install pyarrow).") from e
+    return pyarrow
+
+def check_engine(engine, schema=None):
+    """Raise ValueError unless ``engine`` is one of ``JSON_ENGINES`` and supports ``schema``."""
+    if engine not in JSON_ENGINES:
+        raise ValueError("Unsupported JSON engine. Choose 'pandas' or 'pyarrow'.")
+    if schema is not None and engine != 'pyarrow':
+        raise ValueError("An explicit JSON schema requires the 'pyarrow' engine.")
+
+def parse_schema(schema):
+    """
+    Build a pyarrow schema from a column to type mapping.
+
+    Parameters:
+        schema: A ``pyarrow.Schema``, a dict such as ``{'id': 'int64', 'when': 'timestamp[s]'}``
+            (types are pyarrow type names or ``pyarrow.DataType`` objects), a string
+            such as ``'id:int64,name:string'``, or None.
+
+    Returns:
+        pyarrow.Schema or None.
+    """
+    if schema is None:
+        return None
+    pa = _pyarrow()
+    if isinstance(schema, pa.Schema):
+        return schema
+    if isinstance(schema, str):
+        fields = [part.strip().rpartition(':') for part in schema.split(',') if part.strip()]
+        if any(not name for name, _, _ in fields):
+            raise ValueError(f"Invalid schema {schema!r}; expected 'column:type,...'.")
+        schema = {name.strip(): type_name.strip() for name, _, type_name in fields}
+    return pa.schema([(name, pa.type_for_alias(type_name) if isinstance(type_name, str) else type_name)
+                      for name, type_name in schema.items()])
+
+def _options(schema, block_size):
+    pa = _pyarrow()
+    read_options = pa.json.ReadOptions(use_threads=True, block_size=block_size)
+    parse_options = pa.json.ParseOptions(explicit_schema=parse_schema(schema), newlines_in_values=False)
+    return read_options, parse_options
+
+def _source(path):
+    # Compressed files are decompressed in parallel by dataauto.compression; pyarrow reads the stream
+    return open_compressed(path) if detect_compression(path) is not None else open(path, 'rb')
+
+def _is_empty(error):
+    return str(error).startswith('Empty JSON')
+
+def read_ndjson(path, schema=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Read a JSON lines file with pyarrow's multi-threaded JSON parser.
+
+    Blocks of lines are parsed straight into typed columns, without building
+    a Python object per value as ``pd.read_json`` does. With ``schema``, the
+    listed columns are parsed as the given types instead of being inferred;
+    other columns are still inferred.
+
+    Parameters:
+        path (str): Path of the file, optionally gzip, bz2 or zstd compressed.
+        schema: Column types (see ``parse_schema``), or None to infer them.
+        block_size (int): Bytes parsed per block.
+
+    Returns:
+        pd.DataFrame: The parsed data.
+    """
+    pa = _pyarrow()
+    read_options, parse_options = _options(schema, block_size)
+    with _source(path) as source:
+        try:
+            table = pa.json.read_json(source, read_options=read_options, parse_options=parse_options)
+        except pa.ArrowInvalid as e:
+            if _is_empty(e):
+                return pd.DataFrame()
+            raise ValueError(f"Cannot parse {path} as JSON lines: {e}") from e
+    return table.to_pandas()
+
+def iter_ndjson(path, schema=None, chunksize=100000, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Iterate over a JSON lines file in DataFrame chunks, parsing one block at a time.
+
+    Column types are fixed by ``schema`` or, without it, inferred from the
+    first block; a column whose type changes later in the file (e.g. an
+    integer column with a decimal value) raises ValueError and needs an
+    explicit schema.
+
+    Parameters:
+        path (str): Path of the file, optionally gzip, bz2 or zstd compressed.
+        schema: Column types (see ``parse_schema``), or None to infer them.
+        chunksize (int): Number of rows per chunk.
+        block_size (int): Bytes parsed per block.
+
+    Returns:
+        Iterator[pd.DataFrame]: Chunks indexed by row number in the file, as with ``pd.read_json``.
+    """
+    pa = _pyarrow()
+    read_options, parse_options = _options(schema, block_size)
+    with _source(path) as source:
+        try:
+            reader = pa.json.open_json(source, read_options=read_options, parse_options=parse_options)
+        except pa.ArrowInvalid as e:
+            if _is_empty(e):
+                return
+            raise ValueError(f"Cannot parse {path} as JSON lines: {e}") from e
+        pending = []
+        buffered = 0
+        start = 0
+        while True:
+            try:
+                batch = reader.read_next_batch()
+            except StopIteration:
+                break
+            except pa.ArrowInvalid as e:
+                raise ValueError(f"Cannot parse {path} as JSON lines: {e}. Column types are inferred from the "
+                                 f"first block; pass an explicit schema if they change later in the file.") from e
+            pending.append(batch)
+            buffered += batch.num_rows
+            while buffered >= chunksize:
+                table = pa.Table.from_batches(pending)
+                yield _chunk(table.slice(0, chunksize), start)
+                start += chunksize
+                buffered -= chunksize
+                pending = table.slice(chunksize).to_batches()
+        if buffered:
+            yield _chunk(pa.Table.from_batches(pending), start)
+
+def _chunk(table, start):
+    df = table.to_pandas()
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df
+
+def _encode_value(value):
+    if value is None or (isinstance(value, float) and not np.isfinite(value)):
+        return 'null'
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return json.dumps(pd.Timestamp(value).isoformat())
+    if isinstance(value, np.generic):
+        value = value.item()
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+def _encode_objects(series):
+    pa = _pyarrow()
+    return pa.array([_encode_value(value) for value in series.astype(object).where(series.notna(), None)],
+                    type=pa.string())
+
+def _encode_column(series):
+    """Return the JSON text of every value of ``series`` as a pyarrow string array, with nulls as 'null'."""
+    pa = _pyarrow()
+    pc = pa.compute
+    try:
+        column = pa.array(series, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return _encode_objects(series)
+    kind = column.type
+    if pa.types.is_dictionary(kind):
+        column = column.dictionary_decode()
+        kind = column.type
+    if pa.types.is_null(kind):
+        return pa.array(['null'] * len(column), type=pa.string())
+    if pa.types.is_boolean(kind) or pa.types.is_integer(kind) or pa.types.is_decimal(kind):
+        text = pc.cast(column, pa.string())
+    elif pa.types.is_floating(kind):
+        column = pc.cast(column, pa.float64())
+        # NaN and infinities are not JSON numbers
+        text = pc.cast(pc.if_else(pc.is_finite(column), column, pa.scalar(None, pa.float64())), pa.string())
+        if pc.any(pc.equal(pc.floor(column), column)).as_py():
+            # Whole numbers keep a decimal point ('5.0', not '5') so that they are read back as floats
+            text = pc.if_else(pc.match_substring_regex(text, r'^-?\d+$'),
+                              pc.binary_join_element_wise(text, '.0', ''), text)
+    elif pa.types.is_string(kind) or pa.types.is_large_string(kind):
+        if pc.any(pc.match_substring_regex(column, _NEEDS_ESCAPE)).as_py():
+            return _encode_objects(series)
+        text = pc.binary_join_element_wise('"', column, '"', '')
+    elif pa.types.is_timestamp(kind):
+        text = pc.replace_substring(pc.cast(column, pa.string()), ' ', 'T', max_replacements=1)
+        if kind.tz is None:
+            # Whole seconds are written without a fraction, which the reader parses back as timestamps
+            text = pc.replace_substring_regex(text, r'\.0+$', '')
+        text = pc.binary_join_element_wise('"', text, '"', '')
+    elif pa.types.is_date(kind):
+        text = pc.binary_join_element_wise('"', pc.cast(column, pa.string()), '"', '')
+    else:
+        return _encode_objects(series)
+    return pc.fill_null(text, 'null')
+
+def encode_ndjson(df):
+    """
+    Encode a DataFrame as JSON lines, one batch of ``WRITE_BATCH_ROWS`` rows at a time.
+
+    Each column is converted to JSON text in one vectorized pyarrow kernel
+    call, and the columns are then joined into lines element-wise, so no
+    Python code runs per row. Only columns pyarrow cannot represent (e.g.
+    mixed types or nested objects) and text columns with characters to escape
+    are encoded value by value.
+
+    Parameters:
+        df (pd.DataFrame): The data.
+
+    Returns:
+        Iterator[memoryview]: UTF-8 encoded lines.
+    """
+    pa = _pyarrow()
+    pc = pa.compute
+    keys = [('{' if index == 0 else ',') + json.dumps(str(name), ensure_ascii=False) + ':'
+            for index, name in enumerate(df.columns)]
+    for start in range(0, len(df), WRITE_BATCH_ROWS):
+        batch = df.iloc[start:start + WRITE_BATCH_ROWS]
+        if not keys:
+            yield memoryview(b'{}\n' * len(batch))
+            continue
+        parts = []
+        for position, key in enumerate(keys):
+            parts += [key, _encode_column(batch.iloc[:, position])]
+        lines = pc.binary_join_element_wise(*parts, '}\n', '')
+        _, offsets, data = lines.buffers()
+        offsets = np.frombuffer(offsets, dtype=np.int32)[lines.offset:lines.offset + len(lines) + 1]
+        yield memoryview(data)[offsets[0]:offsets[-1]]
+
+def open_output(path):
+    """Open ``path`` for writing bytes, compressing in parallel if its name ends in .gz, .bz2 or .zst."""
+    return open_compressed(path, 'wb') if detect_compression(path) is not None else open(path, 'wb')
+
+def write_ndjson(data, path):
+    """
+    Write a DataFrame, or an iterable of DataFrame chunks, as a JSON lines file with ``encode_ndjson``.
+
+    Floats are written with full precision, missing values as null, and
+    datetimes as ISO 8601 strings.
+
+    Parameters:
+        data: A DataFrame or an iterable of DataFrame chunks.
+        path (str): Path of the file, optionally ending in .gz, .bz2 or .zst.
+
+    Returns:
+        int: Number of rows written.
+    """
+    rows = 0
+    with open_output(path) as f:
+        for chunk in [data] if isinstance(data, pd.DataFrame) else data:
+            for lines in encode_ndjson(chunk):
+                f.write(lines)
+            rows += len(chunk)
+    return rows
@@ -0,0 +1,317 @@
+# dataauto/pipeline.py
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+
+STATE_VERSION = 1
+
+class PipelineStep:
+    """
+    One CLI command of a pipeline and the files it reads and writes.
+
+    Parameters:
+        name (str): Unique step name.
+        command (str): dataauto command, e.g. 'clean'.
+        args (list): Positional arguments and options passed to the command.
+        params (dict): Options appended as ``--key value`` (lists repeat the option, True adds a flag).
+        inputs (list): Files the step reads; their contents are part of the step's hash.
+        outputs (list): Files the step writes.
+        depends_on (list): Names of steps that must finish first, in addition to
+            the steps producing this step's inputs.
+    """
+
+    def __init__(self, name, command, args=(), params=None, inputs=(), outputs=(), depends_on=()):
+        self.name = name
+        self.command = command
+        self.args = [str(arg) for arg in args]
+        self.params = dict(params or {})
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.depends_on = list(depends_on)
+
+    def argv(self):
+        """Return the command line of the step."""
+        argv = [self.command, *self.args]
+        for key, value in self.params.items():
+            option = f"--{key.replace('_', '-')}"
+            if value is True:
+                argv.append(option)
+            elif value is False or value is None:
+                continue
+            elif isinstance(value, (list, tuple)):
+                for item in value:
+                    argv.extend([option, str(item)])
+            else:
+                argv.extend([option, str(value)])
+        return argv
+
+    @classmethod
+    def from_dict(cls, step):
+        unknown = set(step) - {'name', 'command', 'args', 'params', 'inputs', 'outputs', 'depends_on'}
+        if unknown:
+            raise ValueError(f"Unknown keys in step {step.get('name')!r}: {', '.join(sorted(unknown))}")
+        if 'name' not in step or 'command' not in step:
+            raise ValueError("Every pipeline step needs a 'name' and a 'command'.")
+        return cls(**step)
+
+class Pipeline:
+    """
+    Directed acyclic graph of pipeline steps.
+
+    A step depends on the steps listed in its ``depends_on`` and on every step
+    that lists one of its inputs among its outputs.
+
+    Parameters:
+        steps (list): PipelineStep objects.
+        name (str): Pipeline name.
+    """
+
+    def __init__(self, steps, name=None):
+        self.name = name
+        self.steps = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate pipeline step name: {step.name!r}")
+            self.steps[step.name] = step
+        producers = {}
+        for step in self.steps.values():
+            for output in step.outputs:
+                if os.path.normpath(output) in producers:
+                    raise ValueError(f"Output {output!r} is written by more than one step.")
+                producers[os.path.normpath(output)] = step.name
+        self.dependencies = {}
+        for step in self.steps.values():
+            dependencies = [producers[os.path.normpath(path)] for path in step.inputs
+                            if os.path.normpath(path) in producers]
+            for name in step.depends_on:
+                if name not in self.steps:
+                    raise ValueError(f"Step {step.name!r} depends on unknown step {name!r}.")
+                dependencies.append(name)
+            self.dependencies[step.name] = sorted(set(dependencies) - {step.name})
+        self.order()
+
+    def order(self):
+        """
+        Return the step names in a topological order, keeping definition order among independent steps.
+
+        Raises:
+            ValueError: If the steps form a cycle.
+        """
+        remaining = {name: set(dependencies) for name, dependencies in self.dependencies.items()}
+        order = []
+        while remaining:
+            ready = [name for name in self.steps if name in remaining and not remaining[name]]
+            if not ready:
+                raise ValueError(f"Pipeline steps form a cycle: {', '.join(sorted(remaining))}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+        return order
+
+    @classmethod
+    def from_dict(cls, definition):
+        return cls([PipelineStep.from_dict(step) for step in definition['steps']], name=definition.get('name'))
+
+    @classmethod
+    def load(cls, path):
+        """Load a pipeline from a JSON file with a ``steps`` list."""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class PipelineState:
+    """
+    Hashes of the last successful run of every step, stored as JSON.
+
+    File digests are cached by size and modification time, so unchanged
+    inputs are not re-read on every run.
+
+    Parameters:
+        path (str): Path of the state file, or None to keep the state in memory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.steps = {}
+        self.files = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            if state.get('version') == STATE_VERSION:
+                self.steps = state['steps']
+                self.files = state['files']
+
+    def file_digest(self, path):
+        """Return the sha256 of a file's contents, or None if it does not exist."""
+        if not os.path.isfile(path):
+            return None
+        key = os.path.abspath(path)
+        fingerprint = _fingerprint(path)
+        cached = self.files.get(key)
+        if cached is not None and cached[:2] == fingerprint:
+            return cached[2]
+        digest = _sha256_file(path)
+        self.files[key] = fingerprint + [digest]
+        return digest
+
+    def step_key(self, step):
+        """Hash of the step's command line and the contents of its inputs."""
+        digest = hashlib.sha256(json.dumps(step.argv()).encode('utf-8'))
+        for path in sorted(step.inputs):
+            digest.update(f"\0{path}\0{self.file_digest(path)}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def is_current(self, step, key):
+        """Whether the last successful run had the same key and its outputs are untouched."""
+        previous = self.steps.get(step.name)
+        if previous is None or previous['key'] != key:
+            return False
+        for path in step.outputs:
+            if not os.path.exists(path) or _fingerprint(path) != previous['outputs'].get(path):
+                return False
+        return True
+
+    def record(self, step, key):
+        self.steps[step.name] = {
+            'key': key,
+            'outputs': {path: _fingerprint(path) for path in step.outputs if os.path.exists(path)},
+            'finished_at': time.time(),
+        }
+        self.save()
+
+    def save(self):
+        """Write the state file atomically."""
+        if not self.path:
+            return
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump({'version': STATE_VERSION, 'steps': self.steps, 'files': self.files}, f)
+        os.replace(temporary, self.path)
+
+def _run_in_process(args):
+    from dataauto.cli import cli
+    from dataauto.scheduler import invoke_command
+    future = Future()
+    start = time.perf_counter()
+    exit_code, error = invoke_command(cli, args)
+    future.set_result((exit_code, error, time.perf_counter() - start))
+    return future
+
+def _run_in_pool(pool):
+    def submit(args):
+        future = Future()
+
+        def done(job):
+            try:
+                result = job.result()
+            except Exception as e:
+                future.set_result((1, f"{type(e).__name__}: {e}", 0.0))
+            else:
+                future.set_result((result.exit_code, result.error, result.duration))
+        pool.submit(args).add_done_callback(done)
+        return future
+    return submit
+
+def run_pipeline(pipeline, state_file=None, force=False, dry_run=False, pool=None, echo=print):
+    """
+    Run a pipeline, skipping steps whose inputs and parameters are unchanged.
+
+    A step's key is the sha256 of its command line and the contents of its
+    inputs. A step is skipped, reusing its existing outputs, when its key
+    equals that of its last successful run and its outputs were not modified
+    since. Skipped steps leave their outputs untouched, so downstream steps
+    are skipped too unless something else changed. When a step fails, the
+    steps depending on it are not run.
+
+    Parameters:
+        pipeline (Pipeline or str): Pipeline, or path of a JSON pipeline definition.
+        state_file (str): JSON file keeping the keys of successful runs; defaults to
+            ``<definition>.state.json`` when a path is given, otherwise nothing is kept.
+        force (bool): Run every step regardless of the stored keys.
+        dry_run (bool): Only report which steps would run.
+        pool (WorkerPool): Run independent steps concurrently in this pool instead of
+            one after another in the current process.
+        echo (callable): Function called with a progress line per step.
+
+    Returns:
+        list: One dict per step with ``name``, ``status`` ('ran', 'skipped', 'failed',
+        'blocked' or 'pending' for a dry run), ``duration`` and ``error``.
+    """
+    if isinstance(pipeline, str):
+        if state_file is None:
+            state_file = f"{pipeline}.state.json"
+        pipeline = Pipeline.load(pipeline)
+    state = PipelineState(state_file)
+    submit = _run_in_pool(pool) if pool is not None else _run_in_process
+    order = pipeline.order()
+    results = {name: {'name': name, 'status': None, 'duration': 0.0, 'error': None} for name in order}
+    keys = {}
+    running = {}
+
+    def settled(name):
+        return results[name]['status'] is not None
+
+    while True:
+        for name in order:
+            if settled(name) or name in running.values():
+                continue
+            dependencies = pipeline.dependencies[name]
+            if any(results[dependency]['status'] in ('failed', 'blocked') for dependency in dependencies):
+                results[name]['status'] = 'blocked'
+                echo(f"{name}: not run, an upstream step failed")
+                continue
+            if not all(settled(dependency) for dependency in dependencies):
+                continue
+            step = pipeline.steps[name]
+            if dry_run:
+                # Inputs produced by upstream steps do not exist yet, so judge by the stored state only
+                upstream_runs = any(results[dependency]['status'] == 'pending' for dependency in dependencies)
+                keys[name] = state.step_key(step)
+                current = not force and not upstream_runs and state.is_current(step, keys[name])
+                results[name]['status'] = 'skipped' if current else 'pending'
+                echo(f"{name}: {'up to date' if current else 'would run'}")
+                continue
+            keys[name] = state.step_key(step)
+            if not force and state.is_current(step, keys[name]):
+                results[name]['status'] = 'skipped'
+                echo(f"{name}: skipped, inputs and parameters unchanged")
+                continue
+            running[submit(step.argv())] = name
+        if not running:
+            break
+        finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+        for future in finished:
+            name = running.pop(future)
+            exit_code, error, duration = future.result()
+            step = pipeline.steps[name]
+            missing = [path for path in step.outputs if not os.path.exists(path)]
+            if exit_code == 0 and missing:
+                exit_code, error = 1, f"Declared outputs were not written: {', '.join(missing)}"
+            results[name].update(duration=duration, error=error)
+            if exit_code == 0:
+                results[name]['status'] = 'ran'
+                # Outputs of the step were just written, so its inputs are hashed as they were at the start
+                state.record(step, keys[name])
+                echo(f"{name}: ran in {duration:.2f}s")
+            else:
+                results[name]['status'] = 'failed'
+                echo(f"{name}: failed: {error}")
+
+    if not dry_run:
+        state.save()
+    return [results[name] for name in order]
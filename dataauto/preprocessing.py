@@ -1,12 +1,21 @@
 # dataauto/preprocessing.py
 
 import pandas as pd
-from sklearn.preprocessing import OneHotEncoder, StandardScaler, MinMaxScaler
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.preprocessing import OneHotEncoder, StandardScaler, MinMaxScaler, TargetEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from scipy import stats
 import numpy as np
 
+# Categorical columns with at most this many distinct values are one-hot encoded.
+ONEHOT_MAX_CARDINALITY = 50
+# Categorical columns with more distinct values than this are feature-hashed.
+HASHING_MIN_CARDINALITY = 1000
+# Fixed output width of the hashing encoder.
+HASHING_N_FEATURES = 256
+
 def fill_missing(df, strategy='mean', columns=None, value=None):
     """
     Fill missing values in specified columns using the given strategy.
@@ -128,12 +137,132 @@ def scale_data(df, columns, method='standard'):
 
     return df
 
-def preprocess_features(X):
+class FrequencyEncoder(BaseEstimator, TransformerMixin):
+    """
+    Encode each categorical column as the relative frequency of its value in the training data.
+
+    Unseen values are encoded as 0. Produces one float32 column per input column.
+    """
+
+    def fit(self, X, y=None):
+        X = pd.DataFrame(X)
+        self.frequencies_ = {col: X[col].value_counts(normalize=True).to_dict() for col in X.columns}
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def transform(self, X):
+        X = pd.DataFrame(X)
+        encoded = [X[col].map(self.frequencies_[col]).fillna(0.0).to_numpy(dtype=np.float32)
+                   for col in X.columns]
+        return np.column_stack(encoded) if encoded else np.empty((len(X), 0), dtype=np.float32)
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray([f"{col}_frequency" for col in input_features], dtype=object)
+
+class HashingEncoder(BaseEstimator, TransformerMixin):
+    """
+    Encode categorical columns by hashing 'column=value' tokens into a fixed number of sparse features.
+
+    The output width does not depend on the number of distinct values, so memory
+    stays bounded for ID-like columns.
+    """
+
+    def __init__(self, n_features=HASHING_N_FEATURES):
+        self.n_features = n_features
+
+    def fit(self, X, y=None):
+        self.n_features_in_ = pd.DataFrame(X).shape[1]
+        return self
+
+    def transform(self, X):
+        X = pd.DataFrame(X)
+        tokens = [f"{col}=" + X[col].astype(str) for col in X.columns]
+        hasher = FeatureHasher(n_features=self.n_features, input_type='string', alternate_sign=False,
+                               dtype=np.float32)
+        return hasher.transform(zip(*tokens))
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray([f"hash_{i}" for i in range(self.n_features)], dtype=object)
+
+def encoding_for_cardinality(n_unique, onehot_max_cardinality=ONEHOT_MAX_CARDINALITY,
+                             hashing_min_cardinality=HASHING_MIN_CARDINALITY, target_encoding=False):
+    """
+    Choose how to encode a categorical column from its number of distinct values.
+
+    Parameters:
+        n_unique (int): Number of distinct values in the column.
+        onehot_max_cardinality (int): Largest cardinality that is one-hot encoded.
+        hashing_min_cardinality (int): Cardinality above which the column is hashed.
+        target_encoding (bool): Use target encoding instead of frequency encoding
+            for medium-cardinality columns.
+
+    Returns:
+        str: One of 'onehot', 'frequency', 'target' or 'hashing'.
+    """
+    if n_unique <= onehot_max_cardinality:
+        return 'onehot'
+    if n_unique > hashing_min_cardinality:
+        return 'hashing'
+    return 'target' if target_encoding else 'frequency'
+
+def categorical_encoding_plan(X, columns=None, **policy):
+    """
+    Measure the cardinality of categorical columns and choose an encoding for each.
+
+    Parameters:
+        X (pd.DataFrame): Feature DataFrame.
+        columns (list): Categorical columns. If None, all object and category columns are used.
+        **policy: Keyword arguments forwarded to ``encoding_for_cardinality``.
+
+    Returns:
+        dict: Mapping of column name to encoding.
+    """
+    if columns is None:
+        columns = X.select_dtypes(include=['object', 'category']).columns.tolist()
+    return {col: encoding_for_cardinality(X[col].nunique(), **policy) for col in columns}
+
+def categorical_transformers(plan, categories=None, dense=False):
+    """
+    Build ColumnTransformer entries for an encoding plan.
+
+    Parameters:
+        plan (dict): Mapping of column name to encoding, as returned by ``categorical_encoding_plan``.
+        categories (dict): Optional known categories per one-hot encoded column.
+        dense (bool): Produce dense one-hot output instead of sparse.
+
+    Returns:
+        list: (name, transformer, columns) tuples.
+    """
+    groups = {}
+    for col, encoding in plan.items():
+        groups.setdefault(encoding, []).append(col)
+
+    transformers = []
+    if 'onehot' in groups:
+        onehot_categories = 'auto'
+        if categories is not None:
+            onehot_categories = [sorted(categories[col], key=str) for col in groups['onehot']]
+        transformers.append(('cat', OneHotEncoder(categories=onehot_categories, handle_unknown='ignore',
+                                                  sparse_output=not dense, dtype=np.float32), groups['onehot']))
+    if 'frequency' in groups:
+        transformers.append(('freq', FrequencyEncoder(), groups['frequency']))
+    if 'target' in groups:
+        transformers.append(('target', TargetEncoder(), groups['target']))
+    if 'hashing' in groups:
+        transformers.append(('hash', HashingEncoder(), groups['hashing']))
+    return transformers
+
+def preprocess_features(X, **policy):
     """
     Preprocess features by encoding categorical variables and scaling numerical variables.
 
+    Categorical columns are encoded according to their cardinality: one-hot for
+    low cardinality, frequency (or target) encoding for medium cardinality and
+    feature hashing with a fixed width for ID-like columns.
+
     Parameters:
         X (pd.DataFrame): Feature DataFrame.
+        **policy: Keyword arguments forwarded to ``encoding_for_cardinality``.
 
     Returns:
         ColumnTransformer: A scikit-learn ColumnTransformer object for preprocessing.
@@ -141,11 +270,11 @@ def preprocess_features(X):
     categorical_cols = X.select_dtypes(include=['object', 'category']).columns.tolist()
     numerical_cols = X.select_dtypes(include=['float64', 'int64']).columns.tolist()
 
+    plan = categorical_encoding_plan(X, categorical_cols, **policy)
     preprocessor = ColumnTransformer(
-        transformers=[
-            ('num', StandardScaler(), numerical_cols),
-            ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_cols)
-        ]
+        transformers=[('num', StandardScaler(), numerical_cols)] + categorical_transformers(plan),
+        # One-hot and hashed columns stay sparse whatever their share of the output
+        sparse_threshold=1.0
     )
 
     return preprocessor
\ No newline at end of file
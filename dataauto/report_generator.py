@@ -3,19 +3,226 @@
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
-import matplotlib.pyplot as plt
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib import cbook
+import numpy as np
+import pandas as pd
 import seaborn as sns
+import inspect
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 from reportlab.lib.utils import ImageReader  # Import ImageReader
+from dataauto.data_profiler import profile_dataframe
+from dataauto.correlation import correlation_matrix, numeric_columns, plot_subset, top_correlations, ANNOTATE_MAX_COLUMNS
+from dataauto.instrumentation import stage
+import os
 import sys
 
-def generate_report(df, output_report='data_report.pdf'):
+MARGIN = 50
+# Per-column sections drawn on each page.
+SECTIONS_PER_PAGE = 3
+# Histogram bins and the maximum number of outliers drawn per box plot.
+HISTOGRAM_BINS = 30
+MAX_FLIERS = 500
+# Most frequent values drawn for non-numeric columns.
+TOP_VALUES = 10
+# Below this many figures starting worker processes costs more than it saves.
+MIN_PARALLEL_FIGURES = 24
+# Default number of worker processes rendering figures.
+DEFAULT_FIGURE_JOBS = 4
+# Matplotlib 3.10 replaced bxp's ``vert`` with ``orientation``.
+HORIZONTAL_BOX = ({'orientation': 'horizontal'} if 'orientation' in inspect.signature(Axes.bxp).parameters
+                  else {'vert': False})
+
+def _png(fig, dpi=100):
+    buf = BytesIO()
+    FigureCanvasAgg(fig).print_figure(buf, format='png', dpi=dpi)
+    return buf.getvalue()
+
+def render_column_figure(spec):
+    """
+    Render the figure of one column section to PNG bytes.
+
+    Uses the object-oriented Matplotlib API with the Agg canvas, so it is
+    safe to call from worker processes. ``spec`` holds pre-aggregated data
+    only (histogram counts, box plot statistics or value counts), which keeps
+    what is sent to the workers small whatever the number of rows.
+
+    Parameters:
+        spec (dict): Output of ``column_figure_spec``.
+
+    Returns:
+        bytes: The PNG image.
+    """
+    fig = Figure(figsize=(4.5, 2.6))
+    if spec['kind'] == 'numeric':
+        hist_ax, box_ax = fig.subplots(2, 1, sharex=True, gridspec_kw={'height_ratios': [3, 1]})
+        edges, counts = spec['edges'], spec['counts']
+        hist_ax.stairs(counts, edges, fill=True, color='#4c72b0')
+        hist_ax.set_ylabel('Count')
+        if spec['box'] is not None:
+            box_ax.bxp([spec['box']], **HORIZONTAL_BOX, widths=0.6, flierprops={'markersize': 2})
+        box_ax.set_yticks([])
+    elif spec['kind'] == 'categorical':
+        ax = fig.subplots()
+        labels = [str(label)[:20] for label in spec['labels']][::-1]
+        ax.barh(labels, spec['counts'][::-1], color='#4c72b0')
+        ax.set_xlabel('Count')
+        ax.tick_params(axis='y', labelsize=7)
+    else:
+        ax = fig.subplots()
+        ax.text(0.5, 0.5, 'No values', ha='center', va='center')
+        ax.set_axis_off()
+    # A fixed layout is much cheaper than tight_layout and every section figure has the same shape
+    if spec['kind'] == 'numeric':
+        fig.subplots_adjust(left=0.14, right=0.97, bottom=0.12, top=0.97, hspace=0.05)
+    else:
+        fig.subplots_adjust(left=0.25, right=0.97, bottom=0.18, top=0.97)
+    return _png(fig)
+
+def render_heatmap_figure(corr):
+    """Render a correlation heatmap to PNG bytes."""
+    fig = Figure(figsize=(7, 5.5))
+    ax = fig.subplots()
+    sns.heatmap(corr, annot=len(corr) <= ANNOTATE_MAX_COLUMNS, fmt='.2f', cmap='coolwarm',
+                vmin=-1, vmax=1, ax=ax, xticklabels=True, yticklabels=True)
+    ax.tick_params(labelsize=6 if len(corr) > ANNOTATE_MAX_COLUMNS else 8)
+    ax.set_title("Correlation Heatmap")
+    fig.tight_layout()
+    return _png(fig, dpi=120)
+
+def column_figure_spec(name, series):
+    """
+    Pre-aggregate a column into the data needed to draw its section figure.
+
+    Parameters:
+        name (str): Column name.
+        series (pd.Series): Column values.
+
+    Returns:
+        dict: Histogram and box plot statistics for numeric columns, top value counts otherwise.
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.to_numpy(dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if not values.size:
+            return {'name': name, 'kind': 'empty'}
+        counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+        box = cbook.boxplot_stats(values)[0]
+        fliers = box['fliers']
+        if len(fliers) > MAX_FLIERS:
+            box['fliers'] = np.random.default_rng(0).choice(fliers, MAX_FLIERS, replace=False)
+        return {'name': name, 'kind': 'numeric', 'edges': edges, 'counts': counts, 'box': box}
+    counts = series.value_counts().head(TOP_VALUES)
+    if not len(counts):
+        return {'name': name, 'kind': 'empty'}
+    return {'name': name, 'kind': 'categorical', 'labels': list(counts.index), 'counts': counts.to_numpy()}
+
+def profile_figure_spec(name, column):
+    """
+    Build the section figure data of a column from its streaming profile instead of its values.
+
+    The histogram comes from the quantile sketch and the box plot from the
+    approximate quartiles, with whiskers at 1.5 IQR clipped to min/max and no
+    individual outliers.
+
+    Parameters:
+        name (str): Column name.
+        column (ColumnProfile): Profile of the column.
+
+    Returns:
+        dict: Same layout as ``column_figure_spec``.
+    """
+    if column.numeric:
+        if not column.count:
+            return {'name': name, 'kind': 'empty'}
+        counts, edges = column.quantiles.histogram(HISTOGRAM_BINS, range=(column.min, column.max))
+        q1, median, q3 = column.quantiles.quantiles([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        box = {'med': median, 'q1': q1, 'q3': q3, 'fliers': [],
+               'whislo': max(column.min, q1 - 1.5 * iqr), 'whishi': min(column.max, q3 + 1.5 * iqr)}
+        return {'name': name, 'kind': 'numeric', 'edges': edges, 'counts': counts, 'box': box}
+    top = column.top.top(TOP_VALUES)
+    if not top:
+        return {'name': name, 'kind': 'empty'}
+    return {'name': name, 'kind': 'categorical', 'labels': [value for value, _ in top],
+            'counts': np.array([count for _, count in top])}
+
+def render_figures(specs, n_jobs=None):
+    """
+    Render column section figures, concurrently when ``n_jobs`` > 1.
+
+    Without ``n_jobs``, fewer than ``MIN_PARALLEL_FIGURES`` figures are
+    rendered in this process and more use up to ``DEFAULT_FIGURE_JOBS``
+    workers. Workers are spawned rather than forked, so they do not inherit
+    the state of a multithreaded parent.
+
+    Parameters:
+        specs (list): Outputs of ``column_figure_spec``.
+        n_jobs (int): Number of worker processes.
+
+    Returns:
+        list: PNG bytes, in the order of ``specs``.
+    """
+    if n_jobs is None:
+        n_jobs = 1 if len(specs) < MIN_PARALLEL_FIGURES else min(DEFAULT_FIGURE_JOBS, os.cpu_count() or 1)
+    if n_jobs <= 1 or len(specs) < 2:
+        return [render_column_figure(spec) for spec in specs]
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(specs)),
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        return list(executor.map(render_column_figure, specs, chunksize=max(1, len(specs) // (4 * n_jobs))))
+
+def _format_value(value):
+    if isinstance(value, (float, np.floating)):
+        return f"{value:.6g}"
+    return str(value)
+
+def _draw_lines(c, lines, top, font='Courier', font_size=8, leading=None):
+    """Draw text lines starting at ``top``, continuing on new pages as needed; return the final y."""
+    width, height = letter
+    leading = leading or font_size * 1.2
+    # Shrink the font until the widest line fits the page
+    widest = max(lines, key=len) if lines else ''
+    while font_size > 4 and stringWidth(widest, font, font_size) > width - 2 * MARGIN:
+        font_size -= 0.5
+        leading = font_size * 1.2
+    y = top
+    for line in lines:
+        if y < MARGIN:
+            c.showPage()
+            y = height - MARGIN
+        c.setFont(font, font_size)
+        c.drawString(MARGIN, y, line)
+        y -= leading
+    return y
+
+def generate_report(df, output_report='data_report.pdf', profile=None, max_heatmap_columns=30,
+                    column_sections=True, n_jobs=None, correlation=None):
     """
-    Generate a PDF report summarizing the DataFrame.
+    Generate a multi-page PDF report summarizing the DataFrame.
+
+    The report starts with an overview (a summary table with one row per
+    column and a correlation heatmap) followed by one section per column with
+    its statistics, a histogram and box plot (numeric columns) or its most
+    frequent values. Section figures are rendered first (in a process pool
+    for larger reports) and the PDF is assembled once they are all done.
+
+    With ``df=None`` the report is drawn from ``profile`` (a DataProfile) and
+    ``correlation`` alone, e.g. from a stored incremental profile state.
 
     Parameters:
-        df (pd.DataFrame): The input DataFrame.
+        df (pd.DataFrame): The input DataFrame, or None to report on ``profile`` only.
         output_report (str): Path to save the PDF report.
+        profile (DataProfile or SampleSummary): Precomputed profile of the data; computed from ``df``
+            in one pass if None. A SampleSummary adds confidence intervals to every estimate.
+        max_heatmap_columns (int): Maximum number of columns drawn in the correlation heatmap.
+        column_sections (bool): Whether to add a section for every column.
+        n_jobs (int): Number of processes rendering figures; chosen from the number of figures if None.
+        correlation (StreamingCorrelation): Precomputed correlation accumulators; computed from ``df`` if None.
 
     Returns:
         None
@@ -24,39 +231,81 @@ def generate_report(df, output_report='data_report.pdf'):
         c = canvas.Canvas(output_report, pagesize=letter)
         width, height = letter
 
+        with stage('profile'):
+            if profile is None:
+                profile = profile_dataframe(df)
+            stats = profile.to_frame()
+        columns = list(df.columns) if df is not None else list(profile.columns)
+
+        # Figures are rendered before anything is drawn so the pool can work on all of them at once
+        with stage('figures'):
+            if not column_sections:
+                specs = []
+            elif df is not None:
+                specs = [column_figure_spec(name, df[name]) for name in columns]
+            else:
+                specs = [profile_figure_spec(name, profile.columns[name]) for name in columns]
+            images = render_figures(specs, n_jobs=n_jobs)
+
         # Title
         c.setFont("Helvetica-Bold", 20)
         c.drawCentredString(width / 2, height - 50, "DataAuto Report")
+        c.setFont("Helvetica", 10)
+        c.drawCentredString(width / 2, height - 68, f"{profile.rows:,.0f} rows, {len(columns)} columns")
 
-        # Summary Statistics
+        # Summary Statistics, one row per column
         c.setFont("Helvetica-Bold", 14)
-        c.drawString(50, height - 100, "Summary Statistics:")
-        summary = df.describe(include='all').to_string()
-        text = c.beginText(50, height - 120)
-        text.setFont("Helvetica", 10)
-        for line in summary.split('\n'):
-            text.textLine(line)
-        c.drawText(text)
+        c.drawString(MARGIN, height - 100, "Summary Statistics:")
+        # DataFrame.map is applymap before pandas 2.1
+        formatted = stats.T.map if hasattr(pd.DataFrame, 'map') else stats.T.applymap
+        summary = formatted(_format_value).to_string()
+        _draw_lines(c, summary.split('\n'), height - 120)
 
         # Correlation Heatmap
-        numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns
-        if len(numeric_cols) >= 2:
-            corr = df[numeric_cols].corr()
-
-            fig, ax = plt.subplots(figsize=(6, 4))
-            sns.heatmap(corr, annot=True, cmap='coolwarm', ax=ax)
-            plt.title("Correlation Heatmap")
-            buf = BytesIO()
-            plt.savefig(buf, format='png')
-            plt.close(fig)
-            buf.seek(0)
-            image = ImageReader(buf)  # Create an ImageReader object
-            c.drawImage(image, 50, height - 500, width=500, height=300)  # Use ImageReader
-            buf.close()
-
-        c.save()
+        with stage('correlation'):
+            if correlation is not None:
+                full_corr = correlation.correlation()
+            elif df is not None and len(numeric_columns(df)) >= 2:
+                full_corr = correlation_matrix(df, numeric_columns(df))
+            else:
+                full_corr = None
+        if full_corr is not None and len(full_corr) >= 2:
+            corr = plot_subset(full_corr, max_columns=max_heatmap_columns)
+
+            c.showPage()
+            image = ImageReader(BytesIO(render_heatmap_figure(corr)))  # Create an ImageReader object
+            c.drawImage(image, MARGIN, height - MARGIN - 6.5 * inch, width=width - 2 * MARGIN, height=6.5 * inch,
+                        preserveAspectRatio=True)
+            y = height - MARGIN - 6.5 * inch - 20
+
+            if len(full_corr) > len(corr):
+                # The heatmap only shows a subset; list the strongest pairs as well
+                lines = [f"Strongest correlations ({len(corr)} of {len(full_corr)} columns shown above):"]
+                for row in top_correlations(full_corr, k=10).itertuples(index=False):
+                    lines.append(f"  {row.column_1} ~ {row.column_2}: {row.correlation:.3f}")
+                _draw_lines(c, lines, y, font='Helvetica', font_size=9)
+
+        # Per-column sections
+        section_height = (height - 2 * MARGIN) / SECTIONS_PER_PAGE
+        for index, (name, png) in enumerate(zip(columns, images)):
+            if index % SECTIONS_PER_PAGE == 0:
+                c.showPage()
+            top = height - MARGIN - (index % SECTIONS_PER_PAGE) * section_height
+            c.setFont("Helvetica-Bold", 12)
+            c.drawString(MARGIN, top - 12, str(name))
+            text = c.beginText(MARGIN, top - 30)
+            text.setFont("Courier", 8)
+            if name in stats.columns:
+                for stat, value in stats[name].items():
+                    text.textLine(f"{str(stat)[:14]:<14} {_format_value(value)[:16]}")
+            c.drawText(text)
+            c.drawImage(ImageReader(BytesIO(png)), MARGIN + 2.3 * inch, top - section_height + 10,
+                        width=width - 2 * MARGIN - 2.3 * inch, height=section_height - 20, preserveAspectRatio=True)
+
+        with stage('write'):
+            c.save()
         print(f"Report generated successfully and saved to {output_report}.")
 
     except Exception as e:
         print(f"Error generating report: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,282 @@
+# dataauto/sampling.py
+
+import io
+import os
+import numpy as np
+import pandas as pd
+from scipy import stats
+from dataauto.data_loader import iter_chunks
+
+# Column added to block samples to identify the block each row came from.
+BLOCK_COLUMN = '__block__'
+
+def reservoir_sample(chunks, n, random_state=42):
+    """
+    Draw a uniform random sample of ``n`` rows from a stream of chunks.
+
+    Every row gets a uniform random key and the ``n`` rows with the smallest
+    keys are kept, which is equivalent to reservoir sampling but vectorized
+    per chunk. Memory is bounded by ``n`` plus one chunk.
+
+    Parameters:
+        chunks (Iterable[pd.DataFrame]): DataFrame chunks.
+        n (int): Sample size.
+        random_state (int): Random state for reproducibility.
+
+    Returns:
+        pd.DataFrame: The sample.
+        int: Total number of rows seen.
+    """
+    rng = np.random.default_rng(random_state)
+    sample = None
+    keys = np.empty(0)
+    total_rows = 0
+    for chunk in chunks:
+        total_rows += len(chunk)
+        chunk_keys = rng.random(len(chunk))
+        if sample is None:
+            sample, keys = chunk, chunk_keys
+        else:
+            sample = pd.concat([sample, chunk], ignore_index=True)
+            keys = np.concatenate([keys, chunk_keys])
+        if len(sample) > n:
+            keep = np.sort(np.argpartition(keys, n)[:n])
+            sample, keys = sample.iloc[keep].reset_index(drop=True), keys[keep]
+    if sample is None:
+        sample = pd.DataFrame()
+    return sample, total_rows
+
+def block_sample_csv(file_path, n_blocks=100, rows_per_block=100, random_state=42):
+    """
+    Sample a CSV file by reading short runs of lines at random byte offsets.
+
+    Only ``n_blocks * rows_per_block`` rows are parsed, so the cost does not
+    grow with the file size. An offset falling inside a block already read is
+    skipped, so no row is sampled twice. The total row count is estimated from
+    the mean line length. Quoted fields containing newlines are not supported.
+
+    Parameters:
+        file_path (str): Path to the CSV file.
+        n_blocks (int): Number of random offsets to read from.
+        rows_per_block (int): Number of consecutive lines read at each offset.
+        random_state (int): Random state for reproducibility.
+
+    Returns:
+        pd.DataFrame: The sample, with a ``BLOCK_COLUMN`` column identifying each row's block.
+        tuple: Estimated total row count and its (lower, upper) 95% interval.
+    """
+    rng = np.random.default_rng(random_state)
+    file_size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+        offsets = np.sort(rng.integers(data_start, max(file_size, data_start + 1), size=n_blocks))
+        lines, blocks, block_bytes, block_rows = [], [], [], []
+        end = data_start
+        for block, offset in enumerate(offsets):
+            if offset < end:
+                continue
+            f.seek(offset)
+            if offset > data_start:
+                # Skip the partial line the offset landed in
+                f.readline()
+            block_lines = [line for line in (f.readline() for _ in range(rows_per_block)) if line.strip()]
+            end = f.tell()
+            lines.extend(block_lines)
+            blocks.extend([block] * len(block_lines))
+            block_bytes.append(sum(len(line) for line in block_lines))
+            block_rows.append(len(block_lines))
+
+    if not lines:
+        return pd.DataFrame(columns=pd.read_csv(io.BytesIO(header)).columns), (0, (0, 0))
+    sample = pd.read_csv(io.BytesIO(header + b''.join(lines)))
+    sample[BLOCK_COLUMN] = blocks
+
+    # Ratio estimate of the mean line length, with a CI from the block-level variance
+    block_bytes, block_rows = np.asarray(block_bytes, float), np.asarray(block_rows, float)
+    mean_length = block_bytes.sum() / block_rows.sum()
+    data_bytes = file_size - data_start
+    estimate = data_bytes / mean_length
+    if len(block_rows) > 1:
+        residuals = block_bytes - mean_length * block_rows
+        se_length = np.sqrt(np.var(residuals, ddof=1) / len(block_rows)) / block_rows.mean()
+        lower_length = max(mean_length - 1.96 * se_length, 1e-9)
+        interval = (data_bytes / (mean_length + 1.96 * se_length), data_bytes / lower_length)
+    else:
+        interval = (estimate, estimate)
+    return sample, (estimate, interval)
+
+def sample_file(file_path, n, method='reservoir', format='csv', chunksize=100000, random_state=42):
+    """
+    Draw a sample of about ``n`` rows from a file.
+
+    Parameters:
+        file_path (str): Path to the input file.
+        n (int): Sample size.
+        method (str): 'reservoir' (uniform, one streaming pass) or 'block' (random byte offsets, CSV only).
+        format (str): Format of the input file ('csv' or 'json').
+        chunksize (int): Number of rows per chunk for reservoir sampling.
+        random_state (int): Random state for reproducibility.
+
+    Returns:
+        SampleSummary: Estimates and confidence intervals computed from the sample.
+    """
+    if method == 'reservoir':
+        sample, total_rows = reservoir_sample(iter_chunks(file_path, format, chunksize), n, random_state)
+        return SampleSummary(sample, total_rows)
+    elif method == 'block':
+        if format != 'csv':
+            raise ValueError("Block sampling is only supported for CSV files.")
+        rows_per_block = 100
+        n_blocks = max(1, int(np.ceil(n / rows_per_block)))
+        sample, (total_rows, rows_interval) = block_sample_csv(file_path, n_blocks, rows_per_block, random_state)
+        return SampleSummary(sample, total_rows, rows_interval=rows_interval)
+    else:
+        raise ValueError("Unsupported sampling method. Choose 'reservoir' or 'block'.")
+
+def mean_interval(values, confidence=0.95, population_size=None, blocks=None):
+    """
+    Confidence interval for a mean.
+
+    With ``blocks``, the interval is computed from the per-block means, which
+    accounts for rows within a block being correlated.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if blocks is not None:
+        values = pd.Series(values).groupby(np.asarray(blocks)).mean().to_numpy()
+    n = len(values)
+    if n < 2:
+        return (np.nan, np.nan)
+    estimate = values.mean()
+    se = values.std(ddof=1) / np.sqrt(n)
+    if population_size and blocks is None and population_size > n:
+        se *= np.sqrt((population_size - n) / (population_size - 1))
+    margin = stats.t.ppf(0.5 + confidence / 2, n - 1) * se
+    return (estimate - margin, estimate + margin)
+
+def quantile_interval(values, q, confidence=0.95):
+    """Distribution-free confidence interval for a quantile, from order statistics."""
+    values = np.sort(np.asarray(values, dtype=np.float64))
+    n = len(values)
+    if n == 0:
+        return (np.nan, np.nan)
+    z = stats.norm.ppf(0.5 + confidence / 2)
+    spread = z * np.sqrt(n * q * (1 - q))
+    lower = int(np.clip(np.floor(n * q - spread), 0, n - 1))
+    upper = int(np.clip(np.ceil(n * q + spread), 0, n - 1))
+    return (values[lower], values[upper])
+
+def proportion_interval(successes, n, confidence=0.95):
+    """Wilson score interval for a proportion."""
+    if n == 0:
+        return (np.nan, np.nan)
+    z = stats.norm.ppf(0.5 + confidence / 2)
+    p = successes / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    margin = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return (center - margin, center + margin)
+
+def correlation_interval(r, n, confidence=0.95):
+    """Confidence interval for a Pearson correlation via the Fisher z-transform."""
+    if n <= 3 or np.isnan(r):
+        return (np.nan, np.nan)
+    z = np.arctanh(np.clip(r, -0.999999, 0.999999))
+    margin = stats.norm.ppf(0.5 + confidence / 2) / np.sqrt(n - 3)
+    return (np.tanh(z - margin), np.tanh(z + margin))
+
+class SampleSummary:
+    """
+    Statistics estimated from a sample, with confidence intervals.
+
+    Parameters:
+        sample (pd.DataFrame): The sampled rows (block samples carry a ``BLOCK_COLUMN`` column).
+        total_rows (float): Number of rows in the full dataset (exact or estimated).
+        rows_interval (tuple): Confidence interval of ``total_rows`` when it is estimated.
+        confidence (float): Confidence level of the intervals.
+    """
+
+    def __init__(self, sample, total_rows, rows_interval=None, confidence=0.95):
+        self.blocks = sample[BLOCK_COLUMN].to_numpy() if BLOCK_COLUMN in sample.columns else None
+        self.sample = sample.drop(columns=[BLOCK_COLUMN], errors='ignore')
+        self.total_rows = total_rows
+        self.rows_interval = rows_interval
+        self.confidence = confidence
+
+    @property
+    def rows(self):
+        return self.total_rows
+
+    def numeric_columns(self):
+        """Return the names of the numeric columns."""
+        return self.sample.select_dtypes(include=['float64', 'int64']).columns.tolist()
+
+    def intervals(self):
+        """
+        Return estimates with confidence intervals.
+
+        Returns:
+            pd.DataFrame: Rows indexed by (column, statistic) with 'estimate', 'lower' and 'upper'.
+        """
+        records = []
+        n = len(self.sample)
+        for column in self.sample.columns:
+            series = self.sample[column]
+            mask = series.notna().to_numpy()
+            nulls = n - int(mask.sum())
+            lower, upper = proportion_interval(nulls, n, self.confidence)
+            records.append((column, 'null_fraction', nulls / n if n else np.nan, lower, upper))
+            if column in self.numeric_columns():
+                values = series.to_numpy(dtype=np.float64)[mask]
+                blocks = self.blocks[mask] if self.blocks is not None else None
+                lower, upper = mean_interval(values, self.confidence, self.total_rows, blocks)
+                records.append((column, 'mean', values.mean() if len(values) else np.nan, lower, upper))
+                for q, name in [(0.25, '25%'), (0.5, '50%'), (0.75, '75%')]:
+                    lower, upper = quantile_interval(values, q, self.confidence)
+                    estimate = np.quantile(values, q) if len(values) else np.nan
+                    records.append((column, name, estimate, lower, upper))
+            else:
+                counts = series.value_counts()
+                if len(counts):
+                    lower, upper = proportion_interval(int(counts.iloc[0]), n, self.confidence)
+                    records.append((column, f"share of '{counts.index[0]}'", counts.iloc[0] / n, lower, upper))
+        frame = pd.DataFrame(records, columns=['column', 'statistic', 'estimate', 'lower', 'upper'])
+        return frame.set_index(['column', 'statistic'])
+
+    def correlation_intervals(self):
+        """Return the sample correlation of every numeric column pair with its confidence interval."""
+        columns = self.numeric_columns()
+        corr = self.sample[columns].corr()
+        records = []
+        for i, first in enumerate(columns):
+            for second in columns[i + 1:]:
+                n = int(self.sample[[first, second]].dropna().shape[0])
+                lower, upper = correlation_interval(corr.loc[first, second], n, self.confidence)
+                records.append((first, second, corr.loc[first, second], lower, upper))
+        return pd.DataFrame(records, columns=['column_1', 'column_2', 'estimate', 'lower', 'upper'])
+
+    def to_frame(self):
+        """Return 'estimate ± margin' strings with one column per data column."""
+        intervals = self.intervals()
+        cells = intervals.apply(
+            lambda row: f"{row['estimate']:.6g} ± {(row['upper'] - row['lower']) / 2:.2g}", axis=1)
+        statistics = list(dict.fromkeys(intervals.index.get_level_values('statistic')))
+        return cells.unstack(level=0).reindex(index=statistics, columns=self.sample.columns)
+
+    def to_string(self):
+        """Return a printable summary including the confidence level and row count estimate."""
+        lines = [f"Estimated from a sample of {len(self.sample)} rows "
+                 f"({self.confidence:.0%} confidence intervals)."]
+        if self.rows_interval is not None:
+            lower, upper = self.rows_interval
+            lines.append(f"Rows: ~{self.total_rows:.0f} (between {lower:.0f} and {upper:.0f})")
+        else:
+            lines.append(f"Rows: {self.total_rows}")
+        lines.append(self.to_frame().to_string())
+        correlations = self.correlation_intervals()
+        if len(correlations):
+            lines.append("Correlations:")
+            for row in correlations.itertuples(index=False):
+                lines.append(f"  {row.column_1} ~ {row.column_2}: {row.estimate:.3f} "
+                             f"[{row.lower:.3f}, {row.upper:.3f}]")
+        return '\n'.join(lines)
@@ -3,37 +3,661 @@
 import schedule
 import time
 import threading
-import subprocess
+import importlib
+import multiprocessing
+import queue
 import sys
+import os
+import json
+from collections import deque
+from concurrent.futures import Future
+from dataauto.instrumentation import reset_peak_rss, peak_rss_bytes
+from dataauto.triggers import Trigger, TriggerLoop, CronTrigger, IntervalTrigger, FileTrigger
 
-def run_command(command, file_path):
-    """Run a CLI command using subprocess."""
-    subprocess.run([sys.executable, '-m', 'dataauto.cli', command, file_path])
+# Modules imported once by every worker process, so jobs do not pay for them.
+PRELOAD_MODULES = ['numpy', 'pandas', 'sklearn.ensemble', 'matplotlib.pyplot', 'seaborn', 'plotly.express',
+                   'dataauto.data_loader', 'dataauto.data_profiler', 'dataauto.data_cleaner', 'dataauto.model_trainer',
+                   'dataauto.data_plotter', 'dataauto.report_generator']
+# Click command that jobs are dispatched to, as 'module:attribute'.
+DEFAULT_TARGET = 'dataauto.cli:cli'
 
-def schedule_command(command, file_path, schedule_time):
+# Memory assumed for a job that has never run before.
+DEFAULT_JOB_MEMORY = 512 * 1024 ** 2
+# Number of past runs per job kept for footprint estimates.
+HISTORY_RUNS = 20
+
+# Pool and executor shared by scheduled jobs, created on first use by get_pool() / get_executor().
+_default_pool = None
+_default_executor = None
+_default_pool_options = {'workers': 2, 'timeout': None, 'memory_budget': None, 'history_file': None}
+_default_pool_lock = threading.Lock()
+# Loop running every trigger of scheduled jobs, and the thread running it once started.
+_trigger_loop = TriggerLoop()
+_scheduler_thread = None
+# Set by stop_scheduler() to end run_scheduler().
+_scheduler_stop = threading.Event()
+# Triggers and daily jobs added by schedule_command(), removed again by shutdown_scheduler().
+_scheduled = []
+
+class JobResult:
+    """
+    Outcome of a job run by a WorkerPool.
+
+    Parameters:
+        args (list): Command line arguments of the job.
+        exit_code (int): 0 on success.
+        error (str): Error message, or None.
+        duration (float): Wall time in seconds.
+        timed_out (bool): Whether the job was killed after exceeding its timeout.
+        peak_rss_bytes (int): Peak resident memory of the worker while running the job, if known.
+    """
+
+    def __init__(self, args, exit_code, error=None, duration=0.0, timed_out=False, peak_rss_bytes=None):
+        self.args = args
+        self.exit_code = exit_code
+        self.error = error
+        self.duration = duration
+        self.timed_out = timed_out
+        self.peak_rss_bytes = peak_rss_bytes
+
+    @property
+    def ok(self):
+        return self.exit_code == 0
+
+    def __repr__(self):
+        return f"JobResult(args={self.args!r}, exit_code={self.exit_code}, error={self.error!r}, duration={self.duration:.3f})"
+
+def _load_target(target):
+    module_name, attribute = target.split(':')
+    return getattr(importlib.import_module(module_name), attribute)
+
+def invoke_command(command, args):
+    """
+    Call a click command in-process and turn its outcome into an exit code.
+
+    Parameters:
+        command (click.Command): Command to call.
+        args (list): Command line arguments.
+
+    Returns:
+        tuple: ``(exit_code, error)`` where error is a message or None.
+    """
+    import click
+    error = None
+    try:
+        result = command.main(args=list(args), prog_name='dataauto', standalone_mode=False)
+        exit_code = result if isinstance(result, int) else 0
+    except click.exceptions.ClickException as e:
+        exit_code, error = e.exit_code, e.format_message()
+    except click.exceptions.Abort:
+        exit_code, error = 1, 'Aborted'
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        if exit_code:
+            error = f"Exited with status {e.code}"
+    except Exception as e:
+        exit_code, error = 1, f"{type(e).__name__}: {e}"
+    finally:
+        sys.stdout.flush()
+        if 'matplotlib.pyplot' in sys.modules:
+            # Figures left open by a failed job would otherwise accumulate
+            sys.modules['matplotlib.pyplot'].close('all')
+    return exit_code, error
+
+def _worker_main(conn, target, preload):
+    """Worker process loop: import heavy modules once, then run click commands in-process."""
+    # Jobs run here, not in a `dataauto daemon` that may be listening
+    os.environ['DATAAUTO_NO_DAEMON'] = '1'
+    import matplotlib
+    matplotlib.use('Agg')
+    for module in preload:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    command = _load_target(target)
+    conn.send('ready')
+    while True:
+        try:
+            args = conn.recv()
+        except EOFError:
+            break
+        if args is None:
+            break
+        reset_peak_rss()
+        start = time.perf_counter()
+        exit_code, error = invoke_command(command, args)
+        conn.send((exit_code, error, time.perf_counter() - start, peak_rss_bytes()))
+    conn.close()
+
+class _Worker:
+    """A long-lived worker process and the pipe used to send it jobs."""
+
+    def __init__(self, context, target, preload):
+        self.context = context
+        self.target = target
+        self.preload = preload
+        self.process = None
+        self.conn = None
+
+    def start(self):
+        self.conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(target=_worker_main, args=(child_conn, self.target, self.preload),
+                                            daemon=True)
+        self.process.start()
+        child_conn.close()
+        # Wait until the heavy imports are done so they are not charged to the first job's timeout
+        self.conn.recv()
+
+    def stop(self, kill=False):
+        if self.process is None:
+            return
+        if kill or not self.process.is_alive():
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                self.process.kill()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+        self.process = None
+
+    def run(self, args, timeout):
+        if self.process is None or not self.process.is_alive():
+            self.stop()
+            self.start()
+        start = time.perf_counter()
+        self.conn.send(list(args))
+        if not self.conn.poll(timeout):
+            # Kill the stuck worker; a fresh one is started for the next job
+            self.stop(kill=True)
+            return JobResult(args, 1, f"Timed out after {timeout}s", time.perf_counter() - start, timed_out=True)
+        try:
+            exit_code, error, duration, peak_rss = self.conn.recv()
+        except EOFError:
+            self.stop(kill=True)
+            return JobResult(args, 1, "Worker process exited unexpectedly", time.perf_counter() - start)
+        return JobResult(args, exit_code, error, duration, peak_rss_bytes=peak_rss)
+
+class WorkerPool:
+    """
+    Pool of long-lived processes that run dataauto CLI commands in-process.
+
+    Each worker imports pandas, scikit-learn, matplotlib, etc. once when it
+    starts and then executes jobs by calling the click command directly, so a
+    job costs only its own work instead of a new interpreter and all imports.
+    A job that exceeds its timeout is killed together with its worker, which
+    is replaced by a fresh one.
+
+    Parameters:
+        workers (int): Number of worker processes, i.e. how many jobs run concurrently.
+        timeout (float): Default per-job timeout in seconds, or None for no limit.
+        preload (list): Modules imported by every worker at start-up.
+        target (str): Click command that jobs are dispatched to, as 'module:attribute'.
+    """
+
+    def __init__(self, workers=2, timeout=None, preload=PRELOAD_MODULES, target=DEFAULT_TARGET):
+        if workers < 1:
+            raise ValueError("A worker pool needs at least one worker.")
+        self.workers = workers
+        self.timeout = timeout
+        self.preload = list(preload)
+        self.target = target
+        self._jobs = queue.Queue()
+        self._threads = []
+        self._context = multiprocessing.get_context('spawn')
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the worker processes (done automatically by the first ``submit``)."""
+        with self._lock:
+            if self._threads:
+                return self
+            for index in range(self.workers):
+                worker = _Worker(self._context, self.target, self.preload)
+                thread = threading.Thread(target=self._serve, args=(worker,), name=f"dataauto-worker-{index}",
+                                          daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def _serve(self, worker):
+        try:
+            worker.start()
+        except Exception:
+            # Started again on demand by the first job
+            worker.stop(kill=True)
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            args, timeout, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(worker.run(args, timeout))
+            except Exception as e:
+                future.set_exception(e)
+        worker.stop()
+
+    def submit(self, args, timeout=None):
+        """
+        Queue a job without waiting for it.
+
+        Parameters:
+            args (list): Command line arguments, e.g. ``['summarize', 'data.csv']``.
+            timeout (float): Timeout for this job; the pool default if None.
+
+        Returns:
+            concurrent.futures.Future: Resolves to a JobResult.
+        """
+        self.start()
+        future = Future()
+        self._jobs.put((list(args), timeout if timeout is not None else self.timeout, future))
+        return future
+
+    def run(self, args, timeout=None):
+        """Run a job and wait for its JobResult."""
+        return self.submit(args, timeout).result()
+
+    def shutdown(self):
+        """Stop the workers after the queued jobs have finished."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._jobs.put(None)
+        for thread in threads:
+            thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        return False
+
+def physical_memory_bytes():
+    """Return the total physical memory of the machine, or None if it cannot be determined."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def _input_bytes(input_path):
+    if input_path is None:
+        return None
+    try:
+        return os.path.getsize(input_path)
+    except OSError:
+        return None
+
+class JobExecutor:
+    """
+    Run named jobs concurrently within a CPU and memory budget.
+
+    Each job occupies one worker of a WorkerPool (one CPU) and is charged the
+    memory it is expected to need, estimated from its previous runs: the
+    highest recent peak RSS, scaled up when the input file has grown since.
+    Queued jobs are admitted in submission order while both budgets allow;
+    a job is always admitted when nothing else is running, so a single job
+    larger than the memory budget still runs (alone). A job submitted while
+    another run of the same name is queued or running is skipped rather than
+    started twice.
+
+    Every run is recorded as a dict with the keys ``name``, ``args``,
+    ``status`` ('succeeded', 'failed', 'timed_out' or 'skipped'),
+    ``exit_code``, ``error``, ``submitted_at``, ``started_at``,
+    ``finished_at``, ``queue_wait``, ``run_time``, ``input_bytes``,
+    ``estimated_memory`` and ``peak_rss``; records are appended as JSON lines
+    to ``history_file`` and reloaded from it, so estimates survive restarts.
+
+    Parameters:
+        cpu_budget (int): Maximum number of jobs running at once.
+        memory_budget (int): Memory in bytes the running jobs may use together;
+            defaults to 75% of physical memory.
+        timeout (float): Per-job timeout in seconds, or None for no limit.
+        history_file (str): JSON lines file of past runs, or None to keep history in memory only.
+        pool (WorkerPool): Pool to run jobs in; one with ``cpu_budget`` workers is created if None.
     """
-    Schedule a CLI command at a specific time using the schedule module.
+
+    def __init__(self, cpu_budget=2, memory_budget=None, timeout=None, history_file=None, pool=None):
+        if cpu_budget < 1:
+            raise ValueError("The CPU budget must allow at least one job.")
+        if memory_budget is None:
+            physical = physical_memory_bytes()
+            memory_budget = int(physical * 0.75) if physical else None
+        self.cpu_budget = cpu_budget
+        self.memory_budget = memory_budget
+        self.history_file = history_file
+        self.pool = pool if pool is not None else WorkerPool(workers=cpu_budget, timeout=timeout)
+        self.timeout = timeout
+        self._pending = deque()
+        self._running = {}
+        self._history = {}
+        self._lock = threading.Lock()
+        # Serializes appends to history_file, which happen outside ``_lock``
+        self._history_lock = threading.Lock()
+        self._load_history()
+
+    def _load_history(self):
+        if not self.history_file or not os.path.exists(self.history_file):
+            return
+        with open(self.history_file) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash
+                    continue
+                self._remember(record)
+
+    def _remember(self, record):
+        if record.get('peak_rss'):
+            self._history.setdefault(record['name'], deque(maxlen=HISTORY_RUNS)).append(record)
+
+    def history(self, name):
+        """Return the recorded runs of job ``name`` that reported a peak RSS, oldest first."""
+        with self._lock:
+            return list(self._history.get(name, ()))
+
+    def estimate_memory(self, name, input_bytes=None):
+        """
+        Estimate the peak memory of the next run of job ``name``.
+
+        Parameters:
+            name (str): Job name.
+            input_bytes (int): Current size of the job's input file, if known.
+
+        Returns:
+            int: Estimated peak RSS in bytes.
+        """
+        runs = self._history.get(name)
+        if not runs:
+            return DEFAULT_JOB_MEMORY
+        estimate = 0
+        for run in runs:
+            peak = run['peak_rss']
+            if input_bytes and run.get('input_bytes'):
+                peak = peak * max(1.0, input_bytes / run['input_bytes'])
+            estimate = max(estimate, peak)
+        return int(estimate)
+
+    def _memory_in_use(self):
+        return sum(record['estimated_memory'] for record in self._running.values())
+
+    def submit(self, name, args, input_path=None):
+        """
+        Queue job ``name`` unless a run of it is already queued or running.
+
+        Parameters:
+            name (str): Job name; runs with the same name never overlap.
+            args (list): Command line arguments of the job.
+            input_path (str): Input file of the job, used to scale its memory estimate.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the job's record.
+        """
+        future = Future()
+        now = time.time()
+        record = {
+            'name': name,
+            'args': list(args),
+            'status': None,
+            'exit_code': None,
+            'error': None,
+            'submitted_at': now,
+            'started_at': None,
+            'finished_at': None,
+            'queue_wait': None,
+            'run_time': None,
+            'input_bytes': _input_bytes(input_path),
+            'estimated_memory': None,
+            'peak_rss': None,
+        }
+        with self._lock:
+            if name in self._running or any(queued['name'] == name for queued, _ in self._pending):
+                record.update(status='skipped', finished_at=now)
+                future.set_result(record)
+                return future
+            record['estimated_memory'] = self.estimate_memory(name, record['input_bytes'])
+            self._pending.append((record, future))
+            admitted = self._admit()
+        self._start(admitted)
+        return future
+
+    def _admit(self):
+        """
+        Move queued jobs, in order, to the running set while the budgets allow. Called with the lock held.
+
+        Returns:
+            list: (record, future) pairs to pass to ``_start`` once the lock is released.
+        """
+        admitted = []
+        while self._pending:
+            record, future = self._pending[0]
+            if self._running:
+                if len(self._running) + 1 > self.cpu_budget:
+                    break
+                if (self.memory_budget is not None
+                        and self._memory_in_use() + record['estimated_memory'] > self.memory_budget):
+                    break
+            self._pending.popleft()
+            record['started_at'] = time.time()
+            record['queue_wait'] = record['started_at'] - record['submitted_at']
+            self._running[record['name']] = record
+            admitted.append((record, future))
+        return admitted
+
+    def _start(self, admitted):
+        # Outside the lock: a callback added to a future that is already done runs right away and takes the lock
+        for record, future in admitted:
+            self.pool.submit(record['args'], self.timeout).add_done_callback(
+                lambda done, record=record, future=future: self._finish(record, future, done))
+
+    def _finish(self, record, future, done):
+        record['finished_at'] = time.time()
+        record['run_time'] = record['finished_at'] - record['started_at']
+        try:
+            result = done.result()
+        except Exception as e:
+            record.update(status='failed', exit_code=1, error=f"{type(e).__name__}: {e}")
+        else:
+            status = 'timed_out' if result.timed_out else ('succeeded' if result.ok else 'failed')
+            record.update(status=status, exit_code=result.exit_code, error=result.error,
+                          peak_rss=result.peak_rss_bytes)
+        if self.history_file:
+            with self._history_lock:
+                with open(self.history_file, 'a') as f:
+                    f.write(json.dumps(record) + '\n')
+        with self._lock:
+            del self._running[record['name']]
+            self._remember(record)
+            admitted = self._admit()
+        self._start(admitted)
+        future.set_result(record)
+
+    def run(self, name, args, input_path=None):
+        """Run job ``name`` and wait for its record."""
+        return self.submit(name, args, input_path).result()
+
+    def shutdown(self):
+        """Stop the pool after the running jobs have finished; queued jobs still start first."""
+        while True:
+            with self._lock:
+                if not self._pending and not self._running:
+                    break
+            time.sleep(0.05)
+        self.pool.shutdown()
+
+def configure_pool(workers=2, timeout=None, memory_budget=None, history_file=None):
+    """
+    Set the budgets and per-job timeout used by scheduled jobs.
+
+    Parameters:
+        workers (int): Number of worker processes, i.e. the CPU budget.
+        timeout (float): Per-job timeout in seconds, or None for no limit.
+        memory_budget (int): Memory budget in bytes; 75% of physical memory if None.
+        history_file (str): JSON lines file recording every run, or None.
+
+    Takes effect when the pool is first used.
+    """
+    _default_pool_options.update(workers=workers, timeout=timeout, memory_budget=memory_budget,
+                                 history_file=history_file)
+
+def get_pool():
+    """Return the shared WorkerPool used by scheduled jobs, creating it on first use."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = WorkerPool(workers=_default_pool_options['workers'],
+                                       timeout=_default_pool_options['timeout'])
+        return _default_pool
+
+def get_executor():
+    """Return the shared JobExecutor used by scheduled jobs, creating it on first use."""
+    global _default_executor
+    pool = get_pool()
+    with _default_pool_lock:
+        if _default_executor is None:
+            _default_executor = JobExecutor(
+                cpu_budget=_default_pool_options['workers'],
+                memory_budget=_default_pool_options['memory_budget'],
+                timeout=_default_pool_options['timeout'],
+                history_file=_default_pool_options['history_file'],
+                pool=pool,
+            )
+        return _default_executor
+
+def _log_record(future):
+    try:
+        record = future.result()
+    except Exception as e:
+        print(f"Scheduled job failed: {e}", file=sys.stderr)
+        return
+    if record['status'] == 'skipped':
+        print(f"Scheduled job {record['name']} skipped: the previous run has not finished.", file=sys.stderr)
+    elif record['status'] != 'succeeded':
+        print(f"Scheduled job {record['name']} failed: {record['error']}", file=sys.stderr)
+
+def run_command(command, file_path, args=(), timeout=None):
+    """
+    Run a CLI command in the shared worker pool and wait for it.
+
+    Returns:
+        JobResult: Outcome of the command.
+    """
+    return get_pool().run([command, file_path, *args], timeout=timeout)
+
+class _ScheduleLibraryJobs(Trigger):
+    """Runs the daily jobs registered with the schedule module as part of the trigger loop."""
+
+    def deadline(self):
+        idle = schedule.idle_seconds()
+        return None if idle is None else time.time() + idle
+
+    def fire(self, now):
+        schedule.run_pending()
+
+_trigger_loop.add(_ScheduleLibraryJobs())
+
+def _start_scheduler():
+    global _scheduler_thread
+    with _default_pool_lock:
+        if _scheduler_thread is None:
+            _scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
+            _scheduler_thread.start()
+    _trigger_loop.wake()
+
+def schedule_command(command, file_path, schedule_time=None, args=(), cron=None, every=None, watch=None,
+                     patterns=None, debounce=2.0, max_delay=60.0, background=True):
+    """
+    Schedule a CLI command daily, on a cron expression, at an interval or when files change.
+
+    The job is handed to the shared JobExecutor (see ``configure_pool``), so
+    the scheduler thread never blocks on a running command, due jobs run
+    concurrently within the CPU and memory budgets, and a run is skipped if
+    the previous run of the same job is still going. The scheduler thread
+    sleeps until the next deadline or file event instead of polling.
 
     Parameters:
         command (str): CLI command to execute.
         file_path (str): File path to pass to the command.
-        schedule_time (str): Time to execute the command in HH:MM format.
+        schedule_time (str): Time to execute the command daily in HH:MM format.
+        args (tuple): Extra arguments passed to the command (e.g. ``('--state-file', 'log.state.json')``
+            so that scheduled summarize/report runs only read newly appended rows).
+        cron (str): Cron expression, e.g. ``'*/15 * * * *'``.
+        every (float): Interval in seconds between runs.
+        watch (list): Files or directories whose changes trigger a run. A burst of
+            changes within ``debounce`` seconds causes a single run, and changes
+            made while the job runs cause one more run after it.
+        patterns (list): Glob patterns of file names that trigger a run (with ``watch``).
+        debounce (float): Quiet period in seconds before a file-triggered run.
+        max_delay (float): Longest delay in seconds between a file change and the run.
+        background (bool): Start the scheduler thread; if False, the caller runs ``run_scheduler()`` itself.
 
     Returns:
         None
     """
+    triggers = [value for value in (schedule_time, cron, every, watch) if value]
+    if len(triggers) != 1:
+        raise ValueError("Specify exactly one of a daily time, a cron expression, an interval or paths to watch.")
+    job_args = [command, file_path, *args]
+    name = ' '.join(job_args)
+
     def job():
-        run_command(command, file_path)
+        future = get_executor().submit(name, job_args, input_path=file_path)
+        future.add_done_callback(_log_record)
+        return future
 
-    try:
-        schedule.every().day.at(schedule_time).do(job)
-        scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-        scheduler_thread.start()
-    except Exception as e:
-        raise e
+    if schedule_time:
+        _scheduled.append(schedule.every().day.at(schedule_time).do(job))
+    elif cron:
+        _scheduled.append(_trigger_loop.add(CronTrigger(cron, job)))
+    elif every:
+        _scheduled.append(_trigger_loop.add(IntervalTrigger(every, job)))
+    else:
+        _scheduled.append(_trigger_loop.add(FileTrigger(watch, lambda changed: job(), patterns=patterns,
+                                                        debounce=debounce, max_delay=max_delay)))
+    if background:
+        _start_scheduler()
+    else:
+        _trigger_loop.wake()
 
 def run_scheduler():
-    """Run the scheduler to execute pending jobs."""
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
\ No newline at end of file
+    """Run the scheduled jobs until ``stop_scheduler()``, sleeping until one is due or a watched file changes."""
+    _trigger_loop.run(_scheduler_stop)
+
+def stop_scheduler():
+    """Make ``run_scheduler()`` return."""
+    _scheduler_stop.set()
+    _trigger_loop.wake()
+
+def shutdown_scheduler():
+    """
+    Remove the scheduled jobs, then wait for the running ones and stop the shared executor and worker pool.
+
+    Call after ``stop_scheduler()``, or once ``run_scheduler()`` has returned.
+    """
+    global _default_pool, _default_executor, _scheduler_thread
+    with _default_pool_lock:
+        thread, _scheduler_thread = _scheduler_thread, None
+    if thread is not None:
+        thread.join()
+    while _scheduled:
+        job = _scheduled.pop()
+        if isinstance(job, Trigger):
+            _trigger_loop.remove(job)
+        else:
+            schedule.cancel_job(job)
+    with _default_pool_lock:
+        executor, _default_executor = _default_executor, None
+        pool, _default_pool = _default_pool, None
+    if executor is not None:
+        executor.shutdown()
+    elif pool is not None:
+        pool.shutdown()
+    _scheduler_stop.clear()
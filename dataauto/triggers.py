@@ -0,0 +1,354 @@
+# dataauto/triggers.py
+
+import fnmatch
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+CRON_ALIASES = {
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+    '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@hourly': '0 * * * *',
+}
+MONTH_NAMES = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+DAY_NAMES = ['sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat']
+# How far ahead next_after looks before deciding an expression never matches (e.g. '0 0 30 2 *').
+CRON_SEARCH_DAYS = 366 * 5
+
+def _parse_cron_value(value, low, names):
+    value = value.lower()
+    if names and value in names:
+        return names.index(value) + low
+    return int(value)
+
+def _parse_cron_field(field, low, high, names=None):
+    """Return the set of values matched by one cron field, e.g. '*/15' or '1-5,10'."""
+    values = set()
+    for part in field.split(','):
+        range_part, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if range_part == '*':
+            start, end = low, high
+        elif '-' in range_part:
+            start, end = (_parse_cron_value(value, low, names) for value in range_part.split('-', 1))
+        else:
+            start = _parse_cron_value(range_part, low, names)
+            end = high if step != 1 else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Invalid cron field {field!r}: values must be within {low}-{high}.")
+        values.update(range(start, end + 1, step))
+    return values
+
+class CronExpression:
+    """
+    Standard five-field cron expression: minute, hour, day of month, month and day of week.
+
+    Fields accept ``*``, numbers, ranges (``1-5``), steps (``*/15``, ``0-30/10``),
+    lists (``1,15``) and month/day names (``jan``, ``mon``); Sunday is 0 or 7.
+    As in cron, when both the day of month and the day of week are
+    restricted a day matching either one matches. The aliases ``@hourly``,
+    ``@daily``, ``@weekly``, ``@monthly`` and ``@yearly`` are supported.
+
+    Parameters:
+        expression (str): Cron expression, e.g. ``'30 2 * * 1-5'``.
+    """
+
+    def __init__(self, expression):
+        self.expression = expression
+        fields = CRON_ALIASES.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"A cron expression needs 5 fields, got {expression!r}.")
+        minute, hour, day, month, weekday = fields
+        self.minutes = _parse_cron_field(minute, 0, 59)
+        self.hours = _parse_cron_field(hour, 0, 23)
+        self.days = _parse_cron_field(day, 1, 31)
+        self.months = _parse_cron_field(month, 1, 12, MONTH_NAMES)
+        self.weekdays = {value % 7 for value in _parse_cron_field(weekday, 0, 7, DAY_NAMES)}
+        self._any_day = day.startswith('*')
+        self._any_weekday = weekday.startswith('*')
+
+    def _matches_day(self, date):
+        day_matches = date.day in self.days
+        # Python counts weekdays from Monday, cron from Sunday
+        weekday_matches = (date.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_matches and weekday_matches
+        return day_matches or weekday_matches
+
+    def next_after(self, moment):
+        """
+        Return the first matching minute strictly after ``moment``.
+
+        Parameters:
+            moment (datetime): Naive local time.
+
+        Returns:
+            datetime: The next run time.
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=CRON_SEARCH_DAYS)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._matches_day(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            later = [minute for minute in self.minutes if minute >= candidate.minute]
+            if not later:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            return candidate.replace(minute=min(later))
+        raise ValueError(f"Cron expression {self.expression!r} never matches.")
+
+class Trigger:
+    """
+    Base class of the triggers run by a TriggerLoop.
+
+    Subclasses implement ``deadline`` (epoch seconds of the next run, or None
+    while nothing is due) and ``fire``.
+    """
+
+    loop = None
+
+    def deadline(self):
+        raise NotImplementedError
+
+    def fire(self, now):
+        raise NotImplementedError
+
+    def attach(self, loop):
+        self.loop = loop
+
+    def detach(self):
+        self.loop = None
+
+class CronTrigger(Trigger):
+    """
+    Call ``callback()`` at the times matched by a cron expression.
+
+    Runs missed while the process was busy or suspended are not repeated.
+
+    Parameters:
+        expression (str): Cron expression (see CronExpression).
+        callback (callable): Function called on every run.
+    """
+
+    def __init__(self, expression, callback):
+        self.cron = CronExpression(expression)
+        self.callback = callback
+        self._next = self.cron.next_after(datetime.now()).timestamp()
+
+    def deadline(self):
+        return self._next
+
+    def fire(self, now):
+        self._next = self.cron.next_after(datetime.fromtimestamp(now)).timestamp()
+        self.callback()
+
+class IntervalTrigger(Trigger):
+    """
+    Call ``callback()`` every ``seconds`` seconds, starting one interval from now.
+
+    Parameters:
+        seconds (float): Interval between runs.
+        callback (callable): Function called on every run.
+    """
+
+    def __init__(self, seconds, callback):
+        if seconds <= 0:
+            raise ValueError("The interval must be positive.")
+        self.seconds = seconds
+        self.callback = callback
+        self._next = time.time() + seconds
+
+    def deadline(self):
+        return self._next
+
+    def fire(self, now):
+        while self._next <= now:
+            self._next += self.seconds
+        self.callback()
+
+class FileTrigger(Trigger):
+    """
+    Call ``callback(paths)`` when files are created, modified or moved into watched paths.
+
+    Events are debounced and coalesced: the callback runs once the watched
+    paths have been quiet for ``debounce`` seconds (or at the latest
+    ``max_delay`` seconds after the first event of a burst) with the sorted
+    list of every changed file, so 500 partition files landing together cause
+    a single run. If the callback returns a Future, the trigger waits for it
+    before running again; events arriving meanwhile are batched into the
+    next run.
+
+    Parameters:
+        paths (list): Files or directories to watch (directories recursively).
+        callback (callable): Function called with the list of changed files.
+        patterns (list): Glob patterns of file names to react to, e.g. ``['*.csv']``; all files if None.
+        debounce (float): Quiet period in seconds before a run.
+        max_delay (float): Longest delay in seconds between the first event and the run.
+    """
+
+    def __init__(self, paths, callback, patterns=None, debounce=2.0, max_delay=60.0):
+        if isinstance(paths, str):
+            paths = [paths]
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.callback = callback
+        self.patterns = list(patterns) if patterns else None
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._changed = set()
+        self._first_event = None
+        self._last_event = None
+        self._running = None
+        self._lock = threading.Lock()
+        self._watches = []
+
+    def matches(self, path):
+        """Whether a change to ``path`` concerns this trigger."""
+        path = os.path.abspath(path)
+        if not any(path == watched or path.startswith(watched.rstrip(os.sep) + os.sep) for watched in self.paths):
+            return False
+        name = os.path.basename(path)
+        return self.patterns is None or any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
+
+    def notify(self, path):
+        """Record a change to ``path`` (called by the file system observer)."""
+        if not self.matches(path):
+            return
+        now = time.time()
+        with self._lock:
+            self._changed.add(os.path.abspath(path))
+            if self._first_event is None:
+                self._first_event = now
+            self._last_event = now
+        if self.loop is not None:
+            self.loop.wake()
+
+    def deadline(self):
+        with self._lock:
+            if not self._changed or (self._running is not None and not self._running.done()):
+                return None
+            return min(self._last_event + self.debounce, self._first_event + self.max_delay)
+
+    def fire(self, now):
+        with self._lock:
+            changed, self._changed = sorted(self._changed), set()
+            self._first_event = self._last_event = None
+        result = self.callback(changed)
+        if hasattr(result, 'add_done_callback'):
+            with self._lock:
+                self._running = result
+            if self.loop is not None:
+                result.add_done_callback(lambda _: self.loop.wake() if self.loop is not None else None)
+
+    def attach(self, loop):
+        super().attach(loop)
+        handler = _change_handler(self)
+        for path in self.paths:
+            if os.path.isdir(path):
+                self._watches.append(loop.observer().schedule(handler, path, recursive=True))
+            else:
+                # Files are watched through their directory so replacing or creating them is seen too
+                self._watches.append(loop.observer().schedule(handler, os.path.dirname(path), recursive=False))
+
+    def detach(self):
+        if self.loop is not None:
+            for watch in self._watches:
+                self.loop.observer().unschedule(watch)
+        self._watches = []
+        super().detach()
+
+def _change_handler(trigger):
+    from watchdog.events import FileSystemEventHandler
+
+    class ChangeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory or event.event_type not in ('created', 'modified', 'moved', 'closed'):
+                return
+            trigger.notify(os.fsdecode(event.dest_path or event.src_path))
+
+    return ChangeHandler()
+
+class TriggerLoop:
+    """
+    Run triggers from a single thread that sleeps until the next deadline.
+
+    The loop wakes up when the earliest trigger is due or when a trigger
+    signals new work (e.g. a file event), instead of polling.
+    """
+
+    def __init__(self):
+        self.triggers = []
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._observer = None
+
+    def observer(self):
+        """Return the shared watchdog observer, starting it on first use."""
+        with self._lock:
+            if self._observer is None:
+                from watchdog.observers import Observer
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+            return self._observer
+
+    def add(self, trigger):
+        """Start running ``trigger``."""
+        trigger.attach(self)
+        with self._lock:
+            self.triggers.append(trigger)
+        self.wake()
+        return trigger
+
+    def remove(self, trigger):
+        with self._lock:
+            self.triggers.remove(trigger)
+        trigger.detach()
+
+    def wake(self):
+        """Make the loop re-check its triggers now."""
+        self._wakeup.set()
+
+    def run_pending(self, now=None):
+        """
+        Fire the triggers that are due.
+
+        Returns:
+            float: Seconds until the next deadline, or None if no trigger is scheduled.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            triggers = list(self.triggers)
+        for trigger in triggers:
+            deadline = trigger.deadline()
+            if deadline is not None and deadline <= now:
+                trigger.fire(now)
+        deadlines = [deadline for deadline in (trigger.deadline() for trigger in triggers) if deadline is not None]
+        return max(0.0, min(deadlines) - time.time()) if deadlines else None
+
+    def run(self, stop=None):
+        """
+        Run until ``stop`` (a threading.Event) is set; call ``wake()`` after setting it.
+        """
+        while stop is None or not stop.is_set():
+            timeout = self.run_pending()
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+    def close(self):
+        """Stop watching files."""
+        for trigger in list(self.triggers):
+            self.remove(trigger)
+        with self._lock:
+            observer, self._observer = self._observer, None
+        if observer is not None:
+            observer.stop()
+            observer.join()
@@ -0,0 +1,102 @@
+# tests/test_benchmarks.py
+
+import importlib
+import inspect
+import json
+import pandas as pd
+from click.testing import CliRunner
+from benchmarks.cases import all_cases
+from benchmarks.run import compare, main, run_benchmarks
+from benchmarks.synthetic import dataset_path, generate_frame, parse_column_spec
+
+BENCHMARKED_MODULES = ['data_loader', 'data_saver', 'data_cleaner', 'preprocessing', 'data_plotter',
+                       'model_trainer', 'report_generator']
+NOT_BENCHMARKED = {'data_loader.load_sql', 'data_loader.iter_sql', 'data_loader.create_sql_engine',
+                   'data_loader.set_frame_cache', 'data_saver.save_sql',
+                   'preprocessing.encoding_for_cardinality', 'preprocessing.categorical_transformers'}
+
+def test_generate_frame_is_deterministic():
+    df = generate_frame(500, columns='float:2,int:1,category:1,string:1,bool:1,datetime:1', null_rate=0.1,
+                        cardinality=7, seed=3)
+    pd.testing.assert_frame_equal(df, generate_frame(500, columns={'float': 2, 'int': 1, 'category': 1, 'string': 1,
+                                                                    'bool': 1, 'datetime': 1},
+                                                     null_rate=0.1, cardinality=7, seed=3))
+    assert not df.equals(generate_frame(500, null_rate=0.1, cardinality=7, seed=4))
+    assert list(df.columns) == ['float_0', 'float_1', 'int_0', 'category_0', 'string_0', 'bool_0', 'datetime_0',
+                                'target', 'label']
+    assert df['category_0'].nunique() <= 7
+    assert 0.05 < df['float_0'].isna().mean() < 0.15
+    assert df[['target', 'label']].notna().all().all()
+
+def test_parse_column_spec_rejects_unknown_kinds():
+    assert parse_column_spec('float:3,category') == {'float': 3, 'category': 1}
+    try:
+        parse_column_spec('complex:2')
+    except ValueError as e:
+        assert 'complex' in str(e)
+    else:
+        raise AssertionError("Expected a ValueError")
+
+def test_dataset_path_is_cached(tmp_path):
+    path = dataset_path(str(tmp_path), 100, format='csv', seed=1)
+    mtime = (tmp_path / path).stat().st_mtime_ns
+    assert dataset_path(str(tmp_path), 100, format='csv', seed=1) == path
+    assert (tmp_path / path).stat().st_mtime_ns == mtime
+    assert dataset_path(str(tmp_path), 100, format='csv', seed=2) != path
+    assert len(pd.read_csv(path)) == 100
+
+def test_every_public_function_has_a_case():
+    names = {case.name for case in all_cases()}
+    for module_name in BENCHMARKED_MODULES:
+        module = importlib.import_module(f"dataauto.{module_name}")
+        for name, obj in vars(module).items():
+            qualified = f"{module_name}.{name}"
+            if name.startswith('_') or getattr(obj, '__module__', None) != module.__name__:
+                continue
+            if (inspect.isfunction(obj) or inspect.isclass(obj)) and qualified not in NOT_BENCHMARKED:
+                assert qualified in names
+
+def test_run_benchmarks(tmp_path):
+    results = run_benchmarks([300], ['data_loader.load_csv', 'data_cleaner.*', 'data_saver.save_json'],
+                             data_dir=str(tmp_path), echo=lambda line: None, seed=0)
+    by_name = {result['name']: result for result in results['results']}
+    assert set(by_name) == {'data_loader.load_csv', 'data_cleaner.clean_data', 'data_cleaner.remove_outliers',
+                            'data_cleaner.scale_features', 'data_saver.save_json'}
+    for result in by_name.values():
+        assert 'error' not in result
+        assert result['rows'] == 300 and result['seconds'] > 0 and result['rows_per_second'] > 0
+    assert results['meta']['options'] == {'seed': 0}
+
+def result(name, seconds, memory, rows=1000):
+    return {'name': name, 'rows': rows, 'seconds': seconds, 'rows_per_second': rows / seconds,
+            'peak_memory_bytes': memory}
+
+def test_compare_flags_regressions():
+    mb = 1024 * 1024
+    baseline = {'results': [result('a', 1.0, 100 * mb), result('b', 1.0, 1 * mb), result('c', 1.0, 100 * mb),
+                            result('gone', 1.0, mb)]}
+    current = {'results': [result('a', 1.2, 110 * mb), result('b', 1.0, 10 * mb), result('c', 2.0, 200 * mb),
+                           result('new', 9.0, mb), {'name': 'a', 'rows': 10, 'error': 'ValueError: x'}]}
+    regressions = compare(current, baseline, threshold=0.25)
+    # 'b' grew tenfold but stays below the memory noise floor
+    assert [(r['name'], r['metric']) for r in regressions] == [('c', 'seconds'), ('c', 'peak_memory_bytes')]
+    assert regressions[0]['change'] == 1.0
+
+def test_cli_exits_on_regression(tmp_path):
+    runner = CliRunner()
+    baseline = tmp_path / 'baseline.json'
+    args = ['--rows', '2e2', '--case', 'data_cleaner.clean_data', '--data-dir', str(tmp_path)]
+    result = runner.invoke(main, args + ['--output', str(baseline)])
+    assert result.exit_code == 0, result.output
+    assert 'data_cleaner.clean_data' in result.output
+    assert json.loads(baseline.read_text())['results'][0]['rows'] == 200
+
+    result = runner.invoke(main, args + ['--baseline', str(baseline), '--threshold', '1000'])
+    assert result.exit_code == 0 and 'No regressions' in result.output
+
+    data = json.loads(baseline.read_text())
+    data['results'][0]['seconds'] = 1e-9
+    baseline.write_text(json.dumps(data))
+    result = runner.invoke(main, args + ['--baseline', str(baseline)])
+    assert result.exit_code == 1
+    assert 'REGRESSION data_cleaner.clean_data' in result.output
@@ -4,7 +4,11 @@ import pytest
 from click.testing import CliRunner
 from dataauto.cli import cli
 import os
+import json
 import pandas as pd
+import pstats
+import subprocess
+import sys
 
 @pytest.fixture
 def sample_csv(tmp_path):
@@ -63,6 +67,16 @@ def test_load_json_command(sample_json):
     assert f"Data loaded from {sample_json}." in result.output
     assert "Shape:" in result.output
 
+def test_load_json_pyarrow_command(sample_json):
+    pytest.importorskip('pyarrow')
+    runner = CliRunner()
+    result = runner.invoke(cli, ['load', str(sample_json), '--format', 'json', '--json-engine', 'pyarrow',
+                                 '--json-schema', 'Age:float64'])
+    if result.exit_code != 0:
+        print("CLI Output:", result.output)
+    assert result.exit_code == 0
+    assert f"Data loaded from {sample_json}. Shape: (3, 4)" in result.output
+
 def test_load_excel_command(sample_excel):
     runner = CliRunner()
     result = runner.invoke(cli, ['load', str(sample_excel), '--format', 'excel', '--sheet', 'Sheet1'])
@@ -72,6 +86,14 @@ def test_load_excel_command(sample_excel):
     assert f"Data loaded from {sample_excel}." in result.output
     assert "Shape:" in result.output
 
+def test_load_excel_all_sheets_command(sample_excel):
+    runner = CliRunner()
+    result = runner.invoke(cli, ['load', str(sample_excel), '--format', 'excel', '--all-sheets', '--n-jobs', '1'])
+    if result.exit_code != 0:
+        print("CLI Output:", result.output)
+    assert result.exit_code == 0
+    assert f"Sheet Sheet1 loaded from {sample_excel}. Shape: (3, 4)" in result.output
+
 def test_save_csv_command(sample_csv, tmp_path):
     runner = CliRunner()
     output_file = tmp_path / "output.csv"
@@ -102,6 +124,23 @@ def test_save_excel_command(sample_csv, tmp_path):
     assert f"Data saved successfully to {output_file} in EXCEL format." in result.output
     assert os.path.exists(output_file)
 
+def test_convert_command(sample_csv, tmp_path):
+    runner = CliRunner()
+    output_file = tmp_path / "output.jsonl"
+    result = runner.invoke(cli, ['convert', str(sample_csv), str(output_file), '--chunksize', '2'])
+    assert result.exit_code == 0, result.output
+    assert f"Converted 5 rows in 3 chunks from {sample_csv} to {output_file}." in result.output
+    pd.testing.assert_frame_equal(pd.read_json(output_file, lines=True), pd.read_csv(sample_csv))
+
+    excel_file = tmp_path / "output.xlsx"
+    result = runner.invoke(cli, ['convert', str(output_file), str(excel_file), '--output-sheet', 'Data'])
+    assert result.exit_code == 0, result.output
+    assert len(pd.read_excel(excel_file, sheet_name='Data')) == 5
+
+    result = runner.invoke(cli, ['convert', str(sample_csv), str(tmp_path / "output.bin")])
+    assert result.exit_code != 0
+    assert "Cannot infer the format" in result.output
+
 def test_clean_command(sample_csv, tmp_path):
     runner = CliRunner()
     output_file = tmp_path / "cleaned_data.csv"
@@ -156,6 +195,35 @@ def test_scale_command(sample_csv, tmp_path):
     assert f"Scaled data saved to {output_file}." in result.output
     assert os.path.exists(output_file)
 
+def test_filter_command(sample_csv, tmp_path):
+    runner = CliRunner()
+    output_file = tmp_path / "filtered.csv"
+    result = runner.invoke(cli, [
+        'filter', str(sample_csv), "Age > 30 and Department in ('Sales', 'Engineering')",
+        '--output-file', str(output_file)
+    ])
+    if result.exit_code != 0:
+        print("CLI Output:", result.output)
+    assert result.exit_code == 0
+    assert "Kept 2 rows matching Age > 30 and Department in ('Sales', 'Engineering')." in result.output
+    assert f"Filtered data saved to {output_file}." in result.output
+    assert list(pd.read_csv(output_file)['Name']) == ['Charlie', 'Eve']
+    result = runner.invoke(cli, ['filter', str(sample_csv), "Age > 'old'", '--output-file', str(output_file)])
+    assert result.exit_code != 0
+    assert "Error filtering data: Cannot compare Age (number) with 'old' (string)." in result.output
+
+def test_load_where_command(sample_csv, tmp_path):
+    pytest.importorskip('pyarrow')
+    parquet_file = tmp_path / "sample_data.parquet"
+    pd.read_csv(sample_csv).to_parquet(parquet_file, index=False)
+    runner = CliRunner()
+    for path, format in [(sample_csv, 'csv'), (parquet_file, 'parquet')]:
+        result = runner.invoke(cli, ['load', str(path), '--format', format, '--where', 'Salary >= 90000'])
+        if result.exit_code != 0:
+            print("CLI Output:", result.output)
+        assert result.exit_code == 0
+        assert f"Data loaded from {path}. Shape: (3, 4)" in result.output
+
 def test_plot_histogram_command(sample_csv, tmp_path):
     runner = CliRunner()
     output_dir = tmp_path / "plots"
@@ -188,4 +256,221 @@ def test_plot_scatter_command(sample_csv, tmp_path):
         print("CLI Output:", result.output)
     assert result.exit_code == 0
     assert os.path.exists(output_dir / "Age_vs_Salary_scatter.png")
-    assert os.path.exists(output_dir / "Age_vs_Salary_scatter.html")
\ No newline at end of file
+    assert os.path.exists(output_dir / "Age_vs_Salary_scatter.html")
+
+def test_train_and_predict_commands(sample_csv, tmp_path):
+    runner = CliRunner()
+    output_model = tmp_path / "model.joblib"
+    output_report = tmp_path / "report.txt"
+    result = runner.invoke(cli, [
+        'train', str(sample_csv),
+        '--target', 'Salary',
+        '--model-type', 'regressor',
+        '--output-model', str(output_model),
+        '--output-report', str(output_report)
+    ])
+    if result.exit_code != 0:
+        print("CLI Output:", result.output)
+    assert result.exit_code == 0
+    assert os.path.exists(output_model)
+    assert os.path.exists(f"{output_model}.meta.json")
+
+    output_file = tmp_path / "predictions.csv"
+    result = runner.invoke(cli, ['predict', str(output_model), str(sample_csv), '--output-file', str(output_file)])
+    if result.exit_code != 0:
+        print("CLI Output:", result.output)
+    assert result.exit_code == 0
+    assert f"Predictions for 5 rows saved to {output_file}." in result.output
+    assert 'prediction' in pd.read_csv(output_file).columns
+
+def test_train_incremental_command(sample_csv, tmp_path):
+    runner = CliRunner()
+    output_model = tmp_path / "model.joblib"
+    output_report = tmp_path / "report.txt"
+    result = runner.invoke(cli, [
+        'train', str(sample_csv),
+        '--target', 'Department',
+        '--model-type', 'classifier',
+        '--incremental', '--chunksize', '2',
+        '--output-model', str(output_model),
+        '--output-report', str(output_report)
+    ])
+    if result.exit_code != 0:
+        print("CLI Output:", result.output)
+    assert result.exit_code == 0
+    assert os.path.exists(output_model)
+
+def test_train_command_writes_timings(sample_csv, tmp_path):
+    runner = CliRunner()
+    output_report = tmp_path / "report.txt"
+    profile_file = tmp_path / "fit.prof"
+    result = runner.invoke(cli, [
+        'train', str(sample_csv),
+        '--target', 'Salary',
+        '--model-type', 'regressor',
+        '--output-model', str(tmp_path / "model.joblib"),
+        '--output-report', str(output_report),
+        '--profile-fit', str(profile_file)
+    ])
+    if result.exit_code != 0:
+        print("CLI Output:", result.output)
+    assert result.exit_code == 0
+    timings_file = tmp_path / "report.timings.json"
+    assert f"Stage timings saved to {timings_file}." in result.output
+    with open(timings_file) as f:
+        names = [record['name'] for record in json.load(f)['stages']]
+    assert {'load', 'train/preprocess', 'train/fit', 'train/metrics', 'save'} <= set(names)
+    assert os.path.exists(profile_file)
+
+@pytest.mark.parametrize('profile', [False, True])
+def test_train_command_traces_memory_only_when_profiling(sample_csv, tmp_path, mocker, profile):
+    import tracemalloc
+    start = mocker.spy(tracemalloc, 'start')
+    output_report = tmp_path / "report.txt"
+    result = CliRunner().invoke(cli, ['--profile'] * profile + [
+        'train', str(sample_csv), '--target', 'Salary', '--model-type', 'regressor',
+        '--output-model', str(tmp_path / "model.joblib"), '--output-report', str(output_report)
+    ])
+    assert result.exit_code == 0
+    assert start.called == profile
+    with open(tmp_path / "report.timings.json") as f:
+        stages = json.load(f)['stages']
+    assert all(('peak_memory_bytes' in record) == profile for record in stages)
+    assert all('max_rss_bytes' in record for record in stages)
+
+def test_summarize_command(sample_csv):
+    runner = CliRunner()
+    result = runner.invoke(cli, ['summarize', str(sample_csv), '--chunksize', '2'])
+    if result.exit_code != 0:
+        print("CLI Output:", result.output)
+    assert result.exit_code == 0
+    assert "Rows: 5" in result.output
+    assert "Salary" in result.output
+    assert "distinct" in result.output
+
+def test_report_command(sample_csv, tmp_path):
+    runner = CliRunner()
+    output_report = tmp_path / "report.pdf"
+    result = runner.invoke(cli, ['report', str(sample_csv), '--output-report', str(output_report)])
+    if result.exit_code != 0:
+        print("CLI Output:", result.output)
+    assert result.exit_code == 0
+    assert os.path.exists(output_report)
+
+def test_html_report_command(sample_csv, tmp_path):
+    runner = CliRunner()
+    output_report = tmp_path / "report.html"
+    result = runner.invoke(cli, ['report', str(sample_csv), '--output-report', str(output_report), '--chunksize', '2'])
+    if result.exit_code != 0:
+        print("CLI Output:", result.output)
+    assert result.exit_code == 0
+    html = output_report.read_text()
+    assert 'id="report-data"' in html
+    assert 'Salary' in html
+
+def test_summarize_and_report_with_state_file(sample_csv, tmp_path):
+    runner = CliRunner()
+    state_file = tmp_path / "state.json"
+    result = runner.invoke(cli, ['summarize', str(sample_csv), '--state-file', str(state_file)])
+    assert result.exit_code == 0
+    assert "Processed 5 new rows." in result.output
+    with open(sample_csv, 'a') as f:
+        f.write("Frank,50,120000,Sales\n")
+    result = runner.invoke(cli, ['summarize', str(sample_csv), '--state-file', str(state_file)])
+    assert result.exit_code == 0
+    assert "Processed 1 new rows." in result.output
+    assert "Rows: 6" in result.output
+
+    report_state = tmp_path / "report_state.json"
+    for output_report in [tmp_path / "report.pdf", tmp_path / "report.html"]:
+        result = runner.invoke(cli, ['report', str(sample_csv), '--output-report', str(output_report),
+                                     '--state-file', str(report_state), '--n-jobs', '1'])
+        if result.exit_code != 0:
+            print("CLI Output:", result.output)
+        assert result.exit_code == 0
+        assert os.path.exists(output_report)
+
+def test_summarize_sample_command(sample_csv):
+    runner = CliRunner()
+    result = runner.invoke(cli, ['summarize', str(sample_csv), '--sample', '3'])
+    if result.exit_code != 0:
+        print("CLI Output:", result.output)
+    assert result.exit_code == 0
+    assert "Estimated from a sample of 3 rows" in result.output
+    assert "±" in result.output
+
+def test_pipeline_command(sample_csv, tmp_path):
+    cleaned = tmp_path / "cleaned.csv"
+    definition = {'steps': [
+        {'name': 'clean', 'command': 'clean', 'args': [str(sample_csv), '--columns', 'Age', '--output-file', str(cleaned)],
+         'inputs': [str(sample_csv)], 'outputs': [str(cleaned)]},
+        {'name': 'summary', 'command': 'summarize', 'args': [str(cleaned)], 'inputs': [str(cleaned)]},
+    ]}
+    pipeline_file = tmp_path / "pipeline.json"
+    pipeline_file.write_text(json.dumps(definition))
+    runner = CliRunner()
+    result = runner.invoke(cli, ['pipeline', str(pipeline_file)])
+    assert result.exit_code == 0, result.output
+    assert "clean: ran" in result.output
+    result = runner.invoke(cli, ['pipeline', str(pipeline_file)])
+    assert result.exit_code == 0
+    assert "clean: skipped" in result.output and "summary: skipped" in result.output
+
+def test_pipeline_command_with_workers(sample_csv, tmp_path, mocker):
+    from dataauto.scheduler import WorkerPool
+    submit = mocker.spy(WorkerPool, 'submit')
+    steps = [{'name': f'clean_{column}', 'command': 'clean',
+              'args': [str(sample_csv), '--columns', column, '--output-file', str(tmp_path / f"{column}.csv")],
+              'inputs': [str(sample_csv)], 'outputs': [str(tmp_path / f"{column}.csv")]} for column in ['Age', 'Salary']]
+    pipeline_file = tmp_path / "pipeline.json"
+    pipeline_file.write_text(json.dumps({'steps': steps}))
+    result = CliRunner().invoke(cli, ['pipeline', str(pipeline_file), '--workers', '2'])
+    assert result.exit_code == 0, result.output
+    assert "clean_Age: ran" in result.output and "clean_Salary: ran" in result.output
+    assert submit.call_count == 2
+    assert pd.read_csv(tmp_path / "Salary.csv")['Salary'].notna().all()
+
+# Import time allowed for `dataauto --help`, in milliseconds (about 40ms when commands load lazily).
+HELP_IMPORT_BUDGET_MS = 300
+
+def import_times(code):
+    """Run ``code`` under ``python -X importtime`` and return {module: cumulative microseconds}."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('package'):
+            _, cumulative, name = line[len('import time:'):].split('|')
+            times[name.strip()] = int(cumulative)
+    return times
+
+def test_help_does_not_import_heavy_dependencies():
+    times = import_times("from dataauto.cli import cli; cli(['--help'], standalone_mode=False)")
+    heavy = {'pandas', 'numpy', 'sklearn', 'matplotlib', 'seaborn', 'plotly', 'reportlab', 'joblib', 'scipy'}
+    assert heavy.isdisjoint(times), sorted(heavy & set(times))
+    assert times['dataauto.cli'] / 1000 < HELP_IMPORT_BUDGET_MS
+
+def test_profile_option(sample_csv, tmp_path):
+    runner = CliRunner()
+    profile_file = tmp_path / "profile.json"
+    result = runner.invoke(cli, ['--profile-output', str(profile_file), 'clean', str(sample_csv), '--columns', 'Age',
+                                 '--output-file', str(tmp_path / "cleaned.csv")])
+    assert result.exit_code == 0, result.output
+    assert "wall s" in result.output
+    names = [record['name'] for record in json.loads(profile_file.read_text())['stages']]
+    assert {'clean', 'clean/import', 'clean/load', 'clean/compute', 'clean/write'} <= set(names)
+
+    # Stages recorded by library code and by the train command's own profiler are included
+    result = runner.invoke(cli, ['--profile-output', str(profile_file), 'train', str(sample_csv), '--target', 'Salary',
+                                 '--model-type', 'regressor', '--output-model', str(tmp_path / "model.joblib"),
+                                 '--output-report', str(tmp_path / "report.txt")])
+    assert result.exit_code == 0, result.output
+    names = [record['name'] for record in json.loads(profile_file.read_text())['stages']]
+    assert {'train/train', 'train/train/fit', 'train/save'} <= set(names)
+
+    dump = tmp_path / "clean.prof"
+    result = runner.invoke(cli, ['--profile-output', str(dump), 'clean', str(sample_csv), '--columns', 'Age',
+                                 '--output-file', str(tmp_path / "cleaned.csv")])
+    assert result.exit_code == 0, result.output
+    assert any(function[2] == 'clean_data' for function in pstats.Stats(str(dump)).stats)
@@ -0,0 +1,112 @@
+# tests/test_compression.py
+
+import pytest
+import bz2
+import gzip
+import os
+import threading
+import numpy as np
+import pandas as pd
+from dataauto.compression import detect_compression, open_compressed, open_text, strip_compression_extension
+from dataauto.data_loader import iter_csv, iter_json, load_csv, load_json
+from dataauto.data_saver import save_chunks, save_csv, save_json
+
+@pytest.fixture
+def payload():
+    rng = np.random.default_rng(0)
+    return b''.join(f"{i},{value:.6f}\n".encode() for i, value in enumerate(rng.normal(size=20000)))
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({'id': np.arange(3000), 'value': rng.normal(size=3000).round(6),
+                         'group': rng.choice(['a', 'b'], size=3000)})
+
+def test_detect_compression():
+    assert detect_compression('data.csv.gz') == 'gzip'
+    assert detect_compression('data.jsonl.ZST') == 'zstd'
+    assert detect_compression('data.csv.bz2') == 'bz2'
+    assert detect_compression('data.csv') is None
+    assert strip_compression_extension('dir/data.csv.gz') == 'dir/data.csv'
+    assert strip_compression_extension('data.csv') == 'data.csv'
+
+@pytest.mark.parametrize('codec, opener', [('gzip', gzip.open), ('bz2', bz2.open)])
+def test_blocks_are_standard_multi_member_files(tmp_path, payload, codec, opener):
+    path = tmp_path / f"data.{codec}"
+    with open_compressed(path, 'wb', compression=codec, threads=3, block_size=4096) as f:
+        f.write(payload)
+    # Written in independent blocks that standard tools read as one file
+    with opener(path) as f:
+        assert f.read() == payload
+    with open_compressed(path, compression=codec, threads=3, block_size=4096) as f:
+        assert f.read() == payload
+
+@pytest.mark.parametrize('codec, opener', [('gzip', gzip.open), ('bz2', bz2.open)])
+def test_reads_files_from_other_writers(tmp_path, payload, codec, opener):
+    path = tmp_path / f"data.{codec}"
+    with opener(path, 'wb') as f:
+        f.write(payload)
+    with open_compressed(path, compression=codec) as f:
+        assert f.read() == payload
+
+def test_gzip_with_foreign_members_appended(tmp_path, payload):
+    path = tmp_path / "data.gz"
+    with open_compressed(path, 'wb', block_size=1000) as f:
+        f.write(payload[:5000])
+    with open(path, 'ab') as f:
+        f.write(gzip.compress(payload[5000:]))
+    with open_compressed(path) as f:
+        assert f.read() == payload
+
+def test_corrupt_gzip_raises(tmp_path, payload):
+    path = tmp_path / "data.gz"
+    with open_compressed(path, 'wb', block_size=1000) as f:
+        f.write(payload)
+    data = bytearray(path.read_bytes())
+    data[len(data) // 2] ^= 0xff
+    path.write_bytes(bytes(data))
+    with pytest.raises(Exception):
+        with open_compressed(path) as f:
+            f.read()
+
+def test_early_close_stops_background_threads(tmp_path, payload):
+    path = tmp_path / "data.gz"
+    with open_compressed(path, 'wb', block_size=1000) as f:
+        f.write(payload)
+    f = open_compressed(path, threads=2, block_size=1000)
+    assert f.read(10) == payload[:10]
+    f.close()
+    assert not any(thread.name.startswith('dataauto-decompress') for thread in threading.enumerate())
+
+def test_zstd(tmp_path, payload):
+    pytest.importorskip('zstandard')
+    path = tmp_path / "data.zst"
+    with open_compressed(path, 'wb', threads=2) as f:
+        f.write(payload)
+    with open_compressed(path) as f:
+        assert f.read() == payload
+
+def test_text_mode_without_compression(tmp_path):
+    path = tmp_path / "data.csv"
+    with open_text(path, 'w') as f:
+        f.write("a,b\n1,2\n")
+    assert path.read_text() == "a,b\n1,2\n"
+
+@pytest.mark.parametrize('extension', ['gz', 'bz2'])
+def test_loaders_and_savers(tmp_path, frame, extension):
+    csv_file, json_file = tmp_path / f"data.csv.{extension}", tmp_path / f"data.jsonl.{extension}"
+    save_csv(frame, str(csv_file))
+    save_json(frame, str(json_file))
+    pd.testing.assert_frame_equal(load_csv(str(csv_file)), frame)
+    pd.testing.assert_frame_equal(load_json(str(json_file)), frame)
+    # pandas reads the files too
+    pd.testing.assert_frame_equal(pd.read_csv(csv_file), frame)
+    pd.testing.assert_frame_equal(pd.concat(iter_csv(str(csv_file), chunksize=700), ignore_index=True), frame)
+    pd.testing.assert_frame_equal(pd.concat(iter_json(str(json_file), chunksize=700), ignore_index=True), frame)
+
+def test_save_chunks_compressed(tmp_path, frame):
+    output = tmp_path / "out.csv.gz"
+    rows = save_chunks((frame.iloc[start:start + 1000] for start in range(0, 3000, 1000)), str(output))
+    assert rows == 3000
+    pd.testing.assert_frame_equal(pd.read_csv(output), frame)
+    assert os.path.getsize(output) < len(frame.to_csv(index=False))
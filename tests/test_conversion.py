@@ -0,0 +1,87 @@
+# tests/test_conversion.py
+
+import pytest
+import threading
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from dataauto import conversion
+from dataauto.conversion import convert_file, infer_format
+
+SQL = {'db_type': 'postgresql', 'host': 'localhost', 'port': 5432, 'dbname': 'db', 'user': 'user', 'password': 'pw'}
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'id': np.arange(1050),
+        'value': rng.normal(size=1050).round(6),
+        'group': rng.choice(['a', 'b', 'c'], size=1050),
+    })
+
+@pytest.fixture
+def sample_csv(tmp_path, frame):
+    file = tmp_path / "data.csv"
+    frame.to_csv(file, index=False)
+    return file
+
+def test_infer_format():
+    assert infer_format('data.CSV') == 'csv'
+    assert infer_format('dir/data.jsonl') == 'json'
+    assert infer_format('book.xlsx') == 'excel'
+    with pytest.raises(ValueError, match='specify it explicitly'):
+        infer_format('data.parquet')
+
+def test_convert_refuses_xls_output(sample_csv, tmp_path):
+    with pytest.raises(ValueError, match=r'written as \.xlsx'):
+        convert_file(str(sample_csv), str(tmp_path / "out.xls"))
+    assert not (tmp_path / "out.xls").exists()
+
+@pytest.mark.parametrize('extension', ['json', 'jsonl', 'xlsx', 'csv', 'jsonl.gz'])
+def test_convert_round_trip(tmp_path, sample_csv, frame, extension):
+    output = tmp_path / f"out.{extension}"
+    result = convert_file(str(sample_csv), str(output), chunksize=100, queue_size=2)
+    assert result == {'rows': 1050, 'chunks': 11}
+    back = tmp_path / "back.csv"
+    convert_file(str(output), str(back), chunksize=333)
+    pd.testing.assert_frame_equal(pd.read_csv(back), frame)
+
+def test_convert_sql(tmp_path, sample_csv, frame, mocker):
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    mocker.patch('dataauto.data_saver.create_sql_engine', return_value=engine)
+    mocker.patch('dataauto.data_loader.create_sql_engine', return_value=engine)
+    assert convert_file(str(sample_csv), 'events', output_format='sql', chunksize=400, sql=SQL)['chunks'] == 3
+    output = tmp_path / "out.csv"
+    result = convert_file('SELECT * FROM events ORDER BY id', str(output), input_format='sql', chunksize=500, sql=SQL)
+    assert result == {'rows': 1050, 'chunks': 3}
+    pd.testing.assert_frame_equal(pd.read_csv(output), frame)
+
+def test_convert_sql_requires_connection(sample_csv):
+    with pytest.raises(ValueError, match='connection parameters'):
+        convert_file(str(sample_csv), 'events', output_format='sql')
+
+def test_reader_error_is_raised(tmp_path):
+    bad = tmp_path / "bad.json"
+    bad.write_text('{"a": 1}\nnot json\n')
+    with pytest.raises(ValueError):
+        convert_file(str(bad), str(tmp_path / "out.csv"), chunksize=1)
+
+def test_writer_error_stops_reader(tmp_path, sample_csv, mocker):
+    produced = []
+
+    def chunks(file_path, chunksize):
+        for start in range(0, 1000, chunksize):
+            produced.append(start)
+            yield pd.DataFrame({'a': range(start, start + chunksize)})
+
+    def failing_writer(chunks, *args, **kwargs):
+        next(chunks)
+        raise OSError("disk full")
+
+    mocker.patch.object(conversion, 'iter_csv', chunks)
+    mocker.patch.object(conversion, 'save_chunks', failing_writer)
+    with pytest.raises(OSError, match='disk full'):
+        convert_file(str(sample_csv), str(tmp_path / "out.json"), chunksize=10, queue_size=2)
+    # The reader stopped at the bounded queue instead of parsing the whole input
+    assert len(produced) <= 4
+    assert not any(thread.name == 'dataauto-convert-reader' for thread in threading.enumerate())
@@ -0,0 +1,60 @@
+# tests/test_correlation.py
+
+import pytest
+import pandas as pd
+import numpy as np
+from dataauto.correlation import (
+    StreamingCorrelation, correlation_chunks, correlation_matrix, top_correlations, cluster_order, plot_subset
+)
+
+@pytest.fixture
+def wide_df():
+    rng = np.random.default_rng(0)
+    n = 2000
+    factors = rng.normal(size=(n, 3))
+    data = factors @ rng.normal(size=(3, 12)) + rng.normal(size=(n, 12)) + 1000
+    df = pd.DataFrame(data, columns=[f'c{i}' for i in range(12)])
+    df.iloc[rng.random(df.shape) < 0.05] = np.nan
+    df['label'] = 'x'
+    return df
+
+def test_correlation_matches_pandas_with_missing_values(wide_df):
+    numeric = wide_df.drop(columns=['label'])
+    expected = numeric.corr()
+    result = correlation_matrix(wide_df, chunksize=300)
+    assert list(result.columns) == list(numeric.columns)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), atol=1e-5)
+
+def test_spearman_matches_pandas_without_missing_values(wide_df):
+    numeric = wide_df.drop(columns=['label']).fillna(0)
+    result = correlation_matrix(numeric, method='spearman')
+    np.testing.assert_allclose(result.to_numpy(), numeric.corr('spearman').to_numpy(), atol=1e-5)
+
+def test_merge_equals_single_pass(wide_df):
+    columns = [f'c{i}' for i in range(12)]
+    first = StreamingCorrelation(columns).update(wide_df.iloc[:700])
+    second = StreamingCorrelation(columns).update(wide_df.iloc[700:])
+    merged = first.merge(second).correlation()
+    single = correlation_chunks([wide_df], columns)
+    np.testing.assert_allclose(merged.to_numpy(), single.to_numpy(), atol=1e-5)
+
+def test_constant_column_has_undefined_correlation():
+    df = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'b': [5.0, 5.0, 5.0]})
+    corr = correlation_matrix(df)
+    assert np.isnan(corr.loc['a', 'b'])
+    assert np.isnan(corr.loc['b', 'b'])
+    assert corr.loc['a', 'a'] == 1.0
+
+def test_top_correlations_and_plot_subset(wide_df):
+    corr = correlation_matrix(wide_df)
+    top = top_correlations(corr, k=5)
+    assert len(top) == 5
+    strengths = top['correlation'].abs().to_numpy()
+    assert np.all(np.diff(strengths) <= 0)
+    upper = corr.to_numpy()[np.triu_indices(len(corr), k=1)]
+    assert strengths[0] == pytest.approx(np.nanmax(np.abs(upper)))
+
+    subset = plot_subset(corr, max_columns=5)
+    assert subset.shape == (5, 5)
+    assert list(subset.index) == list(subset.columns)
+    assert sorted(cluster_order(corr)) == sorted(corr.columns)
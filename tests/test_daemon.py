@@ -0,0 +1,126 @@
+# tests/test_daemon.py
+
+import pytest
+import os
+import socket
+import stat
+import subprocess
+import sys
+import time
+import pandas as pd
+from click.testing import CliRunner
+from dataauto.cli import cli
+from dataauto.daemon import FrameCache, forward, request, serve, socket_path
+
+@pytest.fixture
+def csv_files(tmp_path):
+    files = []
+    for index in range(3):
+        file = tmp_path / f"data_{index}.csv"
+        pd.DataFrame({'a': range(1000), 'b': [float(index)] * 1000}).to_csv(file, index=False)
+        files.append(str(file))
+    return files
+
+@pytest.fixture
+def daemon_socket(tmp_path, monkeypatch):
+    path = str(tmp_path / "dataauto.sock")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen([sys.executable, '-m', 'dataauto.cli', 'daemon', 'start', '--socket', path,
+                                '--no-preload'], cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while request(path, {'action': 'status'}) is None:
+        assert time.time() < deadline and process.poll() is None, "daemon did not start"
+        time.sleep(0.05)
+    monkeypatch.setenv('DATAAUTO_SOCKET', path)
+    monkeypatch.delenv('DATAAUTO_NO_DAEMON', raising=False)
+    yield path
+    request(path, {'action': 'stop'})
+    process.wait(timeout=10)
+
+def test_frame_cache_lru_and_invalidation(csv_files):
+    loads = []
+
+    def loader(path):
+        loads.append(path)
+        return pd.read_csv(path)
+
+    size = int(pd.read_csv(csv_files[0]).memory_usage(deep=True).sum())
+    cache = FrameCache(max_bytes=size * 2)
+    first = cache.get(csv_files[0], 'csv', lambda: loader(csv_files[0]))
+    first['a'] = 0
+    # Callers get copies, so modifying one leaves the cached frame intact
+    assert cache.get(csv_files[0], 'csv', lambda: loader(csv_files[0]))['a'].sum() == sum(range(1000))
+    cache.get(csv_files[1], 'csv', lambda: loader(csv_files[1]))
+    cache.get(csv_files[2], 'csv', lambda: loader(csv_files[2]))
+    # The least recently used frame was evicted to stay within the limit
+    assert cache.total_bytes <= size * 2
+    assert cache.peek(csv_files[0], 'csv') is None
+    assert cache.peek(csv_files[2], 'csv') is not None
+    assert loads == csv_files
+
+    # A modified file is reloaded
+    pd.DataFrame({'a': [1], 'b': [2.0]}).to_csv(csv_files[2], index=False)
+    assert len(cache.get(csv_files[2], 'csv', lambda: loader(csv_files[2]))) == 1
+    assert cache.stats()['misses'] == 4
+
+def test_commands_run_in_daemon(daemon_socket, csv_files, tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(cli, ['load', csv_files[0]])
+    assert result.exit_code == 0
+    assert "Shape: (1000, 2)" in result.output
+    output_file = str(tmp_path / "scaled.csv")
+    result = runner.invoke(cli, ['scale', csv_files[0], '--columns', 'a', '--output-file', output_file])
+    assert result.exit_code == 0
+    assert os.path.exists(output_file)
+    result = runner.invoke(cli, ['summarize', csv_files[0]])
+    assert result.exit_code == 0 and "Rows: 1000" in result.output
+
+    stats = request(daemon_socket, {'action': 'status'})['cache']
+    assert [frame['path'] for frame in stats['frames']] == [csv_files[0]]
+    assert stats['misses'] == 1 and stats['hits'] == 2
+
+    result = runner.invoke(cli, ['load', str(tmp_path / "missing.csv")])
+    assert result.exit_code == 1
+    assert "Error loading data" in result.output
+
+    result = runner.invoke(cli, ['daemon', 'status', '--socket', daemon_socket])
+    assert result.exit_code == 0 and "1 frames" in result.output
+    assert stat.S_IMODE(os.stat(daemon_socket).st_mode) == 0o600
+
+def test_commands_fall_back_without_daemon(csv_files, tmp_path, monkeypatch):
+    monkeypatch.setenv('DATAAUTO_SOCKET', str(tmp_path / "none.sock"))
+    result = CliRunner().invoke(cli, ['load', csv_files[0]])
+    assert result.exit_code == 0
+    assert "Shape: (1000, 2)" in result.output
+    result = CliRunner().invoke(cli, ['daemon', 'status'])
+    assert result.exit_code == 1 and "No daemon is running" in result.output
+
+def test_socket_path_is_private_without_runtime_dir(monkeypatch, tmp_path):
+    monkeypatch.delenv('DATAAUTO_SOCKET', raising=False)
+    monkeypatch.delenv('XDG_RUNTIME_DIR', raising=False)
+    monkeypatch.setenv('TMPDIR', str(tmp_path))
+    monkeypatch.setattr('tempfile.tempdir', None)
+    path = socket_path()
+    assert path == str(tmp_path / f"dataauto-{os.getuid()}" / "daemon.sock")
+    # A directory someone else could have prepared is refused
+    os.makedirs(os.path.dirname(path), mode=0o755)
+    os.chmod(os.path.dirname(path), 0o755)
+    with pytest.raises(RuntimeError, match="only you can access"):
+        serve(path, preload=False)
+
+def test_forward_only_to_own_sockets(monkeypatch, tmp_path):
+    monkeypatch.delenv('DATAAUTO_NO_DAEMON', raising=False)
+    path = tmp_path / "dataauto.sock"
+    monkeypatch.setenv('DATAAUTO_SOCKET', str(path))
+    path.write_text('')
+    assert forward(['load', 'data.csv']) is None
+    path.unlink()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(path))
+        listener.listen()
+        listener.settimeout(0.5)
+        # A socket of another user does not get the command line
+        monkeypatch.setattr(os, 'getuid', lambda: os.stat(path).st_uid + 1)
+        assert forward(['load', 'data.csv', '--password', 'secret']) is None
+        with pytest.raises(socket.timeout):
+            listener.accept()
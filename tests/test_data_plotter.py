@@ -2,6 +2,7 @@
 
 import pytest
 import pandas as pd
+import numpy as np
 from dataauto.data_plotter import plot_histogram, plot_scatter, plot_box, plot_heatmap, plot_line
 import os
 
@@ -49,4 +50,11 @@ def test_plot_line(sample_df, tmp_path, capsys):
     plot_line(sample_df, 'Age', 'Salary', output_dir=str(output_dir), interactive=False)
     captured = capsys.readouterr()
     assert f"Line plot for Salary over Age saved to {output_dir}/Salary_over_Age_line.png." in captured.out
-    assert os.path.exists(output_dir / "Salary_over_Age_line.png")
\ No newline at end of file
+    assert os.path.exists(output_dir / "Salary_over_Age_line.png")
+
+def test_plot_heatmap_wide_table(tmp_path, capsys):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(100, 40)), columns=[f'c{i}' for i in range(40)])
+    output_dir = tmp_path / "plots"
+    plot_heatmap(df, output_dir=str(output_dir), max_columns=20)
+    assert os.path.exists(output_dir / "correlation_heatmap.png")
@@ -0,0 +1,110 @@
+# tests/test_data_profiler.py
+
+import pytest
+import pandas as pd
+import numpy as np
+import json
+from dataauto.data_profiler import DataProfile, HyperLogLog, QuantileSketch, TopK, profile_dataframe, profile_chunks
+
+@pytest.fixture
+def sample_df():
+    data = {
+        'Name': ['Alice', 'Bob', 'Charlie', 'David', 'Eve'],
+        'Age': [25, 30, None, 40, 45],
+        'Salary': [70000, 80000, 90000, 100000, 110000],
+        'Department': ['Engineering', 'Marketing', 'Sales', 'HR', 'Engineering']
+    }
+    return pd.DataFrame(data)
+
+def test_profile_matches_describe_on_small_data(sample_df):
+    profile = profile_dataframe(sample_df, chunksize=2)
+    summary = profile.to_frame()
+    expected = sample_df.describe()
+    for column in ['Age', 'Salary']:
+        for stat in ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']:
+            assert summary.loc[stat, column] == pytest.approx(expected.loc[stat, column])
+    assert profile.rows == 5
+    assert summary.loc['null_count', 'Age'] == 1
+    assert summary.loc['distinct', 'Department'] == 4
+    assert summary.loc['top', 'Department'] == 'Engineering'
+    assert summary.loc['freq', 'Department'] == 2
+
+def test_profile_chunks_merge(sample_df):
+    whole = profile_dataframe(sample_df)
+    merged = profile_dataframe(sample_df.iloc[:2]).merge(profile_dataframe(sample_df.iloc[2:]))
+    pd.testing.assert_frame_equal(whole.to_frame(), merged.to_frame())
+
+def test_hyperloglog_accuracy():
+    hll = HyperLogLog()
+    values = np.arange(200000, dtype=np.float64)
+    for chunk in np.array_split(values, 7):
+        hll.update(pd.util.hash_array(chunk))
+    assert hll.estimate() == pytest.approx(200000, rel=0.05)
+
+def test_quantile_sketch_accuracy():
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=100000)
+    sketch = QuantileSketch()
+    for chunk in np.array_split(values, 10):
+        sketch.update(chunk)
+    for q, estimate in zip([0.1, 0.5, 0.9], sketch.quantiles([0.1, 0.5, 0.9])):
+        # Compare ranks rather than values
+        assert np.mean(values <= estimate) == pytest.approx(q, abs=0.02)
+
+def test_quantile_sketch_histogram():
+    values = np.random.default_rng(0).uniform(0, 10, 100000)
+    sketch = QuantileSketch(k=256)
+    for chunk in np.array_split(values, 10):
+        sketch.update(chunk)
+    counts, edges = sketch.histogram(bins=10, range=(0, 10))
+    assert counts.sum() == pytest.approx(100000)
+    expected, _ = np.histogram(values, bins=10, range=(0, 10))
+    np.testing.assert_allclose(counts, expected, rtol=0.1)
+
+def test_topk_keeps_heavy_hitters():
+    topk = TopK(capacity=10)
+    values = pd.Series(['common'] * 500 + [f"rare_{i}" for i in range(1000)])
+    for start in range(0, len(values), 100):
+        topk.update(values.iloc[start:start + 100].value_counts())
+    assert topk.top(1)[0][0] == 'common'
+
+def test_profile_chunks_from_file(tmp_path, sample_df):
+    from dataauto.data_loader import iter_chunks
+    file = tmp_path / "sample.csv"
+    sample_df.to_csv(file, index=False)
+    profile = profile_chunks(iter_chunks(str(file), chunksize=2))
+    assert profile.rows == 5
+    assert profile.numeric_columns() == ['Age', 'Salary']
+
+def test_column_turning_out_to_be_text_is_promoted(tmp_path):
+    from dataauto.data_loader import iter_csv
+    path = tmp_path / "mixed.csv"
+    path.write_text("a\n1\n2\n3\nx\ny\nz\n")
+    profile = profile_chunks(iter_csv(str(path), chunksize=3))
+    summary = profile.to_frame()['a']
+    assert profile.numeric_columns() == []
+    assert summary['count'] == 6 and summary['null_count'] == 0
+    assert summary['distinct'] == 6
+    assert (summary['min'], summary['max']) == ('1', 'z')
+    assert np.isnan(summary['mean'])
+
+def test_merge_numeric_and_text_profiles():
+    numbers = profile_dataframe(pd.DataFrame({'a': [1.5, 2.0, None]}))
+    text = profile_dataframe(pd.DataFrame({'a': ['x', 'y']}))
+    merged = profile_dataframe(pd.DataFrame({'a': [0.5]})).merge(text).merge(numbers)
+    column = merged.columns['a']
+    assert not column.numeric
+    assert (column.count, column.null_count) == (5, 1)
+    assert (column.min, column.max) == ('0.5', 'y')
+
+def test_datetime_profile_round_trips_through_json():
+    df = pd.DataFrame({'when': pd.to_datetime(['2024-01-05', '2023-06-01', None]),
+                       'took': pd.to_timedelta(['1h', '90s', '2h'])})
+    profile = DataProfile.from_dict(json.loads(json.dumps(profile_dataframe(df).to_dict())))
+    column = profile.columns['when']
+    assert (column.min, column.max) == (pd.Timestamp('2023-06-01'), pd.Timestamp('2024-01-05'))
+    assert column.top.top(1)[0][0] in (pd.Timestamp('2023-06-01'), pd.Timestamp('2024-01-05'))
+    assert profile.columns['took'].max == pd.Timedelta('2h')
+    # Restored values keep merging with new chunks
+    profile.update(pd.DataFrame({'when': pd.to_datetime(['2025-01-01']), 'took': pd.to_timedelta(['1s'])}))
+    assert column.max == pd.Timestamp('2025-01-01') and profile.columns['took'].min == pd.Timedelta('1s')
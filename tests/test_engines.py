@@ -0,0 +1,153 @@
+# tests/test_engines.py
+
+import pytest
+import numpy as np
+import pandas as pd
+from dataauto.data_cleaner import clean_data, remove_outliers, scale_features
+from dataauto import engines
+from dataauto.engines import ENGINES, get_engine
+from dataauto.filtering import filter_frame
+
+def _engine(name):
+    if name != 'pandas':
+        pytest.importorskip(name)
+    return get_engine(name)
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'id': np.arange(200),
+        'value': rng.normal(size=200),
+        'count': rng.integers(0, 5, size=200).astype(float),
+        'city': rng.choice(['Paris', 'Oslo', 'Rome'], size=200),
+    })
+    df.loc[[3, 50, 120], 'value'] = np.nan
+    df.loc[[7, 8], 'count'] = np.nan
+    df.loc[10, 'value'] = 40.0
+    return df
+
+@pytest.fixture(params=['csv', 'parquet'])
+def sample_file(request, tmp_path, frame):
+    path = tmp_path / f"data.{request.param}"
+    if request.param == 'csv':
+        frame.to_csv(path, index=False)
+    else:
+        frame.to_parquet(path, index=False)
+    return path
+
+def _read(path):
+    return pd.read_parquet(path) if str(path).endswith('.parquet') else pd.read_csv(path)
+
+def _assert_same(path, expected):
+    pd.testing.assert_frame_equal(_read(path).reset_index(drop=True), expected.reset_index(drop=True),
+                                  check_dtype=False)
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('strategy', ['mean', 'median', 'mode'])
+def test_clean(tmp_path, frame, sample_file, engine, strategy):
+    output = tmp_path / f"out{sample_file.suffix}"
+    _engine(engine).clean(str(sample_file), str(output), strategy=strategy, columns=['value', 'count'])
+    _assert_same(output, clean_data(frame.copy(), strategy=strategy, columns=['value', 'count']))
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_remove_outliers(tmp_path, frame, sample_file, engine):
+    output = tmp_path / f"out{sample_file.suffix}"
+    removed = _engine(engine).remove_outliers(str(sample_file), str(output), column='value', multiplier=1.5)
+    expected, expected_removed = remove_outliers(frame, column='value', multiplier=1.5)
+    assert removed == expected_removed
+    _assert_same(output, expected)
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('method', ['standard', 'minmax', 'robust'])
+def test_scale(tmp_path, frame, sample_file, engine, method):
+    output = tmp_path / f"out{sample_file.suffix}"
+    _engine(engine).scale(str(sample_file), str(output), columns=['value', 'count'], method=method)
+    _assert_same(output, scale_features(frame.copy(), columns=['value', 'count'], method=method))
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_filter(tmp_path, frame, sample_file, engine):
+    output = tmp_path / f"out{sample_file.suffix}"
+    kept = _engine(engine).filter(str(sample_file), str(output),
+                                  "value > 0 and city in ('Paris', 'Rome') and not count between 1 and 2")
+    expected = frame[(frame['value'] > 0) & frame['city'].isin(['Paris', 'Rome'])
+                     & ((frame['count'] < 1) | (frame['count'] > 2))]
+    assert kept == len(expected)
+    _assert_same(output, expected)
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_filter_missing_values(tmp_path, frame, sample_file, engine):
+    output = tmp_path / f"out{sample_file.suffix}"
+    # A comparison with a missing value is unknown, so 'not' does not keep those rows either
+    kept = _engine(engine).filter(str(sample_file), str(output), "not (count > 2) or value is null")
+    expected = frame[(frame['count'] <= 2) | frame['value'].isna()]
+    assert kept == len(expected)
+    _assert_same(output, expected)
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('expression', ["not (value > 0)", "value is null", "value * 2 < 1"])
+def test_filter_nan_stored_in_parquet(tmp_path, frame, engine, expression):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    source, output = tmp_path / "data.parquet", tmp_path / "out.parquet"
+    # Missing values stored as NaN, not null, as polars and duckdb write them
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    pq.write_table(table.set_column(1, 'value', pa.array(frame['value'].to_numpy())), source, row_group_size=50)
+    kept = _engine(engine).filter(str(source), str(output), expression)
+    expected = filter_frame(frame, expression)
+    assert kept == len(expected)
+    _assert_same(output, expected)
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_filter_modulo_of_negative_numbers(tmp_path, engine):
+    source, output = tmp_path / "data.csv", tmp_path / "out.csv"
+    frame = pd.DataFrame({'a': [-7, -5, -1, 0, 1, 5, 8], 'b': [3, 3, 3, 3, -3, -3, 3]})
+    frame.to_csv(source, index=False)
+    # Floor modulo, as in Python: -1 % 3 is 2 and 1 % -3 is -2
+    expression = "a % 3 = 2 or a % b = -2"
+    kept = _engine(engine).filter(str(source), str(output), expression)
+    expected = frame[(frame['a'] % 3 == 2) | (frame['a'] % frame['b'] == -2)]
+    assert list(expected['a']) == [-7, -1, 1, 5, 8]
+    assert kept == len(expected)
+    _assert_same(output, expected)
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_filter_boolean_column_with_gaps(tmp_path, engine):
+    source, output = tmp_path / "data.csv", tmp_path / "out.csv"
+    # pandas reads a boolean CSV column with missing values as object
+    source.write_text("id,flag\n1,True\n2,\n3,False\n4,True\n")
+    kept = _engine(engine).filter(str(source), str(output), "flag == true or not flag and id > 3")
+    assert kept == 2
+    assert list(pd.read_csv(output)['id']) == [1, 4]
+
+def test_pandas_filter_streams_chunks(tmp_path, frame, mocker):
+    source = tmp_path / "data.csv.gz"
+    frame.to_csv(source, index=False)
+    spy = mocker.spy(engines, 'filter_frame')
+    kept = get_engine('pandas', chunksize=64).filter(str(source), str(tmp_path / "out.csv"), "id % 3 = 0")
+    assert kept == 67
+    assert [len(call.args[0]) for call in spy.call_args_list] == [64, 64, 64, 8]
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "out.csv"), frame[frame['id'] % 3 == 0].reset_index(drop=True))
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_filter_type_errors(tmp_path, sample_file, engine):
+    with pytest.raises(ValueError, match='Cannot compare'):
+        _engine(engine).filter(str(sample_file), str(tmp_path / f"out{sample_file.suffix}"), "city > 3")
+    with pytest.raises(ValueError, match="Unknown column 'town'"):
+        _engine(engine).filter(str(sample_file), str(tmp_path / f"out{sample_file.suffix}"), "town = 'Oslo'")
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_compressed_csv(tmp_path, frame, engine):
+    source = tmp_path / "data.csv.gz"
+    frame.to_csv(source, index=False)
+    output = tmp_path / "out.csv.gz"
+    _engine(engine).clean(str(source), str(output), strategy='median', columns=['value'])
+    pd.testing.assert_frame_equal(pd.read_csv(output), clean_data(frame.copy(), 'median', ['value']))
+
+def test_unknown_engine_and_options(tmp_path, sample_file):
+    with pytest.raises(ValueError, match='Unsupported engine'):
+        get_engine('spark')
+    with pytest.raises(ValueError, match='Unsupported strategy'):
+        get_engine('pandas').clean(str(sample_file), str(tmp_path / "out.csv"), strategy='max')
+    with pytest.raises(ValueError, match='Unsupported scaling method'):
+        get_engine('pandas').scale(str(sample_file), str(tmp_path / "out.csv"), method='log')
@@ -0,0 +1,153 @@
+# tests/test_filtering.py
+
+import pytest
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from dataauto.data_loader import iter_sql, load_parquet, load_sql
+from dataauto.filtering import (And, Compare, In, Not, arrow_filter, filter_frame, filter_mask, parse_expression,
+                                sql_where)
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'id': [1, 2, 3, 4, 5, 6],
+        'price': [9.5, np.nan, 20.0, 3.25, 12.0, 20.0],
+        'city': ['Paris', 'Oslo', None, 'Rome', "O'Hare", 'Paris'],
+        'member': [True, False, True, False, True, False],
+        'joined': pd.to_datetime(['2024-01-05', '2023-06-01', None, '2024-03-01', '2022-12-31', '2024-02-29']),
+        'unit price': [1, 2, 3, 4, 5, 6],
+    })
+
+def _ids(df, expression):
+    return list(filter_frame(df, expression)['id'])
+
+def test_parse_tree():
+    tree = parse_expression("a > 1 and not b in ('x', \"y\") or c between -2 and 2.5e1")
+    assert str(tree) == "(((a > 1) and (not (b in ('x', 'y')))) or ((c >= -2) and (c <= 25.0)))"
+    assert tree.columns() == {'a', 'b', 'c'}
+    conjunction = tree.operands[0]
+    assert isinstance(conjunction, And) and isinstance(conjunction.operands[1], Not)
+    assert isinstance(conjunction.operands[1].operand, In)
+    # pandas' query spellings parse to the same tree
+    assert str(parse_expression("a == 1 & ~(b != 'x') | c <> 2")) == \
+        str(parse_expression("a = 1 and not b <> 'x' or c != 2"))
+    assert isinstance(parse_expression("0 < a <= 5").operands[1], Compare)
+
+@pytest.mark.parametrize('expression, expected', [
+    ("price > 10", [3, 5, 6]),
+    ("price * 2 - 1 >= 19 and city = 'Paris'", [6]),
+    ("id % 2 = 0 or member", [1, 2, 3, 4, 5, 6]),
+    ("city in ('Paris', 'Rome')", [1, 4, 6]),
+    ("city not in ['Paris', 'Rome']", [2, 5]),
+    ("city = 'O''Hare' or city = \"Rome\"", [4, 5]),
+    ("price is null or city is null", [2, 3]),
+    ("joined >= '2024-01-01' and joined < '2024-03-01'", [1, 6]),
+    ("not member and price between 3 and 20", [4, 6]),
+    ("`unit price` / 4 > 1", [5, 6]),
+    ("2 < id < 5", [3, 4]),
+    ("member = true and -price < -10", [3, 5]),
+])
+def test_filter_frame(frame, expression, expected):
+    assert _ids(frame, expression) == expected
+
+def test_three_valued_logic(frame):
+    # A comparison with a missing value is unknown, and so is its negation
+    assert _ids(frame, "price > 10") + _ids(frame, "not price > 10") == [3, 5, 6, 1, 4]
+    # false and unknown is false, true and unknown is unknown
+    assert _ids(frame, "not (price > 10 and city = 'Paris')") == [1, 2, 4, 5]
+    assert _ids(frame, "price > 100 or city = 'Oslo'") == [2]
+    assert _ids(frame, "not (price > 100 or city = 'Oslo')") == [1, 4, 5, 6]
+
+def test_matches_pandas_query(frame):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'a': rng.normal(size=1000), 'b': rng.integers(0, 10, size=1000),
+                       'c': rng.choice(['x', 'y', 'z'], size=1000)})
+    expression = "(a > 0.5 or b in (1, 2, 3)) and c != 'z' and b * a < 2"
+    pd.testing.assert_frame_equal(filter_frame(df, expression), df.query(expression))
+    assert filter_mask(df, expression).dtype == bool
+
+def test_nullable_and_categorical_columns():
+    df = pd.DataFrame({'n': pd.array([1, None, 3], dtype='Int64'),
+                       'flag': pd.array([True, None, False], dtype='boolean'),
+                       'group': pd.Categorical(['a', 'b', None])})
+    assert list(filter_frame(df, "n >= 1").index) == [0, 2]
+    assert list(filter_frame(df, "flag or group = 'b'").index) == [0, 1]
+    assert list(filter_frame(df, "group not in ('a')").index) == [1]
+
+def test_object_boolean_column():
+    df = pd.DataFrame({'f': [True, None, False, True]}, dtype=object)
+    assert list(filter_frame(df, "f == true").index) == [0, 3]
+    assert list(filter_frame(df, "not f or f is null").index) == [1, 2]
+
+@pytest.mark.parametrize('expression, message', [
+    ("price > 'cheap'", "Cannot compare price"),
+    ("city + 1 > 2", "Arithmetic on city"),
+    ("joined > 'yesterday'", "not a date"),
+    ("town = 'Oslo'", "Unknown column 'town'"),
+    ("price", "not a condition"),
+    ("price = null", "use 'is null'"),
+    ("price >", "unexpected end"),
+    ("price > 1 and", "unexpected end"),
+    ("(price > 1", r"expected '\)'"),
+    ("price > 1 city", "unexpected 'city'"),
+    ("price # 2", "unexpected '# 2'"),
+    ("city in (price)", "lists hold"),
+    ("price not 3", "'in' or 'between'"),
+    ("", "empty"),
+])
+def test_errors(frame, expression, message):
+    with pytest.raises(ValueError, match=message):
+        filter_frame(frame, expression)
+
+@pytest.fixture(params=['null', 'nan'])
+def parquet_file(request, tmp_path, frame):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    path = tmp_path / "data.parquet"
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    if request.param == 'nan':
+        # As written by polars, duckdb or pyarrow itself: missing floats stored as NaN rather than null
+        table = table.set_column(table.schema.get_field_index('price'), 'price', pa.array(frame['price'].to_numpy()))
+    pq.write_table(table, path, row_group_size=2)
+    return path
+
+def test_parquet_pushdown(parquet_file, frame):
+    import pyarrow.parquet as pq
+    expression = "price > 5 and id % 2 = 0 and city is not null and id > 1"
+    pushed, remaining = arrow_filter(expression, pq.read_schema(parquet_file))
+    # Conditions on float columns stay in pandas, which reads NaN as missing
+    assert str(remaining) == "((price > 5) and ((id % 2) == 0))"
+    assert pq.read_table(parquet_file, filters=pushed).num_rows == 4
+    pd.testing.assert_frame_equal(load_parquet(str(parquet_file), where=expression),
+                                  filter_frame(frame, expression).reset_index(drop=True))
+
+@pytest.mark.parametrize('expression', [
+    "not city in ('Paris', 'Rome')",
+    "joined > '2024-01-01' or price / 2 < 2",
+    "not (price > 10)",
+    "member and `unit price` between 2 and 5",
+    "price is null",
+    "price + 1 > 0 or not (price < 10)",
+])
+def test_parquet_pushdown_matches_frame(parquet_file, frame, expression):
+    pd.testing.assert_frame_equal(load_parquet(str(parquet_file), where=expression),
+                                  filter_frame(frame, expression).reset_index(drop=True))
+
+def test_sql_where(tmp_path, frame, mocker):
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    frame.drop(columns=['joined']).to_sql('shop', engine, index=False)
+    mocker.patch('dataauto.data_loader.create_sql_engine', return_value=engine)
+    condition, parameters = sql_where("city = 'Paris' and price / 2 > 5", lambda name: f'"{name}"')
+    assert condition == '(("city" = :f0) AND (("price" * 1.0 / :f1) > :f2))'
+    assert parameters == {'f0': 'Paris', 'f1': 2, 'f2': 5}
+    # Values are bound parameters, so quotes in them cannot change the query
+    expression = "(city in ('Paris', 'O''Hare') or price is null) and `unit price` >= 2"
+    df = load_sql('postgresql', 'host', 5432, 'db', 'user', 'secret', 'SELECT * FROM shop', where=expression)
+    assert list(df['id']) == [2, 5, 6]
+    chunks = list(iter_sql('postgresql', 'host', 5432, 'db', 'user', 'secret', 'SELECT * FROM shop', chunksize=2,
+                           where="id > 1"))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    # % takes the sign of the divisor, as in pandas, not SQL's truncation
+    df = load_sql('postgresql', 'host', 5432, 'db', 'user', 'secret', 'SELECT * FROM shop', where="-id % 4 = 1")
+    assert list(df['id']) == _ids(frame, "-id % 4 = 1") == [3]
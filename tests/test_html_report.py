@@ -0,0 +1,78 @@
+# tests/test_html_report.py
+
+import pytest
+import json
+import re
+import pandas as pd
+import numpy as np
+from dataauto.html_report import build_report_data, render_html_report, generate_html_report
+from dataauto.sampling import SampleSummary
+
+@pytest.fixture
+def sample_df():
+    rng = np.random.default_rng(0)
+    n = 5000
+    df = pd.DataFrame({
+        'Age': rng.integers(18, 80, n),
+        'Salary': rng.normal(50000, 10000, n),
+        'Department': rng.choice(['Engineering', 'Sales', '</script><b>HR</b>'], n),
+    })
+    df.loc[::10, 'Salary'] = np.nan
+    return df
+
+def _embedded_data(html):
+    match = re.search(r'<script type="application/json" id="report-data">(.*?)</script>', html, re.S)
+    return json.loads(match.group(1))
+
+def test_build_report_data_is_aggregated(sample_df):
+    chunks = [sample_df.iloc[start:start + 1000] for start in range(0, len(sample_df), 1000)]
+    data = build_report_data(chunks)
+    assert data['rows'] == 5000
+    salary = next(column for column in data['columns'] if column['name'] == 'Salary')
+    # Approximate histogram counts add up to the non-null values
+    assert sum(salary['counts']) == pytest.approx(4500, rel=0.01)
+    assert len(salary['edges']) == len(salary['counts']) + 1
+    assert len(salary['quantiles']) == 9
+    department = next(column for column in data['columns'] if column['name'] == 'Department')
+    assert sorted(department['labels']) == sorted(sample_df['Department'].unique())
+    assert data['correlation']['columns'] and len(data['correlation']['values']) == 2
+
+def test_html_report_is_self_contained_and_escaped(sample_df, tmp_path):
+    output_report = tmp_path / "report.html"
+    generate_html_report(sample_df, output_report=str(output_report))
+    html = output_report.read_text()
+    assert '<script src=' not in html
+    assert 'IntersectionObserver' in html
+    assert '<b>HR</b>' not in html
+    data = _embedded_data(html)
+    assert len(data['columns']) == 3
+
+def test_column_with_text_in_a_later_chunk():
+    rng = np.random.default_rng(2)
+    first = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'b': [10.0, 21.0, 29.0], 'c': [3.0, 1.0, 2.0]})
+    second = pd.DataFrame({'a': ['x', '5'], 'b': rng.normal(size=2), 'c': [4.0, 0.0]})
+    data = build_report_data([first, second])
+    a = next(column for column in data['columns'] if column['name'] == 'a')
+    assert 'labels' in a and 'edges' not in a
+    # The text column leaves the correlation matrix; the others keep all their rows
+    assert data['correlation']['columns'] == ['b', 'c']
+
+def test_report_size_does_not_grow_with_rows():
+    rng = np.random.default_rng(1)
+    small = render_html_report(build_report_data([pd.DataFrame(rng.normal(size=(1000, 5)))]))
+    large = render_html_report(build_report_data(
+        [pd.DataFrame(rng.normal(size=(20000, 5))) for _ in range(10)]))
+    assert len(large) < 1.2 * len(small)
+
+def test_sample_report_shows_intervals(sample_df, tmp_path):
+    summary = SampleSummary(sample_df.sample(1000, random_state=0), total_rows=50000)
+    output_report = tmp_path / "report.html"
+    generate_html_report(summary, output_report=str(output_report))
+    html = output_report.read_text()
+    data = _embedded_data(html)
+    assert data['rows'] == 50000 and data['sample'] == {'rows': 1000, 'confidence': 0.95}
+    assert 'sample of 1,000 rows, 95% confidence intervals' in html
+    salary = next(column for column in data['columns'] if column['name'] == 'Salary')
+    statistics = {interval[0]: interval[1:] for interval in salary['intervals']}
+    lower, upper = statistics['mean'][1:]
+    assert lower < sample_df['Salary'].mean() < upper
@@ -0,0 +1,101 @@
+# tests/test_incremental.py
+
+import pytest
+import pandas as pd
+import numpy as np
+from dataauto.incremental import update_profile_state, ProfileState
+from dataauto.data_profiler import profile_dataframe
+
+@pytest.fixture
+def log_df():
+    rng = np.random.default_rng(0)
+    n = 3000
+    return pd.DataFrame({
+        'latency': rng.exponential(100, n).round(3),
+        'status': rng.choice(['200', '404', '500'], n),
+        'bytes': rng.integers(0, 10000, n),
+    })
+
+def _append(path, df):
+    with open(path, 'a') as f:
+        df.to_csv(f, header=False, index=False)
+
+def test_only_appended_rows_are_parsed(tmp_path, log_df):
+    path = tmp_path / "log.csv"
+    state_file = tmp_path / "log.state.json"
+    log_df.iloc[:1000].to_csv(path, index=False)
+
+    state = update_profile_state(str(path), str(state_file), chunksize=300)
+    assert state.rows_added == 1000
+
+    _append(path, log_df.iloc[1000:])
+    state = update_profile_state(str(path), str(state_file), chunksize=300)
+    assert state.rows_added == 2000
+    assert state.offset == path.stat().st_size
+
+    expected = profile_dataframe(pd.read_csv(path)).to_frame()
+    result = ProfileState.load(str(state_file)).profile.to_frame()
+    for column in ['latency', 'bytes']:
+        for stat in ['count', 'null_count', 'min', 'max']:
+            assert result.loc[stat, column] == expected.loc[stat, column]
+        assert result.loc['mean', column] == pytest.approx(expected.loc['mean', column])
+        assert result.loc['std', column] == pytest.approx(expected.loc['std', column])
+    assert result.loc['count', 'status'] == 3000
+
+    state = update_profile_state(str(path), str(state_file))
+    assert state.rows_added == 0
+
+def test_partial_last_line_is_left_for_next_run(tmp_path, log_df):
+    path = tmp_path / "log.csv"
+    state_file = tmp_path / "log.state.json"
+    log_df.iloc[:10].to_csv(path, index=False)
+    with open(path, 'a') as f:
+        f.write('12.5,200')
+    state = update_profile_state(str(path), str(state_file))
+    assert state.rows_added == 10
+    with open(path, 'a') as f:
+        f.write(',77\n')
+    state = update_profile_state(str(path), str(state_file))
+    assert state.rows_added == 1
+    assert state.profile.rows == 11
+    assert state.profile.columns['latency'].min == min(12.5, log_df['latency'].iloc[:10].min())
+
+def test_rewritten_file_is_profiled_from_scratch(tmp_path, log_df):
+    path = tmp_path / "log.csv"
+    state_file = tmp_path / "log.state.json"
+    log_df.iloc[:1000].to_csv(path, index=False)
+    update_profile_state(str(path), str(state_file))
+
+    # Log rotation: the file is replaced by a new, shorter one
+    log_df.iloc[2000:2500].to_csv(path, index=False)
+    state = update_profile_state(str(path), str(state_file))
+    assert state.profile.rows == 500
+
+def test_json_lines_with_correlation(tmp_path, log_df):
+    path = tmp_path / "log.json"
+    state_file = tmp_path / "log.state.json"
+    log_df.iloc[:1500].to_json(path, orient='records', lines=True)
+    update_profile_state(str(path), str(state_file), format='json', correlation=True)
+    with open(path, 'a') as f:
+        f.write(log_df.iloc[1500:].to_json(orient='records', lines=True))
+    state = update_profile_state(str(path), str(state_file), format='json', correlation=True)
+    assert state.profile.rows == 3000
+    corr = state.correlation.correlation()
+    expected = log_df[['latency', 'bytes']].corr()
+    assert corr.loc['latency', 'bytes'] == pytest.approx(expected.loc['latency', 'bytes'], abs=1e-5)
+
+def test_text_appended_to_numeric_column(tmp_path, log_df):
+    path = tmp_path / "log.csv"
+    state_file = tmp_path / "log.state.json"
+    log_df.iloc[:100].to_csv(path, index=False)
+    update_profile_state(str(path), str(state_file), correlation=True)
+    with open(path, 'a') as f:
+        f.write('x,200,4\n')
+    state = update_profile_state(str(path), str(state_file), correlation=True)
+    assert state.rows_added == 1
+    assert not state.profile.columns['latency'].numeric
+    assert 'latency' not in state.correlation.columns
+    # The state was saved, so the next run starts after the text row
+    _append(path, log_df.iloc[100:110])
+    state = update_profile_state(str(path), str(state_file), correlation=True)
+    assert state.rows_added == 10 and state.profile.rows == 111
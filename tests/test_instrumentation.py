@@ -0,0 +1,62 @@
+# tests/test_instrumentation.py
+
+import json
+import pstats
+import numpy as np
+from dataauto.instrumentation import StageProfiler, stage, reset_peak_rss, peak_rss_bytes
+
+def test_stage_is_noop_without_profiler():
+    with stage('anything'):
+        pass
+
+def test_profiler_records_nested_stages(tmp_path):
+    with StageProfiler() as profiler:
+        with stage('outer'):
+            with stage('allocate'):
+                data = np.ones(1_000_000)
+            del data
+    names = [record['name'] for record in profiler.stages]
+    assert names == ['outer/allocate', 'outer']
+    allocate, outer = profiler.stages
+    assert allocate['peak_memory_bytes'] >= 8_000_000
+    assert outer['peak_memory_bytes'] >= allocate['peak_memory_bytes']
+    assert outer['wall_time'] >= allocate['wall_time']
+
+    output_file = tmp_path / "timings.json"
+    profiler.write_json(str(output_file))
+    with open(output_file) as f:
+        timings = json.load(f)
+    assert timings['max_rss_bytes'] > 0
+    assert len(timings['stages']) == 2
+
+def test_profiler_cprofile_stage(tmp_path):
+    output_file = tmp_path / "fit.prof"
+    with StageProfiler(track_memory=False, profile_stages=['fit'], profile_output=str(output_file)):
+        with stage('fit'):
+            sorted(range(1000))
+    assert pstats.Stats(str(output_file)).total_calls > 0
+
+def test_peak_rss_reset():
+    block = np.ones(50 * 1024 ** 2 // 8)
+    before = peak_rss_bytes()
+    assert before >= block.nbytes
+    del block
+    if reset_peak_rss():
+        assert peak_rss_bytes() < before
+
+def test_nested_profilers_and_table():
+    with StageProfiler() as outer:
+        with stage('command'):
+            with StageProfiler() as inner:
+                with inner.stage('fit'):
+                    with stage('step'):
+                        np.ones(10 ** 6)
+    assert [record['name'] for record in inner.stages] == ['fit/step', 'fit']
+    assert [record['name'] for record in outer.stages] == ['command/fit/step', 'command/fit', 'command']
+    command = outer.stages[-1]
+    assert command['peak_memory_bytes'] >= 8 * 10 ** 6
+    assert outer.stages[1]['start'] >= command['start']
+    table = outer.format_table().splitlines()
+    assert table[0].split() == ['stage', 'wall', 's', 'cpu', 's', 'peak', 'MB', 'rss', 'MB']
+    assert [line.split()[0] for line in table[1:]] == ['command', 'fit', 'step', 'total']
+    assert table[3].startswith('    step')
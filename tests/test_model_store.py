@@ -0,0 +1,63 @@
+# tests/test_model_store.py
+
+import pytest
+import pandas as pd
+import numpy as np
+import warnings
+from sklearn.exceptions import UndefinedMetricWarning
+from dataauto.model_trainer import train_model
+from dataauto.model_store import (
+    build_model_metadata, save_model, load_model, load_model_metadata, metadata_path, predict
+)
+import os
+
+@pytest.fixture
+def trained_model():
+    data = {
+        'Name': ['Alice', 'Bob', 'Charlie', 'David', 'Eve'],
+        'Age': [25, 30, 35, 40, 45],
+        'Salary': [70000, 80000, 90000, 100000, 110000],
+        'Department': ['Engineering', 'Marketing', 'Sales', 'HR', 'Engineering']
+    }
+    df = pd.DataFrame(data)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UndefinedMetricWarning)
+        model, _ = train_model(df, target='Salary', model_type='regressor', test_size=0.2, random_state=42)
+    return model, df
+
+def test_save_and_load_memory_mapped(trained_model, tmp_path):
+    model, df = trained_model
+    output_model = str(tmp_path / "model.joblib")
+    X = df.drop(columns=['Salary'])
+    metadata = build_model_metadata(model, X=X, target='Salary', model_type='regressor', training_time=0.5)
+    save_model(model, output_model, metadata=metadata)
+
+    assert os.path.exists(metadata_path(output_model))
+    stored = load_model_metadata(output_model)
+    assert stored['feature_names'] == ['Name', 'Age', 'Department']
+    assert stored['feature_dtypes']['Age'] == 'int64'
+    assert stored['training_time_seconds'] == 0.5
+    assert stored['mmap_compatible'] is True
+    assert stored['file_size_bytes'] == os.path.getsize(output_model)
+
+    loaded = load_model(output_model)
+    scaler = loaded.named_steps['preprocessor'].named_transformers_['num'].named_steps['scaler']
+    assert isinstance(scaler.mean_, np.memmap)
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+
+def test_save_compressed(trained_model, tmp_path):
+    model, df = trained_model
+    output_model = str(tmp_path / "model_compressed.joblib")
+    save_model(model, output_model, compress=3)
+    assert load_model_metadata(output_model)['mmap_compatible'] is False
+    loaded = load_model(output_model)
+    X = df.drop(columns=['Salary'])
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+
+def test_predict_in_worker_processes(trained_model, tmp_path):
+    model, df = trained_model
+    output_model = str(tmp_path / "model.joblib")
+    X = df.drop(columns=['Salary'])
+    save_model(model, output_model, metadata=build_model_metadata(model, X=X))
+    predictions = predict(output_model, df, n_jobs=2, chunksize=2)
+    np.testing.assert_array_equal(predictions, model.predict(X))
@@ -2,7 +2,8 @@
 
 import pytest
 import pandas as pd
-from dataauto.model_trainer import train_model
+from dataauto.model_trainer import train_model, train_model_incremental
+import numpy as np
 import joblib
 import os
 import warnings
@@ -55,4 +56,48 @@ def test_train_classifier(sample_csv, tmp_path):
         assert "precision" in report.lower()
         assert "recall" in report.lower()
         assert os.path.exists(output_model)
-        assert os.path.exists(output_report)
\ No newline at end of file
+        assert os.path.exists(output_report)
+@pytest.fixture
+def large_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame({
+        'x1': rng.normal(size=n),
+        'x2': rng.normal(size=n),
+        'group': rng.choice(['a', 'b', 'c'], size=n),
+    })
+    df['y'] = 3 * df['x1'] - 2 * df['x2'] + df['group'].map({'a': 0.0, 'b': 1.0, 'c': -1.0})
+    df['label'] = np.where(df['y'] > 0, 'pos', 'neg')
+    file = tmp_path / "large_data.csv"
+    df.to_csv(file, index=False)
+    return file
+
+def test_train_regressor_incremental(large_csv):
+    model, report = train_model_incremental(str(large_csv), target='y', model_type='regressor',
+                                            chunksize=300, test_size=0.2, random_state=42)
+    assert "R^2 Score" in report
+    r2 = float(report.split("R^2 Score: ")[1])
+    assert r2 > 0.95
+    scaler = model.named_steps['preprocessor'].named_transformers_['num']
+    assert scaler.n_samples_seen_.max() > 1000
+
+def test_train_classifier_incremental(large_csv):
+    df = pd.read_csv(large_csv).drop(columns=['y'])
+    df.to_csv(large_csv, index=False)
+    for estimator in ['sgd', 'naive_bayes']:
+        model, report = train_model_incremental(str(large_csv), target='label', model_type='classifier',
+                                                estimator=estimator, chunksize=500)
+        assert "precision" in report.lower()
+        assert set(model.predict(df.drop(columns=['label']).head(50))) <= {'pos', 'neg'}
+
+def test_train_incremental_column_with_text_after_missing_chunk(large_csv):
+    df = pd.read_csv(large_csv).drop(columns=['label'])
+    # Missing from the whole first chunk, so it is float there; text and numbers later
+    df['note'] = np.where(np.arange(len(df)) % 2, 'late', '7')
+    df.loc[:399, 'note'] = np.nan
+    df.to_csv(large_csv, index=False)
+    model, report = train_model_incremental(str(large_csv), target='y', model_type='regressor', chunksize=300)
+    assert float(report.split("R^2 Score: ")[1]) > 0.95
+    preprocessor = model.named_steps['preprocessor']
+    assert 'note' not in preprocessor.named_transformers_['num'].feature_names_in_
+    assert any('note' in columns for _, _, columns in preprocessor.transformers_)
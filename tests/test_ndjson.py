@@ -0,0 +1,102 @@
+# tests/test_ndjson.py
+
+import pytest
+import numpy as np
+import pandas as pd
+
+pytest.importorskip('pyarrow')
+
+from dataauto.conversion import convert_file
+from dataauto.data_loader import iter_json, load_json
+from dataauto.data_saver import save_chunks, save_json
+from dataauto.ndjson import encode_ndjson, iter_ndjson, parse_schema, read_ndjson
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'id': np.arange(1000),
+        'value': rng.normal(size=1000),
+        'whole': np.arange(1000, dtype=float),
+        'name': rng.choice(['a', 'b "quoted"', 'ünï', 'back\\slash', 'new\nline'], size=1000),
+        'flag': rng.random(1000) < 0.5,
+        'when': np.datetime64('2024-01-01T00:00:00') + rng.integers(0, 10 ** 6, size=1000).astype('timedelta64[s]'),
+        'group': pd.Categorical(rng.choice(['x', 'y'], size=1000)),
+    })
+    df.loc[::7, 'value'] = np.nan
+    df.loc[::11, 'name'] = None
+    return df
+
+def test_round_trip(tmp_path, frame):
+    path = tmp_path / "data.jsonl"
+    save_json(frame, str(path), engine='pyarrow')
+    expected = frame.assign(group=frame['group'].astype(object))
+    pd.testing.assert_frame_equal(load_json(str(path), engine='pyarrow'), expected)
+    # The output is plain JSON lines that pandas reads too
+    back = pd.read_json(path, lines=True, convert_dates=['when'])
+    pd.testing.assert_frame_equal(back, expected, check_dtype=False)
+
+def test_encoding(frame):
+    df = pd.DataFrame({'x': [1.0, np.inf, np.nan, 2.5e-7], 'n': [None, {'a': [1]}, 'text', np.int64(3)],
+                       't': pd.to_datetime(['2024-01-01', None, '2024-01-01 10:00:00.5', '2024-01-02'], format='ISO8601')})
+    text = b''.join(encode_ndjson(df)).decode()
+    assert text.splitlines() == [
+        '{"x":1.0,"n":null,"t":"2024-01-01T00:00:00"}',
+        '{"x":null,"n":{"a": [1]},"t":null}',
+        '{"x":null,"n":"text","t":"2024-01-01T10:00:00.500000000"}',
+        '{"x":2.5e-7,"n":3,"t":"2024-01-02T00:00:00"}',
+    ]
+
+def test_reads_pandas_output(tmp_path, frame):
+    path = tmp_path / "data.jsonl"
+    # pandas writes datetimes as epoch milliseconds and reads whole floats back as integers
+    frame.drop(columns=['when', 'whole']).to_json(path, orient='records', lines=True)
+    pd.testing.assert_frame_equal(load_json(str(path), engine='pyarrow'), load_json(str(path)))
+
+def test_explicit_schema(tmp_path):
+    path = tmp_path / "data.jsonl"
+    path.write_text('{"id": 1, "code": "007", "when": "2024-01-01"}\n{"id": 2, "code": "010", "when": null}\n')
+    df = load_json(str(path), engine='pyarrow', schema='id:float64, code:string')
+    assert df['id'].dtype == 'float64' and list(df['code']) == ['007', '010']
+    assert df['when'].dtype.kind == 'M'
+    assert parse_schema({'id': 'int32'}).field('id').type.bit_width == 32
+    with pytest.raises(ValueError, match='Invalid schema'):
+        parse_schema('id')
+
+def test_iter_chunks(tmp_path, frame):
+    path = tmp_path / "data.jsonl.gz"
+    save_chunks((frame.iloc[start:start + 300] for start in range(0, 1000, 300)), str(path), format='json',
+                json_engine='pyarrow')
+    chunks = list(iter_json(str(path), chunksize=400, engine='pyarrow'))
+    assert [len(chunk) for chunk in chunks] == [400, 400, 200]
+    assert chunks[1].index[0] == 400
+    pd.testing.assert_frame_equal(pd.concat(chunks), read_ndjson(str(path)))
+
+def test_iter_type_change_needs_schema(tmp_path):
+    path = tmp_path / "data.jsonl"
+    path.write_text('{"a": 1}\n' * 2000 + '{"a": 1.5}\n')
+    with pytest.raises(ValueError, match='explicit schema'):
+        list(iter_ndjson(str(path), chunksize=500, block_size=1024))
+    chunks = list(iter_ndjson(str(path), schema={'a': 'float64'}, chunksize=500, block_size=1024))
+    assert sum(len(chunk) for chunk in chunks) == 2001 and chunks[-1]['a'].iloc[-1] == 1.5
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    path.write_text('')
+    assert load_json(str(path), engine='pyarrow').empty
+    assert list(iter_json(str(path), engine='pyarrow')) == []
+
+def test_engine_validation(tmp_path, frame):
+    with pytest.raises(ValueError, match='Unsupported JSON engine'):
+        save_json(frame, str(tmp_path / "out.jsonl"), engine='ujson')
+    with pytest.raises(ValueError, match="requires the 'pyarrow' engine"):
+        load_json(str(tmp_path / "out.jsonl"), schema='id:int64')
+
+def test_convert(tmp_path, frame):
+    source = tmp_path / "data.csv"
+    frame.to_csv(source, index=False)
+    output = tmp_path / "out.jsonl"
+    assert convert_file(str(source), str(output), chunksize=250, json_engine='pyarrow')['rows'] == 1000
+    back = tmp_path / "back.csv"
+    convert_file(str(output), str(back), chunksize=300, json_engine='pyarrow', json_schema='id:int64')
+    pd.testing.assert_frame_equal(pd.read_csv(back), pd.read_csv(source))
@@ -0,0 +1,79 @@
+# tests/test_pipeline.py
+
+import pytest
+import json
+import os
+import pandas as pd
+from dataauto.pipeline import Pipeline, PipelineStep, run_pipeline
+
+@pytest.fixture
+def pipeline_file(tmp_path):
+    raw = tmp_path / "raw.csv"
+    pd.DataFrame({'a': [1.0, None, 3.0, 4.0], 'b': [10.0, 20.0, None, 40.0]}).to_csv(raw, index=False)
+    clean, scaled = tmp_path / "clean.csv", tmp_path / "scaled.csv"
+    definition = {
+        'name': 'daily',
+        'steps': [
+            # Listed out of order: dependencies come from inputs and outputs
+            {'name': 'scale', 'command': 'scale', 'args': [str(clean)],
+             'params': {'columns': ['a', 'b'], 'output_file': str(scaled)},
+             'inputs': [str(clean)], 'outputs': [str(scaled)]},
+            {'name': 'clean', 'command': 'clean', 'args': [str(raw)],
+             'params': {'columns': ['a', 'b'], 'output_file': str(clean)},
+             'inputs': [str(raw)], 'outputs': [str(clean)]},
+        ],
+    }
+    file = tmp_path / "pipeline.json"
+    file.write_text(json.dumps(definition))
+    return file
+
+def statuses(results):
+    return {result['name']: result['status'] for result in results}
+
+def test_pipeline_order_and_cycles():
+    pipeline = Pipeline([
+        PipelineStep('report', 'report', inputs=['scaled.csv']),
+        PipelineStep('scale', 'scale', inputs=['clean.csv'], outputs=['scaled.csv']),
+        PipelineStep('clean', 'clean', outputs=['clean.csv']),
+        PipelineStep('summary', 'summarize', depends_on=['clean']),
+    ])
+    assert pipeline.order() == ['clean', 'scale', 'summary', 'report']
+    with pytest.raises(ValueError, match="cycle"):
+        Pipeline([PipelineStep('x', 'clean', inputs=['b'], outputs=['a']),
+                  PipelineStep('y', 'clean', inputs=['a'], outputs=['b'])])
+    assert PipelineStep('s', 'scale', ['in.csv'], params={'columns': ['a', 'b'], 'dry': True}).argv() == \
+        ['scale', 'in.csv', '--columns', 'a', '--columns', 'b', '--dry']
+
+def test_run_pipeline_skips_unchanged_steps(pipeline_file, tmp_path):
+    assert statuses(run_pipeline(str(pipeline_file))) == {'clean': 'ran', 'scale': 'ran'}
+    scaled = pd.read_csv(tmp_path / "scaled.csv")
+    assert scaled['a'].isna().sum() == 0
+    assert os.path.exists(f"{pipeline_file}.state.json")
+
+    assert statuses(run_pipeline(str(pipeline_file))) == {'clean': 'skipped', 'scale': 'skipped'}
+    assert statuses(run_pipeline(str(pipeline_file), force=True)) == {'clean': 'ran', 'scale': 'ran'}
+
+    # Rewriting the input with the same content keeps both steps cached
+    raw = tmp_path / "raw.csv"
+    raw.write_bytes(raw.read_bytes())
+    assert statuses(run_pipeline(str(pipeline_file))) == {'clean': 'skipped', 'scale': 'skipped'}
+
+    # A changed input reruns the step; an identical output lets the next step be skipped
+    pd.read_csv(raw).fillna(0).to_csv(raw, index=False)
+    assert statuses(run_pipeline(str(pipeline_file), dry_run=True)) == {'clean': 'pending', 'scale': 'pending'}
+    assert statuses(run_pipeline(str(pipeline_file))) == {'clean': 'ran', 'scale': 'ran'}
+
+    # A deleted output is rebuilt
+    os.remove(tmp_path / "scaled.csv")
+    assert statuses(run_pipeline(str(pipeline_file))) == {'clean': 'skipped', 'scale': 'ran'}
+
+def test_run_pipeline_blocks_steps_after_failure(tmp_path):
+    pipeline = Pipeline([
+        PipelineStep('clean', 'clean', [str(tmp_path / "missing.csv")],
+                     params={'columns': 'a', 'output_file': str(tmp_path / "clean.csv")},
+                     outputs=[str(tmp_path / "clean.csv")]),
+        PipelineStep('summary', 'summarize', [str(tmp_path / "clean.csv")], inputs=[str(tmp_path / "clean.csv")]),
+    ])
+    results = run_pipeline(pipeline, echo=lambda line: None)
+    assert statuses(results) == {'clean': 'failed', 'summary': 'blocked'}
+    assert "Error cleaning data" in results[0]['error']
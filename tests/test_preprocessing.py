@@ -0,0 +1,55 @@
+# tests/test_preprocessing.py
+
+import pytest
+import pandas as pd
+import numpy as np
+import scipy.sparse as sp
+from dataauto.preprocessing import (
+    FrequencyEncoder, HashingEncoder, categorical_encoding_plan, encoding_for_cardinality, preprocess_features
+)
+
+@pytest.fixture
+def mixed_df():
+    n = 3000
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'amount': rng.normal(size=n),
+        'color': rng.choice(['red', 'green', 'blue'], size=n),
+        'city': [f"city_{i % 200}" for i in range(n)],
+        'user_id': [f"user_{i}" for i in range(n)],
+    })
+
+def test_encoding_for_cardinality():
+    assert encoding_for_cardinality(3) == 'onehot'
+    assert encoding_for_cardinality(200) == 'frequency'
+    assert encoding_for_cardinality(200, target_encoding=True) == 'target'
+    assert encoding_for_cardinality(5000) == 'hashing'
+
+def test_categorical_encoding_plan(mixed_df):
+    plan = categorical_encoding_plan(mixed_df)
+    assert plan == {'color': 'onehot', 'city': 'frequency', 'user_id': 'hashing'}
+
+def test_preprocess_features_bounded_width(mixed_df):
+    preprocessor = preprocess_features(mixed_df)
+    Xt = preprocessor.fit_transform(mixed_df)
+    # 1 numeric + 3 one-hot + 1 frequency + 256 hashed columns, regardless of user_id cardinality
+    assert Xt.shape == (len(mixed_df), 1 + 3 + 1 + 256)
+    assert sp.issparse(Xt)
+
+def test_preprocess_features_keeps_dense_share_sparse(mixed_df):
+    # Half of the values are non-zero, above ColumnTransformer's default sparse_threshold of 0.3
+    df = mixed_df[['amount', 'color']]
+    assert sp.issparse(preprocess_features(df).fit_transform(df))
+
+def test_frequency_encoder_unseen_values():
+    encoder = FrequencyEncoder().fit(pd.DataFrame({'c': ['a', 'a', 'b', 'a']}))
+    encoded = encoder.transform(pd.DataFrame({'c': ['a', 'b', 'z']}))
+    np.testing.assert_allclose(encoded[:, 0], [0.75, 0.25, 0.0])
+    assert encoded.dtype == np.float32
+
+def test_hashing_encoder_is_sparse_and_fixed_width():
+    encoded = HashingEncoder(n_features=16).fit_transform(pd.DataFrame({'id': ['x', 'y', 'x']}))
+    assert sp.issparse(encoded)
+    assert encoded.shape == (3, 16)
+    assert encoded.dtype == np.float32
+    assert (encoded[0] != encoded[2]).nnz == 0
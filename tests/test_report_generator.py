@@ -1,9 +1,11 @@
 # tests/test_report_generator.py
 
 import pytest
-from dataauto.report_generator import generate_report
+from dataauto.report_generator import generate_report, column_figure_spec, render_column_figure, render_figures
 import pandas as pd
+import numpy as np
 import os
+import re
 
 @pytest.fixture
 def sample_df():
@@ -20,4 +22,27 @@ def test_generate_report(sample_df, tmp_path):
     output_report = tmp_path / "data_report.pdf"
     generate_report(sample_df, output_report=str(output_report))
     assert os.path.exists(output_report)
-    # Optionally, you can add more checks to verify the PDF content if needed
\ No newline at end of file
+    # Optionally, you can add more checks to verify the PDF content if needed
+def test_generate_report_wide_data_is_multi_page(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(500, 12)), columns=[f'col_{i}' for i in range(12)])
+    df['category'] = rng.choice(['a', 'b', 'c'], size=500)
+    output_report = tmp_path / "wide_report.pdf"
+    generate_report(df, output_report=str(output_report), n_jobs=2)
+    content = output_report.read_bytes()
+    # Overview, heatmap and 13 column sections at 3 per page
+    assert len(re.findall(rb'/Type /Page(?!s)', content)) >= 7
+
+def test_render_column_figure_returns_png():
+    spec = column_figure_spec('values', pd.Series([1.0, 2.0, 2.0, 3.0, 50.0]))
+    assert spec['kind'] == 'numeric'
+    assert spec['counts'].sum() == 5
+    assert render_column_figure(spec).startswith(b'\x89PNG')
+    assert column_figure_spec('empty', pd.Series([np.nan, np.nan]))['kind'] == 'empty'
+
+def test_render_figures_is_serial_for_small_reports(mocker):
+    pool = mocker.patch('dataauto.report_generator.ProcessPoolExecutor')
+    specs = [column_figure_spec(f'col_{i}', pd.Series([1.0, 2.0, 3.0])) for i in range(3)]
+    images = render_figures(specs)
+    pool.assert_not_called()
+    assert len(images) == 3 and all(image.startswith(b'\x89PNG') for image in images)
@@ -0,0 +1,62 @@
+# tests/test_sampling.py
+
+import pytest
+import pandas as pd
+import numpy as np
+from dataauto.sampling import (
+    reservoir_sample, block_sample_csv, sample_file, mean_interval, proportion_interval, BLOCK_COLUMN
+)
+
+@pytest.fixture
+def large_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 20000
+    df = pd.DataFrame({
+        'value': rng.normal(10, 2, n),
+        'other': rng.normal(size=n),
+        'group': rng.choice(['a', 'b'], size=n),
+    })
+    file = tmp_path / "large.csv"
+    df.to_csv(file, index=False)
+    return file, df
+
+def test_reservoir_sample_size_and_uniformity():
+    chunks = [pd.DataFrame({'x': np.arange(start, start + 1000)}) for start in range(0, 10000, 1000)]
+    sample, total_rows = reservoir_sample(chunks, 500, random_state=1)
+    assert total_rows == 10000
+    assert len(sample) == 500
+    assert sample['x'].is_unique
+    # Rows from every part of the stream should be represented
+    assert sample['x'].min() < 1000 and sample['x'].max() >= 9000
+
+def test_block_sample_estimates_row_count(large_csv):
+    file, df = large_csv
+    sample, (estimate, (lower, upper)) = block_sample_csv(str(file), n_blocks=20, rows_per_block=50)
+    assert BLOCK_COLUMN in sample.columns
+    assert list(sample.columns[:3]) == ['value', 'other', 'group']
+    assert lower <= len(df) <= upper
+    assert estimate == pytest.approx(len(df), rel=0.05)
+
+def test_block_sample_reads_each_row_once(tmp_path):
+    file = tmp_path / "small.csv"
+    pd.DataFrame({'id': np.arange(300), 'value': np.arange(300) * 1.5}).to_csv(file, index=False)
+    # Far more blocks than fit in the file without overlapping
+    sample, (estimate, _) = block_sample_csv(str(file), n_blocks=80, rows_per_block=20)
+    assert sample['id'].is_unique
+    assert sample.groupby(BLOCK_COLUMN).size().max() <= 20
+    assert estimate == pytest.approx(300, rel=0.1)
+
+def test_sample_file_intervals_cover_truth(large_csv):
+    file, df = large_csv
+    for method in ['reservoir', 'block']:
+        summary = sample_file(str(file), 2000, method=method, chunksize=3000)
+        intervals = summary.intervals()
+        lower, upper = intervals.loc[('value', 'mean'), ['lower', 'upper']]
+        assert lower <= df['value'].mean() <= upper
+        assert "±" in summary.to_string()
+
+def test_interval_helpers():
+    lower, upper = mean_interval([1.0, 2.0, 3.0, 4.0])
+    assert lower < 2.5 < upper
+    lower, upper = proportion_interval(0, 100)
+    assert lower == pytest.approx(0.0, abs=1e-12) and 0 < upper < 0.05
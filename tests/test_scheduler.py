@@ -2,7 +2,21 @@
 
 import pytest
 from unittest.mock import patch
-from dataauto.scheduler import schedule_command
+import time
+import click
+import pandas as pd
+import json
+import threading
+from concurrent.futures import Future
+from dataauto.scheduler import schedule_command, WorkerPool, JobExecutor, JobResult, DEFAULT_JOB_MEMORY
+
+@click.command()
+@click.argument('seconds', type=float)
+def sleepy(seconds):
+    """Test command that sleeps, or fails for negative durations."""
+    if seconds < 0:
+        raise click.ClickException("negative duration")
+    time.sleep(seconds)
 
 def test_schedule_command(mocker):
     with patch('dataauto.scheduler.schedule') as mock_schedule:
@@ -20,4 +34,118 @@ def test_schedule_command(mocker):
     
             # Assert that the scheduler thread was started
             mock_thread.assert_called_once()
-            mock_thread.return_value.start.assert_called_once()
\ No newline at end of file
+            mock_thread.return_value.start.assert_called_once()
+
+def test_schedule_command_requires_one_trigger():
+    with pytest.raises(ValueError, match="exactly one"):
+        schedule_command('load', '/path/to/file.csv', '14:30', cron='*/5 * * * *')
+    with pytest.raises(ValueError, match="exactly one"):
+        schedule_command('load', '/path/to/file.csv')
+
+def test_worker_pool_runs_cli_commands_in_process(tmp_path):
+    file = tmp_path / "data.csv"
+    pd.DataFrame({'a': [1, 2, 3], 'b': ['x', 'y', 'z']}).to_csv(file, index=False)
+    with WorkerPool(workers=1, preload=()) as pool:
+        result = pool.run(['summarize', str(file)])
+        assert result.ok, result.error
+        result = pool.run(['summarize', str(tmp_path / "missing.csv")])
+        assert result.exit_code == 1
+        assert "Error summarizing data" in result.error
+
+def test_worker_pool_timeout_replaces_worker():
+    with WorkerPool(workers=2, preload=(), target='tests.test_scheduler:sleepy') as pool:
+        slow = pool.submit(['5'], timeout=0.5)
+        fast = pool.submit(['0'])
+        assert fast.result().ok
+        result = slow.result()
+        assert result.timed_out
+        assert result.duration < 5
+        # The killed worker is replaced and keeps serving jobs
+        results = [pool.submit(['0']) for _ in range(3)]
+        assert all(future.result().ok for future in results)
+        failed = pool.run(['--', '-1'])
+        assert failed.exit_code == 1 and failed.error == "negative duration"
+
+def test_job_executor_runs_within_budget_and_skips_overlaps(tmp_path):
+    history_file = tmp_path / "history.jsonl"
+    pool = WorkerPool(workers=2, preload=(), target='tests.test_scheduler:sleepy')
+    executor = JobExecutor(cpu_budget=2, memory_budget=10 ** 12, history_file=str(history_file), pool=pool)
+    first = executor.submit('a', ['0.5'])
+    second = executor.submit('b', ['0.5'])
+    overlapping = executor.submit('a', ['0'])
+    third = executor.submit('c', ['0'])
+    assert overlapping.result()['status'] == 'skipped'
+    records = [future.result() for future in (first, second, third)]
+    executor.shutdown()
+    assert [record['status'] for record in records] == ['succeeded'] * 3
+    # 'a' and 'b' ran side by side; 'c' waited for a free CPU
+    assert records[1]['started_at'] < records[0]['finished_at']
+    assert records[2]['queue_wait'] >= 0.3
+    assert all(record['run_time'] > 0 and record['peak_rss'] > 0 for record in records)
+    lines = [json.loads(line) for line in history_file.read_text().splitlines()]
+    assert sorted(line['name'] for line in lines) == ['a', 'b', 'c']
+
+def test_job_executor_memory_admission(tmp_path):
+    history_file = tmp_path / "history.jsonl"
+    runs = [{'name': 'big', 'peak_rss': 600, 'input_bytes': 100}, {'name': 'small', 'peak_rss': 300}]
+    history_file.write_text(''.join(json.dumps(run) + '\n' for run in runs))
+    pool = WorkerPool(workers=2, preload=(), target='tests.test_scheduler:sleepy')
+    executor = JobExecutor(cpu_budget=2, memory_budget=1000, history_file=str(history_file), pool=pool)
+    assert executor.estimate_memory('big') == 600
+    # The input doubled in size since the recorded run
+    input_file = tmp_path / "input.csv"
+    input_file.write_bytes(b'x' * 200)
+    assert executor.estimate_memory('big', 200) == 1200
+    assert executor.estimate_memory('unknown') == DEFAULT_JOB_MEMORY
+
+    big = executor.submit('big', ['0.5'], input_path=str(input_file))
+    small = executor.submit('small', ['0'])
+    big_record, small_record = big.result(), small.result()
+    executor.shutdown()
+    # The oversized job ran alone and the next one waited for it
+    assert big_record['estimated_memory'] == 1200
+    assert small_record['started_at'] >= big_record['finished_at']
+
+class InstantPool:
+    """Pool whose jobs are already done when submitted."""
+
+    def submit(self, args, timeout=None):
+        future = Future()
+        future.set_result(JobResult(args, 0, peak_rss_bytes=100))
+        return future
+
+    def shutdown(self):
+        pass
+
+def test_job_executor_handles_jobs_done_on_submit(tmp_path):
+    history_file = tmp_path / "history.jsonl"
+    executor = JobExecutor(cpu_budget=1, memory_budget=10 ** 12, history_file=str(history_file), pool=InstantPool())
+    # The done callbacks run during submit; they used to wait forever on the executor's lock
+    thread = threading.Thread(target=lambda: [executor.run(name, []) for name in 'abc'], daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    executor.shutdown()
+    assert [json.loads(line)['name'] for line in history_file.read_text().splitlines()] == ['a', 'b', 'c']
+
+def test_schedule_cli_runs_jobs_until_stopped(tmp_path):
+    from click.testing import CliRunner
+    from dataauto.cli import cli
+    from dataauto.scheduler import stop_scheduler
+    data = tmp_path / "data.csv"
+    pd.DataFrame({'a': [1, 2, 3]}).to_csv(data, index=False)
+    history_file = tmp_path / "history.jsonl"
+
+    def stop_after_first_run():
+        deadline = time.time() + 60
+        while time.time() < deadline and not (history_file.exists() and history_file.read_text()):
+            time.sleep(0.1)
+        stop_scheduler()
+
+    threading.Thread(target=stop_after_first_run, daemon=True).start()
+    result = CliRunner().invoke(cli, ['schedule', str(data), '--every', '0.5', '--command', 'summarize',
+                                      '--workers', '1', '--history-file', str(history_file)])
+    assert result.exit_code == 0, result.output
+    assert "every 0.5s" in result.output
+    record = json.loads(history_file.read_text().splitlines()[0])
+    assert record['name'] == f"summarize {data}" and record['status'] == 'succeeded'
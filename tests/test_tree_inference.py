@@ -0,0 +1,75 @@
+# tests/test_tree_inference.py
+
+import pytest
+import pandas as pd
+import numpy as np
+import warnings
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from sklearn.exceptions import UndefinedMetricWarning
+from dataauto.model_trainer import train_model
+from dataauto.tree_inference import compile_forest, save_compiled_forest, load_compiled_forest, benchmark_forest
+
+@pytest.fixture
+def features():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(3000, 6))
+    y = 2 * X[:, 0] - X[:, 1] + rng.normal(scale=0.1, size=3000)
+    X[rng.random(X.shape) < 0.05] = np.nan
+    return X, y
+
+def test_regressor_matches_sklearn_exactly(features):
+    X, y = features
+    model = RandomForestRegressor(n_estimators=20, random_state=0).fit(X[:2000], y[:2000])
+    compiled = compile_forest(model)
+    assert np.array_equal(compiled.predict(X), model.predict(X))
+    assert np.array_equal(compiled.predict(X[:7], batch_size=3), model.predict(X[:7]))
+
+def test_classifier_matches_sklearn_exactly(features):
+    X, y = features
+    labels = np.where(y > 0, 'high', 'low')
+    model = RandomForestClassifier(n_estimators=20, random_state=0).fit(X[:2000], labels[:2000])
+    compiled = compile_forest(model)
+    assert np.array_equal(compiled.predict_proba(X), model.predict_proba(X))
+    assert np.array_equal(compiled.predict(X), model.predict(X))
+
+def test_compile_trained_pipeline(tmp_path):
+    df = pd.DataFrame({
+        'Name': ['Alice', 'Bob', 'Charlie', 'David', 'Eve'],
+        'Age': [25, 30, 35, 40, 45],
+        'Salary': [70000, 80000, 90000, 100000, 110000],
+        'Department': ['Engineering', 'Marketing', 'Sales', 'HR', 'Engineering']
+    })
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UndefinedMetricWarning)
+        model, _ = train_model(df, target='Department', model_type='classifier')
+    X = df.drop(columns=['Department'])
+    path = str(tmp_path / "forest.joblib")
+    save_compiled_forest(compile_forest(model), path)
+    compiled = load_compiled_forest(path)
+    assert isinstance(compiled.threshold, np.memmap)
+    assert np.array_equal(compiled.predict(X), model.predict(X))
+
+def test_preprocesses_one_batch_at_a_time(mocker):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'amount': rng.normal(size=300), 'user': [f"user_{i}" for i in range(300)]})
+    df['target'] = df['amount'] * 2
+    model, _ = train_model(df, target='target')
+    X = df.drop(columns=['target'])
+    compiled = compile_forest(model)
+    transform = mocker.spy(compiled.preprocessor, 'transform')
+    assert np.array_equal(compiled.predict(X, batch_size=128), model.predict(X))
+    assert [len(call.args[0]) for call in transform.call_args_list] == [128, 128, 44]
+
+def test_compile_rejects_other_models():
+    from sklearn.linear_model import LinearRegression
+    model = LinearRegression().fit([[0.0], [1.0]], [0.0, 1.0])
+    with pytest.raises(TypeError):
+        compile_forest(model)
+
+def test_benchmark_forest(features):
+    X, y = features
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+    result = benchmark_forest(model, X[:100], repeats=1)
+    assert result['rows'] == 100
+    assert result['sklearn_rows_per_sec'] > 0
+    assert result['compiled_rows_per_sec'] > 0
@@ -0,0 +1,86 @@
+# tests/test_triggers.py
+
+import pytest
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from dataauto.triggers import CronExpression, CronTrigger, IntervalTrigger, FileTrigger, TriggerLoop
+
+@pytest.fixture
+def loop():
+    loop = TriggerLoop()
+    stop = threading.Event()
+    thread = threading.Thread(target=loop.run, args=(stop,), daemon=True)
+    thread.start()
+    yield loop
+    stop.set()
+    loop.wake()
+    thread.join(timeout=5)
+    loop.close()
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+def test_cron_next_after():
+    moment = datetime(2024, 11, 15, 10, 7, 30)  # a Friday
+    assert CronExpression('*/15 * * * *').next_after(moment) == datetime(2024, 11, 15, 10, 15)
+    assert CronExpression('30 2 * * *').next_after(moment) == datetime(2024, 11, 16, 2, 30)
+    assert CronExpression('0 9 * * mon-fri').next_after(moment) == datetime(2024, 11, 18, 9, 0)
+    assert CronExpression('@monthly').next_after(moment) == datetime(2024, 12, 1, 0, 0)
+    assert CronExpression('0 0 29 2 *').next_after(moment) == datetime(2028, 2, 29, 0, 0)
+    # Day of month and day of week restricted: either matches
+    assert CronExpression('0 0 1 * sun').next_after(moment) == datetime(2024, 11, 17, 0, 0)
+    # Strictly after: a matching minute is not returned again
+    assert CronExpression('7 10 * * *').next_after(moment) == datetime(2024, 11, 16, 10, 7)
+    for invalid in ('* * * *', '60 * * * *', '0 0 30 2 *'):
+        with pytest.raises(ValueError):
+            CronExpression(invalid).next_after(moment)
+
+def test_interval_and_cron_triggers_fire_on_deadline(loop):
+    runs = []
+    interval = loop.add(IntervalTrigger(0.2, lambda: runs.append(time.time())))
+    assert wait_for(lambda: len(runs) >= 3)
+    loop.remove(interval)
+    assert runs[1] - runs[0] == pytest.approx(0.2, abs=0.1)
+    cron = CronTrigger('* * * * *', lambda: None)
+    assert 0 < cron.deadline() - time.time() <= 60
+
+def test_file_trigger_coalesces_bursts(loop, tmp_path):
+    batches = []
+    loop.add(FileTrigger(str(tmp_path), batches.append, patterns=['*.csv'], debounce=0.3))
+    for index in range(50):
+        (tmp_path / f"part-{index:03d}.csv").write_text("a\n1\n")
+    (tmp_path / "ignored.tmp").write_text("x")
+    assert wait_for(lambda: batches)
+    time.sleep(0.5)
+    assert len(batches) == 1
+    assert len(batches[0]) == 50 and all(path.endswith('.csv') for path in batches[0])
+
+def test_file_trigger_waits_for_running_job(loop, tmp_path):
+    watched = tmp_path / "data.csv"
+    watched.write_text("a\n")
+    runs = []
+
+    def job(changed):
+        runs.append(changed)
+        future = Future()
+        threading.Timer(0.5, future.set_result, args=(None,)).start()
+        return future
+
+    loop.add(FileTrigger(str(watched), job, debounce=0.05))
+    watched.write_text("a\n1\n")
+    assert wait_for(lambda: len(runs) == 1)
+    # Changes made while the job runs are batched into exactly one more run after it
+    (tmp_path / "other.csv").write_text("not watched\n")
+    for index in range(5):
+        watched.write_text(f"a\n{index}\n")
+        time.sleep(0.02)
+    time.sleep(0.2)
+    assert len(runs) == 1
+    assert wait_for(lambda: len(runs) == 2)
+    time.sleep(0.3)
+    assert runs == [[str(watched)], [str(watched)]]